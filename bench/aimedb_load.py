@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Replays aimedb lookup, register and log packets against a running aimedb server at a
+fixed rate and reports throughput and latency. Each connection sends --pipeline requests
+back to back before reading the responses, like a busy reader would.
+
+register creates users and cards when allow_user_registration is on, so point this at a
+throwaway database. The key must match aimedb.key in the server's core.yaml.
+Run from the repository root:
+    python -m bench.aimedb_load -k <aimedb key> -r 2000 -j 32 --pipeline 4 -t 10
+"""
+import argparse
+import asyncio
+import itertools
+import struct
+import time
+from typing import Callable, Dict, List, Tuple
+
+from Crypto.Cipher import AES
+
+GAME_ID = b"SDBT"
+STORE_ID = 1
+KEYCHIP_ID = b"A69E01A8888"
+
+CMD_LOOKUP = 0x04
+CMD_REGISTER = 0x05
+CMD_LOG = 0x09
+
+
+def header(cmd: int, length: int) -> bytes:
+    return struct.pack("<5H6sI12s", 0xA13E, 0x3087, cmd, length, 1, GAME_ID, STORE_ID, KEYCHIP_ID)
+
+
+def lookup_packet(cmd: int, access_code: int) -> bytes:
+    body = bytes.fromhex(f"{access_code:020}") + struct.pack("<bbI", 1, 2, 0)
+    return header(cmd, 0x30) + body
+
+
+def log_packet(aime_id: int) -> bytes:
+    body = struct.pack("<IIQiii", aime_id, 1, aime_id, 1, 1, 0)
+    return header(CMD_LOG, 0x40) + body + bytes(0x20 - len(body))
+
+
+def packet_makers(kinds: List[str], base_code: int) -> Callable[[int], bytes]:
+    makers: Dict[str, Callable[[int], bytes]] = {
+        "lookup": lambda i: lookup_packet(CMD_LOOKUP, base_code + i % 1000),
+        "register": lambda i: lookup_packet(CMD_REGISTER, base_code + 1000 + i),
+        "log": lambda i: log_packet(i % 1000 + 1),
+    }
+    chosen = [makers[kind] for kind in kinds]
+    return lambda i: chosen[i % len(chosen)](i)
+
+
+async def read_packet(reader: asyncio.StreamReader, cipher) -> bytes:
+    first = cipher.decrypt(await reader.readexactly(0x10))
+    length = max(struct.unpack_from("<H", first, 6)[0], 0x20)
+    return first + cipher.decrypt(await reader.readexactly(length - 0x10))
+
+
+async def client(
+    args: argparse.Namespace, conn: int, make: Callable[[int], bytes], stop_at: float
+) -> Tuple[int, int, List[float]]:
+    cipher = AES.new(args.key.encode(), AES.MODE_ECB)
+    counter = itertools.count(conn * 1_000_000)
+    ok = 0
+    failed = 0
+    latencies: List[float] = []
+    # Every connection gets an equal share of the total rate, sent in pipelined batches
+    interval = args.pipeline * args.connections / args.rate if args.rate > 0 else 0
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+
+    try:
+        next_send = time.monotonic()
+        while time.monotonic() < stop_at:
+            batch = b"".join(cipher.encrypt(make(next(counter))) for _ in range(args.pipeline))
+            start = time.monotonic()
+            writer.write(batch)
+            await writer.drain()
+
+            for _ in range(args.pipeline):
+                resp = await read_packet(reader, cipher)
+                if struct.unpack_from("<H", resp, 8)[0] in (1, 4, 5, 10):
+                    ok += 1
+                else:
+                    failed += 1
+            latencies.append(time.monotonic() - start)
+
+            if interval:
+                next_send += interval
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+    except (OSError, asyncio.IncompleteReadError):
+        failed += 1
+
+    finally:
+        writer.close()
+
+    return ok, failed, latencies
+
+
+async def main(args: argparse.Namespace) -> None:
+    make = packet_makers(args.mix.split(","), args.access_code)
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *[client(args, i, make, start + args.time) for i in range(args.connections)]
+    )
+    elapsed = time.monotonic() - start
+
+    ok = sum(x[0] for x in results)
+    failed = sum(x[1] for x in results)
+    latencies = sorted(itertools.chain.from_iterable(x[2] for x in results))
+
+    print(f"{ok} ok, {failed} failed in {elapsed:.1f}s ({ok / elapsed:.1f} req/s)")
+    if latencies:
+        pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+        print(f"batch latency ms: p50 {pct(0.5):.2f}  p90 {pct(0.9):.2f}  p99 {pct(0.99):.2f}  max {latencies[-1] * 1000:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aimedb load generator")
+    parser.add_argument("--key", "-k", type=str, required=True, help="Aimedb key")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Aimedb address")
+    parser.add_argument("--port", "-p", type=int, default=22345, help="Aimedb port")
+    parser.add_argument("--rate", "-r", type=float, default=0, help="Total requests per second, 0 for as fast as possible")
+    parser.add_argument("--connections", "-j", type=int, default=16, help="Concurrent reader connections")
+    parser.add_argument("--pipeline", type=int, default=1, help="Requests sent per connection before reading responses")
+    parser.add_argument("--mix", type=str, default="lookup,lookup,lookup,log", help="Comma separated request kinds (lookup, register, log), cycled in order")
+    parser.add_argument("--access-code", type=int, default=50000000000000000000, help="First access code to use")
+    parser.add_argument("--time", "-t", type=float, default=10, help="Seconds to run")
+    asyncio.run(main(parser.parse_args()))
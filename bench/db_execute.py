@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Measures how many concurrent "requests" per second the database layer can serve when
+queries block the event loop (the old behaviour, BaseData.execute_sync called inline)
+versus when they are dispatched to the database thread pool (BaseData.execute).
+
+Run from the repository root against a configured database:
+    python -m bench.db_execute -c config -n 500 -j 50 -d 0.005
+"""
+import argparse
+import asyncio
+import time
+from os import path
+
+import yaml
+
+from core.config import CoreConfig
+from core.data import Data
+
+
+async def run_requests(fn, total: int, concurrency: int, sql: str) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one_request() -> None:
+        async with sem:
+            await fn(sql)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one_request() for _ in range(total)])
+    return time.perf_counter() - start
+
+
+async def main(args: argparse.Namespace) -> None:
+    cfg = CoreConfig()
+    if path.exists(f"{args.config}/core.yaml"):
+        cfg.update(yaml.safe_load(open(f"{args.config}/core.yaml")))
+
+    data = Data(cfg)
+    sql = f"SELECT SLEEP({args.delay})"
+
+    async def blocking(sql: str) -> None:
+        data.base.execute_sync(sql)
+
+    async def threaded(sql: str) -> None:
+        await data.base.execute(sql)
+
+    for name, fn in (("blocking", blocking), ("thread pool", threaded)):
+        elapsed = await run_requests(fn, args.requests, args.concurrency, sql)
+        print(f"{name:>12}: {args.requests} requests in {elapsed:.3f}s ({args.requests / elapsed:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BaseData.execute throughput benchmark")
+    parser.add_argument("--config", "-c", type=str, default="config", help="Config folder to use")
+    parser.add_argument("--requests", "-n", type=int, default=500, help="Total number of requests")
+    parser.add_argument("--concurrency", "-j", type=int, default=50, help="Requests in flight at once")
+    parser.add_argument("--delay", "-d", type=float, default=0.005, help="Simulated query time in seconds")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Load test for the Pokken matchmaker. Simulated cabinets start matching in a random
+region and mode, poll is_matching until they are paired, and some of them give up
+and stop matching instead. Reports how many matching calls per second the matchmaker
+handles and their latency, and checks that every paired cabinet ended up in exactly
+one session with cabinets from its own queue.
+
+Run from the repository root:
+    python -m bench.pokken_matching -n 1000 10000 --regions 4 --modes 2 -r 3
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List, Tuple
+
+from titles.pokken.matching import MatchingSession, PokkenMatchmaker
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+async def run(cabinets: int, regions: int, modes: int, cancel: float, seed: int) -> Tuple[float, List[float], List[str]]:
+    rng = random.Random(seed)
+    matching = PokkenMatchmaker()
+    keys = {f"PCB{i:08d}": (rng.randrange(regions), rng.randrange(modes)) for i in range(cabinets)}
+    pending = list(keys)
+    rng.shuffle(pending)
+
+    sessions: Dict[str, MatchingSession] = {}
+    cancelled = set()
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    async def call(func, *args):
+        start = time.perf_counter()
+        ret = await func(*args)
+        latencies.append(time.perf_counter() - start)
+        return ret
+
+    started = time.perf_counter()
+    waiting: List[str] = []
+    while pending or waiting:
+        # a few new cabinets join, then every waiting cabinet polls once
+        for _ in range(min(len(pending), max(1, cabinets // 50))):
+            pcb_id = pending.pop()
+            region, mode = keys[pcb_id]
+            session = await call(matching.start, pcb_id, "127.0.0.1", region, mode)
+            if session is None:
+                waiting.append(pcb_id)
+
+        still_waiting = []
+        for pcb_id in waiting:
+            session, entry = await call(matching.poll, pcb_id)
+            if session is not None:
+                sessions[pcb_id] = session
+            elif entry is None:
+                errors.append(f"{pcb_id} is neither waiting nor matched")
+            elif rng.random() < cancel:
+                await call(matching.stop, pcb_id)
+                cancelled.add(pcb_id)
+            elif pending:
+                still_waiting.append(pcb_id)
+            else:
+                # nobody left to pair with, give up like the cabinet would
+                await call(matching.stop, pcb_id)
+                cancelled.add(pcb_id)
+        waiting = still_waiting
+    elapsed = time.perf_counter() - started
+
+    # cabinets that were paired right away in start() never polled, pick their session up too
+    for pcb_id in keys:
+        if pcb_id not in sessions and pcb_id not in cancelled:
+            session, _ = await matching.poll(pcb_id)
+            if session is not None:
+                sessions[pcb_id] = session
+
+    seen: Dict[str, str] = {}
+    for session in {id(x): x for x in sessions.values()}.values():
+        if len(session.members) != matching.MATCH_SIZE:
+            errors.append(f"session {session.id} has {len(session.members)} members")
+        if len({keys[x.pcb_id] for x in session.members}) != 1:
+            errors.append(f"session {session.id} mixes regions or modes")
+        for member in session.members:
+            if member.pcb_id in seen:
+                errors.append(f"{member.pcb_id} is in sessions {seen[member.pcb_id]} and {session.id}")
+            seen[member.pcb_id] = session.id
+            if member.pcb_id in cancelled:
+                errors.append(f"{member.pcb_id} stopped matching but is in session {session.id}")
+
+    for pcb_id, session in sessions.items():
+        if seen.get(pcb_id) != session.id:
+            errors.append(f"{pcb_id} was handed session {session.id} it isn't a member of")
+
+    if matching.stats()["waiting"]:
+        errors.append(f"{matching.stats()['waiting']} cabinets are still waiting")
+
+    return elapsed, latencies, errors
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'cabinets':>8} {'calls':>8} {'calls/s':>10} {'p50 us':>7} {'p99 us':>7} {'max us':>7} {'errors':>6}")
+    for n in args.cabinets:
+        best = None
+        for r in range(args.repeat):
+            elapsed, latencies, errors = asyncio.run(run(n, args.regions, args.modes, args.cancel, args.seed + r))
+            for error in errors[:10]:
+                print(error)
+            if best is None or elapsed < best[0]:
+                best = (elapsed, latencies, errors)
+
+        elapsed, latencies, errors = best
+        latencies.sort()
+        print(
+            f"{n:>8} {len(latencies):>8} {len(latencies) / elapsed:>10.0f} {percentile(latencies, 0.5) * 1e6:>7.1f} "
+            f"{percentile(latencies, 0.99) * 1e6:>7.1f} {latencies[-1] * 1e6:>7.1f} {len(errors):>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pokken matchmaking load test")
+    parser.add_argument("--cabinets", "-n", type=int, nargs="+", default=[1000, 10000], help="Number of simulated cabinets")
+    parser.add_argument("--regions", type=int, default=4, help="Number of regions cabinets pick from")
+    parser.add_argument("--modes", type=int, default=2, help="Number of modes cabinets pick from")
+    parser.add_argument("--cancel", type=float, default=0.05, help="Chance a waiting cabinet stops matching on every poll")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Runs per size, the fastest one is reported")
+    main(parser.parse_args())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Times encoding the biggest SAO list responses (hero logs, equipment and items) with the
+FieldLayout codec against the construct based encoder they used before, and checks that
+both produce the same bytes. Also times encode_arr_cls on a list of shop items against
+the old bytes concatenation loop.
+
+Run from the repository root, the responses read their level tables from titles/sao/data:
+    python -m bench.sao_codec -n 100 1000 5000 -r 5
+"""
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+from construct import Array, Int8ul, Int16ub, Int16ul, Int32ub, Rebuild, Struct, len_, this
+
+from titles.sao.handlers.base import (
+    SaoGetEquipmentUserDataListResponse,
+    SaoGetHeroLogUserDataListResponse,
+    SaoGetItemUserDataListResponse,
+)
+from titles.sao.handlers.helpers import YuiMedalShopItemData, encode_arr_cls, encode_int
+
+PROPERTY_FIELDS = [
+    f"property{n}_{field}" for n in range(1, 5) for field in ("property_id", "value1", "value2")
+]
+
+
+def legacy_build(resp, list_name: str, fields: List[Tuple[str, object]], rows: List[dict]) -> bytes:
+    """
+    The construct encoder the list responses used before: build an empty response, parse
+    it back, append every row as a dict and build the whole thing again
+    """
+    item_struct = Struct(*[name / kind for name, kind in fields])
+    resp_struct = Struct(
+        "result" / Int8ul,
+        f"{list_name}_size" / Rebuild(Int32ub, len_(this[list_name])),
+        list_name / Array(this[f"{list_name}_size"], item_struct),
+    )
+    resp_data = resp_struct.parse(resp_struct.build({"result": resp.result, f"{list_name}_size": 0, list_name: []}))
+    for row in rows:
+        resp_data[list_name].append(row)
+    resp_data[f"{list_name}_size"] = len(resp_data[list_name])
+    return resp_struct.build(resp_data)
+
+
+def str_fields(name: str, value: str) -> List[Tuple[str, object]]:
+    return [(f"{name}_size", Int32ub), (name, Int16ul[len(value)])]
+
+
+def str_values(name: str, value: str) -> dict:
+    return {f"{name}_size": len(value) * 2, name: [ord(x) for x in value]}
+
+
+def legacy_hero_logs(resp: SaoGetHeroLogUserDataListResponse) -> bytes:
+    fields = str_fields("user_hero_log_id", resp.user_hero_log_id[0]) + [
+        ("hero_log_id", Int32ub), ("log_level", Int16ub), ("max_log_level_extended_num", Int16ub),
+        ("log_exp", Int32ub), ("possible_awakening_flag", Int8ul), ("awakening_stage", Int16ub),
+        ("awakening_exp", Int32ub), ("skill_slot_correction_value", Int8ul),
+    ] + [(f"last_set_skill_slot{n}_skill_id", Int16ub) for n in range(1, 6)] + [
+        (name, Int32ub) for name in PROPERTY_FIELDS
+    ] + [
+        ("converted_card_num", Int16ub), ("shop_purchase_flag", Int8ul), ("protect_flag", Int8ul),
+    ] + str_fields("get_date", resp.get_date)
+
+    rows = []
+    for i in range(len(resp.hero_log_id)):
+        row = str_values("user_hero_log_id", resp.user_hero_log_id[i])
+        row.update(
+            hero_log_id=resp.hero_log_id[i], log_level=resp.log_level[i],
+            max_log_level_extended_num=resp.max_log_level_extended_num[i], log_exp=resp.log_exp[i],
+            possible_awakening_flag=resp.possible_awakening_flag, awakening_stage=resp.awakening_stage,
+            awakening_exp=resp.awakening_exp, skill_slot_correction_value=resp.skill_slot_correction_value,
+            converted_card_num=resp.converted_card_num, shop_purchase_flag=resp.shop_purchase_flag,
+            protect_flag=resp.protect_flag,
+        )
+        for n in range(1, 6):
+            row[f"last_set_skill_slot{n}_skill_id"] = getattr(resp, f"last_set_skill_slot{n}_skill_id")[i]
+        for name in PROPERTY_FIELDS:
+            row[name] = getattr(resp, name)
+        row.update(str_values("get_date", resp.get_date))
+        rows.append(row)
+
+    return legacy_build(resp, "hero_log_user_data_list", fields, rows)
+
+
+def legacy_equipment(resp: SaoGetEquipmentUserDataListResponse) -> bytes:
+    fields = str_fields("user_equipment_id", resp.user_equipment_id[0]) + [
+        ("equipment_id", Int32ub), ("enhancement_value", Int16ub), ("max_enhancement_value_extended_num", Int16ub),
+        ("enhancement_exp", Int32ub), ("possible_awakening_flag", Int8ul), ("awakening_stage", Int16ub),
+        ("awakening_exp", Int32ub),
+    ] + [(name, Int32ub) for name in PROPERTY_FIELDS] + [
+        ("converted_card_num", Int16ub), ("shop_purchase_flag", Int8ul), ("protect_flag", Int8ul),
+    ] + str_fields("get_date", resp.get_date)
+
+    rows = []
+    for i in range(len(resp.equipment_id)):
+        row = str_values("user_equipment_id", resp.user_equipment_id[i])
+        row.update(
+            equipment_id=resp.equipment_id[i], enhancement_value=resp.enhancement_value[i],
+            max_enhancement_value_extended_num=resp.max_enhancement_value_extended_num[i],
+            enhancement_exp=resp.enhancement_exp[i], possible_awakening_flag=resp.possible_awakening_flag[i],
+            awakening_stage=resp.awakening_stage[i], awakening_exp=resp.awakening_exp[i],
+            converted_card_num=resp.converted_card_num, shop_purchase_flag=resp.shop_purchase_flag,
+            protect_flag=resp.protect_flag,
+        )
+        for name in PROPERTY_FIELDS:
+            row[name] = getattr(resp, name)
+        row.update(str_values("get_date", resp.get_date))
+        rows.append(row)
+
+    return legacy_build(resp, "equipment_user_data_list", fields, rows)
+
+
+def legacy_items(resp: SaoGetItemUserDataListResponse) -> bytes:
+    fields = str_fields("user_item_id", resp.user_item_id[0]) + [
+        ("item_id", Int32ub), ("protect_flag", Int8ul),
+    ] + str_fields("get_date", resp.get_date)
+
+    rows = []
+    for i in range(len(resp.item_id)):
+        row = str_values("user_item_id", resp.user_item_id[i])
+        row.update(item_id=resp.item_id[i], protect_flag=resp.protect_flag)
+        row.update(str_values("get_date", resp.get_date))
+        rows.append(row)
+
+    return legacy_build(resp, "item_user_data_list", fields, rows)
+
+
+def legacy_encode_arr_cls(data: list) -> bytes:
+    ret = encode_int(len(data))
+    for x in data:
+        ret += x.make()
+    return ret
+
+
+def best_of(repeat: int, func: Callable[[], bytes]) -> Tuple[float, bytes]:
+    best = float("inf")
+    out = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'response':<12} {'rows':>6} {'before ms':>10} {'after ms':>9} {'speedup':>8}")
+    for n in args.rows:
+        # ids have the same number of digits, the old encoder needed fixed width strings
+        heroes = [(i, 0, 101000010 + i, 0, i * 100 % 1000000, 0, 0, 30086, 1001, 1002, 0, 0) for i in range(n)]
+        equipment = [(i, 0, 101000000 + i, 0, i * 10, 0, 0, 0) for i in range(n)]
+        items = [(i, 0, 100000 + i) for i in range(n)]
+        shop_items = [YuiMedalShopItemData.from_args(i, i, 1, 101000000 + i, 1) for i in range(n)]
+
+        cases = [
+            ("hero logs", SaoGetHeroLogUserDataListResponse(0xC601, heroes), legacy_hero_logs),
+            ("equipment", SaoGetEquipmentUserDataListResponse(0xC605, equipment), legacy_equipment),
+            ("items", SaoGetItemUserDataListResponse(0xC609, items), legacy_items),
+        ]
+
+        for name, resp, legacy in cases:
+            before, old = best_of(args.repeat, lambda: legacy(resp))
+            after, new = best_of(args.repeat, resp.make)
+            if new[-len(old):] != old:
+                print(f"{name}: encoded bytes differ from the old encoder!")
+            print(f"{name:<12} {n:>6} {before * 1000:>10.2f} {after * 1000:>9.2f} {before / after:>7.1f}x")
+
+        before, old = best_of(args.repeat, lambda: legacy_encode_arr_cls(shop_items))
+        after, new = best_of(args.repeat, lambda: encode_arr_cls(shop_items))
+        if new != old:
+            print("shop items: encoded bytes differ from the old encoder!")
+        print(f"{'shop items':<12} {n:>6} {before * 1000:>10.2f} {after * 1000:>9.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SAO response encoding benchmark")
+    parser.add_argument("--rows", "-n", type=int, nargs="+", default=[100, 1000, 5000], help="List sizes to encode")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Runs per case, the best one is reported")
+    main(parser.parse_args())
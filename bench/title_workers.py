@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Measures title server throughput for different numbers of worker processes. For every
+worker count the server is started with index.py (server.workers overridden through the
+CFG_core_server_workers environment variable), hammered with keep-alive HTTP requests
+for a fixed time, then stopped.
+
+Use a config with is_develop turned off. Run from the repository root:
+    python -m bench.title_workers -c config -w 1 2 4 8 -j 64 -t 10
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+
+async def wait_for_port(host: str, port: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return True
+
+        except OSError:
+            await asyncio.sleep(0.25)
+
+    return False
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def client(host: str, port: int, request: bytes, stop_at: float) -> Tuple[int, int]:
+    ok = 0
+    failed = 0
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        while time.monotonic() < stop_at:
+            writer.write(request)
+            await writer.drain()
+            if await read_response(reader) < 500:
+                ok += 1
+            else:
+                failed += 1
+
+    except (OSError, asyncio.IncompleteReadError):
+        failed += 1
+
+    finally:
+        writer.close()
+
+    return ok, failed
+
+
+async def run_load(args: argparse.Namespace) -> Tuple[int, int, float]:
+    if args.body:
+        body = bytes.fromhex(args.body)
+        request = (
+            f"POST {args.path} HTTP/1.1\r\nHost: {args.host}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n"
+        ).encode() + body
+    else:
+        request = f"GET {args.path} HTTP/1.1\r\nHost: {args.host}\r\nConnection: keep-alive\r\n\r\n".encode()
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *[client(args.host, args.port, request, start + args.time) for _ in range(args.concurrency)]
+    )
+    elapsed = time.monotonic() - start
+
+    return sum(x[0] for x in results), sum(x[1] for x in results), elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    rows: List[Tuple[int, int, int, float]] = []
+
+    for workers in args.workers:
+        env = dict(os.environ, CFG_core_server_workers=str(workers))
+        server = subprocess.Popen(
+            [sys.executable, "index.py", "-c", args.config, "-p", str(args.port)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        try:
+            if not await wait_for_port(args.host, args.port, 60):
+                print(f"{workers} workers: server did not come up")
+                continue
+
+            # Give every worker a chance to finish loading before measuring
+            await asyncio.sleep(args.warmup)
+            ok, failed, elapsed = await run_load(args)
+            rows.append((workers, ok, failed, elapsed))
+            print(f"{workers:>3} workers: {ok} ok, {failed} failed in {elapsed:.1f}s ({ok / elapsed:.1f} req/s)")
+
+        finally:
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(15)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+    if rows:
+        base = rows[0][1] / rows[0][3]
+        print("\nworkers  req/s  speedup")
+        for workers, ok, _, elapsed in rows:
+            print(f"{workers:>7}  {ok / elapsed:>5.0f}  {ok / elapsed / base:>6.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Title server throughput vs worker count")
+    parser.add_argument("--config", "-c", type=str, default="config", help="Configuration folder")
+    parser.add_argument("--workers", "-w", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to test")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address the server listens on")
+    parser.add_argument("--port", "-p", type=int, default=8080, help="Title port to start the server on")
+    parser.add_argument("--path", type=str, default="/", help="Path to request")
+    parser.add_argument("--body", type=str, default="", help="Hex encoded POST body, sends GET if empty")
+    parser.add_argument("--concurrency", "-j", type=int, default=64, help="Concurrent connections")
+    parser.add_argument("--time", "-t", type=float, default=10, help="Seconds to run each test")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds to wait after the port opens")
+    asyncio.run(main(parser.parse_args()))
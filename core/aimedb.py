@@ -2,6 +2,9 @@ import logging, coloredlogs
 from Crypto.Cipher import AES
 from typing import Dict, Tuple, Callable, Union, Optional
 import asyncio
+import struct
+import time
+from datetime import datetime
 from logging.handlers import TimedRotatingFileHandler
 
 from core.config import CoreConfig
@@ -10,10 +13,19 @@ from core.data import Data
 from .adb_handlers import *
 
 class AimedbServlet():
+    MAX_PACKET_SIZE = 0x1000
     request_list: Dict[int, Tuple[Callable[[bytes, int], Union[ADBBaseResponse, bytes]], int, str]] = {}
     def __init__(self, core_cfg: CoreConfig) -> None:        
         self.config = core_cfg        
         self.data = Data(core_cfg)
+        # access code -> (expires, user id, is_banned, is_locked)
+        self.card_cache: Dict[str, Tuple[float, int, bool, bool]] = {}
+        # access code -> last login time, written in batches by flush_logins
+        self.pending_logins: Dict[str, datetime] = {}
+        self.flush_task: Optional[asyncio.Task] = None
+        self.cipher = None
+        self.cipher_key = ""
+        self.connections = 0
 
         self.logger = logging.getLogger("aimedb")
         if not hasattr(self.logger, "initted"):
@@ -68,32 +80,135 @@ class AimedbServlet():
         self.logger.info(f"Start on port {self.config.aimedb.port}")
         addr = self.config.aimedb.listen_address if self.config.aimedb.listen_address else self.config.server.listen_address
         asyncio.create_task(asyncio.start_server(self.dataReceived, addr, self.config.aimedb.port))
-    
-    async def dataReceived(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
-        self.logger.debug(f"Connection made from {writer.get_extra_info('peername')[0]}")
+        if self.config.aimedb.last_login_flush_seconds > 0:
+            self.flush_task = asyncio.create_task(self.flush_loop())
+
+    async def stop(self) -> None:
+        """
+        Writes out any buffered last login times, call before the event loop shuts down
+        """
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+        await self.flush_logins()
+
+    async def flush_loop(self) -> None:
         while True:
+            await asyncio.sleep(self.config.aimedb.last_login_flush_seconds)
             try:
-                data: bytes = await reader.read(4096)
-                if len(data) == 0:
-                    self.logger.debug("Connection closed")
-                    return
-                await self.process_data(data, reader, writer)
-                await writer.drain()
-            except ConnectionResetError as e:
-                self.logger.debug("Connection reset, disconnecting")
-                return
+                await self.flush_logins()
+            except Exception as e:
+                self.logger.error(f"Failed to flush last login times - {e}")
 
-    async def process_data(self, data: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[bytes]:
-        addr = writer.get_extra_info('peername')[0]
-        cipher = AES.new(self.config.aimedb.key.encode(), AES.MODE_ECB)
+    async def flush_logins(self) -> None:
+        if not self.pending_logins:
+            return
+
+        logins = self.pending_logins
+        self.pending_logins = {}
+        self.logger.debug(f"Updating last login time for {len(logins)} cards")
 
         try:
-            decrypted = cipher.decrypt(data)
-        
+            updated = await self.data.card.update_cards_last_login(logins)
         except Exception as e:
-            self.logger.error(f"Failed to decrypt {data.hex()} because {e}")
+            self.logger.error(f"Failed to update last login time for {len(logins)} cards - {e}")
+            updated = False
+
+        if not updated:
+            # try again on the next flush, cards seen since then keep their newer time
+            for access_code, login in logins.items():
+                self.pending_logins.setdefault(access_code, login)
+
+    async def touch_card(self, access_code: str) -> None:
+        if self.config.aimedb.last_login_flush_seconds > 0:
+            self.pending_logins[access_code] = datetime.now()
+        else:
+            await self.data.card.update_card_last_login(access_code)
+
+    async def resolve_card(self, access_code: str) -> Tuple[Optional[int], bool, bool]:
+        """
+        Returns the user id (None if the card isn't registered), ban and lock status of a card
+        """
+        now = time.monotonic()
+        cached = self.card_cache.get(access_code)
+        if cached is not None and cached[0] > now:
+            return cached[1:]
+
+        card = await self.data.card.resolve_card(access_code)
+        if card is None:
+            self.card_cache.pop(access_code, None)
+            return (None, False, False)
+
+        ret = (int(card["user"]), bool(card["is_banned"]), bool(card["is_locked"]))
+        lifetime = self.config.aimedb.card_cache_seconds
+        if lifetime > 0:
+            if len(self.card_cache) > 4096:
+                self.card_cache = {k: v for k, v in self.card_cache.items() if v[0] > now}
+            self.card_cache[access_code] = (now + lifetime, *ret)
+        return ret
+    
+    async def dataReceived(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        addr = writer.get_extra_info('peername')[0]
+        max_connections = self.config.aimedb.max_connections
+        if max_connections > 0 and self.connections >= max_connections:
+            self.logger.warning(f"Refusing connection from {addr}, {self.connections} connections already open")
+            writer.close()
             return
 
+        self.connections += 1
+        self.logger.debug(f"Connection made from {addr}")
+        timeout = self.config.aimedb.idle_timeout or None
+        # Packets are decrypted into this buffer, it's reused for every packet on the connection
+        buf = bytearray(self.MAX_PACKET_SIZE)
+        view = memoryview(buf)
+
+        try:
+            while not writer.is_closing():
+                try:
+                    # The first AES block holds the length of the whole packet
+                    block = await asyncio.wait_for(reader.readexactly(0x10), timeout)
+                    cipher = self.get_cipher()
+                    cipher.decrypt(block, output=view[:0x10])
+
+                    length = max(struct.unpack_from("<H", buf, 6)[0], HEADER_SIZE) # Goodbye may not set a length
+                    if length > self.MAX_PACKET_SIZE or length % 0x10:
+                        self.logger.error(f"Bad packet length {hex(length)} from {addr}, disconnecting")
+                        return
+
+                    rest = await asyncio.wait_for(reader.readexactly(length - 0x10), timeout)
+                    cipher.decrypt(rest, output=view[0x10:length])
+
+                except asyncio.IncompleteReadError as e:
+                    if e.partial:
+                        self.logger.warning(f"Connection from {addr} closed mid packet ({len(e.partial)} of {e.expected} bytes)")
+                    else:
+                        self.logger.debug("Connection closed")
+                    return
+
+                except asyncio.TimeoutError:
+                    self.logger.debug(f"Closing idle connection from {addr}")
+                    return
+
+                await self.process_data(view[:length], addr, writer)
+                await writer.drain()
+
+        except ConnectionResetError as e:
+            self.logger.debug("Connection reset, disconnecting")
+
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    def get_cipher(self):
+        # AES ECB keeps no state between blocks so one cipher serves every connection
+        key = self.config.aimedb.key
+        if self.cipher is None or self.cipher_key != key:
+            self.cipher = AES.new(key.encode(), AES.MODE_ECB)
+            self.cipher_key = key
+        return self.cipher
+
+    async def process_data(self, decrypted: memoryview, addr: str, writer: asyncio.StreamWriter) -> Optional[bytes]:
+        cipher = self.get_cipher()
         self.logger.debug(f"{addr} wrote {decrypted.hex()}")
 
         try:
@@ -176,10 +291,8 @@ class AimedbServlet():
 
     async def handle_lookup(self, data: bytes, resp_code: int) -> ADBBaseResponse:
         req = ADBLookupRequest(data)
-        user_id = await self.data.card.get_user_id_from_card(req.access_code)
-        is_banned = await self.data.card.get_card_banned(req.access_code)
-        is_locked = await self.data.card.get_card_locked(req.access_code)
-        
+        user_id, is_banned, is_locked = await self.resolve_card(req.access_code)
+
         ret = ADBLookupResponse.from_req(req.head, user_id)
         if is_banned and is_locked:
             ret.head.status = ADBStatus.BAN_SYS_USER
@@ -193,15 +306,12 @@ class AimedbServlet():
         )
         
         if user_id and user_id > 0:
-            await self.data.card.update_card_last_login(req.access_code)
+            await self.touch_card(req.access_code)
         return ret
 
     async def handle_lookup_ex(self, data: bytes, resp_code: int) -> ADBBaseResponse:
         req = ADBLookupRequest(data)
-        user_id = await self.data.card.get_user_id_from_card(req.access_code)
-
-        is_banned = await self.data.card.get_card_banned(req.access_code)
-        is_locked = await self.data.card.get_card_locked(req.access_code)
+        user_id, is_banned, is_locked = await self.resolve_card(req.access_code)
 
         ret = ADBLookupExResponse.from_req(req.head, user_id)
         if is_banned and is_locked:
@@ -224,7 +334,7 @@ class AimedbServlet():
                 ret.auth_key = auth_key_full
 
         if user_id and user_id > 0:
-            await self.data.card.update_card_last_login(req.access_code)
+            await self.touch_card(req.access_code)
         return ret
 
     async def handle_felica_lookup(self, data: bytes, resp_code: int) -> bytes:
@@ -259,6 +369,7 @@ class AimedbServlet():
 
             else:
                 card_id = await self.data.card.create_card(user_id, ac)
+                self.card_cache.pop(ac, None)
 
                 if card_id is None:
                     self.logger.error("Failed to register card!")
@@ -274,13 +385,13 @@ class AimedbServlet():
             )
 
         if user_id > 0:
-            await self.data.card.update_card_last_login(ac)
+            await self.touch_card(ac)
         return ADBFelicaLookupResponse.from_req(req.head, ac)
 
     async def handle_felica_lookup_ex(self, data: bytes, resp_code: int) -> bytes:
         req = ADBFelicaLookup2Request(data)
         access_code = self.data.card.to_access_code(req.idm)
-        user_id = await self.data.card.get_user_id_from_card(access_code=access_code)
+        user_id, _, _ = await self.resolve_card(access_code)
 
         if user_id is None:
             user_id = -1
@@ -300,7 +411,7 @@ class AimedbServlet():
                 resp.auth_key = auth_key_full
         
         if user_id and user_id > 0:
-            await self.data.card.update_card_last_login(access_code)
+            await self.touch_card(access_code)
         return resp
 
     async def handle_campaign_clear(self, data: bytes, resp_code: int) -> ADBBaseResponse:
@@ -324,6 +435,7 @@ class AimedbServlet():
 
             else:
                 card_id = await self.data.card.create_card(user_id, req.access_code)
+                self.card_cache.pop(req.access_code, None)
 
                 if card_id is None:
                     self.logger.error("Failed to register card!")
@@ -343,7 +455,7 @@ class AimedbServlet():
             resp.head.status = ADBStatus.BAN_SYS # Closest we can get to a "You cannot register"
 
         else:
-            await self.data.card.update_card_last_login(req.access_code)
+            await self.touch_card(req.access_code)
 
         return resp
 
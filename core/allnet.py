@@ -7,7 +7,9 @@ import logging
 import coloredlogs
 import urllib.parse
 import math
-from typing import Dict, List, Any, Optional, Union, Final
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Union, Final
 from logging.handlers import TimedRotatingFileHandler
 from starlette.requests import Request
 from starlette.responses import PlainTextResponse
@@ -18,7 +20,7 @@ from enum import Enum
 from Crypto.PublicKey import RSA
 from Crypto.Hash import SHA
 from Crypto.Signature import PKCS1_v1_5
-from os import path, environ, mkdir, access, W_OK
+from os import path, environ, mkdir, access, W_OK, stat
 
 from .config import CoreConfig
 from .utils import Utils
@@ -167,7 +169,7 @@ class AllnetServlet:
 
         self.logger.debug(f"Allnet request: {vars(req)}")
 
-        machine = await self.data.arcade.get_machine(req.serial)        
+        machine = await self.data.arcade.registry.get_machine(req.serial)        
         if machine is None and not self.config.server.allow_unregistered_serials:
             msg = f"Unrecognised serial {req.serial} attempted allnet auth from {request_ip}."
             await self.data.base.log_event(
@@ -181,7 +183,7 @@ class AllnetServlet:
 
 
         if machine is not None:
-            arcade = await self.data.arcade.get_arcade(machine["arcade"])
+            arcade = await self.data.arcade.registry.get_arcade(machine["arcade"])
             if self.config.server.check_arcade_ip:
                 if arcade["ip"] and arcade["ip"] is not None and arcade["ip"] != req.ip:
                     msg = f"Serial {req.serial} attempted allnet auth from bad IP {req.ip} (expected {arcade['ip']})."
@@ -482,10 +484,16 @@ class AllnetServlet:
         return base64.b64encode(zipped)
 
 class BillingServlet:
+    SIGNATURE_CACHE_SIZE = 1024
+
     def __init__(self, core_cfg: CoreConfig, cfg_folder: str) -> None:
         self.config = core_cfg
         self.config_folder = cfg_folder
         self.data = Data(core_cfg)
+        self.signer = None
+        self.signing_key_stamp: Optional[Tuple[str, float]] = None
+        # (playlimit, nearfull, keychip) -> (playlimit signature, nearfull signature)
+        self.signatures: "OrderedDict[Tuple[int, int, bytes], Tuple[str, str]]" = OrderedDict()
 
         self.logger = logging.getLogger("billing")
         if not hasattr(self.logger, "initialized"):
@@ -512,8 +520,66 @@ class BillingServlet:
             self.logger.initialized = True
     
     def startup(self) -> None:
+        self.get_signer()
         self.logger.info(f"Ready on port {self.config.billing.port if self.config.billing.standalone else self.config.server.port}")
 
+    def get_signer(self) -> Optional[Any]:
+        """
+        Returns the signer for the billing signing key, loading it again if the key file changed
+        """
+        key_file = self.config.billing.signing_key
+        try:
+            stamp = (key_file, stat(key_file).st_mtime)
+            if stamp == self.signing_key_stamp:
+                return self.signer
+
+            with open(key_file, "rb") as f:
+                self.signer = PKCS1_v1_5.new(RSA.import_key(f.read()))
+
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Failed to load billing signing key {key_file}: {e}")
+            return self.signer
+
+        self.signing_key_stamp = stamp
+        self.signatures.clear()
+        self.logger.info(f"Loaded billing signing key {key_file}")
+        return self.signer
+
+    @staticmethod
+    def sign_billing(signer: Any, playlimit: int, nearfull: int, kc_serial_bytes: bytes) -> Tuple[str, str]:
+        digest = SHA.new()
+        digest.update(playlimit.to_bytes(4, "little") + kc_serial_bytes)
+        playlimit_sig = signer.sign(digest).hex()
+
+        digest = SHA.new()
+        digest.update(nearfull.to_bytes(4, "little") + kc_serial_bytes)
+        nearfull_sig = signer.sign(digest).hex()
+
+        return (playlimit_sig, nearfull_sig)
+
+    async def get_signatures(self, playlimit: int, nearfull: int, kc_serial_bytes: bytes) -> Optional[Tuple[str, str]]:
+        signer = self.get_signer()
+        if signer is None:
+            return None
+
+        key = (playlimit, nearfull, kc_serial_bytes)
+        sigs = self.signatures.get(key)
+        if sigs is not None:
+            self.signatures.move_to_end(key)
+            return sigs
+
+        # RSA signing is slow enough to stall every other request if done on the event loop
+        sigs = await asyncio.get_running_loop().run_in_executor(
+            None, self.sign_billing, signer, playlimit, nearfull, kc_serial_bytes
+        )
+
+        if signer is self.signer:
+            self.signatures[key] = sigs
+            while len(self.signatures) > self.SIGNATURE_CACHE_SIZE:
+                self.signatures.popitem(last=False)
+
+        return sigs
+
     def billing_req_to_dict(self, data: bytes):
         """
         Parses an billing request string into a python dictionary
@@ -547,9 +613,6 @@ class BillingServlet:
 
         self.logger.debug(f"request {req_dict}")
 
-        rsa = RSA.import_key(open(self.config.billing.signing_key, "rb").read())
-        signer = PKCS1_v1_5.new(rsa)
-        digest = SHA.new()
         traces: List[TraceData] = []
         try:
             req = BillingInfo(req_dict[0])
@@ -578,7 +641,7 @@ class BillingServlet:
         kc_serial_bytes = req.keychipid.encode()
         
 
-        machine = await self.data.arcade.get_machine(req.keychipid)
+        machine = await self.data.arcade.registry.get_machine(req.keychipid)
         if machine is None and not self.config.server.allow_unregistered_serials:
             msg = f"Unrecognised serial {req.keychipid} attempted billing checkin from {request_ip} for {req.gameid} v{req.gamever}."
             await self.data.base.log_event(
@@ -599,19 +662,17 @@ class BillingServlet:
         kc_playlimit = req.playlimit
         kc_nearfull = req.nearfull
 
-        while req.playcnt > req.playlimit:
+        while req.playcnt > kc_playlimit:
             kc_playlimit += 1024
             kc_nearfull += 1024
 
         playlimit = kc_playlimit
         nearfull = kc_nearfull + (req.billingtype.value * 0x00010000)
 
-        digest.update(playlimit.to_bytes(4, "little") + kc_serial_bytes)
-        playlimit_sig = signer.sign(digest).hex()
-
-        digest = SHA.new()
-        digest.update(nearfull.to_bytes(4, "little") + kc_serial_bytes)
-        nearfull_sig = signer.sign(digest).hex()
+        sigs = await self.get_signatures(playlimit, nearfull, kc_serial_bytes)
+        if sigs is None:
+            return PlainTextResponse(f"result=1&requestno={req.requestno}&message=Signing key unavailable\r\n")
+        playlimit_sig, nearfull_sig = sigs
 
         # TODO: playhistory
 
@@ -921,6 +982,7 @@ cfg_dir = environ.get("DIANA_CFG_DIR", "config")
 cfg: CoreConfig = CoreConfig()
 if path.exists(f"{cfg_dir}/core.yaml"):
     cfg.update(yaml.safe_load(open(f"{cfg_dir}/core.yaml")))
+CoreConfig.freeze(cfg, f"{cfg_dir}/core.yaml")
 
 if not path.exists(cfg.server.log_dir):
     mkdir(cfg.server.log_dir)
@@ -20,6 +20,7 @@ cfg_dir = environ.get("ARTEMIS_CFG_DIR", "config")
 cfg: CoreConfig = CoreConfig()
 if path.exists(f"{cfg_dir}/core.yaml"):
     cfg.update(yaml.safe_load(open(f"{cfg_dir}/core.yaml")))
+CoreConfig.freeze(cfg, f"{cfg_dir}/core.yaml")
 
 if not path.exists(cfg.server.log_dir):
     mkdir(cfg.server.log_dir)
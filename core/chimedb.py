@@ -100,8 +100,12 @@ class ChimeServlet:
         return user_id
 
     async def _lookup_user_status(self, access_code):
-        is_banned = await self.data.card.get_card_banned(access_code)
-        is_locked = await self.data.card.get_card_locked(access_code)
+        card = await self.data.card.resolve_card(access_code)
+        if card is None:
+            return None
+
+        is_banned = card["is_banned"]
+        is_locked = card["is_locked"]
 
         if is_banned and is_locked:
             return ChimeDBStatus.LOCK_BAN_SYSTEM_USER
@@ -1,5 +1,6 @@
 import logging, os
-from typing import Any
+import yaml
+from typing import Any, Dict, List, Optional, Tuple
 
 class ServerConfig:
     def __init__(self, parent_config: "CoreConfig") -> None:
@@ -112,6 +113,35 @@ class ServerConfig:
             self.__config, "core", "server", "strict_ip_checking", default=False
         )
 
+    @property
+    def workers(self) -> int:
+        """
+        Number of processes serving the title port. Anything above 1 also moves aimedb
+        into its own process.
+        """
+        return int(CoreConfig.get_config_field(
+            self.__config, "core", "server", "workers", default=1
+        ))
+
+    @property
+    def shared_store(self) -> str:
+        """
+        Where state shared between requests is kept, one of local, memcached or sql
+        """
+        return CoreConfig.get_config_field(
+            self.__config, "core", "server", "shared_store", default="local"
+        )
+
+    @property
+    def title_url(self) -> str:
+        """
+        Base url games are sent to by allnet, with the port included if it isn't 80
+        and a proxy isn't being used, ex. http://localhost:8080
+        """
+        if not self.is_using_proxy and self.port != 80:
+            return f"http://{self.hostname}:{self.port}"
+        return f"http://{self.hostname}"
+
 class TitleConfig:
     def __init__(self, parent_config: "CoreConfig") -> None:
         self.__config = parent_config
@@ -202,6 +232,25 @@ class DatabaseConfig:
             self.__config, "core", "database", "memcached_host", default="localhost"
         )
 
+    @property
+    def cache_size(self) -> int:
+        """
+        Maximum number of entries held in the in-process cache
+        """
+        return CoreConfig.get_config_field(
+            self.__config, "core", "database", "cache_size", default=4096
+        )
+
+    @property
+    def thread_pool_size(self) -> int:
+        """
+        Number of worker threads (and pooled connections) used to run queries
+        off of the event loop
+        """
+        return CoreConfig.get_config_field(
+            self.__config, "core", "database", "thread_pool_size", default=8
+        )
+
 class FrontendConfig:
     def __init__(self, parent_config: "CoreConfig") -> None:
         self.__config = parent_config
@@ -376,6 +425,30 @@ class AimedbConfig:
             self.__config, "core", "aimedb", "id_lifetime_seconds", default=86400
         )
 
+    @property
+    def card_cache_seconds(self) -> int:
+        return CoreConfig.get_config_field(
+            self.__config, "core", "aimedb", "card_cache_seconds", default=0
+        )
+
+    @property
+    def last_login_flush_seconds(self) -> int:
+        return CoreConfig.get_config_field(
+            self.__config, "core", "aimedb", "last_login_flush_seconds", default=5
+        )
+
+    @property
+    def idle_timeout(self) -> int:
+        return CoreConfig.get_config_field(
+            self.__config, "core", "aimedb", "idle_timeout", default=60
+        )
+
+    @property
+    def max_connections(self) -> int:
+        return CoreConfig.get_config_field(
+            self.__config, "core", "aimedb", "max_connections", default=1024
+        )
+
 class MuchaConfig:
     def __init__(self, parent_config: "CoreConfig") -> None:
         self.__config = parent_config
@@ -414,7 +487,15 @@ class ChimedbConfig:
         )
 
 
+def frozen_setattr(self, name: str, value: Any) -> None:
+    raise AttributeError(f"{type(self).__name__} is a read only config snapshot")
+
+
 class CoreConfig(dict):
+    # (config, yaml file) pairs that get swapped on reload
+    frozen_configs: List[Tuple[dict, Optional[str]]] = []
+    frozen_classes: Dict[type, type] = {}
+
     def __init__(self) -> None:
         self.server = ServerConfig(self)
         self.title = TitleConfig(self)
@@ -470,3 +551,91 @@ class CoreConfig(dict):
             read = read.get(path[x], {})
 
         return read.get(path[len(path) - 1], default)
+
+    @classmethod
+    def snapshot_section(cls, section: Any) -> Any:
+        """
+        Returns a read only copy of a config section with every property resolved once,
+        stored in slots so reads skip get_config_field. Methods still work off the
+        section's own config dict.
+        """
+        section_cls = type(section)
+        props = tuple(
+            name for name in dir(section_cls)
+            if isinstance(getattr(section_cls, name), property)
+        )
+
+        try:
+            values = {name: getattr(section, name) for name in props}
+
+        except Exception as e:
+            logging.getLogger("core").warning(
+                f"Not freezing config section {section_cls.__name__}: {e}"
+            )
+            return section
+
+        frozen_cls = cls.frozen_classes.get(section_cls)
+        if frozen_cls is None:
+            frozen_cls = type(
+                f"Frozen{section_cls.__name__}",
+                (section_cls,),
+                {"__slots__": props, "__setattr__": frozen_setattr, "__delattr__": frozen_setattr},
+            )
+            cls.frozen_classes[section_cls] = frozen_cls
+
+        frozen = object.__new__(frozen_cls)
+        frozen.__dict__.update(vars(section))
+        for name, value in values.items():
+            object.__setattr__(frozen, name, value)
+
+        return frozen
+
+    @classmethod
+    def snapshot_sections(cls, config: dict) -> None:
+        for name, section in list(vars(config).items()):
+            section_cls = type(section)
+            if any(isinstance(getattr(section_cls, x, None), property) for x in dir(section_cls)):
+                setattr(config, name, cls.snapshot_section(section))
+
+    @classmethod
+    def freeze(cls, config: dict, file: Optional[str] = None) -> None:
+        """
+        Replaces every section of a loaded config with a read only snapshot. If file is
+        given the config is also registered so reload_all can re-read it later.
+        """
+        cls.snapshot_sections(config)
+
+        if not any(x[0] is config for x in cls.frozen_configs):
+            cls.frozen_configs.append((config, file))
+
+    @classmethod
+    def reload_all(cls) -> int:
+        """
+        Re-reads every registered config file and swaps in new snapshots. The swap
+        doesn't yield to the event loop, so a request sees either the old or the new
+        config, never a mix. Returns the number of configs reloaded.
+        """
+        logger = logging.getLogger("core")
+        fresh_configs: List[Tuple[dict, dict]] = []
+
+        for config, file in cls.frozen_configs:
+            fresh = type(config)()
+            if file is not None and os.path.exists(file):
+                try:
+                    with open(file) as f:
+                        fresh.update(yaml.safe_load(f) or {})
+
+                except (OSError, yaml.YAMLError) as e:
+                    logger.error(f"Failed to reload {file}, keeping the current config: {e}")
+                    return 0
+
+            cls.snapshot_sections(fresh)
+            fresh_configs.append((config, fresh))
+
+        for config, fresh in fresh_configs:
+            config.clear()
+            config.update(fresh)
+            config.__dict__.update(vars(fresh))
+
+        logger.info(f"Reloaded {len(fresh_configs)} configs")
+        return len(fresh_configs)
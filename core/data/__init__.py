@@ -1,2 +1,3 @@
 from core.data.database import Data
-from core.data.cache import cached
+from core.data.cache import cached, invalidate
+from core.data.snapshot import snapshots
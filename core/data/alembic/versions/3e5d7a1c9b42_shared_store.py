@@ -0,0 +1,31 @@
+"""Shared store table
+
+Revision ID: 3e5d7a1c9b42
+Revises: 81e44dd6047a
+Create Date: 2026-10-18 10:12:41.512310
+
+"""
+from alembic import op
+from sqlalchemy import Column, String, BigInteger, LargeBinary, TIMESTAMP
+
+
+# revision identifiers, used by Alembic.
+revision = '3e5d7a1c9b42'
+down_revision = '81e44dd6047a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "shared_store",
+        Column("name", String(255), primary_key=True, nullable=False),
+        Column("value", LargeBinary),
+        Column("counter", BigInteger, nullable=False, server_default="0"),
+        Column("expires", TIMESTAMP),
+        mysql_charset="utf8mb4",
+    )
+
+
+def downgrade():
+    op.drop_table("shared_store")
@@ -0,0 +1,27 @@
+"""Index for Diva global rankings
+
+Revision ID: 4f2d9c1e7a56
+Revises: c7a35d0e8f21
+Create Date: 2026-10-18 15:02:11.408316
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2d9c1e7a56'
+down_revision = 'c7a35d0e8f21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "diva_score_chart_idx",
+        "diva_score",
+        ["pv_id", "difficulty", "edition", "score"],
+    )
+
+
+def downgrade():
+    op.drop_index("diva_score_chart_idx", "diva_score")
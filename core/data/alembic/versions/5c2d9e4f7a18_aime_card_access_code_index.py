@@ -0,0 +1,23 @@
+"""Index aime_card access codes
+
+Revision ID: 5c2d9e4f7a18
+Revises: 3e5d7a1c9b42
+Create Date: 2026-10-18 11:02:17.204861
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2d9e4f7a18'
+down_revision = '3e5d7a1c9b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("aime_card_access_code_idx", "aime_card", ["access_code"])
+
+
+def downgrade():
+    op.drop_index("aime_card_access_code_idx", "aime_card")
@@ -0,0 +1,35 @@
+"""Play count ranking tables for chuni and mai2
+
+Revision ID: 9b4e1f6a2c73
+Revises: 5c2d9e4f7a18
+Create Date: 2026-10-18 12:40:05.918322
+
+"""
+from alembic import op
+from sqlalchemy import Column, Integer, UniqueConstraint, Index
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4e1f6a2c73'
+down_revision = '5c2d9e4f7a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for game in ("chuni", "mai2"):
+        op.create_table(
+            f"{game}_score_ranking",
+            Column("id", Integer, primary_key=True, nullable=False),
+            Column("version", Integer, nullable=False),
+            Column("musicId", Integer, nullable=False),
+            Column("playCount", Integer, nullable=False, server_default="0"),
+            UniqueConstraint("version", "musicId", name=f"{game}_score_ranking_uk"),
+            Index(f"{game}_score_ranking_count_idx", "version", "playCount"),
+            mysql_charset="utf8mb4",
+        )
+
+
+def downgrade():
+    op.drop_table("mai2_score_ranking")
+    op.drop_table("chuni_score_ranking")
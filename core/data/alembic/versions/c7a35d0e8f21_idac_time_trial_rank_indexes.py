@@ -0,0 +1,33 @@
+"""Indexes for IDAC time trial ranks
+
+Revision ID: c7a35d0e8f21
+Revises: 9b4e1f6a2c73
+Create Date: 2026-10-18 13:21:48.770154
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a35d0e8f21'
+down_revision = '9b4e1f6a2c73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "idac_user_time_trial_course_idx",
+        "idac_user_time_trial",
+        ["version", "course_id", "user", "goal_time"],
+    )
+    op.create_index(
+        "idac_user_time_trial_course_car_idx",
+        "idac_user_time_trial",
+        ["version", "course_id", "style_car_id", "user", "goal_time"],
+    )
+
+
+def downgrade():
+    op.drop_index("idac_user_time_trial_course_car_idx", "idac_user_time_trial")
+    op.drop_index("idac_user_time_trial_course_idx", "idac_user_time_trial")
@@ -1,8 +1,13 @@
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+from collections import OrderedDict
+from contextvars import ContextVar
 from functools import wraps
+import asyncio
 import hashlib
+import inspect
 import pickle
 import logging
+import time
 from core.config import CoreConfig
 
 cfg: CoreConfig = None  # type: ignore
@@ -15,52 +20,285 @@ except ModuleNotFoundError:
     has_mc = False
 
 
-def cached(lifetime: int = 10, extra_key: Any = None) -> Callable:
+class Cache:
+    """
+    Two tier cache, a bounded in-process LRU in front of an optional memcached server.
+    Entries may carry tags (ex. user:10000) so that every entry belonging to a tag can be
+    dropped at once from both tiers when the underlying data is written.
+    """
+    MEMCACHE_RETRY_SECONDS = 60
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.logger = logging.getLogger("database")
+        self.max_entries = max_entries
+        self.memcache = None
+        self.memcache_retry_at = 0.0
+        self.configured = False
+
+        self.entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self.tag_keys: Dict[str, Set[str]] = {}
+        self.tag_gens: Dict[str, int] = {}
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def configure(self, core_cfg: CoreConfig) -> None:
+        if self.configured:
+            return
+
+        self.max_entries = core_cfg.database.cache_size
+        if has_mc and core_cfg.database.enable_memcached:
+            self.memcache = pylibmc.Client([core_cfg.database.memcached_host], binary=True)
+            self.memcache.behaviors = {"tcp_nodelay": True, "ketama": True}
+
+        if core_cfg.server.workers > 1:
+            # Invalidations don't reach the other workers' local tiers, so skip it
+            self.max_entries = 0
+
+        self.configured = True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "inflight": len(self.inflight),
+        }
+
+    def tag_generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self.tag_gens.get(tag, 0) for tag in tags)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires, value, tags = entry
+            if expires > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return (True, value)
+            self.__drop(key)
+
+        mc = self.__memcache()
+        if mc is not None:
+            try:
+                remote = mc.get(key)
+                if remote is not None:
+                    expires_at, versions, value, tags = remote
+                    ttl = expires_at - time.time()
+                    if ttl > 0 and versions == self.__remote_versions(mc, tags):
+                        self.__store(key, value, ttl, tags)
+                        self.remote_hits += 1
+                        return (True, value)
+
+            except pylibmc.Error as e:
+                self.__memcache_failed(e)
+
+        self.misses += 1
+        return (False, None)
+
+    def set(self, key: str, value: Any, lifetime: float, tags: Tuple[str, ...] = ()) -> None:
+        self.__store(key, value, lifetime, tags)
+
+        mc = self.__memcache()
+        if mc is not None:
+            try:
+                payload = (time.time() + lifetime, self.__remote_versions(mc, tags), value, tags)
+                mc.set(key, payload, int(lifetime) or 1)
+
+            except pylibmc.Error as e:
+                self.__memcache_failed(e)
+
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                self.logger.debug(f"Not caching {key} remotely: {e}")
+
+    def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            self.tag_gens[tag] = self.tag_gens.get(tag, 0) + 1
+            for key in list(self.tag_keys.get(tag, ())):
+                self.__drop(key)
+            self.tag_keys.pop(tag, None)
+            self.invalidations += 1
+
+        mc = self.__memcache()
+        if mc is not None:
+            for tag in tags:
+                try:
+                    mc.incr(f"tag:{tag}")
+                except pylibmc.NotFound:
+                    mc.set(f"tag:{tag}", 1)
+                except pylibmc.Error as e:
+                    self.__memcache_failed(e)
+                    break
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.tag_keys.clear()
+
+    def __store(self, key: str, value: Any, lifetime: float, tags: Tuple[str, ...]) -> None:
+        if key in self.entries:
+            self.__drop(key)
+
+        if self.max_entries <= 0:
+            return
+
+        self.entries[key] = (time.monotonic() + lifetime, value, tags)
+        for tag in tags:
+            self.tag_keys.setdefault(tag, set()).add(key)
+
+        while len(self.entries) > self.max_entries:
+            old_key = next(iter(self.entries))
+            self.__drop(old_key)
+            self.evictions += 1
+
+    def __drop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self.tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    self.tag_keys.pop(tag)
+
+    def __memcache(self) -> Optional[Any]:
+        if self.memcache is None or time.monotonic() < self.memcache_retry_at:
+            return None
+        return self.memcache
+
+    def __memcache_failed(self, e: Exception) -> None:
+        self.logger.error(f"Memcache failed, using local cache only for {self.MEMCACHE_RETRY_SECONDS}s: {e}")
+        self.memcache_retry_at = time.monotonic() + self.MEMCACHE_RETRY_SECONDS
+
+    def __remote_versions(self, mc: Any, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        if not tags:
+            return ()
+
+        versions = mc.get_multi([f"tag:{tag}" for tag in tags])
+        return tuple(int(versions.get(f"tag:{tag}", 0)) for tag in tags)
+
+
+cache = Cache()
+
+# Tags invalidated inside of the current task's database transaction, which are invalidated
+# again once it ends, since a read between the write and the commit still sees the old rows
+pending_invalidations: ContextVar[Optional[Set[str]]] = ContextVar("pending_invalidations", default=None)
+
+
+def invalidate(*tags: str) -> None:
+    """
+    Drop every cached entry carrying any of the given tags, ex. invalidate(f"user:{aime_id}")
+    """
+    cache.invalidate(*tags)
+
+    pending = pending_invalidations.get()
+    if pending is not None:
+        pending.update(tags)
+
+
+def cached(lifetime: int = 10, extra_key: Any = None, tags: Iterable[str] = ()) -> Callable:
+    """
+    Caches the return value of a method for lifetime seconds, keyed by its arguments (minus self).
+    Works on both regular and async functions. tags are format strings filled in with the call's
+    arguments, ex. tags=["user:{aime_id}"], and are used to invalidate entries on write.
+    Concurrent calls for the same key while the first is still running share its result.
+    """
+    tags = tuple(tags)
+
     def _cached(func: Callable) -> Callable:
-        if has_mc and (cfg and cfg.database.enable_memcached):
-            hostname = "127.0.0.1"
-            if cfg:
-                hostname = cfg.database.memcached_host
-            memcache = pylibmc.Client([hostname], binary=True)
-            memcache.behaviors = {"tcp_nodelay": True, "ketama": True}
+        if lifetime is None:
+            return func
+
+        sig = inspect.signature(func)
+
+        def make_key(args: Tuple, kwargs: Dict) -> Optional[str]:
+            try:
+                hashable_args = (args[1:], sorted(list(kwargs.items())))
+                args_key = hashlib.md5(pickle.dumps(hashable_args)).hexdigest()
+
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return None
+
+            return f'{func.__module__}-{func.__qualname__}-{args_key}-{extra_key() if hasattr(extra_key, "__call__") else extra_key}'
+
+        def make_tags(args: Tuple, kwargs: Dict) -> Tuple[str, ...]:
+            if not tags:
+                return ()
+
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(tag.format(**bound.arguments) for tag in tags)
+
+        if inspect.iscoroutinefunction(func):
 
             @wraps(func)
-            def wrapper(*args: Any, **kwargs: Any) -> Any:
-                if lifetime is not None:
-                    # Hash function args
-                    items = kwargs.items()
-                    hashable_args = (args[1:], sorted(list(items)))
-                    args_key = hashlib.md5(pickle.dumps(hashable_args)).hexdigest()
-
-                    # Generate unique cache key
-                    cache_key = f'{func.__module__}-{func.__name__}-{args_key}-{extra_key() if hasattr(extra_key, "__call__") else extra_key}'
-
-                    # Return cached version if allowed and available
-                    try:
-                        result = memcache.get(cache_key)
-                    except pylibmc.Error as e:
-                        logging.getLogger("database").error(f"Memcache failed: {e}")
-                        result = None
-
-                    if result is not None:
-                        logging.getLogger("database").debug(f"Cache hit: {result}")
-                        return result
-
-                # Generate output
-                result = func(*args, **kwargs)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                cache_key = make_key(args, kwargs)
+                if cache_key is None:
+                    return await func(*args, **kwargs)
+
+                found, result = cache.get(cache_key)
+                if found:
+                    return result
+
+                pending = cache.inflight.get(cache_key)
+                if pending is not None:
+                    return await asyncio.shield(pending)
+
+                entry_tags = make_tags(args, kwargs)
+                gen = cache.tag_generation(entry_tags)
+                pending = asyncio.get_running_loop().create_future()
+                cache.inflight[cache_key] = pending
+
+                try:
+                    result = await func(*args, **kwargs)
+
+                except asyncio.CancelledError:
+                    pending.cancel()
+                    raise
 
-                # Cache output if allowed
-                if lifetime is not None and result is not None:
-                    logging.getLogger("database").debug(f"Setting cache: {result}")
-                    memcache.set(cache_key, result, lifetime)
+                except BaseException as e:
+                    pending.set_exception(e)
+                    pending.exception()  # Mark as retrieved, the caller gets the exception
+                    raise
 
+                finally:
+                    cache.inflight.pop(cache_key, None)
+
+                # Don't cache a result that was invalidated while it was being fetched
+                if result is not None and gen == cache.tag_generation(entry_tags):
+                    cache.set(cache_key, result, lifetime, entry_tags)
+
+                pending.set_result(result)
                 return result
 
         else:
 
             @wraps(func)
             def wrapper(*args: Any, **kwargs: Any) -> Any:
-                return func(*args, **kwargs)
+                cache_key = make_key(args, kwargs)
+                if cache_key is None:
+                    return func(*args, **kwargs)
+
+                found, result = cache.get(cache_key)
+                if found:
+                    return result
+
+                result = func(*args, **kwargs)
+                if result is not None:
+                    cache.set(cache_key, result, lifetime, make_tags(args, kwargs))
+
+                return result
 
         return wrapper
 
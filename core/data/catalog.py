@@ -0,0 +1,86 @@
+from typing import Any, Optional
+import asyncio
+import logging
+import time
+
+from core.config import CoreConfig
+from core.store import get_store
+
+
+class StaticCatalog:
+    """
+    In-process copy of a title's static tables (music, charges, events, ...), which only
+    change when read.py imports new data. Subclasses implement load() to build whatever
+    lookup structures they need from the tables, and get() hands out the current copy,
+    which is shared by every Data instance of the title in the process.
+    read.py calls reload_catalog after an import, which bumps a generation counter in the
+    shared store that every worker checks at most every CHECK_SECONDS. The local store isn't
+    shared with read.py, so the catalog is also rebuilt every MAX_AGE_SECONDS.
+    Catalogs built from files as well can override stale() to be rebuilt when they change.
+    """
+    CHECK_SECONDS = 10
+    MAX_AGE_SECONDS = 300
+
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.logger = logging.getLogger("database")
+        self.lock = asyncio.Lock()
+        self.contents: Any = None
+        self.generation: Optional[int] = None
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+
+    async def load(self, data: Any) -> Any:
+        """
+        Loads the static tables using the title's Data instance, returns None on failure
+        """
+        raise NotImplementedError()
+
+    def stale(self, contents: Any) -> bool:
+        """
+        Returns True if contents should be rebuilt even though the generation didn't change,
+        checked at most every CHECK_SECONDS
+        """
+        return False
+
+    async def get(self, core_cfg: CoreConfig, data: Any) -> Any:
+        """
+        Returns the current contents, or None if they have never been loaded successfully
+        """
+        now = time.monotonic()
+        if self.contents is not None and now - self.loaded_at < self.MAX_AGE_SECONDS:
+            if now - self.checked_at < self.CHECK_SECONDS:
+                return self.contents
+
+            self.checked_at = now
+            generation = await get_store(core_cfg).get_counter(f"catalog:{self.title}")
+            if generation == self.generation and not self.stale(self.contents):
+                return self.contents
+
+        async with self.lock:
+            generation = await get_store(core_cfg).get_counter(f"catalog:{self.title}")
+            if (
+                self.contents is not None
+                and generation == self.generation
+                and time.monotonic() - self.loaded_at < self.MAX_AGE_SECONDS
+                and not self.stale(self.contents)
+            ):
+                return self.contents
+
+            contents = await self.load(data)
+            if contents is None:
+                # keep serving the old copy if the database is having trouble
+                return self.contents
+
+            self.contents = contents
+            self.generation = generation
+            self.loaded_at = self.checked_at = time.monotonic()
+            self.logger.debug(f"Loaded {self.title} static catalog generation {generation}")
+            return self.contents
+
+
+async def reload_catalog(core_cfg: CoreConfig, title: str) -> None:
+    """
+    Tells every worker to reload a title's static catalog, ex. after read.py imported new data
+    """
+    await get_store(core_cfg).incr(f"catalog:{title}")
@@ -12,6 +12,7 @@ import glob
 
 from core.config import CoreConfig
 from core.data.schema import *
+from core.data.cache import cache
 from core.utils import Utils
 
 
@@ -22,6 +23,7 @@ class Data:
     arcade = None
     card = None
     base = None
+    store = None
     def __init__(self, cfg: CoreConfig) -> None:
         self.config = cfg
 
@@ -32,7 +34,11 @@ class Data:
             self.__url = f"{self.config.database.protocol}://{self.config.database.username}:{self.config.database.password}@{self.config.database.host}:{self.config.database.port}/{self.config.database.name}?charset=utf8mb4"
 
         if Data.engine is None:
-            Data.engine = create_engine(self.__url, pool_recycle=3600)
+            Data.engine = create_engine(
+                self.__url,
+                pool_recycle=3600,
+                pool_size=self.config.database.thread_pool_size,
+            )
             self.__engine = Data.engine
 
         if Data.session is None:
@@ -51,6 +57,11 @@ class Data:
         if Data.base is None:
             Data.base = BaseData(self.config, self.session)
 
+        if Data.store is None:
+            Data.store = StoreData(self.config, self.session)
+
+        cache.configure(self.config)
+
         self.logger = logging.getLogger("database")
 
         # Prevent the logger from adding handlers multiple times
@@ -1,12 +1,16 @@
 from typing import Optional, Dict, List
 from sqlalchemy import Table, Column, and_, or_
+from sqlalchemy.engine.base import Connection
 from sqlalchemy.sql.schema import ForeignKey, PrimaryKeyConstraint
 from sqlalchemy.types import Integer, String, Boolean, JSON
 from sqlalchemy.sql import func, select
 from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.engine import Row
 import re
+import asyncio
+import time
 
+from core.config import CoreConfig
 from core.data.schema.base import BaseData, metadata
 from core.const import *
 
@@ -68,7 +72,157 @@ arcade_owner = Table(
 )
 
 
+class ArcadeRegistry:
+    """
+    In memory copy of the arcade and machine tables, indexed by serial, id and board id, so
+    the checks allnet, mucha and the games do on every request are dictionary lookups.
+    New rows are picked up incrementally by id when a lookup misses (at most every
+    MISS_REFRESH_SECONDS), and everything is reloaded every FULL_RELOAD_SECONDS or after
+    invalidate() to catch edits made by other processes.
+    """
+    MISS_REFRESH_SECONDS = 5
+    FULL_RELOAD_SECONDS = 300
+
+    def __init__(self, data: "ArcadeData") -> None:
+        self.data = data
+        self.lock = asyncio.Lock()
+        self.loaded_at = 0.0
+        self.refreshed_at = 0.0
+        self.stale = True
+        self.dirty = False
+        self.__clear()
+
+    def __clear(self) -> None:
+        self.max_machine_id = 0
+        self.max_arcade_id = 0
+        self.machines_by_id: Dict[int, Row] = {}
+        self.machines_by_serial: Dict[str, Row] = {}
+        self.machines_by_board: Dict[str, Row] = {}
+        self.arcades_by_id: Dict[int, Row] = {}
+
+    def invalidate(self) -> None:
+        """
+        Forces a full reload on the next lookup
+        """
+        self.stale = True
+
+    def mark_dirty(self) -> None:
+        """
+        Forces an incremental refresh on the next lookup, for newly inserted rows
+        """
+        self.dirty = True
+
+    def __add_machine(self, row: Row) -> None:
+        self.machines_by_id[row["id"]] = row
+        self.max_machine_id = max(self.max_machine_id, row["id"])
+
+        if row["serial"]:
+            serial = row["serial"].replace("-", "")
+            self.machines_by_serial.setdefault(serial, row)
+            # get_machine matches 11 character serials as a prefix
+            self.machines_by_serial.setdefault(serial[:11], row)
+
+        if row["board"]:
+            self.machines_by_board.setdefault(row["board"], row)
+
+    def __add_arcade(self, row: Row) -> None:
+        self.arcades_by_id[row["id"]] = row
+        self.max_arcade_id = max(self.max_arcade_id, row["id"])
+
+    async def __refresh(self, full: bool) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            if full and not self.stale and now - self.loaded_at < self.FULL_RELOAD_SECONDS:
+                return # Someone else reloaded while we waited for the lock
+
+            machines = await self.data.get_machines_after(0 if full else self.max_machine_id)
+            arcades = await self.data.get_arcades_after(0 if full else self.max_arcade_id)
+            if machines is None or arcades is None:
+                # Keep serving what we have, try again later
+                self.refreshed_at = now
+                return
+
+            if full:
+                self.__clear()
+                self.loaded_at = now
+                self.stale = False
+
+            for row in machines:
+                self.__add_machine(row)
+            for row in arcades:
+                self.__add_arcade(row)
+
+            self.refreshed_at = now
+            self.dirty = False
+
+    async def __ensure_loaded(self) -> None:
+        if self.stale or time.monotonic() - self.loaded_at >= self.FULL_RELOAD_SECONDS:
+            await self.__refresh(True)
+        elif self.dirty:
+            await self.__refresh(False)
+
+    async def __refresh_on_miss(self) -> bool:
+        if time.monotonic() - self.refreshed_at < self.MISS_REFRESH_SECONDS:
+            return False
+
+        await self.__refresh(False)
+        return True
+
+    def __find_machine(self, serial: str = None, id: int = None, board: str = None) -> Optional[Row]:
+        if serial is not None:
+            serial = serial.replace("-", "")
+            if len(serial) not in (11, 15):
+                return None
+            return self.machines_by_serial.get(serial)
+
+        if id is not None:
+            return self.machines_by_id.get(id)
+
+        if board is not None:
+            return self.machines_by_board.get(board)
+
+        return None
+
+    async def get_machine(self, serial: str = None, id: int = None, board: str = None) -> Optional[Row]:
+        await self.__ensure_loaded()
+
+        found = self.__find_machine(serial, id, board)
+        if found is None and await self.__refresh_on_miss():
+            found = self.__find_machine(serial, id, board)
+
+        return found
+
+    async def get_arcade(self, id: int) -> Optional[Row]:
+        await self.__ensure_loaded()
+
+        found = self.arcades_by_id.get(id)
+        if found is None and await self.__refresh_on_miss():
+            found = self.arcades_by_id.get(id)
+
+        return found
+
+
 class ArcadeData(BaseData):
+    def __init__(self, cfg: CoreConfig, conn: Connection) -> None:
+        super().__init__(cfg, conn)
+        self.registry = ArcadeRegistry(self)
+
+    async def get_machines_after(self, id: int) -> Optional[List[Row]]:
+        sql = machine.select(machine.c.id > id).order_by(machine.c.id)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
+    async def get_arcades_after(self, id: int) -> Optional[List[Row]]:
+        sql = arcade.select(arcade.c.id > id).order_by(arcade.c.id)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_machine(self, serial: str = None, id: int = None) -> Optional[Row]:
         if serial is not None:
             serial = serial.replace("-", "")
@@ -113,16 +267,19 @@ class ArcadeData(BaseData):
         result = await self.execute(sql)
         if result is None:
             return None
+        self.registry.mark_dirty()
         return result.lastrowid
 
     async def set_machine_serial(self, machine_id: int, serial: str) -> None:
         result = await self.execute(
-            machine.update(machine.c.id == machine_id).values(keychip=serial)
+            machine.update(machine.c.id == machine_id).values(serial=serial)
         )
         if result is None:
             self.logger.error(
                 f"Failed to update serial for machine {machine_id} -> {serial}"
             )
+            return None
+        self.registry.invalidate()
         return result.lastrowid
 
     async def set_machine_boardid(self, machine_id: int, boardid: str) -> None:
@@ -133,6 +290,8 @@ class ArcadeData(BaseData):
             self.logger.error(
                 f"Failed to update board id for machine {machine_id} -> {boardid}"
             )
+            return
+        self.registry.invalidate()
 
     async def get_arcade(self, id: int) -> Optional[Row]:
         sql = arcade.select(arcade.c.id == id)
@@ -174,6 +333,7 @@ class ArcadeData(BaseData):
         result = await self.execute(sql)
         if result is None:
             return None
+        self.registry.mark_dirty()
         return result.lastrowid
 
     async def get_arcades_managed_by_user(self, user_id: int) -> Optional[List[Row]]:
@@ -1,17 +1,22 @@
 import json
 import logging
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from random import randrange
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Set, Tuple, AsyncIterator
 from sqlalchemy.engine import Row
 from sqlalchemy.engine.cursor import CursorResult
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.sql import text, func, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import MetaData, Table, Column
+from sqlalchemy import MetaData, Table, Column, UniqueConstraint
 from sqlalchemy.types import Integer, String, TIMESTAMP, JSON
 from sqlalchemy.dialects.mysql import insert
 
 from core.config import CoreConfig
+from core.data.cache import cache, pending_invalidations
 
 metadata = MetaData()
 
@@ -29,18 +34,62 @@ event_log = Table(
 )
 
 
+class Transaction:
+    """
+    The connection a transaction() block runs its statements on. failed is set when one of
+    them fails, so the block is rolled back instead of committing the statements that worked.
+    """
+    def __init__(self, conn: Connection) -> None:
+        self.conn = conn
+        self.lock = asyncio.Lock()
+        self.failed = False
+
+
+# Transaction the current task is inside of, if any
+_transaction: ContextVar[Optional[Transaction]] = ContextVar("transaction", default=None)
+
+
 class BaseData:
+    executor: Optional[ThreadPoolExecutor] = None
+
     def __init__(self, cfg: CoreConfig, conn: Connection) -> None:
         self.config = cfg
         self.conn = conn
         self.logger = logging.getLogger("database")
 
+        if BaseData.executor is None:
+            BaseData.executor = ThreadPoolExecutor(
+                max_workers=cfg.database.thread_pool_size,
+                thread_name_prefix="database",
+            )
+
     async def execute(self, sql: str, opts: Dict[str, Any] = {}) -> Optional[CursorResult]:
+        """
+        Runs the statement on the database thread pool so the event loop is never blocked
+        waiting on the database. The scoped session is thread local, so every worker thread
+        gets its own session and connection. Inside of a transaction() block, the statement
+        runs on the transaction's connection instead.
+        """
+        loop = asyncio.get_running_loop()
+        txn = _transaction.get()
+        if txn is None:
+            return await loop.run_in_executor(self.executor, self.execute_sync, sql, opts)
+
+        async with txn.lock:
+            result = await loop.run_in_executor(self.executor, self.execute_sync, sql, opts, txn.conn)
+
+        if result is None:
+            txn.failed = True
+        return result
+
+    def execute_sync(self, sql: str, opts: Dict[str, Any] = {}, conn: Optional[Connection] = None) -> Optional[CursorResult]:
         res = None
+        if conn is None:
+            conn = self.conn
 
         try:
             self.logger.debug(f"SQL Execute: {''.join(str(sql).splitlines())}")
-            res = self.conn.execute(text(sql), opts)
+            res = conn.execute(text(sql), opts)
 
         except SQLAlchemyError as e:
             self.logger.error(f"SQLAlchemy error {e}")
@@ -52,7 +101,7 @@ class BaseData:
 
         except Exception:
             try:
-                res = self.conn.execute(sql, opts)
+                res = conn.execute(sql, opts)
 
             except SQLAlchemyError as e:
                 self.logger.error(f"SQLAlchemy error {e}")
@@ -68,6 +117,108 @@ class BaseData:
 
         return res
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """
+        Groups every execute() made by the current task into a single transaction, committed
+        when the block exits. It is rolled back if the block raises or any of its statements
+        failed, check failed on the yielded Transaction to tell. Nested blocks join the outer one.
+        """
+        txn = _transaction.get()
+        if txn is not None:
+            yield txn
+            return
+
+        loop = asyncio.get_running_loop()
+        conn: Connection = await loop.run_in_executor(self.executor, self.__begin)
+        txn = Transaction(conn)
+        token = _transaction.set(txn)
+        invalidated: Set[str] = set()
+        invalidations_token = pending_invalidations.set(invalidated)
+
+        try:
+            yield txn
+
+        except BaseException:
+            await loop.run_in_executor(self.executor, self.__end, conn, False)
+            raise
+
+        else:
+            if txn.failed:
+                self.logger.error("A statement in the transaction failed, rolling it back")
+            if not await loop.run_in_executor(self.executor, self.__end, conn, not txn.failed):
+                txn.failed = True
+
+        finally:
+            _transaction.reset(token)
+            pending_invalidations.reset(invalidations_token)
+            if invalidated:
+                cache.invalidate(*invalidated)
+
+    def __begin(self) -> Connection:
+        conn = self.conn.get_bind().connect()
+        conn.begin()
+        return conn
+
+    def __end(self, conn: Connection, commit: bool) -> bool:
+        """
+        Commits or rolls back the transaction, returns False if that failed
+        """
+        try:
+            if commit:
+                conn.get_transaction().commit()
+            else:
+                conn.get_transaction().rollback()
+            return True
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Failed to {'commit' if commit else 'roll back'} transaction: {e}")
+            return False
+
+        finally:
+            conn.close()
+
+    async def bulk_upsert(
+        self, table: Table, rows: List[Dict], conflict_cols: Optional[List[str]] = None, chunk_size: int = 500
+    ) -> Optional[int]:
+        """
+        Inserts or updates many rows of a table using one multi-row INSERT ... ON DUPLICATE KEY UPDATE
+        per chunk instead of one statement per row. conflict_cols are the columns that identify a row
+        and are left alone on update, by default the table's primary and unique keys. Rows are grouped
+        by the set of columns they provide, so a row never has another row's missing columns nulled.
+        Returns the number of affected rows, or None if any statement failed.
+        """
+        if not rows:
+            return 0
+
+        if conflict_cols is None:
+            conflict_cols = {col.name for col in table.primary_key}
+            for constraint in table.constraints:
+                if isinstance(constraint, UniqueConstraint):
+                    conflict_cols.update(col.name for col in constraint.columns)
+
+        groups: Dict[Tuple[str, ...], List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        affected = 0
+        for cols, group in groups.items():
+            for i in range(0, len(group), chunk_size):
+                sql = insert(table).values(group[i:i + chunk_size])
+                update = {col: sql.inserted[col] for col in cols if col not in conflict_cols}
+                if not update: # Nothing but key columns, make the duplicate a no-op
+                    update = {cols[0]: sql.inserted[cols[0]]}
+
+                result = await self.execute(sql.on_duplicate_key_update(**update))
+                if result is None:
+                    self.logger.error(
+                        f"bulk_upsert: Failed to upsert {len(group[i:i + chunk_size])} rows into {table.name}"
+                    )
+                    return None
+                affected += result.rowcount
+
+        return affected
+
     def generate_id(self) -> int:
         """
         Generate a random 5-7 digit id
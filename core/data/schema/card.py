@@ -1,8 +1,9 @@
 from typing import Dict, List, Optional
-from sqlalchemy import Table, Column, UniqueConstraint
+from datetime import datetime
+from sqlalchemy import Table, Column, UniqueConstraint, Index
 from sqlalchemy.types import Integer, String, Boolean, TIMESTAMP
 from sqlalchemy.sql.schema import ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, select, case
 from sqlalchemy.engine import Row
 
 from core.data.schema.base import BaseData, metadata
@@ -22,6 +23,7 @@ aime_card = Table(
     Column("is_locked", Boolean, server_default="0"),
     Column("is_banned", Boolean, server_default="0"),
     UniqueConstraint("user", "access_code", name="aime_card_uk"),
+    Index("aime_card_access_code_idx", "access_code"),
     mysql_charset="utf8mb4",
 )
 
@@ -64,6 +66,20 @@ class CardData(BaseData):
 
         return int(card["user"])
 
+    async def resolve_card(self, access_code: str) -> Optional[Row]:
+        """
+        Given a 20 digit access code as a string, get the owning user id along with the
+        card's ban and lock status (user, is_banned, is_locked) in a single query
+        """
+        sql = select(
+            aime_card.c.user, aime_card.c.is_banned, aime_card.c.is_locked
+        ).where(aime_card.c.access_code == access_code).limit(1)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchone()
+
     async def get_card_banned(self, access_code: str) -> Optional[bool]:
         """
         Given a 20 digit access code as a string, check if the card is banned
@@ -121,6 +137,24 @@ class CardData(BaseData):
         result = await self.execute(sql)
         if result is None:
             self.logger.warn(f"Failed to update last login time for {access_code}")
+
+    async def update_cards_last_login(self, logins: Dict[str, datetime]) -> bool:
+        """
+        Given a dict of access code -> login time, update the last login time of every card in one query.
+        Returns False if the update failed.
+        """
+        if not logins:
+            return True
+
+        sql = aime_card.update(aime_card.c.access_code.in_(list(logins.keys()))).values(
+            last_login_date=case(logins, value=aime_card.c.access_code)
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            self.logger.warn(f"Failed to update last login time for {len(logins)} cards")
+            return False
+        return True
     
     def to_access_code(self, luid: str) -> str:
         """
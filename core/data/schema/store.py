@@ -0,0 +1,109 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import Table, Column, or_
+from sqlalchemy.types import String, BigInteger, LargeBinary, TIMESTAMP
+from sqlalchemy.sql import func, select
+from sqlalchemy.dialects.mysql import insert
+
+from core.data.schema.base import BaseData, metadata
+
+shared_store = Table(
+    "shared_store",
+    metadata,
+    Column("name", String(255), primary_key=True, nullable=False),
+    Column("value", LargeBinary),
+    Column("counter", BigInteger, nullable=False, server_default="0"),
+    Column("expires", TIMESTAMP),
+    mysql_charset="utf8mb4",
+)
+
+
+class StoreData(BaseData):
+    """
+    Backing table for core.store.SqlStore, values are pickled by the caller.
+    """
+    def __live(self):
+        return or_(shared_store.c.expires == None, shared_store.c.expires > func.now())
+
+    async def get_value(self, name: str) -> Optional[bytes]:
+        sql = select(shared_store.c.value).where(
+            (shared_store.c.name == name) & self.__live()
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+
+        row = result.fetchone()
+        if row is None:
+            return None
+        return row["value"]
+
+    async def put_value(self, name: str, value: bytes, expires: Optional[datetime] = None) -> Optional[int]:
+        sql = insert(shared_store).values(name=name, value=value, counter=0, expires=expires)
+        conflict = sql.on_duplicate_key_update(value=value, counter=0, expires=expires)
+
+        result = await self.execute(conflict)
+        if result is None:
+            self.logger.error(f"Failed to store shared value {name}")
+            return None
+        return result.rowcount
+
+    async def add_value(self, name: str, value: bytes, expires: Optional[datetime] = None) -> bool:
+        """
+        Only stores the value if the name isn't already taken by a live entry
+        """
+        async with self.transaction():
+            await self.execute(shared_store.delete(
+                (shared_store.c.name == name) & (shared_store.c.expires <= func.now())
+            ))
+
+            sql = insert(shared_store).prefix_with("IGNORE").values(
+                name=name, value=value, counter=0, expires=expires
+            )
+            result = await self.execute(sql)
+
+        return result is not None and result.rowcount > 0
+
+    async def delete_value(self, name: str) -> None:
+        result = await self.execute(shared_store.delete(shared_store.c.name == name))
+        if result is None:
+            self.logger.error(f"Failed to delete shared value {name}")
+
+    async def delete_value_if(self, name: str, value: bytes) -> None:
+        """
+        Deletes the entry only if it still holds value, in a single statement
+        """
+        result = await self.execute(shared_store.delete(
+            (shared_store.c.name == name) & (shared_store.c.value == value)
+        ))
+        if result is None:
+            self.logger.error(f"Failed to delete shared value {name}")
+
+    async def incr_value(self, name: str, delta: int = 1) -> Optional[int]:
+        async with self.transaction():
+            sql = insert(shared_store).values(name=name, counter=delta)
+            conflict = sql.on_duplicate_key_update(counter=shared_store.c.counter + delta)
+
+            result = await self.execute(conflict)
+            if result is None:
+                self.logger.error(f"Failed to increment shared counter {name}")
+                return None
+
+            result = await self.execute(
+                select(shared_store.c.counter).where(shared_store.c.name == name)
+            )
+            if result is None:
+                return None
+
+            return int(result.fetchone()["counter"])
+
+    async def get_counter(self, name: str) -> int:
+        result = await self.execute(
+            select(shared_store.c.counter).where(shared_store.c.name == name)
+        )
+        if result is None:
+            return 0
+
+        row = result.fetchone()
+        return int(row["counter"]) if row is not None else 0
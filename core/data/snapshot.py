@@ -0,0 +1,74 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+import logging
+
+
+class SnapshotCache:
+    """
+    Holds a per session snapshot of a user's list (ex. best scores grouped by musicId) so that
+    paged api requests are served by slicing the snapshot instead of reloading and regrouping
+    every row for every page. The snapshot is rebuilt whenever the first page is requested and
+    should be dropped on upsert_user_all and logout. Snapshots are built from sorted rows so a
+    worker that never saw the first page rebuilds the exact same pages.
+    """
+    def __init__(self, max_entries: int = 512) -> None:
+        self.logger = logging.getLogger("database")
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[str, int, int], List[Any]]" = OrderedDict()
+        self.user_keys: Dict[Tuple[str, int], Set[Tuple[str, int, int]]] = {}
+
+    def get(self, title: str, user_id: int, version: int) -> Optional[List[Any]]:
+        key = (title, user_id, version)
+        items = self.entries.get(key)
+        if items is not None:
+            self.entries.move_to_end(key)
+        return items
+
+    def put(self, title: str, user_id: int, version: int, items: List[Any]) -> None:
+        key = (title, user_id, version)
+        self.entries[key] = items
+        self.entries.move_to_end(key)
+        self.user_keys.setdefault((title, user_id), set()).add(key)
+
+        while len(self.entries) > self.max_entries:
+            old_key, _ = self.entries.popitem(last=False)
+            self.__forget(old_key)
+
+    def drop(self, title: str, user_id: int) -> None:
+        """
+        Drops every snapshot of a user for the given title, regardless of version
+        """
+        for key in self.user_keys.pop((title, user_id), ()):
+            self.entries.pop(key, None)
+
+    def __forget(self, key: Tuple[str, int, int]) -> None:
+        keys = self.user_keys.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self.user_keys.pop(key[:2])
+
+    async def page(
+        self, title: str, user_id: int, version: int, next_index: int, max_count: int,
+        build: Callable[[], Awaitable[Optional[List[Any]]]],
+    ) -> Optional[Tuple[List[Any], int]]:
+        """
+        Returns up to max_count items starting at next_index and the index of the next page,
+        -1 if this was the last one. build is only awaited for the first page or if this process
+        has no snapshot, and returns None on failure.
+        """
+        items = None if next_index <= 0 else self.get(title, user_id, version)
+        if items is None:
+            items = await build()
+            if items is None:
+                return None
+            self.put(title, user_id, version, items)
+
+        end = next_index + max_count
+        if end >= len(items):
+            self.drop(title, user_id)
+            return (items[next_index:], -1)
+        return (items[next_index:end], end)
+
+
+snapshots = SnapshotCache()
@@ -2,7 +2,7 @@ import logging, coloredlogs
 from typing import Any, Dict, List, Union, Optional
 from starlette.requests import Request
 from starlette.routing import Route, Mount
-from starlette.responses import Response, PlainTextResponse, RedirectResponse
+from starlette.responses import Response, PlainTextResponse, RedirectResponse, JSONResponse
 from starlette.applications import Starlette
 from logging.handlers import TimedRotatingFileHandler
 import jinja2
@@ -20,6 +20,7 @@ from os import path, environ, mkdir, W_OK, access
 
 from core import CoreConfig, Utils
 from core.data import Data
+from core.data.cache import cache
 
 class PermissionOffset(Enum):
     USER = 0 # Regular user
@@ -139,6 +140,8 @@ class FrontendServlet():
                 Route("/add.card", self.system.add_card, methods=['POST']),
                 Route("/add.shop", self.system.add_shop, methods=['POST']),
                 Route("/add.cab", self.system.add_cab, methods=['POST']),
+                Route("/cache.stats", self.system.cache_stats, methods=['GET']),
+                Route("/reload.config", self.system.reload_config, methods=['POST']),
             ]),
             Mount("/shop", routes=[
                 Route("/", self.arcade.render_GET, methods=['GET']),
@@ -572,6 +575,22 @@ class FE_System(FE_Base):
             error = err
         ), media_type="text/html; charset=utf-8")
         
+    async def reload_config(self, request: Request) -> Response:
+        usr_sesh = self.validate_session(request)
+        if not usr_sesh or not self.test_perm(usr_sesh.permissions, PermissionOffset.SYSADMIN):
+            return RedirectResponse("/gate/", 303)
+
+        self.logger.info(f"Config reload requested by user {usr_sesh.user_id}")
+        CoreConfig.reload_all()
+        return RedirectResponse("/sys/", 303)
+
+    async def cache_stats(self, request: Request) -> Response:
+        usr_sesh = self.validate_session(request)
+        if not usr_sesh or not self.test_perm(usr_sesh.permissions, PermissionOffset.SYSADMIN):
+            return RedirectResponse("/gate/", 303)
+
+        return JSONResponse(cache.stats())
+
     async def lookup_user(self, request: Request):
         template = self.environment.get_template("core/templates/sys/index.jinja")
         usrlist: List[Dict] = []
@@ -853,6 +872,7 @@ cfg_dir = environ.get("DIANA_CFG_DIR", "config")
 cfg: CoreConfig = CoreConfig()
 if path.exists(f"{cfg_dir}/core.yaml"):
     cfg.update(yaml.safe_load(open(f"{cfg_dir}/core.yaml")))
+CoreConfig.freeze(cfg, f"{cfg_dir}/core.yaml")
 
 if not path.exists(cfg.server.log_dir):
     mkdir(cfg.server.log_dir)
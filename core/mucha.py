@@ -94,11 +94,11 @@ class MuchaServlet:
 
         netid = minfo.get('netid_prefix', "ABxN") + sn_decrypt[5:]
 
-        cab = await self.data.arcade.get_machine(netid)
+        cab = await self.data.arcade.registry.get_machine(netid)
         if cab:
-            arcade = await self.data.arcade.get_arcade(cab['id'])
+            arcade = await self.data.arcade.registry.get_arcade(cab['arcade'])
             if not arcade:
-                self.logger.error(f"Failed to get arcade with id {cab['id']}")
+                self.logger.error(f"Failed to get arcade with id {cab['arcade']}")
                 return PlainTextResponse("RESULTS=000")
 
             resp.AREA_0 = arcade["region_id"] or AllnetJapanRegionId.AICHI.name
@@ -0,0 +1,266 @@
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import pickle
+import time
+import uuid
+
+from core.config import CoreConfig
+
+# Make memcache optional
+try:
+    import pylibmc  # type: ignore
+
+    has_mc = True
+except ModuleNotFoundError:
+    has_mc = False
+
+
+class StoreLockTimeout(Exception):
+    pass
+
+
+class SharedStore:
+    """
+    Key/value store for state that has to be seen by every request no matter which worker
+    process serves it, ex. matching queues. The base class keeps everything in the
+    current process, which is only correct when running a single worker.
+    lifetime is in seconds, 0 means the entry never expires.
+    """
+    # Longest a locked() block may take before another worker can take the lock over
+    LOCK_LIFETIME = 10
+    def __init__(self, core_cfg: CoreConfig) -> None:
+        self.core_cfg = core_cfg
+        self.logger = logging.getLogger("core")
+        self.entries: Dict[str, Tuple[float, Any]] = {}
+
+    def __expired(self, key: str) -> bool:
+        entry = self.entries.get(key)
+        if entry is None:
+            return True
+
+        if entry[0] and entry[0] <= time.monotonic():
+            self.entries.pop(key, None)
+            return True
+
+        return False
+
+    def __expiry(self, lifetime: int) -> float:
+        return time.monotonic() + lifetime if lifetime else 0
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        if self.__expired(key):
+            return default
+        return self.entries[key][1]
+
+    async def set(self, key: str, value: Any, lifetime: int = 0) -> None:
+        self.entries[key] = (self.__expiry(lifetime), value)
+
+    async def add(self, key: str, value: Any, lifetime: int = 0) -> bool:
+        """
+        Stores the value only if the key isn't set, returns True if it was stored
+        """
+        if not self.__expired(key):
+            return False
+
+        self.entries[key] = (self.__expiry(lifetime), value)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    async def get_counter(self, key: str) -> int:
+        """
+        Returns the current value of a counter kept with incr, 0 if it was never incremented
+        """
+        return int(await self.get(key, 0))
+
+    async def release(self, key: str, token: str) -> None:
+        """
+        Deletes a lock taken with add, only if it still holds token
+        """
+        if await self.get(key) == token:
+            await self.delete(key)
+
+    def available(self) -> bool:
+        return True
+
+    @asynccontextmanager
+    async def locked(
+        self, key: str, default: Callable[[], Any], lifetime: int = 0, wait_seconds: float = 2
+    ) -> AsyncIterator[Any]:
+        """
+        Read-modify-write of key while holding a lock on it. Yields the stored value, or
+        default() if there is none, and stores it back when the block exits without raising.
+        The lock holds a token unique to this block, so it is only ever released by its owner.
+        Raises StoreLockTimeout if the lock isn't free within wait_seconds, or if it was lost
+        because the block took longer than LOCK_LIFETIME, in which case nothing is stored.
+        """
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait_seconds
+        while not await self.add(lock_key, token, self.LOCK_LIFETIME):
+            if not self.available() or time.monotonic() > deadline:
+                raise StoreLockTimeout(f"Timed out waiting for the lock on {key}")
+            await asyncio.sleep(0.01)
+
+        try:
+            value = await self.get(key)
+            if value is None:
+                value = default()
+
+            yield value
+
+            if await self.get(lock_key) != token:
+                raise StoreLockTimeout(f"Lost the lock on {key}, not storing it")
+            await self.set(key, value, lifetime)
+
+        finally:
+            await self.release(lock_key, token)
+
+    async def incr(self, key: str, delta: int = 1) -> int:
+        current = 0 if self.__expired(key) else int(self.entries[key][1])
+        expires = self.entries[key][0] if key in self.entries else 0
+        self.entries[key] = (expires, current + delta)
+        return current + delta
+
+
+class MemcachedStore(SharedStore):
+    """
+    Keeps the shared state in memcached. pylibmc blocks and its clients aren't thread safe,
+    so every call runs on a single thread of its own instead of the event loop. If memcached
+    fails, the store logs it and acts as if it were empty for RETRY_SECONDS, like the cache.
+    """
+    RETRY_SECONDS = 60
+
+    def __init__(self, core_cfg: CoreConfig) -> None:
+        super().__init__(core_cfg)
+        self.memcache = pylibmc.Client([core_cfg.database.memcached_host], binary=True)
+        self.memcache.behaviors = {"tcp_nodelay": True, "ketama": True}
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memcached")
+        self.retry_at = 0.0
+
+    def __key(self, key: str) -> str:
+        return f"store:{key}"
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.retry_at
+
+    async def __call(self, default: Any, func: Callable, *args: Any) -> Any:
+        if time.monotonic() < self.retry_at:
+            return default
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+        except pylibmc.Error as e:
+            self.logger.error(f"Memcache failed, shared store unavailable for {self.RETRY_SECONDS}s: {e}")
+            self.retry_at = time.monotonic() + self.RETRY_SECONDS
+            return default
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = await self.__call(None, self.memcache.get, self.__key(key))
+        return default if value is None else value
+
+    async def set(self, key: str, value: Any, lifetime: int = 0) -> None:
+        await self.__call(None, self.memcache.set, self.__key(key), value, lifetime)
+
+    async def add(self, key: str, value: Any, lifetime: int = 0) -> bool:
+        return bool(await self.__call(False, self.memcache.add, self.__key(key), value, lifetime))
+
+    async def delete(self, key: str) -> None:
+        await self.__call(None, self.memcache.delete, self.__key(key))
+
+    async def incr(self, key: str, delta: int = 1) -> int:
+        return await self.__call(0, self.__incr, self.__key(key), delta)
+
+    def __incr(self, mc_key: str, delta: int) -> int:
+        for _ in range(2):
+            try:
+                if delta < 0:
+                    # memcached counters can't go below 0
+                    return self.memcache.decr(mc_key, -delta)
+                return self.memcache.incr(mc_key, delta)
+
+            except pylibmc.NotFound:
+                if self.memcache.add(mc_key, max(delta, 0)):
+                    return max(delta, 0)
+
+        return int(self.memcache.get(mc_key) or 0)
+
+
+class SqlStore(SharedStore):
+    def __init__(self, core_cfg: CoreConfig) -> None:
+        super().__init__(core_cfg)
+        # Imported here so the store can be used before the database is set up
+        from core.data import Data
+        self.data = Data(core_cfg)
+
+    def __expiry(self, lifetime: int) -> Optional[datetime]:
+        return datetime.now() + timedelta(seconds=lifetime) if lifetime else None
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = await self.data.store.get_value(key)
+        if value is None:
+            return default
+        return pickle.loads(value)
+
+    async def set(self, key: str, value: Any, lifetime: int = 0) -> None:
+        await self.data.store.put_value(key, pickle.dumps(value), self.__expiry(lifetime))
+
+    async def add(self, key: str, value: Any, lifetime: int = 0) -> bool:
+        return await self.data.store.add_value(key, pickle.dumps(value), self.__expiry(lifetime))
+
+    async def delete(self, key: str) -> None:
+        await self.data.store.delete_value(key)
+
+    async def get_counter(self, key: str) -> int:
+        # counters are kept in their own column, value is NULL for them
+        return await self.data.store.get_counter(key)
+
+    async def release(self, key: str, token: str) -> None:
+        await self.data.store.delete_value_if(key, pickle.dumps(token))
+
+    async def incr(self, key: str, delta: int = 1) -> int:
+        value = await self.data.store.incr_value(key, delta)
+        return value if value is not None else 0
+
+
+store: Optional[SharedStore] = None
+
+
+def get_store(core_cfg: CoreConfig) -> SharedStore:
+    """
+    Returns the shared store for this process, creating it from the server config on first use
+    """
+    global store
+    if store is not None:
+        return store
+
+    logger = logging.getLogger("core")
+    kind = core_cfg.server.shared_store
+
+    if kind == "memcached" and not has_mc:
+        logger.error("shared_store is set to memcached but pylibmc isn't installed, falling back to local")
+        kind = "local"
+
+    if kind not in ("local", "memcached", "sql"):
+        logger.error(f"Unknown shared_store {kind}, falling back to local")
+        kind = "local"
+
+    if kind == "local" and core_cfg.server.workers > 1:
+        # a local store isn't seen by the other workers, matching would silently break
+        logger.warning("shared_store local can't be used with multiple workers, falling back to sql")
+        kind = "sql"
+
+    if kind == "memcached":
+        store = MemcachedStore(core_cfg)
+    elif kind == "sql":
+        store = SqlStore(core_cfg)
+    else:
+        store = SharedStore(core_cfg)
+
+    return store
@@ -1,5 +1,7 @@
-from typing import Dict, List, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
+from bisect import bisect_right
 import json
+import inflection
 import logging, coloredlogs
 from logging.handlers import TimedRotatingFileHandler
 from starlette.requests import Request
@@ -19,6 +21,57 @@ class JSONResponseNoASCII(Response):
             ensure_ascii=False,
         ).encode("utf-8")
 
+class VersionTable:
+    """
+    Resolves a client version number to an internal version. ranges is a list of
+    (lowest client version, internal version) pairs, anything below the first bound
+    gets default.
+    """
+    def __init__(self, ranges: List[Tuple[int, int]], default: int = 0) -> None:
+        ranges = sorted(ranges)
+        self.bounds = [x[0] for x in ranges]
+        self.values = [x[1] for x in ranges]
+        self.default = default
+
+    def get(self, version: int) -> int:
+        idx = bisect_right(self.bounds, version) - 1
+        if idx < 0:
+            return self.default
+        return self.values[idx]
+
+class HandlerTable:
+    """
+    Maps endpoint names to the bound handle_*_request coroutines of a version
+    class instance, built once at startup instead of on every request.
+    """
+    def __init__(self, handler: Any) -> None:
+        self.handler = handler
+        self.by_method: Dict[str, Callable] = {}
+        self.by_endpoint: Dict[str, Callable] = {}
+
+        for method in dir(handler):
+            if not method.startswith("handle_") or not method.endswith("_request"):
+                continue
+
+            func = getattr(handler, method)
+            self.by_method[method] = func
+            # handle_method_api_request -> HandleMethodApiRequest -> MethodApi
+            self.by_endpoint[inflection.camelize(method)[6:-7]] = func
+
+    def endpoints(self) -> List[str]:
+        return list(self.by_endpoint.keys())
+
+    def get(self, endpoint: str) -> Optional[Callable]:
+        func = self.by_endpoint.get(endpoint)
+        if func is not None:
+            return func
+
+        # Fall back to the old lookup for endpoints whose casing doesn't round trip
+        func = self.by_method.get("handle_" + inflection.underscore(endpoint) + "_request")
+        if func is not None:
+            self.by_endpoint[endpoint] = func
+        return func
+
 class BaseServlet:
     def __init__(self, core_cfg: CoreConfig, cfg_dir: str) -> None:
         self.core_cfg = core_cfg
@@ -67,10 +120,7 @@ class BaseServlet:
         Returns:
             Tuple[str, str]: A tuple where offset 0 is the allnet uri field, and offset 1 is the allnet host field
         """
-        if not self.core_cfg.server.is_using_proxy and Utils.get_title_port(self.core_cfg) != 80:
-            return (f"http://{self.core_cfg.server.hostname}:{Utils.get_title_port(self.core_cfg)}/{game_code}/{game_ver}/", "")
-
-        return (f"http://{self.core_cfg.server.hostname}/{game_code}/{game_ver}/", "")
+        return (f"{self.core_cfg.server.title_url}/{game_code}/{game_ver}/", "")
 
     def get_mucha_info(self, core_cfg: CoreConfig, cfg_dir: str) -> Tuple[bool, List[str], List[str]]:
         """Called once during boot to check if this game is a mucha game
@@ -3,7 +3,7 @@ from types import ModuleType
 from starlette.requests import Request
 import logging
 import importlib
-from os import walk
+from os import walk, environ
 import jwt
 from base64 import b64decode
 from datetime import datetime, timezone
@@ -37,6 +37,21 @@ class Utils:
         ip = req.headers.get("x-forwarded-for", req.client.host)
         return ip.split(", ")[0]
     
+    @classmethod
+    def get_worker_id(cls) -> int:
+        """
+        Index of the title worker process this is, 0 when running a single process
+        """
+        return int(environ.get("ARTEMIS_WORKER_ID", 0))
+
+    @classmethod
+    def is_primary_worker(cls) -> bool:
+        """
+        Sub-services that bind their own ports (echo servers, game specific TCP servers)
+        should only be started by the primary worker
+        """
+        return cls.get_worker_id() == 0
+
     @classmethod
     def get_title_port(cls, cfg: CoreConfig):
         if cls.real_title_port is not None: return cls.real_title_port
@@ -22,7 +22,7 @@ if __name__ == "__main__":
     parser.add_argument("--email", "-e", type=str, help="Email for the new user")
     parser.add_argument("--access_code", "-a", type=str, help="Access code for new/transfer user", default="00000000000000000000")
     parser.add_argument("--message", "-m", type=str, help="Revision message")
-    parser.add_argument("action", type=str, help="create, upgrade, downgrade, create-owner, migrate, create-revision, create-autorevision")
+    parser.add_argument("action", type=str, help="create, upgrade, downgrade, create-owner, migrate, create-revision, create-autorevision, rebuild-rankings")
     args = parser.parse_args()
 
     cfg = CoreConfig()
@@ -70,5 +70,17 @@ if __name__ == "__main__":
         loop = asyncio.get_event_loop()
         loop.run_until_complete(data.create_revision_auto(args.message))
 
+    elif args.action == "rebuild-rankings":
+        # Recount play count rankings from existing playlogs. mai2 playlogs don't record
+        # the version they were sent to, --version picks which version they count for
+        from titles.chuni.database import ChuniData
+        from titles.mai2.database import Mai2Data
+        from titles.mai2.const import Mai2Constants
+
+        mai2_version = int(args.version) if args.version else Mai2Constants.VER_MAIMAI_DX_BUDDIES
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(ChuniData(cfg).score.rebuild_rankings())
+        loop.run_until_complete(Mai2Data(cfg).score.rebuild_rankings(mai2_version))
+
     else:
         logging.getLogger("database").info(f"Unknown action {args.action}")
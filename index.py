@@ -1,36 +1,142 @@
 #!/usr/bin/env python3
 import argparse
 import yaml
-from os import path, environ
+from os import path, environ, kill
 import uvicorn
 import logging
 import asyncio
+import signal
+import socket
+import multiprocessing
+from multiprocessing.process import BaseProcess
+from typing import List
 
 from core import CoreConfig, AimedbServlet
 
-async def launch_main(cfg: CoreConfig, ssl: bool) -> None:
+worker_procs: List[BaseProcess] = []
+
+def load_config(cfg_dir: str) -> CoreConfig:
+    cfg: CoreConfig = CoreConfig()
+    if path.exists(f"{cfg_dir}/core.yaml"):
+        cfg.update(yaml.safe_load(open(f"{cfg_dir}/core.yaml")))
+    CoreConfig.freeze(cfg, f"{cfg_dir}/core.yaml")
+    return cfg
+
+def main_server_config(cfg: CoreConfig, port: int, ssl: bool, reload: bool) -> uvicorn.Config:
     if ssl:
-        server_cfg = uvicorn.Config(
+        return uvicorn.Config(
             "core.app:app", 
             host=cfg.server.listen_address, 
-            port=cfg.server.port if args.port == 0 else args.port, 
-            reload=cfg.server.is_develop,
+            port=port, 
+            reload=reload,
             log_level="info" if cfg.server.is_develop else "critical",
             ssl_version=3,
             ssl_certfile=cfg.server.ssl_cert,
             ssl_keyfile=cfg.server.ssl_key
         ) 
-    else:
-        server_cfg = uvicorn.Config(
-            "core.app:app", 
-            host=cfg.server.listen_address, 
-            port=cfg.server.port if args.port == 0 else args.port, 
-            reload=cfg.server.is_develop,
-            log_level="info" if cfg.server.is_develop else "critical"
-        )
+
+    return uvicorn.Config(
+        "core.app:app", 
+        host=cfg.server.listen_address, 
+        port=port, 
+        reload=reload,
+        log_level="info" if cfg.server.is_develop else "critical"
+    )
+
+async def launch_main(cfg: CoreConfig, ssl: bool) -> None:
+    server_cfg = main_server_config(
+        cfg, cfg.server.port if args.port == 0 else args.port, ssl, cfg.server.is_develop
+    )
     server = uvicorn.Server(server_cfg)
     await server.serve()
 
+def title_worker(cfg_dir: str, port: int, ssl: bool, worker_id: int) -> None:
+    """
+    Entry point of a title worker process. Every worker binds its own socket to the
+    title port with SO_REUSEPORT and the kernel spreads connections between them.
+    """
+    environ["ARTEMIS_CFG_DIR"] = cfg_dir
+    environ["ARTEMIS_WORKER_ID"] = str(worker_id)
+    cfg = load_config(cfg_dir)
+
+    sock = socket.socket(
+        socket.AF_INET6 if ":" in cfg.server.listen_address else socket.AF_INET,
+        socket.SOCK_STREAM,
+    )
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((cfg.server.listen_address, port))
+
+    async def serve() -> None:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, CoreConfig.reload_all)
+        server = uvicorn.Server(main_server_config(cfg, port, ssl, False))
+        await server.serve(sockets=[sock])
+
+    asyncio.run(serve())
+
+def aimedb_worker(cfg_dir: str) -> None:
+    """
+    Entry point of the dedicated aimedb process used when running multiple title workers
+    """
+    environ["ARTEMIS_CFG_DIR"] = cfg_dir
+    cfg = load_config(cfg_dir)
+
+    async def serve() -> None:
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        loop.add_signal_handler(signal.SIGHUP, CoreConfig.reload_all)
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+
+        aimedb = AimedbServlet(cfg)
+        aimedb.start()
+        await stop.wait()
+        await aimedb.stop()
+
+    asyncio.run(serve())
+
+async def launch_workers(cfg: CoreConfig, ssl: bool) -> None:
+    logger = logging.getLogger("core")
+    port = cfg.server.port if args.port == 0 else args.port
+    ctx = multiprocessing.get_context("spawn")
+
+    for i in range(cfg.server.workers):
+        worker_procs.append(ctx.Process(
+            target=title_worker, args=(args.config, port, ssl, i), name=f"artemis-title-{i}", daemon=True
+        ))
+
+    if cfg.aimedb.enable:
+        worker_procs.append(ctx.Process(
+            target=aimedb_worker, args=(args.config,), name="artemis-aimedb", daemon=True
+        ))
+
+    for proc in worker_procs:
+        proc.start()
+
+    logger.info(f"Started {cfg.server.workers} title workers on port {port}")
+
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.wait(
+            [loop.run_in_executor(None, proc.join) for proc in worker_procs],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+
+        for proc in worker_procs:
+            if proc.exitcode is not None:
+                logger.error(f"{proc.name} exited with code {proc.exitcode}")
+
+    finally:
+        for proc in worker_procs:
+            if proc.is_alive():
+                proc.terminate()
+
+def reload_configs() -> None:
+    CoreConfig.reload_all()
+    for proc in worker_procs:
+        if proc.is_alive():
+            kill(proc.pid, signal.SIGHUP)
+
 async def launch_billing(cfg: CoreConfig) -> None:
     server_cfg = uvicorn.Config(
         "core.allnet:app_billing", 
@@ -70,7 +176,19 @@ async def launch_allnet(cfg: CoreConfig) -> None:
 
 
 async def launcher(cfg: CoreConfig, ssl: bool) -> None:
-    task_list = [asyncio.create_task(launch_main(cfg, ssl))]
+    multi_worker = cfg.server.workers > 1
+    if multi_worker and not hasattr(socket, "SO_REUSEPORT"):
+        logging.getLogger("core").error("Multiple workers need SO_REUSEPORT, which this platform lacks. Running a single worker")
+        multi_worker = False
+
+    if hasattr(signal, "SIGHUP"):
+        # Re-read all config files without restarting
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_configs)
+
+    if multi_worker:
+        task_list = [asyncio.create_task(launch_workers(cfg, ssl))]
+    else:
+        task_list = [asyncio.create_task(launch_main(cfg, ssl))]
     
     if cfg.billing.standalone:
         task_list.append(asyncio.create_task(launch_billing(cfg)))
@@ -78,17 +196,24 @@ async def launcher(cfg: CoreConfig, ssl: bool) -> None:
         task_list.append(asyncio.create_task(launch_frontend(cfg)))
     if cfg.allnet.standalone:
         task_list.append(asyncio.create_task(launch_allnet(cfg)))
-    if cfg.aimedb.enable:
-        AimedbServlet(cfg).start()
+    aimedb = None
+    if cfg.aimedb.enable and not multi_worker:
+        aimedb = AimedbServlet(cfg)
+        aimedb.start()
     
-    done, pending = await asyncio.wait(
-        task_list,
-        return_when=asyncio.FIRST_COMPLETED,
-    )
+    try:
+        done, pending = await asyncio.wait(
+            task_list,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
     
-    logging.getLogger("core").info("Shutdown")
-    for pending_task in pending:
-        pending_task.cancel("Another service died, server is shutting down")
+        logging.getLogger("core").info("Shutdown")
+        for pending_task in pending:
+            pending_task.cancel("Another service died, server is shutting down")
+
+    finally:
+        if aimedb is not None:
+            await aimedb.stop()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Artemis main entry point")
@@ -108,9 +233,7 @@ if __name__ == "__main__":
             f"The config folder you specified ({args.config}) does not exist or does not contain core.yaml. Defaults will be used.\nDid you copy the example folder?"
         )
     
-    cfg: CoreConfig = CoreConfig()
-    if path.exists(f"{args.config}/core.yaml"):
-        cfg.update(yaml.safe_load(open(f"{args.config}/core.yaml")))
+    cfg = load_config(args.config)
 
     environ["ARTEMIS_CFG_DIR"] = args.config
 
@@ -12,6 +12,7 @@ from logging.handlers import TimedRotatingFileHandler
 from typing import List, Optional
 
 from core import CoreConfig, Utils
+from core.data.catalog import reload_catalog
 
 
 class BaseReader:
@@ -142,6 +143,8 @@ if __name__ == "__main__":
             handler = mod.reader(config, args.version, bin_arg, opt_arg, args.extra)
             loop = asyncio.get_event_loop()
             loop.run_until_complete(handler.read())
-            
+            # tell running servers to pick up the new static data
+            loop.run_until_complete(reload_catalog(config, dir))
+
 
     logger.info("Done")
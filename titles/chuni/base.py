@@ -4,19 +4,22 @@ from datetime import datetime, timedelta
 from time import strftime
 
 import pytz
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from core.config import CoreConfig
+from core.data import snapshots
+from core.store import get_store
 from titles.chuni.const import ChuniConstants
 from titles.chuni.database import ChuniData
+from titles.chuni.catalog import catalog
 from titles.chuni.config import ChuniConfig
-SCORE_BUFFER = {}
 
 class ChuniBase:
     def __init__(self, core_cfg: CoreConfig, game_cfg: ChuniConfig) -> None:
         self.core_cfg = core_cfg
         self.game_cfg = game_cfg
         self.data = ChuniData(core_cfg)
+        self.store = get_store(core_cfg)
         self.date_time_format = "%Y-%m-%d %H:%M:%S"
         self.logger = logging.getLogger("chuni")
         self.game = ChuniConstants.GAME_CODE
@@ -121,10 +124,12 @@ class ChuniBase:
 
     async def handle_game_logout_api_request(self, data: Dict) -> Dict:
         # self.data.base.log_event("chuni", "logout", logging.INFO, {"version": self.version, "user": data["userId"]})
+        snapshots.drop("chuni", int(data["userId"]))
         return {"returnCode": 1}
 
     async def handle_get_game_charge_api_request(self, data: Dict) -> Dict:
-        game_charge_list = await self.data.static.get_enabled_charges(self.version)
+        static = await catalog.get(self.core_cfg, self.data)
+        game_charge_list = static.get_enabled_charges(self.version) if static else None
 
         if game_charge_list is None or len(game_charge_list) == 0:
             return {"length": 0, "gameChargeList": []}
@@ -146,7 +151,8 @@ class ChuniBase:
         return {"length": len(charges), "gameChargeList": charges}
 
     async def handle_get_game_event_api_request(self, data: Dict) -> Dict:
-        game_events = await self.data.static.get_enabled_events(self.version)
+        static = await catalog.get(self.core_cfg, self.data)
+        game_events = static.get_enabled_events(self.version) if static else None
 
         if game_events is None or len(game_events) == 0:
             self.logger.warning("No enabled events, did you run the reader?")
@@ -410,56 +416,46 @@ class ChuniBase:
         }
     
     async def handle_get_user_rival_music_api_request(self, data: Dict) -> Dict:
-        rival_id = data["rivalId"]
-        next_index = int(data["nextIndex"])
-        max_count = int(data["maxCount"])
-        user_rival_music_list = []
+        rival_id = int(data["rivalId"])
+        # The rival screen pages through the whole list, so it's grouped once and sliced per page
+        page = await snapshots.page(
+            "chuni_rival", rival_id, self.version, int(data["nextIndex"]), int(data["maxCount"]),
+            lambda: self.util_generate_rival_music_list(rival_id),
+        )
+        user_rival_music_list, next_index = page if page is not None else ([], -1)
+
+        return {
+            "userId": data["userId"],
+            "rivalId": data["rivalId"],
+            "nextIndex": str(next_index),
+            "userRivalMusicList": user_rival_music_list,
+        }
 
-        # Fetch all the rival music entries for the user
+    async def util_generate_rival_music_list(self, rival_id: int) -> Optional[List[Dict]]:
         all_entries = await self.data.score.get_rival_music(rival_id)
+        if all_entries is None:
+            return None
 
-        # Process the entries based on max_count and nextIndex
+        # Rows come ordered by musicId so every song's levels are next to each other
+        user_rival_music_list = []
+        music_entry = None
         for music in all_entries:
-            music_id = music["musicId"]
-            level = music["level"]
-            score = music["scoreMax"]
-            rank = music["scoreRank"]
-
-            # Create a music entry for the current music_id if it's unique
-            music_entry = next((entry for entry in user_rival_music_list if entry["musicId"] == music_id), None)
-            if music_entry is None:
+            if music_entry is None or music_entry["musicId"] != music["musicId"]:
                 music_entry = {
-                    "musicId": music_id,
+                    "musicId": music["musicId"],
                     "length": 0,
-                    "userRivalMusicDetailList": []
+                    "userRivalMusicDetailList": [],
                 }
                 user_rival_music_list.append(music_entry)
 
-            # Create a level entry for the current level if it's unique or has a higher score
-            level_entry = next((entry for entry in music_entry["userRivalMusicDetailList"] if entry["level"] == level), None)
-            if level_entry is None:
-                level_entry = {
-                    "level": level,
-                    "scoreMax": score,
-                    "scoreRank": rank
-                }
-                music_entry["userRivalMusicDetailList"].append(level_entry)
-            elif score > level_entry["scoreMax"]:
-                level_entry["scoreMax"] = score
-                level_entry["scoreRank"] = rank
-
-        # Calculate the length for each "musicId" by counting the unique levels
-        for music_entry in user_rival_music_list:
-            music_entry["length"] = len(music_entry["userRivalMusicDetailList"])
+            music_entry["userRivalMusicDetailList"].append({
+                "level": music["level"],
+                "scoreMax": music["scoreMax"],
+                "scoreRank": music["scoreRank"],
+            })
+            music_entry["length"] += 1
 
-        # Prepare the result dictionary with user rival music data
-        result = {
-            "userId": data["userId"],
-            "rivalId": data["rivalId"],
-            "nextIndex": str(next_index + len(user_rival_music_list[next_index: next_index + max_count]) if max_count <= len(user_rival_music_list[next_index: next_index + max_count]) else -1),
-            "userRivalMusicList": user_rival_music_list[next_index: next_index + max_count]
-        }
-        return result
+        return user_rival_music_list
 
     
     async def handle_get_user_favorite_item_api_request(self, data: Dict) -> Dict:
@@ -571,8 +567,13 @@ class ChuniBase:
         }
 
     async def handle_get_user_music_api_request(self, data: Dict) -> Dict:
-        music_detail = await self.data.score.get_scores(data["userId"])
-        if music_detail is None:
+        user_id = int(data["userId"])
+        page = await snapshots.page(
+            "chuni", user_id, self.version, int(data["nextIndex"]), int(data["maxCount"]),
+            lambda: self.util_generate_music_list(user_id),
+        )
+
+        if page is None:
             return {
                 "userId": data["userId"],
                 "length": 0,
@@ -580,48 +581,7 @@ class ChuniBase:
                 "userMusicList": [],  # 240
             }
 
-        song_list = []
-        next_idx = int(data["nextIndex"])
-        max_ct = int(data["maxCount"])
-
-        for x in range(next_idx, len(music_detail)):
-            found = False
-            tmp = music_detail[x]._asdict()
-            tmp.pop("user")
-            tmp.pop("id")
-
-            for song in song_list:
-                score_buf = SCORE_BUFFER.get(str(data["userId"])) or []
-                if song["userMusicDetailList"][0]["musicId"] == tmp["musicId"]:
-                    found = True
-                    song["userMusicDetailList"].append(tmp)
-                    song["length"] = len(song["userMusicDetailList"])
-                    score_buf.append(tmp["musicId"])
-                    SCORE_BUFFER[str(data["userId"])] = score_buf
-
-            score_buf = SCORE_BUFFER.get(str(data["userId"])) or []
-            if not found and tmp["musicId"] not in score_buf:
-                song_list.append({"length": 1, "userMusicDetailList": [tmp]})
-                score_buf.append(tmp["musicId"])
-                SCORE_BUFFER[str(data["userId"])] = score_buf
-
-            if len(song_list) >= max_ct:
-                break
-    
-        for songIdx in range(len(song_list)): 
-            for recordIdx in range(x+1, len(music_detail)):
-                if song_list[songIdx]["userMusicDetailList"][0]["musicId"] == music_detail[recordIdx]["musicId"]:
-                    music = music_detail[recordIdx]._asdict()
-                    music.pop("user")
-                    music.pop("id")
-                    song_list[songIdx]["userMusicDetailList"].append(music)
-                    song_list[songIdx]["length"] += 1
-    
-        if len(song_list) >= max_ct:
-            next_idx += len(song_list)
-        else:
-            next_idx = -1
-            SCORE_BUFFER[str(data["userId"])] = []
+        song_list, next_idx = page
         return {
             "userId": data["userId"],
             "length": len(song_list),
@@ -629,6 +589,23 @@ class ChuniBase:
             "userMusicList": song_list,  # 240
         }
 
+    async def util_generate_music_list(self, user_id: int) -> Optional[List[Dict]]:
+        """
+        Groups all of a user's best scores by musicId, one entry per song
+        """
+        music_detail = await self.data.score.get_scores(user_id)
+        if music_detail is None:
+            return None
+
+        songs: Dict[int, List[Dict]] = {}
+        for md in sorted(music_detail, key=lambda x: (x["musicId"], x["level"])):
+            tmp = md._asdict()
+            tmp.pop("user")
+            tmp.pop("id")
+            songs.setdefault(tmp["musicId"], []).append(tmp)
+
+        return [{"length": len(details), "userMusicDetailList": details} for details in songs.values()]
+
     async def handle_get_user_option_api_request(self, data: Dict) -> Dict:
         p = await self.data.profile.get_profile_option(data["userId"])
 
@@ -817,130 +794,122 @@ class ChuniBase:
             self.logger.info("Guest play from place ID %d, ignoring.", place_id)
             return {"returnCode": "1"}
 
-        if "userData" in upsert:
-            try:
-                upsert["userData"][0]["userName"] = self.read_wtf8(
-                    upsert["userData"][0]["userName"]
-                )
-            except Exception:
-                pass
-
-            await self.data.profile.put_profile_data(
-                user_id, self.version, upsert["userData"][0]
-            )
+        snapshots.drop("chuni", int(user_id))
+        async with self.data.base.transaction():
+            if "userData" in upsert:
+                try:
+                    upsert["userData"][0]["userName"] = self.read_wtf8(
+                        upsert["userData"][0]["userName"]
+                    )
+                except Exception:
+                    pass
 
-        if "userDataEx" in upsert:
-            await self.data.profile.put_profile_data_ex(
-                user_id, self.version, upsert["userDataEx"][0]
-            )
+                await self.data.profile.put_profile_data(
+                    user_id, self.version, upsert["userData"][0]
+                )
 
-        if "userGameOption" in upsert:
-            await self.data.profile.put_profile_option(user_id, upsert["userGameOption"][0])
+            if "userDataEx" in upsert:
+                await self.data.profile.put_profile_data_ex(
+                    user_id, self.version, upsert["userDataEx"][0]
+                )
 
-        if "userGameOptionEx" in upsert:
-            await self.data.profile.put_profile_option_ex(
-                user_id, upsert["userGameOptionEx"][0]
-            )
-        if "userRecentRatingList" in upsert:
-            await self.data.profile.put_profile_recent_rating(
-                user_id, upsert["userRecentRatingList"]
-            )
+            if "userGameOption" in upsert:
+                await self.data.profile.put_profile_option(user_id, upsert["userGameOption"][0])
 
-        if "userCharacterList" in upsert:
-            for character in upsert["userCharacterList"]:
-                await self.data.item.put_character(user_id, character)
-
-        if "userMapList" in upsert:
-            for map in upsert["userMapList"]:
-                await self.data.item.put_map(user_id, map)
-
-        if "userCourseList" in upsert:
-            for course in upsert["userCourseList"]:
-                await self.data.score.put_course(user_id, course)
-
-        if "userDuelList" in upsert:
-            for duel in upsert["userDuelList"]:
-                await self.data.item.put_duel(user_id, duel)
-
-        if "userItemList" in upsert:
-            for item in upsert["userItemList"]:
-                await self.data.item.put_item(user_id, item)
-
-        if "userActivityList" in upsert:
-            for activity in upsert["userActivityList"]:
-                await self.data.profile.put_profile_activity(user_id, activity)
-
-        if "userChargeList" in upsert:
-            for charge in upsert["userChargeList"]:
-                await self.data.profile.put_profile_charge(user_id, charge)
-
-        if "userMusicDetailList" in upsert:
-            for song in upsert["userMusicDetailList"]:
-                await self.data.score.put_score(user_id, song)
-
-        if "userPlaylogList" in upsert:
-            for playlog in upsert["userPlaylogList"]:
-                # convert the player names to utf-8
-                if playlog["playedUserName1"] is not None:
-                  playlog["playedUserName1"] = self.read_wtf8(playlog["playedUserName1"])
-                if playlog["playedUserName2"] is not None:
-                  playlog["playedUserName2"] = self.read_wtf8(playlog["playedUserName2"])
-                if playlog["playedUserName3"] is not None:
-                  playlog["playedUserName3"] = self.read_wtf8(playlog["playedUserName3"])
-                await self.data.score.put_playlog(user_id, playlog, self.version)
-
-        if "userTeamPoint" in upsert:
-            team_points = upsert["userTeamPoint"]
-            try:
-                for tp in team_points:
-                    if tp["teamId"] != '65535':
-                        # Fetch the current team data
-                        current_team = await self.data.profile.get_team_by_id(tp["teamId"])
-
-                        # Calculate the new teamPoint
-                        new_team_point = int(tp["teamPoint"]) + current_team["teamPoint"]
-
-                        # Prepare the data to update
-                        team_data = {
-                            "teamPoint": new_team_point
-                        }
-
-                        # Update the team data
-                        await self.data.profile.update_team(tp["teamId"], team_data)
-            except:
-                pass # Probably a better way to catch if the team is not set yet (new profiles), but let's just pass
-        if "userMapAreaList" in upsert:
-            for map_area in upsert["userMapAreaList"]:
-                await self.data.item.put_map_area(user_id, map_area)
-
-        if "userOverPowerList" in upsert:
-            for overpower in upsert["userOverPowerList"]:
-                await self.data.profile.put_profile_overpower(user_id, overpower)
-
-        if "userEmoneyList" in upsert:
-            for emoney in upsert["userEmoneyList"]:
-                await self.data.profile.put_profile_emoney(user_id, emoney)
-
-        if "userLoginBonusList" in upsert:
-            for login in upsert["userLoginBonusList"]:
-                await self.data.item.put_login_bonus(
-                    user_id, self.version, login["presetId"], isWatched=True
+            if "userGameOptionEx" in upsert:
+                await self.data.profile.put_profile_option_ex(
+                    user_id, upsert["userGameOptionEx"][0]
+                )
+            if "userRecentRatingList" in upsert:
+                await self.data.profile.put_profile_recent_rating(
+                    user_id, upsert["userRecentRatingList"]
                 )
+
+            if "userCharacterList" in upsert:
+                await self.data.item.put_characters(user_id, upsert["userCharacterList"])
+
+            if "userMapList" in upsert:
+                await self.data.item.put_maps(user_id, upsert["userMapList"])
+
+            if "userCourseList" in upsert:
+                await self.data.score.put_courses(user_id, upsert["userCourseList"])
+
+            if "userDuelList" in upsert:
+                await self.data.item.put_duels(user_id, upsert["userDuelList"])
+
+            if "userItemList" in upsert:
+                await self.data.item.put_items(user_id, upsert["userItemList"])
+
+            if "userActivityList" in upsert:
+                await self.data.profile.put_profile_activities(user_id, upsert["userActivityList"])
+
+            if "userChargeList" in upsert:
+                await self.data.profile.put_profile_charges(user_id, upsert["userChargeList"])
+
+            if "userMusicDetailList" in upsert:
+                await self.data.score.put_scores(user_id, upsert["userMusicDetailList"])
+
+            if "userPlaylogList" in upsert:
+                for playlog in upsert["userPlaylogList"]:
+                    # convert the player names to utf-8
+                    if playlog["playedUserName1"] is not None:
+                      playlog["playedUserName1"] = self.read_wtf8(playlog["playedUserName1"])
+                    if playlog["playedUserName2"] is not None:
+                      playlog["playedUserName2"] = self.read_wtf8(playlog["playedUserName2"])
+                    if playlog["playedUserName3"] is not None:
+                      playlog["playedUserName3"] = self.read_wtf8(playlog["playedUserName3"])
+                    await self.data.score.put_playlog(user_id, playlog, self.version)
+
+            if "userTeamPoint" in upsert:
+                team_points = upsert["userTeamPoint"]
+                try:
+                    for tp in team_points:
+                        if tp["teamId"] != '65535':
+                            # Fetch the current team data
+                            current_team = await self.data.profile.get_team_by_id(tp["teamId"])
+
+                            # Calculate the new teamPoint
+                            new_team_point = int(tp["teamPoint"]) + current_team["teamPoint"]
+
+                            # Prepare the data to update
+                            team_data = {
+                                "teamPoint": new_team_point
+                            }
+
+                            # Update the team data
+                            await self.data.profile.update_team(tp["teamId"], team_data)
+                except:
+                    pass # Probably a better way to catch if the team is not set yet (new profiles), but let's just pass
+            if "userMapAreaList" in upsert:
+                await self.data.item.put_map_areas(user_id, upsert["userMapAreaList"])
+
+            if "userOverPowerList" in upsert:
+                await self.data.profile.put_profile_overpowers(user_id, upsert["userOverPowerList"])
+
+            if "userEmoneyList" in upsert:
+                for emoney in upsert["userEmoneyList"]:
+                    await self.data.profile.put_profile_emoney(user_id, emoney)
+
+            if "userLoginBonusList" in upsert:
+                for login in upsert["userLoginBonusList"]:
+                    await self.data.item.put_login_bonus(
+                        user_id, self.version, login["presetId"], isWatched=True
+                    )
         
-        if "userRecentPlayerList" in upsert: # TODO: Seen in Air, maybe implement sometime
-            for rp in upsert["userRecentPlayerList"]:
-                pass
+            if "userRecentPlayerList" in upsert: # TODO: Seen in Air, maybe implement sometime
+                for rp in upsert["userRecentPlayerList"]:
+                    pass
 
-        for rating_type in {"userRatingBaseList", "userRatingBaseHotList", "userRatingBaseNextList"}:
-            if rating_type not in upsert:
-                continue
+            for rating_type in {"userRatingBaseList", "userRatingBaseHotList", "userRatingBaseNextList"}:
+                if rating_type not in upsert:
+                    continue
             
-            await self.data.profile.put_profile_rating(
-                user_id,
-                self.version,
-                rating_type,
-                upsert[rating_type],
-            )
+                await self.data.profile.put_profile_rating(
+                    user_id,
+                    self.version,
+                    rating_type,
+                    upsert[rating_type],
+                )
 
         return {"returnCode": "1"}
 
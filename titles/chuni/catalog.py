@@ -0,0 +1,48 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.engine import Row
+
+from core.data.catalog import StaticCatalog
+
+
+class ChuniCatalog:
+    """
+    Chunithm's static music, charges and events, indexed so handlers and frontend pages
+    never have to query them per row. Music is keyed by (version, songId, chartId).
+    """
+    def __init__(self, music: List[Row], charges: List[Row], events: List[Row]) -> None:
+        self.music: Dict[Tuple[int, int, int], Row] = {
+            (row["version"], row["songId"], row["chartId"]): row for row in music
+        }
+        self.enabled_charges: Dict[int, List[Row]] = {}
+        self.enabled_events: Dict[int, List[Row]] = {}
+
+        for row in charges:
+            if row["enabled"]:
+                self.enabled_charges.setdefault(row["version"], []).append(row)
+
+        for row in events:
+            if row["enabled"]:
+                self.enabled_events.setdefault(row["version"], []).append(row)
+
+    def get_music_chart(self, version: int, song_id: int, chart_id: int) -> Optional[Row]:
+        return self.music.get((version, song_id, chart_id))
+
+    def get_enabled_charges(self, version: int) -> List[Row]:
+        return self.enabled_charges.get(version, [])
+
+    def get_enabled_events(self, version: int) -> List[Row]:
+        return self.enabled_events.get(version, [])
+
+
+class ChuniStaticCatalog(StaticCatalog):
+    async def load(self, data) -> Optional[ChuniCatalog]:
+        music = await data.static.get_all_music()
+        charges = await data.static.get_all_charges()
+        events = await data.static.get_all_events()
+        if music is None or charges is None or events is None:
+            return None
+
+        return ChuniCatalog(music, charges, events)
+
+
+catalog = ChuniStaticCatalog("chuni")
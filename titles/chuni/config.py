@@ -1,5 +1,5 @@
 from core.config import CoreConfig
-from typing import Dict
+from typing import Dict, Tuple
 
 
 class ChuniServerConfig:
@@ -83,6 +83,17 @@ class ChuniCryptoConfig:
             self.__config, "chuni", "crypto", "keys", default={}
         )
 
+    @property
+    def key_bytes(self) -> Dict[int, Tuple[bytes, bytes]]:
+        """
+        keys with the key and iv already decoded from hex, for use on the request path
+        """
+        return {
+            version: (bytes.fromhex(keys[0]), bytes.fromhex(keys[1]))
+            for version, keys in self.keys.items()
+            if len(keys) >= 2
+        }
+
     @property
     def encrypted_only(self) -> bool:
         return CoreConfig.get_config_field(
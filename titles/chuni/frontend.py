@@ -11,6 +11,7 @@ from core.config import CoreConfig
 from .database import ChuniData
 from .config import ChuniConfig
 from .const import ChuniConstants
+from .catalog import catalog
 
 
 class ChuniFrontend(FE_Base):
@@ -91,8 +92,9 @@ class ChuniFrontend(FE_Base):
             base_list=[]
             if profile and rating:
                 song_records = []
+                static = await catalog.get(self.core_config, self.data)
                 for song in rating:
-                    music_chart = await self.data.static.get_music_chart(usr_sesh.chunithm_version, song.musicId, song.difficultId)
+                    music_chart = static.get_music_chart(usr_sesh.chunithm_version, song.musicId, song.difficultId) if static else None
                     if music_chart:
                         if (song.score < 800000):
                             song_rating = 0
@@ -162,8 +164,9 @@ class ChuniFrontend(FE_Base):
                 ), media_type="text/html; charset=utf-8")
             playlog = await self.data.score.get_playlogs_limited(user_id, index, 20)
             playlog_with_title = []
+            static = await catalog.get(self.core_config, self.data)
             for record in playlog:
-                music_chart = await self.data.static.get_music_chart(usr_sesh.chunithm_version, record.musicId, record.level)
+                music_chart = static.get_music_chart(usr_sesh.chunithm_version, record.musicId, record.level) if static else None
                 if music_chart:
                     difficultyNum=music_chart.level
                     artist=music_chart.artist
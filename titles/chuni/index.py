@@ -6,7 +6,6 @@ from logging.handlers import TimedRotatingFileHandler
 import zlib
 import yaml
 import json
-import inflection
 import string
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad
@@ -16,7 +15,7 @@ from os import path
 from typing import Tuple, Dict, List
 
 from core import CoreConfig, Utils
-from core.title import BaseServlet
+from core.title import BaseServlet, HandlerTable, VersionTable
 from .config import ChuniConfig
 from .const import ChuniConstants
 from .base import ChuniBase
@@ -44,6 +43,7 @@ class ChuniServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{ChuniConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{ChuniConstants.CONFIG_NAME}")
 
         self.versions = [
             ChuniBase,
@@ -63,6 +63,39 @@ class ChuniServlet(BaseServlet):
             ChuniSunPlus,
         ]
 
+        # Version classes hold no per-request state, so one instance of each is shared
+        self.handlers = [
+            HandlerTable(ver(core_cfg, self.game_cfg)) for ver in self.versions
+        ]
+
+        jp_versions = VersionTable([
+            (105, ChuniConstants.VER_CHUNITHM_PLUS),
+            (110, ChuniConstants.VER_CHUNITHM_AIR),
+            (115, ChuniConstants.VER_CHUNITHM_AIR_PLUS),
+            (120, ChuniConstants.VER_CHUNITHM_STAR),
+            (125, ChuniConstants.VER_CHUNITHM_STAR_PLUS),
+            (130, ChuniConstants.VER_CHUNITHM_AMAZON),
+            (135, ChuniConstants.VER_CHUNITHM_AMAZON_PLUS),
+            (140, ChuniConstants.VER_CHUNITHM_CRYSTAL),
+            (145, ChuniConstants.VER_CHUNITHM_CRYSTAL_PLUS),
+            (150, ChuniConstants.VER_CHUNITHM_PARADISE),
+            (200, ChuniConstants.VER_CHUNITHM_NEW),
+            (205, ChuniConstants.VER_CHUNITHM_NEW_PLUS),
+            (210, ChuniConstants.VER_CHUNITHM_SUN),
+            (215, ChuniConstants.VER_CHUNITHM_SUN_PLUS),
+        ], ChuniConstants.VER_CHUNITHM)
+
+        self.version_tables: Dict[str, VersionTable] = {
+            "SDHD": jp_versions,
+            "SDBT": jp_versions,
+            "SDGS": VersionTable([ # Int, anything below 1.10 is SUPERSTAR
+                (110, ChuniConstants.VER_CHUNITHM_NEW),
+                (115, ChuniConstants.VER_CHUNITHM_NEW_PLUS),
+                (120, ChuniConstants.VER_CHUNITHM_SUN),
+                (125, ChuniConstants.VER_CHUNITHM_SUN_PLUS),
+            ], ChuniConstants.VER_CHUNITHM_PARADISE),
+        }
+
         self.logger = logging.getLogger("chuni")
 
         if not hasattr(self.logger, "inited"):
@@ -95,13 +128,7 @@ class ChuniServlet(BaseServlet):
 
             self.hash_table[version] = {}
 
-            method_list = [
-                method
-                for method in dir(self.versions[version])
-                if not method.startswith("__")
-            ]
-            for method in method_list:
-                method_fixed = inflection.camelize(method)[6:-7]
+            for method_fixed in self.handlers[version].endpoints():
                 # number of iterations was changed to 70 in SUN and then to 36
                 if version == ChuniConstants.VER_CHUNITHM_SUN_PLUS:
                     iter_count = 36
@@ -141,10 +168,7 @@ class ChuniServlet(BaseServlet):
         return True
 
     def get_allnet_info(self, game_code: str, game_ver: int, keychip: str) -> Tuple[str, str]:
-        if not self.core_cfg.server.is_using_proxy and Utils.get_title_port(self.core_cfg) != 80:
-            return (f"http://{self.core_cfg.server.hostname}:{Utils.get_title_port(self.core_cfg)}/{game_code}/{game_ver}/", self.core_cfg.server.hostname)
-
-        return (f"http://{self.core_cfg.server.hostname}/{game_code}/{game_ver}/", self.core_cfg.server.hostname)
+        return (f"{self.core_cfg.server.title_url}/{game_code}/{game_ver}/", self.core_cfg.server.hostname)
 
     def get_routes(self) -> List[Route]:
         return [
@@ -163,53 +187,12 @@ class ChuniServlet(BaseServlet):
         req_raw = await request.body()
 
         encrtped = False
-        internal_ver = 0
         client_ip = Utils.get_ip_addr(request)
 
-        if game_code == "SDHD" or game_code == "SDBT": # JP
-          if version < 105:  # 1.0
-              internal_ver = ChuniConstants.VER_CHUNITHM
-          elif version >= 105 and version < 110:  # PLUS
-              internal_ver = ChuniConstants.VER_CHUNITHM_PLUS
-          elif version >= 110 and version < 115:  # AIR
-              internal_ver = ChuniConstants.VER_CHUNITHM_AIR
-          elif version >= 115 and version < 120:  # AIR PLUS
-              internal_ver = ChuniConstants.VER_CHUNITHM_AIR_PLUS
-          elif version >= 120 and version < 125:  # STAR
-              internal_ver = ChuniConstants.VER_CHUNITHM_STAR
-          elif version >= 125 and version < 130:  # STAR PLUS
-              internal_ver = ChuniConstants.VER_CHUNITHM_STAR_PLUS
-          elif version >= 130 and version < 135:  # AMAZON
-              internal_ver = ChuniConstants.VER_CHUNITHM_AMAZON
-          elif version >= 135 and version < 140:  # AMAZON PLUS
-              internal_ver = ChuniConstants.VER_CHUNITHM_AMAZON_PLUS
-          elif version >= 140 and version < 145:  # CRYSTAL
-              internal_ver = ChuniConstants.VER_CHUNITHM_CRYSTAL
-          elif version >= 145 and version < 150:  # CRYSTAL PLUS
-              internal_ver = ChuniConstants.VER_CHUNITHM_CRYSTAL_PLUS
-          elif version >= 150 and version < 200:  # PARADISE
-              internal_ver = ChuniConstants.VER_CHUNITHM_PARADISE
-          elif version >= 200 and version < 205:  # NEW!!
-              internal_ver = ChuniConstants.VER_CHUNITHM_NEW
-          elif version >= 205 and version < 210:  # NEW PLUS!!
-              internal_ver = ChuniConstants.VER_CHUNITHM_NEW_PLUS
-          elif version >= 210 and version < 215:  # SUN
-              internal_ver = ChuniConstants.VER_CHUNITHM_SUN
-          elif version >= 215: # SUN
-              internal_ver = ChuniConstants.VER_CHUNITHM_SUN_PLUS
-        elif game_code == "SDGS": # Int
-          if version < 110: # SUPERSTAR
-              internal_ver = ChuniConstants.VER_CHUNITHM_PARADISE # FIXME: Not sure what was intended to go here? was just "PARADISE"
-          elif version >= 110 and version < 115: # NEW
-              internal_ver = ChuniConstants.VER_CHUNITHM_NEW
-          elif version >= 115 and version < 120: # NEW PLUS!!
-              internal_ver = ChuniConstants.VER_CHUNITHM_NEW_PLUS
-          elif version >= 120 and version < 125: # SUN
-              internal_ver = ChuniConstants.VER_CHUNITHM_SUN
-          elif version >= 125: # SUN PLUS
-              internal_ver = ChuniConstants.VER_CHUNITHM_SUN_PLUS
-
-        if all(c in string.hexdigits for c in endpoint) and len(endpoint) == 32:
+        version_table = self.version_tables.get(game_code)
+        internal_ver = version_table.get(version) if version_table is not None else 0
+
+        if len(endpoint) == 32 and all(c in string.hexdigits for c in endpoint):
             # If we get a 32 character long hex string, it's a hash and we're
             # doing encrypted. The likelyhood of false positives is low but
             # technically not 0
@@ -233,9 +216,9 @@ class ChuniServlet(BaseServlet):
 
             try:
                 crypt = AES.new(
-                    bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][0]),
+                    self.game_cfg.crypto.key_bytes[internal_ver][0],
                     AES.MODE_CBC,
-                    bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][1]),
+                    self.game_cfg.crypto.key_bytes[internal_ver][1],
                 )
 
                 req_raw = crypt.decrypt(req_raw)
@@ -277,16 +260,14 @@ class ChuniServlet(BaseServlet):
             if game_code == "SDGS"
             else endpoint
         )
-        func_to_find = "handle_" + inflection.underscore(endpoint) + "_request"
-        handler_cls = self.versions[internal_ver](self.core_cfg, self.game_cfg)
+        handler = self.handlers[internal_ver].get(endpoint)
 
-        if not hasattr(handler_cls, func_to_find):
+        if handler is None:
             self.logger.warning(f"Unhandled v{version} request {endpoint}")
             resp = {"returnCode": 1}
 
         else:
             try:
-                handler = getattr(handler_cls, func_to_find)
                 resp = await handler(req_data)
 
             except Exception as e:
@@ -306,9 +287,9 @@ class ChuniServlet(BaseServlet):
         padded = pad(zipped, 16)
 
         crypt = AES.new(
-            bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][0]),
+            self.game_cfg.crypto.key_bytes[internal_ver][0],
             AES.MODE_CBC,
-            bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][1]),
+            self.game_cfg.crypto.key_bytes[internal_ver][1],
         )
 
         return Response(crypt.encrypt(padded))
\ No newline at end of file
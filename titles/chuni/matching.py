@@ -0,0 +1,209 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from core.config import CoreConfig
+from core.store import SharedStore, StoreLockTimeout, get_store
+
+
+class ChuniMatchingRoom:
+    __slots__ = ("room_id", "host", "members", "rest_sec", "is_full", "touched")
+
+    def __init__(self, room_id: int, host: int, members: List[Dict], rest_sec: int) -> None:
+        self.room_id = room_id
+        self.host = host
+        self.members = members
+        self.rest_sec = rest_sec
+        self.is_full = False
+        self.touched = time.time()
+
+
+class ChuniMatchingRooms:
+    """
+    Every matching room of one version. rooms is ordered from the least to the most
+    recently touched room so stale rooms can be expired from the front, free holds the
+    rooms that can still be joined, oldest first, and users maps a member's user id to
+    the room it is in, since removing a member only gives the user id.
+    """
+    def __init__(self) -> None:
+        self.rooms: "OrderedDict[int, ChuniMatchingRoom]" = OrderedDict()
+        self.free: "OrderedDict[int, None]" = OrderedDict()
+        self.users: Dict[int, int] = {}
+        self.next_id = 1
+
+    def new_room(self, host: int, member: Dict, rest_sec: int) -> ChuniMatchingRoom:
+        room = ChuniMatchingRoom(self.next_id, host, [member], rest_sec)
+        self.next_id += 1
+        self.rooms[room.room_id] = room
+        self.free[room.room_id] = None
+        self.users[host] = room.room_id
+        return room
+
+    def oldest_free(self) -> Optional[ChuniMatchingRoom]:
+        for room_id in self.free:
+            return self.rooms[room_id]
+        return None
+
+    def touch(self, room: ChuniMatchingRoom) -> None:
+        room.touched = time.time()
+        self.rooms.move_to_end(room.room_id)
+
+    def set_full(self, room: ChuniMatchingRoom, is_full: bool) -> None:
+        room.is_full = is_full
+        if is_full:
+            self.free.pop(room.room_id, None)
+        else:
+            self.free[room.room_id] = None
+
+    def delete(self, room: ChuniMatchingRoom) -> None:
+        self.rooms.pop(room.room_id, None)
+        self.free.pop(room.room_id, None)
+        for member in room.members:
+            if self.users.get(int(member["userId"])) == room.room_id:
+                del self.users[int(member["userId"])]
+
+    def expire(self, timeout: int) -> None:
+        cutoff = time.time() - timeout
+        while self.rooms:
+            room = next(iter(self.rooms.values()))
+            if room.touched >= cutoff:
+                break
+            self.delete(room)
+
+
+class ChuniMatchingRegistry:
+    """
+    Keeps Chunithm's matching rooms, which only live for the few seconds it takes to match,
+    out of the database. With a single worker the rooms are held in this process behind an
+    asyncio lock. With several workers every room has to be seen by every worker, so each
+    version's rooms are kept under one shared store key instead, updated with
+    SharedStore.locked. If its lock can't be taken the request is answered as if the room
+    didn't exist.
+    Rooms nobody polled for ROOM_TIMEOUT seconds are dropped.
+    """
+    MAX_MEMBERS = 4
+    REST_SEC = 60
+    ROOM_TIMEOUT = 30
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger("chuni")
+        self.locks: Dict[int, asyncio.Lock] = {}
+        self.versions: Dict[int, ChuniMatchingRooms] = {}
+
+    def __lock(self, version: int) -> asyncio.Lock:
+        lock = self.locks.get(version)
+        if lock is None:
+            lock = self.locks[version] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def __rooms(self, core_cfg: CoreConfig, version: int) -> AsyncIterator[ChuniMatchingRooms]:
+        store = get_store(core_cfg)
+        async with self.__lock(version):
+            if core_cfg.server.workers <= 1 or type(store) is SharedStore:
+                rooms = self.versions.setdefault(version, ChuniMatchingRooms())
+                rooms.expire(self.ROOM_TIMEOUT)
+                yield rooms
+                return
+
+            key = f"chuni:matching:{version}"
+            async with store.locked(key, ChuniMatchingRooms, self.ROOM_TIMEOUT) as rooms:
+                rooms.expire(self.ROOM_TIMEOUT)
+                yield rooms
+
+    async def begin(self, core_cfg: CoreConfig, version: int, member: Dict) -> Optional[ChuniMatchingRoom]:
+        """
+        Puts the member in the oldest room that isn't full, or in a new room it hosts
+        """
+        try:
+            async with self.__rooms(core_cfg, version) as rooms:
+                room = rooms.oldest_free()
+                if room is None:
+                    # the host's user id is required for the countdown later on
+                    room = rooms.new_room(int(member["userId"]), member, self.REST_SEC)
+                else:
+                    room.members.append(member)
+                    room.rest_sec = self.REST_SEC
+                    rooms.users[int(member["userId"])] = room.room_id
+                    rooms.set_full(room, len(room.members) >= self.MAX_MEMBERS)
+
+                rooms.touch(room)
+                self.logger.debug(f"Matching: user {member['userId']} in room {room.room_id}, {len(room.members)} members")
+                return room
+
+        except StoreLockTimeout as e:
+            self.logger.error(f"Matching: could not put user {member['userId']} in a room - {e}")
+            return None
+
+    async def end(self, core_cfg: CoreConfig, version: int, room_id: int) -> Optional[ChuniMatchingRoom]:
+        """
+        Stops the countdown and closes the room so no one else can join
+        """
+        try:
+            async with self.__rooms(core_cfg, version) as rooms:
+                # the game sends the room id as a string
+                room = rooms.rooms.get(int(room_id))
+                if room is None:
+                    return None
+
+                room.rest_sec = 0
+                rooms.set_full(room, True)
+                rooms.touch(room)
+                return room
+
+        except StoreLockTimeout as e:
+            self.logger.error(f"Matching: could not end room {room_id} - {e}")
+            return None
+
+    async def poll(
+        self, core_cfg: CoreConfig, version: int, room_id: int, member: Dict, interval: int
+    ) -> Optional[ChuniMatchingRoom]:
+        """
+        Refreshes the member's info, and counts the room down by interval if it's the host
+        """
+        try:
+            async with self.__rooms(core_cfg, version) as rooms:
+                # the game sends the room id as a string
+                room = rooms.rooms.get(int(room_id))
+                if room is None:
+                    return None
+
+                # only the host user can decrease the countdown
+                if room.host == int(member["userId"]):
+                    room.rest_sec = max(room.rest_sec - interval, 0)
+
+                # update the members in order to recieve messages
+                for i, old in enumerate(room.members):
+                    if old["userId"] == member["userId"]:
+                        room.members[i] = member
+
+                rooms.touch(room)
+                return room
+
+        except StoreLockTimeout as e:
+            self.logger.error(f"Matching: could not poll room {room_id} - {e}")
+            return None
+
+    async def remove(self, core_cfg: CoreConfig, version: int, user_id: int) -> None:
+        """
+        Takes a user out of its room, deleting the room if it was the last member
+        """
+        try:
+            async with self.__rooms(core_cfg, version) as rooms:
+                room_id = rooms.users.pop(int(user_id), None)
+                room = rooms.rooms.get(room_id) if room_id is not None else None
+                if room is None:
+                    return
+
+                room.members = [m for m in room.members if int(m["userId"]) != int(user_id)]
+                if not room.members:
+                    rooms.delete(room)
+
+        except StoreLockTimeout as e:
+            self.logger.error(f"Matching: could not remove user {user_id} - {e}")
+
+
+registry = ChuniMatchingRegistry()
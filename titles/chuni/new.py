@@ -10,6 +10,7 @@ from titles.chuni.const import ChuniConstants
 from titles.chuni.database import ChuniData
 from titles.chuni.base import ChuniBase
 from titles.chuni.config import ChuniConfig
+from titles.chuni.matching import registry
 
 class ChuniNew(ChuniBase):
     ITEM_TYPE = {"character": 20, "story": 21, "card": 22}
@@ -506,73 +507,53 @@ class ChuniNew(ChuniBase):
         return {"returnCode": "1"}
 
     async def handle_begin_matching_api_request(self, data: Dict) -> Dict:
-        room_id = 1
-        # check if there is a free matching room
-        matching_room = await self.data.item.get_oldest_free_matching(self.version)
+        # fix userName WTF8
+        new_member = data["matchingMemberInfo"]
+        new_member["userName"] = self.read_wtf8(new_member["userName"])
 
+        # join the oldest room that isn't full, or host a new one
+        matching_room = await registry.begin(self.core_cfg, self.version, new_member)
         if matching_room is None:
-            # grab the latest roomId and add 1 for the new room
-            newest_matching = await self.data.item.get_newest_matching(self.version)
-            if newest_matching is not None:
-                room_id = newest_matching["roomId"] + 1
-
-            # fix userName WTF8
-            new_member = data["matchingMemberInfo"]
-            new_member["userName"] = self.read_wtf8(new_member["userName"])
-
-            # create the new room with room_id and the current user id (host)
-            # user id is required for the countdown later on
-            await self.data.item.put_matching(
-                self.version, room_id, [new_member], user_id=new_member["userId"]
-            )
-
-            # get the newly created matching room
-            matching_room = await self.data.item.get_matching(self.version, room_id)
-        else:
-            # a room already exists, so just add the new member to it
-            matching_member_list = matching_room["matchingMemberInfoList"]
-            # fix userName WTF8
-            new_member = data["matchingMemberInfo"]
-            new_member["userName"] = self.read_wtf8(new_member["userName"])
-            matching_member_list.append(new_member)
-
-            # add the updated room to the database, make sure to set isFull correctly!
-            await self.data.item.put_matching(
-                self.version,
-                matching_room["roomId"],
-                matching_member_list,
-                user_id=matching_room["user"],
-                is_full=True if len(matching_member_list) >= 4 else False,
-            )
+            # no room could be joined, finish right away so the game fills it with CPUs
+            return {
+                "roomId": 0,
+                "matchingWaitState": {
+                    "isFinish": True,
+                    "restMSec": 0,
+                    "pollingInterval": 1,
+                    "matchingMemberInfoList": [new_member],
+                },
+            }
 
         matching_wait = {
             "isFinish": False,
-            "restMSec": matching_room["restMSec"],  # in sec
+            "restMSec": matching_room.rest_sec,  # in sec
             "pollingInterval": 1,  # in sec
-            "matchingMemberInfoList": matching_room["matchingMemberInfoList"],
+            "matchingMemberInfoList": list(matching_room.members),
         }
 
-        return {"roomId": 1, "matchingWaitState": matching_wait}
+        return {"roomId": matching_room.room_id, "matchingWaitState": matching_wait}
 
     async def handle_end_matching_api_request(self, data: Dict) -> Dict:
-        matching_room = await self.data.item.get_matching(self.version, data["roomId"])
-        members = matching_room["matchingMemberInfoList"]
+        # sets the countdown to 0 and marks the room full, so no one can join
+        matching_room = await registry.end(self.core_cfg, self.version, int(data["roomId"]))
+        if matching_room is None:
+            self.logger.warning(f"Matching room {data['roomId']} not found")
+            return {
+                "matchingResult": 0,
+                "matchingMemberInfoList": [],
+                "matchingMemberRoleList": [],
+                "reflectorUri": f"{self.core_cfg.server.hostname}",
+            }
+
+        members = list(matching_room.members)
 
         # only set the host user to role 1 every other to 0?
         role_list = [
-            {"role": 1} if m["userId"] == matching_room["user"] else {"role": 0}
+            {"role": 1} if int(m["userId"]) == matching_room.host else {"role": 0}
             for m in members
         ]
 
-        await self.data.item.put_matching(
-            self.version,
-            matching_room["roomId"],
-            members,
-            user_id=matching_room["user"],
-            rest_sec=0,  # make sure to always set 0
-            is_full=True,  # and full, so no one can join
-        )
-
         return {
             "matchingResult": 1,  # needs to be 1 for successful matching
             "matchingMemberInfoList": members,
@@ -583,68 +564,29 @@ class ChuniNew(ChuniBase):
         }
 
     async def handle_remove_matching_member_api_request(self, data: Dict) -> Dict:
-        # get all matching rooms, because Chuni only returns the userId
-        # not the actual roomId
-        matching_rooms = await self.data.item.get_all_matchings(self.version)
-        if matching_rooms is None:
-            return {"returnCode": "1"}
-
-        for room in matching_rooms:
-            old_members = room["matchingMemberInfoList"]
-            new_members = [m for m in old_members if m["userId"] != data["userId"]]
-
-            # if nothing changed go to the next room
-            if len(old_members) == len(new_members):
-                continue
-
-            # if the last user got removed, delete the matching room
-            if len(new_members) <= 0:
-                await self.data.item.delete_matching(self.version, room["roomId"])
-            else:
-                # remove the user from the room
-                await self.data.item.put_matching(
-                    self.version,
-                    room["roomId"],
-                    new_members,
-                    user_id=room["user"],
-                    rest_sec=room["restMSec"],
-                )
-
+        # Chuni only sends the userId, not the roomId, the registry knows which
+        # room the user is in and deletes it if the last user got removed
+        await registry.remove(self.core_cfg, self.version, data["userId"])
         return {"returnCode": "1"}
 
     async def handle_get_matching_state_api_request(self, data: Dict) -> Dict:
         polling_interval = 1
-        # get the current active room
-        matching_room = await self.data.item.get_matching(self.version, data["roomId"])
-        members = matching_room["matchingMemberInfoList"]
-        rest_sec = matching_room["restMSec"]
 
-        # grab the current member
+        # grab the current member, also parse WTF-8 everytime
         current_member = data["matchingMemberInfo"]
+        current_member["userName"] = self.read_wtf8(current_member["userName"])
 
-        # only the host user can decrease the countdown
-        if matching_room["user"] == int(current_member["userId"]):
-            # cap the restMSec to 0
-            if rest_sec > 0:
-                rest_sec -= polling_interval
-            else:
-                rest_sec = 0
-
-        # update the members in order to recieve messages
-        for i, member in enumerate(members):
-            if member["userId"] == current_member["userId"]:
-                # replace the old user data with the current user data,
-                # also parse WTF-8 everytime
-                current_member["userName"] = self.read_wtf8(current_member["userName"])
-                members[i] = current_member
-
-        await self.data.item.put_matching(
-            self.version,
-            data["roomId"],
-            members,
-            rest_sec=rest_sec,
-            user_id=matching_room["user"],
+        # get the current active room, the host counts it down
+        matching_room = await registry.poll(
+            self.core_cfg, self.version, int(data["roomId"]), current_member, polling_interval
         )
+        if matching_room is None:
+            self.logger.warning(f"Matching room {data['roomId']} not found")
+            members = []
+            rest_sec = 0
+        else:
+            members = matching_room.members
+            rest_sec = matching_room.rest_sec
 
         # only add the other members to the list
         diff_members = [m for m in members if m["userId"] != current_member["userId"]]
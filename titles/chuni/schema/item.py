@@ -404,6 +404,14 @@ class ChuniItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_characters(self, user_id: int, character_list: List[Dict]) -> Optional[int]:
+        rows = [self.fix_bools({**character_data, "user": user_id}) for character_data in character_list]
+        result = await self.bulk_upsert(character, rows)
+        if result is None:
+            self.logger.error(f"put_characters: Failed to upsert {len(rows)} characters for user {user_id}")
+            return None
+        return result
+
     async def get_character(self, user_id: int, character_id: int) -> Optional[Dict]:
         sql = select(character).where(
             and_(character.c.user == user_id, character.c.characterId == character_id)
@@ -435,6 +443,14 @@ class ChuniItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_items(self, user_id: int, item_list: List[Dict]) -> Optional[int]:
+        rows = [self.fix_bools({**item_data, "user": user_id}) for item_data in item_list]
+        result = await self.bulk_upsert(item, rows)
+        if result is None:
+            self.logger.error(f"put_items: Failed to upsert {len(rows)} items for user {user_id}")
+            return None
+        return result
+
     async def get_items(self, user_id: int, kind: int = None) -> Optional[List[Row]]:
         if kind is None:
             sql = select(item).where(item.c.user == user_id)
@@ -461,6 +477,14 @@ class ChuniItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_duels(self, user_id: int, duel_list: List[Dict]) -> Optional[int]:
+        rows = [self.fix_bools({**duel_data, "user": user_id}) for duel_data in duel_list]
+        result = await self.bulk_upsert(duel, rows)
+        if result is None:
+            self.logger.error(f"put_duels: Failed to upsert {len(rows)} duels for user {user_id}")
+            return None
+        return result
+
     async def get_duels(self, user_id: int) -> Optional[List[Row]]:
         sql = select(duel).where(duel.c.user == user_id)
 
@@ -482,6 +506,14 @@ class ChuniItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_maps(self, user_id: int, map_list: List[Dict]) -> Optional[int]:
+        rows = [self.fix_bools({**map_data, "user": user_id}) for map_data in map_list]
+        result = await self.bulk_upsert(map, rows)
+        if result is None:
+            self.logger.error(f"put_maps: Failed to upsert {len(rows)} maps for user {user_id}")
+            return None
+        return result
+
     async def get_maps(self, user_id: int) -> Optional[List[Row]]:
         sql = select(map).where(map.c.user == user_id)
 
@@ -503,6 +535,14 @@ class ChuniItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_map_areas(self, user_id: int, map_area_list: List[Dict]) -> Optional[int]:
+        rows = [self.fix_bools({**map_area_data, "user": user_id}) for map_area_data in map_area_list]
+        result = await self.bulk_upsert(map_area, rows)
+        if result is None:
+            self.logger.error(f"put_map_areas: Failed to upsert {len(rows)} map areas for user {user_id}")
+            return None
+        return result
+
     async def get_map_areas(self, user_id: int) -> Optional[List[Row]]:
         sql = select(map_area).where(map_area.c.user == user_id)
 
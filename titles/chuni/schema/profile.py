@@ -7,6 +7,7 @@ from sqlalchemy.sql import select, delete
 from sqlalchemy.dialects.mysql import insert
 
 from core.data.schema import BaseData, metadata
+from core.data import cached, invalidate
 
 profile = Table(
     "chuni_profile_data",
@@ -419,6 +420,7 @@ class ChuniProfileData(BaseData):
             userName=new_name
         )
         result = await self.execute(sql)
+        invalidate(f"user:{user_id}")
 
         if result is None:
             self.logger.warning(f"Failed to set user {user_id} name to {new_name}")
@@ -438,6 +440,7 @@ class ChuniProfileData(BaseData):
         sql = insert(profile).values(**profile_data)
         conflict = sql.on_duplicate_key_update(**profile_data)
         result = await self.execute(conflict)
+        invalidate(f"user:{aime_id}")
 
         if result is None:
             self.logger.warning(f"put_profile_data: Failed to update! aime_id: {aime_id}")
@@ -456,6 +459,7 @@ class ChuniProfileData(BaseData):
             return None
         return result.fetchone()
 
+    @cached(lifetime=60, tags=["user:{aime_id}"])
     async def get_profile_data(self, aime_id: int, version: int) -> Optional[Row]:
         sql = select(profile).where(
             and_(
@@ -588,6 +592,20 @@ class ChuniProfileData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_profile_activities(self, aime_id: int, activity_list: List[Dict]) -> Optional[int]:
+        rows = []
+        for activity_data in activity_list:
+            row = {k: v for k, v in activity_data.items() if k != "id"}
+            row["user"] = aime_id
+            row["activityId"] = activity_data["id"]
+            rows.append(row)
+
+        result = await self.bulk_upsert(activity, rows)
+        if result is None:
+            self.logger.error(f"put_profile_activities: Failed to upsert {len(rows)} activities for user {aime_id}")
+            return None
+        return result
+
     async def get_profile_activity(self, aime_id: int, kind: int) -> Optional[List[Row]]:
         sql = (
             select(activity)
@@ -614,6 +632,14 @@ class ChuniProfileData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_profile_charges(self, aime_id: int, charge_list: List[Dict]) -> Optional[int]:
+        rows = [{**charge_data, "user": aime_id} for charge_data in charge_list]
+        result = await self.bulk_upsert(charge, rows)
+        if result is None:
+            self.logger.error(f"put_profile_charges: Failed to upsert {len(rows)} charges for user {aime_id}")
+            return None
+        return result
+
     async def get_profile_charge(self, aime_id: int) -> Optional[List[Row]]:
         sql = select(charge).where(charge.c.user == aime_id)
 
@@ -660,6 +686,14 @@ class ChuniProfileData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_profile_overpowers(self, aime_id: int, overpower_list: List[Dict]) -> Optional[int]:
+        rows = [{**overpower_data, "user": aime_id} for overpower_data in overpower_list]
+        result = await self.bulk_upsert(overpower, rows)
+        if result is None:
+            self.logger.error(f"put_profile_overpowers: Failed to upsert {len(rows)} overpowers for user {aime_id}")
+            return None
+        return result
+
     async def get_profile_overpower(self, aime_id: int) -> Optional[List[Row]]:
         sql = select(overpower).where(overpower.c.user == aime_id)
 
@@ -1,13 +1,14 @@
-from typing import Dict, List, Optional
-from sqlalchemy import Table, Column, UniqueConstraint, PrimaryKeyConstraint, and_
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Table, Column, UniqueConstraint, PrimaryKeyConstraint, Index, and_
 from sqlalchemy.types import Integer, String, TIMESTAMP, Boolean, JSON, BigInteger
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.schema import ForeignKey
 from sqlalchemy.engine import Row
-from sqlalchemy.sql import func, select
+from sqlalchemy.sql import func, select, literal
 from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.sql.expression import exists
 from core.data.schema import BaseData, metadata
+from core.data import cached, invalidate
 
 course = Table(
     "chuni_score_course",
@@ -140,8 +141,41 @@ playlog = Table(
     mysql_charset="utf8mb4"
 )
 
+# Play count per song per version, kept up to date by put_playlog for GetGameRankingApi
+ranking = Table(
+    "chuni_score_ranking",
+    metadata,
+    Column("id", Integer, primary_key=True, nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("musicId", Integer, nullable=False),
+    Column("playCount", Integer, nullable=False, server_default="0"),
+    UniqueConstraint("version", "musicId", name="chuni_score_ranking_uk"),
+    Index("chuni_score_ranking_count_idx", "version", "playCount"),
+    mysql_charset="utf8mb4",
+)
+
 
 class ChuniScoreData(BaseData):
+    # ROM versions whose playlogs count towards each version's rankings, used to rebuild the ranking table.
+    # This prevents tracks that are not accessible in your version from counting towards the results
+    RANKING_ROM_VERSIONS = {
+        14: "2.15%",
+        13: "2.10%",
+        12: "2.05%",
+        11: "2.00%",
+        10: "1.50%",
+        9: "1.45%",
+        8: "1.40%",
+        7: "1.35%",
+        6: "1.30%",
+        5: "1.25%",
+        4: "1.20%",
+        3: "1.15%",
+        2: "1.10%",
+        1: "1.05%",
+        0: "1.00%"
+    }
+
     async def get_courses(self, aime_id: int) -> Optional[Row]:
         sql = select(course).where(course.c.user == aime_id)
 
@@ -162,6 +196,15 @@ class ChuniScoreData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_courses(self, aime_id: int, course_list: List[Dict]) -> Optional[int]:
+        rows = [self.fix_bools({**course_data, "user": aime_id}) for course_data in course_list]
+        result = await self.bulk_upsert(course, rows)
+        if result is None:
+            self.logger.error(f"put_courses: Failed to upsert {len(rows)} courses for user {aime_id}")
+            return None
+        return result
+
+    @cached(lifetime=60, tags=["user:{aime_id}"])
     async def get_scores(self, aime_id: int) -> Optional[Row]:
         sql = select(best_score).where(best_score.c.user == aime_id)
 
@@ -178,10 +221,19 @@ class ChuniScoreData(BaseData):
         conflict = sql.on_duplicate_key_update(**score_data)
 
         result = await self.execute(conflict)
+        invalidate(f"user:{aime_id}")
         if result is None:
             return None
         return result.lastrowid
 
+    async def put_scores(self, aime_id: int, score_list: List[Dict]) -> Optional[int]:
+        rows = [self.fix_bools({**score_data, "user": aime_id}) for score_data in score_list]
+        result = await self.bulk_upsert(best_score, rows)
+        if result is None:
+            self.logger.error(f"put_scores: Failed to upsert {len(rows)} scores for user {aime_id}")
+        invalidate(f"user:{aime_id}")
+        return result
+
     async def get_playlogs(self, aime_id: int) -> Optional[Row]:
         sql = select(playlog).where(playlog.c.user == aime_id)
 
@@ -236,28 +288,18 @@ class ChuniScoreData(BaseData):
         result = await self.execute(conflict)
         if result is None:
             return None
+
+        if playlog_data.get("musicId") is not None:
+            await self.put_ranking_play(version, playlog_data["musicId"], playlog_data.get("level"))
         return result.lastrowid
 
-    async def get_rankings(self, version: int) -> Optional[List[Dict]]:
-        # Calculates the ROM version that should be fetched for rankings, based on the game version being retrieved
-        # This prevents tracks that are not accessible in your version from counting towards the 10 results
-        romVer = {
-            13: "2.10%",
-            12: "2.05%",
-            11: "2.00%",
-            10: "1.50%",
-            9: "1.45%",
-            8: "1.40%",
-            7: "1.35%",
-            6: "1.30%",
-            5: "1.25%",
-            4: "1.20%",
-            3: "1.15%",
-            2: "1.10%",
-            1: "1.05%",
-            0: "1.00%"
-        }
-        sql = select([playlog.c.musicId.label('id'), func.count(playlog.c.musicId).label('point')]).where((playlog.c.level != 4) & (playlog.c.romVersion.like(romVer.get(version, "%")))).group_by(playlog.c.musicId).order_by(func.count(playlog.c.musicId).desc()).limit(10)
+    async def get_rankings(self, version: int, count: int = 10) -> Optional[List[Dict]]:
+        """
+        Returns the count most played songs of a version, World's End charts not included
+        """
+        sql = select(
+            ranking.c.musicId.label("id"), ranking.c.playCount.label("point")
+        ).where(ranking.c.version == version).order_by(ranking.c.playCount.desc()).limit(count)
         result = await self.execute(sql)
 
         if result is None:
@@ -266,8 +308,60 @@ class ChuniScoreData(BaseData):
         rows = result.fetchall()
         return [dict(row) for row in rows]
 
-    async def get_rival_music(self, rival_id: int) -> Optional[List[Dict]]:
-        sql = select(best_score).where(best_score.c.user == rival_id)
+    async def put_ranking_play(self, version: int, music_id: int, level: Any = None) -> None:
+        """
+        Counts a play of music_id, World's End charts (level 4) and unknown levels aren't ranked
+        """
+        # the game sends the level as a string
+        try:
+            level = int(level)
+        except (TypeError, ValueError):
+            self.logger.debug(f"Not ranking play of song {music_id} with level {level}")
+            return
+
+        if level == 4:
+            return
+
+        sql = insert(ranking).values(version=version, musicId=music_id, playCount=1)
+        conflict = sql.on_duplicate_key_update(playCount=ranking.c.playCount + 1)
+
+        result = await self.execute(conflict)
+        if result is None:
+            self.logger.warning(f"Failed to count play of song {music_id} for v{version} rankings")
+
+    async def rebuild_rankings(self) -> None:
+        """
+        Recounts every version's rankings from the playlog table
+        """
+        for version, rom_ver in self.RANKING_ROM_VERSIONS.items():
+            plays = select(
+                literal(version), playlog.c.musicId, func.count(playlog.c.id)
+            ).where(
+                (playlog.c.level != 4) & (playlog.c.romVersion.like(rom_ver))
+            ).group_by(playlog.c.musicId)
+
+            async with self.transaction():
+                await self.execute(ranking.delete(ranking.c.version == version))
+                result = await self.execute(
+                    insert(ranking).from_select(["version", "musicId", "playCount"], plays)
+                )
+
+            if result is None:
+                self.logger.error(f"Failed to rebuild v{version} rankings")
+                continue
+            self.logger.info(f"Rebuilt v{version} rankings, {result.rowcount} songs")
+
+    async def get_rival_music(self, rival_id: int) -> Optional[List[Row]]:
+        """
+        Returns the scoreMax and scoreRank of each (musicId, level) a rival has played, ordered by musicId then level.
+        Best scores are unique per (user, musicId, level), so both come from the same row without aggregating.
+        """
+        sql = select(
+            best_score.c.musicId,
+            best_score.c.level,
+            best_score.c.scoreMax,
+            best_score.c.scoreRank,
+        ).where(best_score.c.user == rival_id).order_by(best_score.c.musicId, best_score.c.level)
 
         result = await self.execute(sql)
         if result is None:
@@ -437,6 +437,30 @@ class ChuniStaticData(BaseData):
             return None
         return result.fetchall()
 
+    async def get_all_music(self) -> Optional[List[Row]]:
+        sql = select(music).order_by(music.c.id)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
+    async def get_all_charges(self) -> Optional[List[Row]]:
+        sql = select(charge).order_by(charge.c.id)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
+    async def get_all_events(self) -> Optional[List[Row]]:
+        sql = select(events).order_by(events.c.id)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_music_chart(
         self, version: int, song_id: int, chart_id: int
     ) -> Optional[List[Row]]:
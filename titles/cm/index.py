@@ -1,5 +1,4 @@
 import json
-import inflection
 import yaml
 import string
 import logging
@@ -14,7 +13,7 @@ from logging.handlers import TimedRotatingFileHandler
 
 from core.config import CoreConfig
 from core.utils import Utils
-from core.title import BaseServlet
+from core.title import BaseServlet, HandlerTable, VersionTable
 from .config import CardMakerConfig
 from .const import CardMakerConstants
 from .base import CardMakerBase
@@ -28,11 +27,19 @@ class CardMakerServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{CardMakerConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{CardMakerConstants.CONFIG_NAME}")
 
         self.versions = [
             CardMakerBase(core_cfg, self.game_cfg),
             CardMaker135(core_cfg, self.game_cfg)
         ]
+        self.handlers = [HandlerTable(ver) for ver in self.versions]
+
+        self.version_table = VersionTable([
+            (130, CardMakerConstants.VER_CARD_MAKER),
+            (135, CardMakerConstants.VER_CARD_MAKER_135),
+            (140, CardMakerConstants.VER_CARD_MAKER),
+        ], CardMakerConstants.VER_CARD_MAKER)
 
         self.logger = logging.getLogger("cardmaker")
         log_fmt_str = "[%(asctime)s] Card Maker | %(levelname)s | %(message)s"
@@ -81,15 +88,10 @@ class CardMakerServlet(BaseServlet):
         version: int = request.path_params.get('version')
         endpoint: str = request.path_params.get('endpoint')
         req_raw = await request.body()
-        internal_ver = 0
+        internal_ver = self.version_table.get(version)
         client_ip = Utils.get_ip_addr(request)
 
-        if version >= 130 and version < 135:  # Card Maker
-            internal_ver = CardMakerConstants.VER_CARD_MAKER
-        elif version >= 135 and version < 140:  # Card Maker 1.35
-            internal_ver = CardMakerConstants.VER_CARD_MAKER_135
-
-        if all(c in string.hexdigits for c in endpoint) and len(endpoint) == 32:
+        if len(endpoint) == 32 and all(c in string.hexdigits for c in endpoint):
             # If we get a 32 character long hex string, it's a hash and we're
             # doing encrypted. The likelyhood of false positives is low but
             # technically not 0
@@ -109,14 +111,13 @@ class CardMakerServlet(BaseServlet):
         self.logger.info(f"v{version} {endpoint} request from {client_ip}")
         self.logger.debug(req_data)
 
-        func_to_find = "handle_" + inflection.underscore(endpoint) + "_request"
+        handler = self.handlers[internal_ver].get(endpoint)
 
-        if not hasattr(self.versions[internal_ver], func_to_find):
+        if handler is None:
             self.logger.warning(f"Unhandled v{version} request {endpoint}")
             return Response(zlib.compress(b'{"returnCode": 1}'))
 
         try:
-            handler = getattr(self.versions[internal_ver], func_to_find)
             resp = await handler(req_data)
 
         except Exception as e:
@@ -2,7 +2,7 @@ import logging
 import json
 from decimal import Decimal
 from base64 import b64encode
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from os import path
 
 from core.config import CoreConfig
@@ -10,7 +10,62 @@ from .config import CxbConfig
 from .const import CxbConstants
 from .database import CxbData
 
-from threading import Thread
+# Contents of the csv files in titles/cxb/data, read once per process
+# (file, encoding) -> lines
+csv_files: Dict[Tuple[str, Optional[str]], List[str]] = {}
+# (kind, file, encoding) -> response data built from the file
+csv_blocks: Dict[Tuple[str, str, Optional[str]], str] = {}
+
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def encode_entry(value: Any) -> str:
+    """
+    Encodes a loadrange entry, compact json in base64
+    """
+    return b64encode(_json_encoder.encode(value).encode("utf-8")).decode("utf-8")
+
+
+def _static_entries() -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Builds the coupon, shop list and story entries every loadrange response carries,
+    they never change so they're encoded once when the module is loaded
+    """
+    index = []
+    values = []
+
+    # Coupons
+    for i in range(500, 510):
+        index.append(str(i))
+        values.append({"couponId": str(i - 500), "couponNum": "1", "couponLog": []})
+
+    # ShopList_Title and ShopList_Icon
+    for i in list(range(200000, 201451)) + list(range(202000, 202264)):
+        index.append(str(i))
+        values.append(
+            {
+                "shopId": i - 200000,
+                "shopState": "2",
+                "isDisable": "t",
+                "isDeleted": "f",
+                "isSpecialFlag": "f",
+            }
+        )
+
+    # Stories
+    for i in range(900000, 900003):
+        index.append(str(i))
+        story = {"storyId": i - 900000}
+        for n in range(1, 17):
+            story[f"unlockState{n}"] = ["t"] * 10
+        values.append(story)
+
+    return tuple(index), tuple(encode_entry(x) for x in values)
+
+
+STATIC_INDEX, STATIC_DATA = _static_entries()
+DEFAULT_CR = ["0", "0", "0", "0", "0"]
+
 
 class CxbBase:
     def __init__(self, cfg: CoreConfig, game_cfg: CxbConfig) -> None:
@@ -21,12 +76,60 @@ class CxbBase:
         self.logger = logging.getLogger("cxb")
         self.version = CxbConstants.VER_CROSSBEATS_REV
 
+    def _get_csv_lines(self, file: str, encoding: str = None) -> List[str]:
+        """
+        Returns the lines of titles/cxb/data/{file}, reading it only the first time
+        """
+        lines = csv_files.get((file, encoding))
+        if lines is not None:
+            return lines
+
+        if not path.exists(f"titles/cxb/data/{file}"):
+            self.logger.warning(f"Failed to find csv file titles/cxb/data/{file}")
+            return []
+
+        with open(f"titles/cxb/data/{file}", encoding=encoding) as f:
+            lines = f.readlines()
+
+        csv_files[(file, encoding)] = lines
+        return lines
+
+    def _get_csv_block(self, file: str, encoding: str = None) -> str:
+        """
+        Returns the lines of a csv file terminated by \r\n, the format of most data responses
+        """
+        key = ("block", file, encoding)
+        block = csv_blocks.get(key)
+        if block is None:
+            block = "".join(f"{line[:-1]}\r\n" for line in self._get_csv_lines(file, encoding))
+            csv_blocks[key] = block
+        return block
+
+    def _get_music_list(self, file: str) -> str:
+        """
+        Returns the first 15 columns of every song in a MusicArchiveList csv file
+        """
+        key = ("music", file, None)
+        block = csv_blocks.get(key)
+        if block is None:
+            block = "".join(
+                ",".join(line.split(",")[:15]) + ",\r\n" for line in self._get_csv_lines(file)
+            )
+            csv_blocks[key] = block
+        return block
+
+    def _get_random_music_list(self, file: str) -> str:
+        key = ("random", file, None)
+        block = csv_blocks.get(key)
+        if block is None:
+            block = "".join(
+                f"0,{line.split(',')[0]},{line.split(',')[0]},\r\n" for line in self._get_csv_lines(file)
+            )
+            csv_blocks[key] = block
+        return block
+
     def _get_data_contents(self, folder: str, filetype: str, encoding: str = None, subfolder: str = "") -> List[str]:
-        if path.exists(f"titles/cxb/data/{folder}/{subfolder}{filetype}.csv"):
-            with open(f"titles/cxb/data/{folder}/{subfolder}{filetype}.csv", encoding=encoding) as f:
-                return f.readlines()
-        
-        return []
+        return self._get_csv_lines(f"{folder}/{subfolder}{filetype}.csv", encoding)
 
     async def handle_action_rpreq_request(self, data: Dict) -> Dict:
         return {}
@@ -61,142 +164,32 @@ class CxbBase:
         self.logger.warning(f"User {data['login']['authid']} does not have a profile")
         return {}
 
-    def task_generateCoupon(index, data1):
-        # Coupons
-        for i in range(500, 510):
-            index.append(str(i))
-            couponid = int(i) - 500
-            dataValue = [
-                {
-                    "couponId": str(couponid),
-                    "couponNum": "1",
-                    "couponLog": [],
-                }
-            ]
-            data1.append(
-                b64encode(
-                    bytes(json.dumps(dataValue[0], separators=(",", ":")), "utf-8")
-                ).decode("utf-8")
-            )
-
-    def task_generateShopListTitle(index, data1):
-        # ShopList_Title
-        for i in range(200000, 201451):
-            index.append(str(i))
-            shopid = int(i) - 200000
-            dataValue = [
-                {
-                    "shopId": shopid,
-                    "shopState": "2",
-                    "isDisable": "t",
-                    "isDeleted": "f",
-                    "isSpecialFlag": "f",
-                }
-            ]
-            data1.append(
-                b64encode(
-                    bytes(json.dumps(dataValue[0], separators=(",", ":")), "utf-8")
-                ).decode("utf-8")
-            )
-
-    def task_generateShopListIcon(index, data1):
-        # ShopList_Icon
-        for i in range(202000, 202264):
-            index.append(str(i))
-            shopid = int(i) - 200000
-            dataValue = [
-                {
-                    "shopId": shopid,
-                    "shopState": "2",
-                    "isDisable": "t",
-                    "isDeleted": "f",
-                    "isSpecialFlag": "f",
-                }
-            ]
-            data1.append(
-                b64encode(
-                    bytes(json.dumps(dataValue[0], separators=(",", ":")), "utf-8")
-                ).decode("utf-8")
-            )
-
-    def task_generateStories(index, data1):
-        # Stories
-        for i in range(900000, 900003):
-            index.append(str(i))
-            storyid = int(i) - 900000
-            dataValue = [
-                {
-                    "storyId": storyid,
-                    "unlockState1": ["t"] * 10,
-                    "unlockState2": ["t"] * 10,
-                    "unlockState3": ["t"] * 10,
-                    "unlockState4": ["t"] * 10,
-                    "unlockState5": ["t"] * 10,
-                    "unlockState6": ["t"] * 10,
-                    "unlockState7": ["t"] * 10,
-                    "unlockState8": ["t"] * 10,
-                    "unlockState9": ["t"] * 10,
-                    "unlockState10": ["t"] * 10,
-                    "unlockState11": ["t"] * 10,
-                    "unlockState12": ["t"] * 10,
-                    "unlockState13": ["t"] * 10,
-                    "unlockState14": ["t"] * 10,
-                    "unlockState15": ["t"] * 10,
-                    "unlockState16": ["t"] * 10,
-                }
-            ]
-            data1.append(
-                b64encode(
-                    bytes(json.dumps(dataValue[0], separators=(",", ":")), "utf-8")
-                ).decode("utf-8")
-            )
-
-    def task_generateScoreData(song, index, data1):
-        song_data = song["data"]
-        songCode = []
-
-        songCode.append(
-            {
-                "mcode": song_data["mcode"],
-                "musicState": song_data["musicState"],
-                "playCount": song_data["playCount"],
-                "totalScore": song_data["totalScore"],
-                "highScore": song_data["highScore"],
-                "everHighScore": song_data["everHighScore"]
-                if "everHighScore" in song_data
-                else ["0", "0", "0", "0", "0"],
-                "clearRate": song_data["clearRate"],
-                "rankPoint": song_data["rankPoint"],
-                "normalCR": song_data["normalCR"]
-                if "normalCR" in song_data
-                else ["0", "0", "0", "0", "0"],
-                "survivalCR": song_data["survivalCR"]
-                if "survivalCR" in song_data
-                else ["0", "0", "0", "0", "0"],
-                "ultimateCR": song_data["ultimateCR"]
-                if "ultimateCR" in song_data
-                else ["0", "0", "0", "0", "0"],
-                "nohopeCR": song_data["nohopeCR"]
-                if "nohopeCR" in song_data
-                else ["0", "0", "0", "0", "0"],
-                "combo": song_data["combo"],
-                "coupleUserId": song_data["coupleUserId"],
-                "difficulty": song_data["difficulty"],
-                "isFullCombo": song_data["isFullCombo"],
-                "clearGaugeType": song_data["clearGaugeType"],
-                "fieldType": song_data["fieldType"],
-                "gameType": song_data["gameType"],
-                "grade": song_data["grade"],
-                "unlockState": song_data["unlockState"],
-                "extraState": song_data["extraState"],
-            }
-        )
-        index.append(song_data["index"])
-        data1.append(
-            b64encode(
-                bytes(json.dumps(songCode[0], separators=(",", ":")), "utf-8")
-            ).decode("utf-8")
-        )
+    @staticmethod
+    def _score_entry(song_data: Dict) -> Dict:
+        return {
+            "mcode": song_data["mcode"],
+            "musicState": song_data["musicState"],
+            "playCount": song_data["playCount"],
+            "totalScore": song_data["totalScore"],
+            "highScore": song_data["highScore"],
+            "everHighScore": song_data.get("everHighScore", DEFAULT_CR),
+            "clearRate": song_data["clearRate"],
+            "rankPoint": song_data["rankPoint"],
+            "normalCR": song_data.get("normalCR", DEFAULT_CR),
+            "survivalCR": song_data.get("survivalCR", DEFAULT_CR),
+            "ultimateCR": song_data.get("ultimateCR", DEFAULT_CR),
+            "nohopeCR": song_data.get("nohopeCR", DEFAULT_CR),
+            "combo": song_data["combo"],
+            "coupleUserId": song_data["coupleUserId"],
+            "difficulty": song_data["difficulty"],
+            "isFullCombo": song_data["isFullCombo"],
+            "clearGaugeType": song_data["clearGaugeType"],
+            "fieldType": song_data["fieldType"],
+            "gameType": song_data["gameType"],
+            "grade": song_data["grade"],
+            "unlockState": song_data["unlockState"],
+            "extraState": song_data["extraState"],
+        }
 
     async def handle_action_loadrange_request(self, data: Dict) -> Dict:
         range_start = data["loadrange"]["range"][0]
@@ -233,11 +226,7 @@ class CxbBase:
                 continue
             else:
                 index.append(profile_index[3])
-                data1.append(
-                    b64encode(
-                        bytes(json.dumps(profile_data, separators=(",", ":")), "utf-8")
-                    ).decode("utf-8")
-                )
+                data1.append(encode_entry(profile_data))
 
         """
         100000 = Songs
@@ -251,25 +240,13 @@ class CxbBase:
         900000 = Stories
         """
 
-        # Async threads to generate the response
-        thread_Coupon = Thread(target=CxbBase.task_generateCoupon(index, data1))
-        thread_ShopListTitle = Thread(target=CxbBase.task_generateShopListTitle(index, data1))
-        thread_ShopListIcon = Thread(target=CxbBase.task_generateShopListIcon(index, data1))
-        thread_Stories = Thread(target=CxbBase.task_generateStories(index, data1))
-
-        thread_Coupon.start()
-        thread_ShopListTitle.start()
-        thread_ShopListIcon.start()
-        thread_Stories.start()
-
-        thread_Coupon.join()
-        thread_ShopListTitle.join()
-        thread_ShopListIcon.join()
-        thread_Stories.join()
-
-        for song in songs:
-            thread_ScoreData = Thread(target=CxbBase.task_generateScoreData(song, index, data1))
-            thread_ScoreData.start()
+        # Coupons, shop lists and stories are force unlocked, they're encoded once at startup
+        index.extend(STATIC_INDEX)
+        data1.extend(STATIC_DATA)
+
+        song_data = [song["data"] for song in songs or []]
+        index.extend([x["index"] for x in song_data])
+        data1.extend([encode_entry(self._score_entry(x)) for x in song_data])
 
         v_profile = await self.data.profile.get_profile_index(0, uid, self.version)
         v_profile_data = v_profile["data"]
@@ -32,6 +32,7 @@ class CxbServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{CxbConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{CxbConstants.CONFIG_NAME}")
 
         self.logger = logging.getLogger("cxb")
         if not hasattr(self.logger, "inited"):
@@ -6,7 +6,7 @@ from hashlib import md5
 from datetime import datetime
 
 from core.config import CoreConfig
-from core.data import Data, cached
+from core.data import Data
 from .config import CxbConfig
 from .base import CxbBase
 from .const import CxbConstants
@@ -20,67 +20,32 @@ class CxbRevSunriseS1(CxbBase):
     async def handle_data_path_list_request(self, data: Dict) -> Dict:
         return {"data": ""}
 
-    @cached(lifetime=86400)
     async def handle_data_music_list_request(self, data: Dict) -> Dict:
-        ret_str = ""
-        with open(r"titles/cxb/data/rss1/MusicArchiveList.csv") as music:
-            lines = music.readlines()
-            for line in lines:
-                line_split = line.split(",")
-                ret_str += f"{line_split[0]},{line_split[1]},{line_split[2]},{line_split[3]},{line_split[4]},{line_split[5]},{line_split[6]},{line_split[7]},{line_split[8]},{line_split[9]},{line_split[10]},{line_split[11]},{line_split[12]},{line_split[13]},{line_split[14]},\r\n"
-
-        return {"data": ret_str}
+        return {"data": self._get_music_list("rss1/MusicArchiveList.csv")}
 
-    @cached(lifetime=86400)
     async def handle_data_item_list_detail_request(self, data: Dict) -> Dict:
         # ItemListIcon load
         ret_str = "#ItemListIcon\r\n"
-        with open(
-            r"titles/cxb/data/rss1/Item/ItemList_Icon.csv", encoding="shift-jis"
-        ) as item:
-            lines = item.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
+        ret_str += self._get_csv_block("rss1/Item/ItemList_Icon.csv", "shift-jis")
 
         # ItemListTitle load
         ret_str += "\r\n#ItemListTitle\r\n"
-        with open(
-            r"titles/cxb/data/rss1/Item/ItemList_Title.csv", encoding="shift-jis"
-        ) as item:
-            lines = item.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
+        ret_str += self._get_csv_block("rss1/Item/ItemList_Title.csv", "shift-jis")
 
         return {"data": ret_str}
 
-    @cached(lifetime=86400)
     async def handle_data_shop_list_detail_request(self, data: Dict) -> Dict:
         # ShopListIcon load
         ret_str = "#ShopListIcon\r\n"
-        with open(
-            r"titles/cxb/data/rss1/Shop/ShopList_Icon.csv", encoding="utf-8"
-        ) as shop:
-            lines = shop.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
+        ret_str += self._get_csv_block("rss1/Shop/ShopList_Icon.csv", "utf-8")
 
         # ShopListMusic load
         ret_str += "\r\n#ShopListMusic\r\n"
-        with open(
-            r"titles/cxb/data/rss1/Shop/ShopList_Music.csv", encoding="utf-8"
-        ) as shop:
-            lines = shop.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
+        ret_str += self._get_csv_block("rss1/Shop/ShopList_Music.csv", "utf-8")
 
         # ShopListTitle load
         ret_str += "\r\n#ShopListTitle\r\n"
-        with open(
-            r"titles/cxb/data/rss1/Shop/ShopList_Title.csv", encoding="utf-8"
-        ) as shop:
-            lines = shop.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
+        ret_str += self._get_csv_block("rss1/Shop/ShopList_Title.csv", "utf-8")
         return {"data": ret_str}
 
     async def handle_data_extra_stage_list_request(self, data: Dict) -> Dict:
@@ -101,14 +66,8 @@ class CxbRevSunriseS1(CxbBase):
     async def handle_data_free_coupon_request(self, data: Dict) -> Dict:
         return {"data": ""}
 
-    @cached(lifetime=86400)
     async def handle_data_news_list_request(self, data: Dict) -> Dict:
-        ret_str = ""
-        with open(r"titles/cxb/data/rss1/NewsList.csv", encoding="UTF-8") as news:
-            lines = news.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
-        return {"data": ret_str}
+        return {"data": self._get_csv_block("rss1/NewsList.csv", "UTF-8")}
 
     async def handle_data_tips_request(self, data: Dict) -> Dict:
         return {"data": ""}
@@ -116,51 +75,18 @@ class CxbRevSunriseS1(CxbBase):
     async def handle_data_release_info_list_request(self, data: Dict) -> Dict:
         return {"data": ""}
 
-    @cached(lifetime=86400)
     async def handle_data_random_music_list_request(self, data: Dict) -> Dict:
-        ret_str = ""
-        with open(r"titles/cxb/data/rss1/MusicArchiveList.csv") as music:
-            lines = music.readlines()
-            count = 0
-            for line in lines:
-                line_split = line.split(",")
-                ret_str += (
-                    str(count) + "," + line_split[0] + "," + line_split[0] + ",\r\n"
-                )
-
-        return {"data": ret_str}
+        return {"data": self._get_random_music_list("rss1/MusicArchiveList.csv")}
 
-    @cached(lifetime=86400)
     async def handle_data_license_request(self, data: Dict) -> Dict:
-        ret_str = ""
-        with open(r"titles/cxb/data/rss1/License.csv", encoding="UTF-8") as licenses:
-            lines = licenses.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
-        return {"data": ret_str}
+        return {"data": self._get_csv_block("rss1/License.csv", "UTF-8")}
 
-    @cached(lifetime=86400)
     async def handle_data_course_list_request(self, data: Dict) -> Dict:
-        ret_str = ""
-        with open(
-            r"titles/cxb/data/rss1/Course/CourseList.csv", encoding="UTF-8"
-        ) as course:
-            lines = course.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
-        return {"data": ret_str}
+        return {"data": self._get_csv_block("rss1/Course/CourseList.csv", "UTF-8")}
 
-    @cached(lifetime=86400)
     async def handle_data_csxxxx_request(self, data: Dict) -> Dict:
         extra_num = int(data["dldate"]["filetype"][-4:])
-        ret_str = ""
-        with open(
-            rf"titles/cxb/data/rss1/Course/Cs{extra_num}.csv", encoding="shift-jis"
-        ) as course:
-            lines = course.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
-        return {"data": ret_str}
+        return {"data": self._get_csv_block(f"rss1/Course/Cs{extra_num}.csv", "shift-jis")}
 
     async def handle_data_mission_list_request(self, data: Dict) -> Dict:
         return {"data": ""}
@@ -189,14 +115,10 @@ class CxbRevSunriseS1(CxbBase):
         ret_str += "---\r\n"
         return {"data": ret_str}
 
-    @cached(lifetime=86400)
     async def handle_data_partnerxxxx_request(self, data: Dict) -> Dict:
         partner_num = int(data["dldate"]["filetype"][-4:])
         ret_str = f"{partner_num},,{partner_num},1,10000,\r\n"
-        with open(r"titles/cxb/data/rss1/Partner0000.csv") as partner:
-            lines = partner.readlines()
-            for line in lines:
-                ret_str += f"{line[:-1]}\r\n"
+        ret_str += self._get_csv_block("rss1/Partner0000.csv")
         return {"data": ret_str}
 
     async def handle_data_server_state_request(self, data: Dict) -> Dict:
@@ -2,12 +2,12 @@ import datetime
 from typing import Dict
 import logging
 import urllib.parse
-from threading import Thread
 
 from core.config import CoreConfig
 from titles.diva.config import DivaConfig
 from titles.diva.const import DivaConstants
 from titles.diva.database import DivaData
+from titles.diva.catalog import DivaStaticCatalog
 
 
 class DivaBase:
@@ -19,6 +19,7 @@ class DivaBase:
         self.logger = logging.getLogger("diva")
         self.game = DivaConstants.GAME_CODE
         self.version = DivaConstants.VER_PROJECT_DIVA_ARCADE_FUTURE_TONE
+        self.catalog = DivaStaticCatalog("diva", self.version)
 
         dt = datetime.datetime.now()
         self.time_lut = urllib.parse.quote(dt.strftime("%Y-%m-%d %H:%M:%S:16.0"))
@@ -88,78 +89,27 @@ class DivaBase:
 
         return encoded
 
+    async def __get_catalog(self):
+        static = await self.catalog.get(self.core_cfg, self.data)
+        if static is None:
+            self.logger.error("Failed to load the static catalog, building it from the data files")
+            static = self.catalog.build(None, None)
+        return static
+
     async def handle_pv_list_request(self, data: Dict) -> Dict:
-        pvlist = ""
-        with open(r"titles/diva/data/PvList0.dat", encoding="utf-8") as shop:
-            lines = shop.readlines()
-            for line in lines:
-                pvlist += f"{line}"
-        pvlist += ","
-
-        with open(r"titles/diva/data/PvList1.dat", encoding="utf-8") as shop:
-            lines = shop.readlines()
-            for line in lines:
-                pvlist += f"{line}"
-        pvlist += ","
-
-        with open(r"titles/diva/data/PvList2.dat", encoding="utf-8") as shop:
-            lines = shop.readlines()
-            for line in lines:
-                pvlist += f"{line}"
-        pvlist += ","
-
-        with open(r"titles/diva/data/PvList3.dat", encoding="utf-8") as shop:
-            lines = shop.readlines()
-            for line in lines:
-                pvlist += f"{line}"
-        pvlist += ","
-
-        with open(r"titles/diva/data/PvList4.dat", encoding="utf-8") as shop:
-            lines = shop.readlines()
-            for line in lines:
-                pvlist += f"{line}"
+        static = await self.__get_catalog()
 
         response = ""
         response += f"&pvl_lut={self.time_lut}"
-        response += f"&pv_lst={pvlist}"
+        response += f"&pv_lst={static.pv_list}"
 
         return response
 
     async def handle_shop_catalog_request(self, data: Dict) -> Dict:
-        catalog = ""
-
-        shopList = await self.data.static.get_enabled_shops(self.version)
-        if not shopList:
-            with open(r"titles/diva/data/ShopCatalog.dat", encoding="utf-8") as shop:
-                lines = shop.readlines()
-                for line in lines:
-                    line = urllib.parse.quote(line) + ","
-                    catalog += f"{urllib.parse.quote(line)}"
-
-        else:
-            for shop in shopList:
-                line = (
-                    str(shop["shopId"])
-                    + ","
-                    + str(shop["unknown_0"])
-                    + ","
-                    + shop["name"]
-                    + ","
-                    + str(shop["points"])
-                    + ","
-                    + shop["start_date"]
-                    + ","
-                    + shop["end_date"]
-                    + ","
-                    + str(shop["type"])
-                )
-                line = urllib.parse.quote(line) + ","
-                catalog += f"{urllib.parse.quote(line)}"
-
-        catalog = catalog.replace("+", "%20")
+        static = await self.__get_catalog()
 
         response = f"&shp_ctlg_lut={self.time_lut}"
-        response += f"&shp_ctlg={catalog[:-3]}"
+        response += f"&shp_ctlg={static.shop_catalog}"
 
         return response
 
@@ -191,40 +141,10 @@ class DivaBase:
         return response
 
     async def handle_cstmz_itm_ctlg_request(self, data: Dict) -> Dict:
-        catalog = ""
-
-        itemList = await self.data.static.get_enabled_items(self.version)
-        if not itemList:
-            with open(r"titles/diva/data/ItemCatalog.dat", encoding="utf-8") as item:
-                lines = item.readlines()
-                for line in lines:
-                    line = urllib.parse.quote(line) + ","
-                    catalog += f"{urllib.parse.quote(line)}"
-
-        else:
-            for item in itemList:
-                line = (
-                    str(item["itemId"])
-                    + ","
-                    + str(item["unknown_0"])
-                    + ","
-                    + item["name"]
-                    + ","
-                    + str(item["points"])
-                    + ","
-                    + item["start_date"]
-                    + ","
-                    + item["end_date"]
-                    + ","
-                    + str(item["type"])
-                )
-                line = urllib.parse.quote(line) + ","
-                catalog += f"{urllib.parse.quote(line)}"
-
-        catalog = catalog.replace("+", "%20")
+        static = await self.__get_catalog()
 
         response = f"&cstmz_itm_ctlg_lut={self.time_lut}"
-        response += f"&cstmz_itm_ctlg={catalog[:-3]}"
+        response += f"&cstmz_itm_ctlg={static.item_catalog}"
 
         return response
 
@@ -663,69 +583,46 @@ class DivaBase:
 
         return pv_result
 
-    async def task_generateScoreData(self, data: Dict, pd_by_pv_id, song):
-        
-        if int(song) > 0:
-            # the request do not send a edition so just perform a query best score and ranking for each edition.
-            # 0=ORIGINAL, 1=EXTRA
-            pd_db_song_0 = await self.data.score.get_best_user_score(
-                data["pd_id"], int(song), data["difficulty"], edition=0
-            )
-            pd_db_song_1 = await self.data.score.get_best_user_score(
-                data["pd_id"], int(song), data["difficulty"], edition=1
-            )
-
-            pd_db_ranking_0, pd_db_ranking_1 = None, None
-            if pd_db_song_0:
-                pd_db_ranking_0 = await self.data.score.get_global_ranking(
-                    data["pd_id"], int(song), data["difficulty"], edition=0
-                )
-
-            if pd_db_song_1:
-                pd_db_ranking_1 = await self.data.score.get_global_ranking(
-                    data["pd_id"], int(song), data["difficulty"], edition=1
-                )
-
-            pd_db_customize = await self.data.pv_customize.get_pv_customize(
-                data["pd_id"], int(song)
-            )
-
-            # generate the pv_result string with the ORIGINAL edition and the EXTRA edition appended
-            pv_result = self._get_pv_pd_result(
-                int(song), pd_db_song_0, pd_db_ranking_0, pd_db_customize, edition=0
-            )
-            pv_result += "," + self._get_pv_pd_result(
-                int(song), pd_db_song_1, pd_db_ranking_1, pd_db_customize, edition=1
-            )
-
-            self.logger.debug(f"pv_result = {pv_result}")
-            pd_by_pv_id.append(urllib.parse.quote(pv_result))
-        else:
-            pd_by_pv_id.append(urllib.parse.quote(f"{song}***"))
-        pd_by_pv_id.append(",")
-
     async def handle_get_pv_pd_request(self, data: Dict) -> Dict:
         song_id = data["pd_pv_id_lst"].split(",")
-        pv = ""
-
-        threads = []
-        pd_by_pv_id = []
+        pv_ids = list({int(song) for song in song_id if int(song) > 0})
+        difficulty = int(data["difficulty"])
 
-        for song in song_id:
-            thread_ScoreData = Thread(target=await self.task_generateScoreData(data, pd_by_pv_id, song))
-            threads.append(thread_ScoreData)
+        # fetch every song at once, the request doesn't send an edition so both
+        # the ORIGINAL (0) and EXTRA (1) editions are returned
+        scores = await self.data.score.get_best_user_scores(data["pd_id"], pv_ids, difficulty)
+        rankings = await self.data.score.get_global_rankings(data["pd_id"], pv_ids, difficulty)
+        customizes = await self.data.pv_customize.get_pv_customizes(data["pd_id"], pv_ids)
 
-        for x in threads:
-            x.start()
+        score_by_pv = {(x["pv_id"], x["edition"]): x for x in scores or []}
+        ranking_by_pv = {(x["pv_id"], x["edition"]): x for x in rankings or []}
+        customize_by_pv = {x["pv_id"]: x for x in customizes or []}
 
-        for x in threads:
-            x.join()
+        pd_by_pv_id = []
+        for song in song_id:
+            if int(song) > 0:
+                pv_id = int(song)
+                pd_db_customize = customize_by_pv.get(pv_id)
+
+                # generate the pv_result string with the ORIGINAL edition and the EXTRA edition appended
+                pv_result = ",".join(
+                    self._get_pv_pd_result(
+                        pv_id,
+                        score_by_pv.get((pv_id, edition)),
+                        ranking_by_pv.get((pv_id, edition)),
+                        pd_db_customize,
+                        edition=edition,
+                    )
+                    for edition in (0, 1)
+                )
 
-        for x in pd_by_pv_id:
-            pv += x
+                self.logger.debug(f"pv_result = {pv_result}")
+                pd_by_pv_id.append(urllib.parse.quote(pv_result))
+            else:
+                pd_by_pv_id.append(urllib.parse.quote(f"{song}***"))
 
         response = ""
-        response += f"&pd_by_pv_id={pv[:-1]}"
+        response += f"&pd_by_pv_id={','.join(pd_by_pv_id)}"
         response += "&pdddt_flg=0"
         response += f"&pdddt_tm={self.time_lut}"
 
@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.engine import Row
+from os import path
+import io
+import urllib.parse
+
+from core.data.catalog import StaticCatalog
+
+PV_LIST_FILES = [f"PvList{n}.dat" for n in range(5)]
+SHOP_CATALOG_FILE = "ShopCatalog.dat"
+ITEM_CATALOG_FILE = "ItemCatalog.dat"
+
+
+def encode_catalog(lines: List[str]) -> str:
+    """
+    Encodes shop or customize item catalog lines the way the game expects them: every
+    line is quoted twice and the trailing encoded comma is dropped
+    """
+    catalog = "".join(urllib.parse.quote(urllib.parse.quote(line) + ",") for line in lines)
+    return catalog.replace("+", "%20")[:-3]
+
+
+def catalog_line(row: Row, id_col: str) -> str:
+    return ",".join((
+        str(row[id_col]),
+        str(row["unknown_0"]),
+        row["name"],
+        str(row["points"]),
+        row["start_date"],
+        row["end_date"],
+        str(row["type"]),
+    ))
+
+
+class DivaCatalog:
+    """
+    The encoded pv_lst, shp_ctlg and cstmz_itm_ctlg values, which only depend on the
+    files in the data folder and the static shop and customize item tables
+    """
+    def __init__(self, pv_list: str, shop_catalog: str, item_catalog: str, mtimes: Dict[str, float]) -> None:
+        self.pv_list = pv_list
+        self.shop_catalog = shop_catalog
+        self.item_catalog = item_catalog
+        self.mtimes = mtimes
+
+
+class DivaStaticCatalog(StaticCatalog):
+    """
+    Builds the Diva catalogs out of the data folder and the static tables. File contents
+    are kept next to their mtime, so the files are read once at startup and again only
+    when one of them changes.
+    """
+    def __init__(self, title: str, version: int, data_dir: str = "titles/diva/data") -> None:
+        super().__init__(title)
+        self.version = version
+        self.data_dir = data_dir
+        # file name -> (mtime, contents)
+        self.files: Dict[str, Tuple[float, str]] = {}
+
+    def __mtime(self, name: str) -> float:
+        try:
+            return path.getmtime(f"{self.data_dir}/{name}")
+        except OSError:
+            return 0.0
+
+    def read_file(self, name: str) -> str:
+        mtime = self.__mtime(name)
+        cached = self.files.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(f"{self.data_dir}/{name}", encoding="utf-8") as f:
+                contents = f.read()
+        except OSError as e:
+            self.logger.error(f"Failed to read {self.data_dir}/{name}: {e}")
+            contents = ""
+
+        self.files[name] = (mtime, contents)
+        return contents
+
+    def read_lines(self, name: str) -> List[str]:
+        return io.StringIO(self.read_file(name)).readlines()
+
+    def preload(self) -> None:
+        """
+        Reads every catalog file, called once at startup
+        """
+        for name in PV_LIST_FILES + [SHOP_CATALOG_FILE, ITEM_CATALOG_FILE]:
+            self.read_file(name)
+
+    def build(self, shops: Optional[List[Row]], items: Optional[List[Row]]) -> DivaCatalog:
+        """
+        Builds the catalogs, the shop and customize item catalogs fall back to their file
+        if the table has no enabled rows
+        """
+        pv_list = ",".join(self.read_file(name) for name in PV_LIST_FILES)
+
+        if shops:
+            shop_catalog = encode_catalog([catalog_line(row, "shopId") for row in shops])
+        else:
+            shop_catalog = encode_catalog(self.read_lines(SHOP_CATALOG_FILE))
+
+        if items:
+            item_catalog = encode_catalog([catalog_line(row, "itemId") for row in items])
+        else:
+            item_catalog = encode_catalog(self.read_lines(ITEM_CATALOG_FILE))
+
+        mtimes = {name: mtime for name, (mtime, _) in self.files.items()}
+        return DivaCatalog(pv_list, shop_catalog, item_catalog, mtimes)
+
+    async def load(self, data) -> Optional[DivaCatalog]:
+        shops = await data.static.get_enabled_shops(self.version)
+        items = await data.static.get_enabled_items(self.version)
+        if shops is None or items is None:
+            return None
+
+        return self.build(shops, items)
+
+    def stale(self, contents: DivaCatalog) -> bool:
+        return any(self.__mtime(name) != mtime for name, mtime in contents.mtimes.items())
@@ -27,6 +27,7 @@ class DivaServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{DivaConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{DivaConstants.CONFIG_NAME}")
 
         self.base = DivaBase(core_cfg, self.game_cfg)
 
@@ -53,16 +54,17 @@ class DivaServlet(BaseServlet):
             level=self.game_cfg.server.loglevel, logger=self.logger, fmt=log_fmt_str
         )
 
+    def setup(self) -> None:
+        # read the pv list and catalog files once, instead of on every boot request
+        self.base.catalog.preload()
+
     def get_routes(self) -> List[Route]:
         return [
             Route("/DivaServlet/", self.render_POST, methods=['POST'])
         ]
     
     def get_allnet_info(self, game_code: str, game_ver: int, keychip: str) -> Tuple[str, str]:
-        if not self.core_cfg.server.is_using_proxy and Utils.get_title_port(self.core_cfg) != 80:
-            return (f"http://{self.core_cfg.server.hostname}:{Utils.get_title_port(self.core_cfg)}/DivaServlet/", self.core_cfg.server.hostname)
-
-        return (f"http://{self.core_cfg.server.hostname}/DivaServlet/", self.core_cfg.server.hostname)
+        return (f"{self.core_cfg.server.title_url}/DivaServlet/", self.core_cfg.server.hostname)
 
     @classmethod
     def is_game_enabled(
@@ -3,6 +3,7 @@ from sqlalchemy import Table, Column, UniqueConstraint, and_
 from sqlalchemy.types import Integer, String
 from sqlalchemy.schema import ForeignKey
 from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.engine import Row
 
 from core.data.schema import BaseData, metadata
 
@@ -84,3 +85,19 @@ class DivaPvCustomizeData(BaseData):
         if result is None:
             return None
         return result.fetchone()
+
+    async def get_pv_customizes(self, aime_id: int, pv_ids: List[int]) -> Optional[List[Row]]:
+        """
+        Returns the user's Pv Customize rows for a list of songs
+        """
+        if not pv_ids:
+            return []
+
+        sql = pv_customize.select(
+            and_(pv_customize.c.user == aime_id, pv_customize.c.pv_id.in_(pv_ids))
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
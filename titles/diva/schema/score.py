@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, UniqueConstraint, PrimaryKeyConstraint, and_
+from sqlalchemy import Table, Column, UniqueConstraint, PrimaryKeyConstraint, Index, and_
 from sqlalchemy.types import Integer, String, TIMESTAMP, JSON, Boolean
 from sqlalchemy.schema import ForeignKey
 from sqlalchemy.sql import func, select
@@ -29,6 +29,7 @@ score = Table(
     Column("worst", Integer),
     Column("max_combo", Integer),
     UniqueConstraint("user", "pv_id", "difficulty", "edition", name="diva_score_uk"),
+    Index("diva_score_chart_idx", "pv_id", "difficulty", "edition", "score"),
     mysql_charset="utf8mb4",
 )
 
@@ -232,6 +233,69 @@ class DivaScoreData(BaseData):
             return None
         return result.fetchone()
 
+    async def get_best_user_scores(
+        self, user_id: int, pv_ids: List[int], difficulty: int
+    ) -> Optional[List[Row]]:
+        """
+        Returns the user's best scores of every edition for a list of songs on one difficulty
+        """
+        if not pv_ids:
+            return []
+
+        sql = score.select(
+            and_(
+                score.c.user == user_id,
+                score.c.pv_id.in_(pv_ids),
+                score.c.difficulty == difficulty,
+            )
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
+    async def get_global_rankings(
+        self, user_id: int, pv_ids: List[int], difficulty: int
+    ) -> Optional[List[Row]]:
+        """
+        Returns the pv_id, edition and global ranking of each of the user's best scores for a
+        list of songs on one difficulty, the same ranking get_global_ranking returns for one
+        """
+        if not pv_ids:
+            return []
+
+        user_score = score.alias("user_score")
+        sql = (
+            select(
+                [user_score.c.pv_id, user_score.c.edition, func.count(score.c.id).label("ranking")]
+            )
+            .select_from(
+                user_score.join(
+                    score,
+                    and_(
+                        score.c.pv_id == user_score.c.pv_id,
+                        score.c.difficulty == user_score.c.difficulty,
+                        score.c.edition == user_score.c.edition,
+                        score.c.score >= user_score.c.score,
+                    ),
+                )
+            )
+            .where(
+                and_(
+                    user_score.c.user == user_id,
+                    user_score.c.pv_id.in_(pv_ids),
+                    user_score.c.difficulty == difficulty,
+                )
+            )
+            .group_by(user_score.c.pv_id, user_score.c.edition)
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_best_scores(self, user_id: int) -> Optional[List[Row]]:
         sql = score.select(score.c.user == user_id)
 
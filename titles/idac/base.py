@@ -4,6 +4,7 @@ from core.config import CoreConfig
 from titles.idac.config import IDACConfig
 from titles.idac.const import IDACConstants
 from titles.idac.database import IDACData
+from titles.idac.ranking import IDACTimeTrialRanks
 
 
 class IDACBase:
@@ -13,4 +14,5 @@ class IDACBase:
         self.game = IDACConstants.GAME_CODE
         self.version = IDACConstants.VER_IDAC_SEASON_1
         self.data = IDACData(core_cfg)
+        self.time_trial_ranks = IDACTimeTrialRanks(core_cfg, self.data)
         self.logger = logging.getLogger("idac")
@@ -14,6 +14,7 @@ import asyncio
 from core.config import CoreConfig
 from core.title import BaseServlet, JSONResponseNoASCII
 from core.utils import Utils
+from core.store import get_store
 from titles.idac.base import IDACBase
 from titles.idac.season2 import IDACSeason2
 from titles.idac.config import IDACConfig
@@ -28,6 +29,8 @@ class IDACServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{IDACConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{IDACConstants.CONFIG_NAME}")
+        self.store = get_store(core_cfg)
 
         self.versions = [
             IDACBase(core_cfg, self.game_cfg),
@@ -151,10 +154,10 @@ class IDACServlet(BaseServlet):
 
         resp = {"status_code": "0"}
         if url == "/regist":
-            self.queue = self.queue + 1
+            await self.store.incr("idac:matching_queue")
         elif url == "/status":
             if req_data.get("cancel_flag"):
-                self.queue = self.queue - 1
+                await self.store.incr("idac:matching_queue", -1)
                 self.logger.info(
                     f"IDAC Matching endpoint {client_ip} had quited"
                 )
@@ -162,8 +165,8 @@ class IDACServlet(BaseServlet):
             resp = {
                 "status_code": "0",
                 # Only IPv4 is supported
-                "host": self.game_config.server.matching_host,
-                "port": self.game_config.server.matching_p2p,
+                "host": self.game_cfg.server.matching_host,
+                "port": self.game_cfg.server.matching_p2p,
                 "room_name": "INDTA",
                 "state": 1,
             }
@@ -181,7 +184,7 @@ class IDACServlet(BaseServlet):
         return ret
 
     def setup(self):
-        if self.game_cfg.server.enable:
+        if self.game_cfg.server.enable and Utils.is_primary_worker():
             loop = asyncio.get_running_loop()
             asyncio.create_task(
                 loop.create_datagram_endpoint(
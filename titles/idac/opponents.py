@@ -0,0 +1,70 @@
+from array import array
+from random import sample
+from typing import Dict, Hashable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from titles.idac.database import IDACData
+
+
+class IDACOpponentSampler:
+    """
+    Draws random theory opponents from id arrays built once and refreshed every
+    RELOAD_SECONDS, instead of sorting the profile table with ORDER BY RAND() for
+    every matching request. Pools are per version for auto match and per
+    (course, powerhouse level) for power match.
+    """
+    RELOAD_SECONDS = 60
+
+    def __init__(self, data: IDACData) -> None:
+        self.data = data
+        self.logger = logging.getLogger("idac")
+        self.lock = asyncio.Lock()
+        self.pools: Dict[Hashable, Tuple[float, array]] = {}
+
+    async def __pool(self, key: Hashable, loader) -> Optional[array]:
+        pool = self.pools.get(key)
+        if pool is not None and time.monotonic() - pool[0] < self.RELOAD_SECONDS:
+            return pool[1]
+
+        async with self.lock:
+            pool = self.pools.get(key)
+            if pool is not None and time.monotonic() - pool[0] < self.RELOAD_SECONDS:
+                return pool[1]
+
+            ids = await loader()
+            if ids is None:
+                # keep using the old pool if the database is having trouble
+                return pool[1] if pool is not None else None
+
+            self.pools[key] = (time.monotonic(), array("q", ids))
+            return self.pools[key][1]
+
+    @staticmethod
+    def __sample(ids: Optional[array], exclude: int, count: int) -> List[int]:
+        if not ids:
+            return []
+
+        # draw one extra in case the requesting user is among them
+        picked = [ids[i] for i in sample(range(len(ids)), min(count + 1, len(ids)))]
+        return [x for x in picked if x != exclude][:count]
+
+    async def auto_match(self, version: int, aime_id: int, count: int) -> List[int]:
+        """
+        Returns up to count random users with a profile for version, never aime_id
+        """
+        ids = await self.__pool(
+            ("auto", version), lambda: self.data.profile.get_profile_user_ids(version)
+        )
+        return self.__sample(ids, aime_id, count)
+
+    async def power_match(self, course_id: int, powerhouse_lv: int, aime_id: int, count: int) -> List[int]:
+        """
+        Returns up to count random users with the given powerhouse level on a course, never aime_id
+        """
+        ids = await self.__pool(
+            ("power", course_id, powerhouse_lv),
+            lambda: self.data.item.get_theory_course_users(course_id, powerhouse_lv),
+        )
+        return self.__sample(ids, aime_id, count)
@@ -0,0 +1,88 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from core.config import CoreConfig
+from titles.idac.database import IDACData
+
+
+class IDACTimeTrialRanks:
+    """
+    Answers "what rank would goal_time have on course C" without loading the course's
+    whole ranking. Every course keeps a sorted list of each user's best time in memory,
+    loaded on first use and updated as new best times are saved, so a lookup is a bisect.
+    Ranks for a single car are rarer and use an indexed COUNT query instead.
+    With multiple workers other workers' new times are only seen once the course is
+    reloaded, every RELOAD_SECONDS.
+    """
+    RELOAD_SECONDS = 60
+
+    def __init__(self, core_cfg: CoreConfig, data: IDACData) -> None:
+        self.core_cfg = core_cfg
+        self.data = data
+        self.logger = logging.getLogger("idac")
+        self.lock = asyncio.Lock()
+        # (version, course_id) -> (loaded at, sorted best times, user -> best time)
+        self.courses: Dict[Tuple[int, int], Tuple[float, List[int], Dict[int, int]]] = {}
+
+    def __fresh(self, loaded_at: float) -> bool:
+        return self.core_cfg.server.workers <= 1 or time.monotonic() - loaded_at < self.RELOAD_SECONDS
+
+    async def __course(self, version: int, course_id: int) -> Optional[Tuple[float, List[int], Dict[int, int]]]:
+        key = (version, course_id)
+        course = self.courses.get(key)
+        if course is not None and self.__fresh(course[0]):
+            return course
+
+        async with self.lock:
+            course = self.courses.get(key)
+            if course is not None and self.__fresh(course[0]):
+                return course
+
+            rows = await self.data.item.get_time_trial_user_best_times(version, course_id)
+            if rows is None:
+                return None
+
+            bests = {row["user"]: row["goal_time"] for row in rows}
+            course = (time.monotonic(), sorted(bests.values()), bests)
+            self.courses[key] = course
+            self.logger.debug(f"Loaded {len(bests)} v{version} time trial times for course {course_id}")
+            return course
+
+    async def get_rank(
+        self, version: int, course_id: int, goal_time: int, style_car_id: Optional[int] = None
+    ) -> int:
+        """
+        Returns one more than the number of users with a faster best time on the course,
+        only counting times set with style_car_id if it's given
+        """
+        if style_car_id is not None:
+            rank = await self.data.item.get_time_trial_rank(version, course_id, goal_time, style_car_id)
+            return rank if rank is not None else 1
+
+        course = await self.__course(version, course_id)
+        if course is None:
+            rank = await self.data.item.get_time_trial_rank(version, course_id, goal_time)
+            return rank if rank is not None else 1
+
+        return bisect_left(course[1], goal_time) + 1
+
+    def put_best_time(self, version: int, course_id: int, user_id: int, goal_time: int) -> None:
+        """
+        Records a newly saved time trial, only changes anything if it beats the user's best
+        """
+        course = self.courses.get((version, course_id))
+        if course is None or goal_time <= 0:
+            return
+
+        _, times, bests = course
+        old = bests.get(user_id)
+        if old is not None:
+            if old <= goal_time:
+                return
+            del times[bisect_left(times, old)]
+
+        bests[user_id] = goal_time
+        insort(times, goal_time)
@@ -1,9 +1,11 @@
 from typing import Dict, Optional, List
+from random import randrange
 from sqlalchemy import (
     Table,
     Column,
     UniqueConstraint,
     PrimaryKeyConstraint,
+    Index,
     and_,
     update,
 )
@@ -142,6 +144,12 @@ trial = Table(
     UniqueConstraint(
         "user", "version", "course_id", "style_car_id", name="idac_user_time_trial_uk"
     ),
+    # per user best times on a course, overall and per car, for rank lookups
+    Index("idac_user_time_trial_course_idx", "version", "course_id", "user", "goal_time"),
+    Index(
+        "idac_user_time_trial_course_car_idx",
+        "version", "course_id", "style_car_id", "user", "goal_time",
+    ),
     mysql_charset="utf8mb4",
 )
 
@@ -311,13 +319,41 @@ class IDACItemData(BaseData):
         return result.fetchone()
 
     async def get_random_car(self, version: int) -> Optional[List[Row]]:
-        sql = select(car).where(car.c.version == version).order_by(func.rand()).limit(1)
+        # pick a random offset instead of ORDER BY RAND(), which sorts the whole table
+        result = await self.execute(
+            select(func.count()).select_from(car).where(car.c.version == version)
+        )
+        if result is None:
+            return None
+
+        total = result.scalar()
+        if not total:
+            return None
+
+        sql = (
+            select(car)
+            .where(car.c.version == version)
+            .order_by(car.c.id)
+            .offset(randrange(total))
+            .limit(1)
+        )
 
         result = await self.execute(sql)
         if result is None:
             return None
         return result.fetchone()
 
+    async def get_cars_by_users(self, aime_ids: List[int], version: int) -> Optional[List[Row]]:
+        if not aime_ids:
+            return []
+
+        sql = select(car).where(and_(car.c.user.in_(aime_ids), car.c.version == version))
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_car(
         self, aime_id: int, version: int, style_car_id: int
     ) -> Optional[List[Row]]:
@@ -573,6 +609,78 @@ class IDACItemData(BaseData):
             return None
         return result.fetchall()
 
+    async def get_time_trial_user_best_times(
+        self, version: int, course_id: int, style_car_id: Optional[int] = None
+    ) -> Optional[List[Row]]:
+        """
+        Returns every user's best goal_time (user, goal_time) on a course, optionally only with one car
+        """
+        sql = select(
+            trial.c.user, func.min(trial.c.goal_time).label("goal_time")
+        ).where(
+            and_(
+                trial.c.version == version,
+                trial.c.course_id == course_id,
+                trial.c.goal_time > 0,
+            )
+        )
+
+        if style_car_id is not None:
+            sql = sql.where(trial.c.style_car_id == style_car_id)
+
+        result = await self.execute(sql.group_by(trial.c.user))
+        if result is None:
+            return None
+        return result.fetchall()
+
+    async def get_time_trial_rank(
+        self, version: int, course_id: int, goal_time: int, style_car_id: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Returns the rank goal_time would have on a course (optionally only with one car), which is
+        one more than the number of users whose best time is faster
+        """
+        subquery = select(trial.c.user).where(
+            and_(
+                trial.c.version == version,
+                trial.c.course_id == course_id,
+                trial.c.goal_time > 0,
+            )
+        )
+
+        if style_car_id is not None:
+            subquery = subquery.where(trial.c.style_car_id == style_car_id)
+
+        subquery = (
+            subquery.group_by(trial.c.user)
+            .having(func.min(trial.c.goal_time) < goal_time)
+            .subquery()
+        )
+
+        result = await self.execute(select(func.count()).select_from(subquery))
+        if result is None:
+            return None
+        return result.scalar() + 1
+
+    async def get_time_trials_by_users(
+        self, version: int, aime_ids: List[int], course_id: int
+    ) -> Optional[List[Row]]:
+        if not aime_ids:
+            return []
+
+        sql = select(trial).where(
+            and_(
+                trial.c.version == version,
+                trial.c.user.in_(aime_ids),
+                trial.c.course_id == course_id,
+            )
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_time_trial_best_ranking_by_course(
         self, version: int, aime_id: int, course_id: int
     ) -> Optional[Row]:
@@ -666,20 +774,27 @@ class IDACItemData(BaseData):
             return None
         return result.fetchall()
 
-    async def get_theory_course_by_powerhouse_lv(
-        self, aime_id: int, course_id: int, powerhouse_lv: int, count: int = 3
-    ) -> Optional[List[Row]]:
-        sql = (
-            select(theory_course)
-            .where(
-                and_(
-                    theory_course.c.user != aime_id,
-                    theory_course.c.course_id == course_id,
-                    theory_course.c.powerhouse_lv == powerhouse_lv,
-                )
+    async def get_theory_course_users(self, course_id: int, powerhouse_lv: int) -> Optional[List[int]]:
+        sql = select(theory_course.c.user).where(
+            and_(
+                theory_course.c.course_id == course_id,
+                theory_course.c.powerhouse_lv == powerhouse_lv,
+            )
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return [row["user"] for row in result.fetchall()]
+
+    async def get_theory_courses_by_users(self, aime_ids: List[int], course_id: int) -> Optional[List[Row]]:
+        if not aime_ids:
+            return []
+
+        sql = select(theory_course).where(
+            and_(
+                theory_course.c.user.in_(aime_ids), theory_course.c.course_id == course_id
             )
-            .order_by(func.rand())
-            .limit(count)
         )
 
         result = await self.execute(sql)
@@ -730,6 +845,24 @@ class IDACItemData(BaseData):
             return None
         return result.fetchone()
 
+    async def get_theory_running_by_users(
+        self, aime_ids: List[int], course_id: int
+    ) -> Optional[List[Row]]:
+        if not aime_ids:
+            return []
+
+        sql = select(theory_running).where(
+            and_(
+                theory_running.c.user.in_(aime_ids),
+                theory_running.c.course_id == course_id,
+            )
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_vs_infos(self, aime_id: int) -> Optional[List[Row]]:
         sql = select(vs_info).where(vs_info.c.user == aime_id)
 
@@ -266,19 +266,23 @@ class IDACProfileData(BaseData):
             return None
         return result.fetchone()
 
-    async def get_different_random_profiles(
-        self, aime_id: int, version: int, count: int = 9
-    ) -> Optional[Row]:
-        sql = (
-            select(profile)
-            .where(
-                and_(
-                    profile.c.user != aime_id,
-                    profile.c.version == version,
-                )
+    async def get_profile_user_ids(self, version: int) -> Optional[List[int]]:
+        sql = select(profile.c.user).where(profile.c.version == version)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return [row["user"] for row in result.fetchall()]
+
+    async def get_profiles(self, aime_ids: List[int], version: int) -> Optional[List[Row]]:
+        if not aime_ids:
+            return []
+
+        sql = select(profile).where(
+            and_(
+                profile.c.user.in_(aime_ids),
+                profile.c.version == version,
             )
-            .order_by(func.rand())
-            .limit(count)
         )
 
         result = await self.execute(sql)
@@ -310,6 +314,33 @@ class IDACProfileData(BaseData):
             return None
         return result.fetchone()
 
+    async def get_profile_avatars(self, aime_ids: List[int]) -> Optional[List[Row]]:
+        if not aime_ids:
+            return []
+
+        sql = select(avatar).where(avatar.c.user.in_(aime_ids))
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
+    async def get_profile_ranks(self, aime_ids: List[int], version: int) -> Optional[List[Row]]:
+        if not aime_ids:
+            return []
+
+        sql = select(rank).where(
+            and_(
+                rank.c.user.in_(aime_ids),
+                rank.c.version == version,
+            )
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_profile_rank(self, aime_id: int, version: int) -> Optional[Row]:
         sql = select(rank).where(
             and_(
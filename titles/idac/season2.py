@@ -10,12 +10,14 @@ from core.utils import Utils
 from titles.idac.const import IDACConstants
 from titles.idac.config import IDACConfig
 from titles.idac.base import IDACBase
+from titles.idac.opponents import IDACOpponentSampler
 
 
 class IDACSeason2(IDACBase):
     def __init__(self, core_cfg: CoreConfig, game_cfg: IDACConfig) -> None:
         super().__init__(core_cfg, game_cfg)
         self.version = IDACConstants.VER_IDAC_SEASON_2
+        self.opponents = IDACOpponentSampler(self.data)
 
         # load the play stamps and timetrial events into memory
         self.stamp_info = []
@@ -399,7 +401,7 @@ class IDACSeason2(IDACBase):
 
                 # get the username, country and store from the profile
                 profile = await self.data.profile.get_profile(user_id, self.version)
-                arcade = await self.data.arcade.get_arcade(profile["store"])
+                arcade = await self.data.arcade.registry.get_arcade(profile["store"])
 
                 if arcade is None:
                     arcade = {}
@@ -595,7 +597,7 @@ class IDACSeason2(IDACBase):
         # get the user's profile, can never be None
         p = await self.data.profile.get_profile(user_id, self.version)
         user_data = p._asdict()
-        arcade = await self.data.arcade.get_arcade(user_data["store"])
+        arcade = await self.data.arcade.registry.get_arcade(user_data["store"])
 
         del user_data["id"]
         del user_data["user"]
@@ -978,7 +980,7 @@ class IDACSeason2(IDACBase):
 
             # get the username, country and store from the profile
             profile = await self.data.profile.get_profile(car_user_id, self.version)
-            arcade = await self.data.arcade.get_arcade(profile["store"])
+            arcade = await self.data.arcade.registry.get_arcade(profile["store"])
 
             if arcade is None:
                 arcade = {}
@@ -1016,7 +1018,7 @@ class IDACSeason2(IDACBase):
             car_user_id = rank["user"]
             # get the username, country and store from the profile
             profile = await self.data.profile.get_profile(car_user_id, self.version)
-            arcade = await self.data.arcade.get_arcade(profile["store"])
+            arcade = await self.data.arcade.registry.get_arcade(profile["store"])
 
             if arcade is None:
                 arcade = {}
@@ -1425,18 +1427,12 @@ class IDACSeason2(IDACBase):
         )
 
         goal_time = data.get("goal_time")
-        # grab the ranking data and count the numbers of rows with a faster time
-        # than the current goal_time
-        course_rank = await self.data.item.get_time_trial_ranking_by_course(
-            self.version, course_id, limit=None
+        # rank by the number of players with a faster best time than the current goal_time
+        course_rank = await self.time_trial_ranks.get_rank(
+            self.version, course_id, goal_time
         )
-        course_rank = len([r for r in course_rank if r["goal_time"] < goal_time]) + 1
-
-        car_course_rank = await self.data.item.get_time_trial_ranking_by_course(
-            self.version, course_id, style_car_id, limit=None
-        )
-        car_course_rank = (
-            len([r for r in car_course_rank if r["goal_time"] < goal_time]) + 1
+        car_course_rank = await self.time_trial_ranks.get_rank(
+            self.version, course_id, goal_time, style_car_id
         )
 
         # only update the time if its better than the best time and also not 0
@@ -1455,6 +1451,9 @@ class IDACSeason2(IDACBase):
                 # now finally save the time trial with updated timestamp
                 data["play_dt"] = datetime.now()
                 await self.data.item.put_time_trial(self.version, user_id, data)
+                self.time_trial_ranks.put_best_time(
+                    self.version, course_id, user_id, data["goal_time"]
+                )
 
         # update the timetrial event points
         await self.data.item.put_timetrial_event(
@@ -1776,11 +1775,8 @@ class IDACSeason2(IDACBase):
 
             goal_time = best_trial["goal_time"]
             # get the rank for the current course
-            course_rank = await self.data.item.get_time_trial_ranking_by_course(
-                season_id, course_id, limit=None
-            )
-            course_rank = (
-                len([r for r in course_rank if r["goal_time"] < goal_time]) + 1
+            course_rank = await self.time_trial_ranks.get_rank(
+                season_id, course_id, goal_time
             )
 
             timetrial_data.append(
@@ -1891,14 +1887,50 @@ class IDACSeason2(IDACBase):
         return {"status_code": "0", "server_status": 1}
 
     async def _generate_theory_rival_data(
-        self, user_list: list, course_id: int, req_user_id: int
+        self, user_list: list, course_id: int, req_user_id: int, count: int
     ) -> list:
+        # fetch every rival's rows with one query per table, the req_user's are used for CPUs
+        user_ids = list({user_id for user_id in user_list if user_id != -1} | {req_user_id})
+        profiles = {
+            r["user"]: r for r in await self.data.profile.get_profiles(user_ids, self.version) or []
+        }
+        ranks = {
+            r["user"]: r for r in await self.data.profile.get_profile_ranks(user_ids, self.version) or []
+        }
+        user_avatars = {
+            r["user"]: r for r in await self.data.profile.get_profile_avatars(user_ids) or []
+        }
+        courses = {
+            r["user"]: r
+            for r in await self.data.item.get_theory_courses_by_users(user_ids, course_id) or []
+        }
+        theory_runs = {
+            r["user"]: r
+            for r in await self.data.item.get_theory_running_by_users(user_ids, course_id) or []
+        }
+
+        user_cars: Dict[int, List] = {}
+        for car in await self.data.item.get_cars_by_users(user_ids, self.version) or []:
+            user_cars.setdefault(car["user"], []).append(car)
+
+        best_trials: Dict[int, Any] = {}
+        for trial in await self.data.item.get_time_trials_by_users(self.version, user_ids, course_id) or []:
+            best = best_trials.get(trial["user"])
+            if best is None or trial["goal_time"] < best["goal_time"]:
+                best_trials[trial["user"]] = trial
+
         rival_data = []
-        for user_id in user_list:
+        # rivals that can't be shown are dropped first, then CPUs fill the list up to count
+        for user_id in [x for x in user_list if x != -1] + [-1] * count:
+            if len(rival_data) >= count:
+                break
+
             # if not enough players are available just use the data from the req_user
             if user_id == -1:
-                profile = await self.data.profile.get_profile(req_user_id, self.version)
-                profile = profile._asdict()
+                if req_user_id not in profiles:
+                    break
+
+                profile = profiles[req_user_id]._asdict()
                 # set the name to CPU
                 profile["username"] = f"ＣＰＵ"
                 # also reset stamps to default
@@ -1910,9 +1942,11 @@ class IDACSeason2(IDACBase):
                 profile["stamp_key_assign_3"] = 3
                 profile["mytitle_id"] = 0
             else:
-                profile = await self.data.profile.get_profile(user_id, self.version)
+                profile = profiles.get(user_id)
+                if profile is None:
+                    continue
 
-            rank = await self.data.profile.get_profile_rank(profile["user"], self.version)
+            rank = ranks.get(profile["user"])
 
             avatars = [
                 {
@@ -1982,21 +2016,26 @@ class IDACSeason2(IDACBase):
                 avatar = choice(avatars)
                 car = await self.data.item.get_random_car(self.version)
             else:
-                avatar = await self.data.profile.get_profile_avatar(profile["user"])
-                car = await self.data.item.get_random_user_car(profile["user"], self.version)
+                avatar = user_avatars.get(profile["user"])
+                car = choice(user_cars[profile["user"]]) if profile["user"] in user_cars else None
+
+            if user_id == -1 and car is None:
+                # there are no cars to give a CPU
+                break
+
+            if avatar is None or car is None:
+                continue
 
             parts_list = []
             for part in car["parts_list"]:
                 parts_list.append(part["parts"])
 
-            course = await self.data.item.get_theory_course(profile["user"], course_id)
+            course = courses.get(profile["user"])
             powerhose_lv = 0
             if course:
                 powerhose_lv = course["powerhouse_lv"]
 
-            theory_running = await self.data.item.get_theory_running_by_course(
-                profile["user"], course_id
-            )
+            theory_running = theory_runs.get(profile["user"])
 
             # normally it's 127 after the first play so we set it to 128
             attack = 128
@@ -2013,13 +2052,11 @@ class IDACSeason2(IDACBase):
 
             # get the time trial ranking medal
             eval_id = 0
-            time_trial = await self.data.item.get_time_trial_best_ranking_by_course(
-                self.version, profile["user"], course_id
-            )
+            time_trial = best_trials.get(profile["user"])
             if time_trial:
                 eval_id = time_trial["eval_id"]
 
-            arcade = await self.data.arcade.get_arcade(profile["store"])
+            arcade = await self.data.arcade.registry.get_arcade(profile["store"])
             if arcade is None:
                 arcade = {}
                 arcade["name"] = self.core_cfg.server.name
@@ -2096,28 +2133,17 @@ class IDACSeason2(IDACBase):
         powerhose_lv = data.pop("powerhouse_lv")
 
         # get random profiles for auto match
-        profiles = await self.data.profile.get_different_random_profiles(
-            user_id, self.version, count=count_auto_match
+        user_list = await self.opponents.auto_match(
+            self.version, user_id, count_auto_match
         )
-
-        user_list = [profile["user"] for profile in profiles]
-        # if user_list is not count_auto_match long, fill it up with -1
-        while len(user_list) < count_auto_match:
-            user_list.append(-1)
-
-        auto_match = await self._generate_theory_rival_data(user_list, course_id, user_id)
+        # rivals missing from user_list are filled up with CPUs
+        auto_match = await self._generate_theory_rival_data(user_list, course_id, user_id, count_auto_match)
 
         # get profiles with the same powerhouse_lv for power match
-        theory_courses = await self.data.item.get_theory_course_by_powerhouse_lv(
-            user_id, course_id, powerhose_lv, count=count_power_match
+        user_list = await self.opponents.power_match(
+            course_id, powerhose_lv, user_id, count_power_match
         )
-        user_list = [course["user"] for course in theory_courses]
-
-        # if user_list is not count_power_match long, fill it up with -1
-        while len(user_list) < count_power_match:
-            user_list.append(-1)
-
-        power_match = await self._generate_theory_rival_data(user_list, course_id, user_id)
+        power_match = await self._generate_theory_rival_data(user_list, course_id, user_id, count_power_match)
 
         return {
             "status_code": "0",
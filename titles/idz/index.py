@@ -12,6 +12,7 @@ import asyncio
 
 from core.config import CoreConfig
 from core.title import BaseServlet
+from core.utils import Utils
 from .config import IDZConfig
 from .const import IDZConstants
 from .userdb import IDZUserDB, IDZKey
@@ -26,6 +27,7 @@ class IDZServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{IDZConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{IDZConstants.CONFIG_NAME}")
 
         self.logger = logging.getLogger("idz")
         if not hasattr(self.logger, "inited"):
@@ -136,6 +138,9 @@ class IDZServlet(BaseServlet):
             except AttributeError as e:
                 continue
         
+        if not Utils.is_primary_worker():
+            return
+
         loop = asyncio.get_running_loop()
         IDZUserDB(self.core_cfg, self.game_cfg, self.rsa_keys, handler_map).start()
         asyncio.create_task(
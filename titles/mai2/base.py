@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import logging
 from base64 import b64decode
 from os import path, stat, remove
@@ -8,6 +8,7 @@ from PIL import ImageFile
 import pytz
 from core.config import CoreConfig
 from core.utils import Utils
+from core.data import snapshots
 from .const import Mai2Constants
 from .config import Mai2Config
 from .database import Mai2Data
@@ -75,7 +76,12 @@ class Mai2Base:
         }
 
     async def handle_get_game_ranking_api_request(self, data: Dict) -> Dict:
-        return {"length": 0, "gameRankingList": []}
+        rankings = await self.data.score.get_rankings(self.version)
+        if rankings is None:
+            return {"length": 0, "gameRankingList": []}
+
+        ranking_list = [{"id": r["musicId"], "point": r["playCount"], "userName": ""} for r in rankings]
+        return {"length": len(ranking_list), "gameRankingList": ranking_list}
 
     async def handle_get_game_tournament_info_api_request(self, data: Dict) -> Dict:
         # TODO: Tournament support
@@ -214,7 +220,7 @@ class Mai2Base:
         user_id = data["userId"]
         playlog = data["userPlaylog"]
 
-        await self.data.score.put_playlog(user_id, playlog)
+        await self.data.score.put_playlog(user_id, playlog, version=self.version)
 
         return {"returnCode": 1, "apiName": "UploadUserPlaylogApi"}
 
@@ -244,140 +250,116 @@ class Mai2Base:
             self.logger.info("Guest play from place ID %d, ignoring.", place_id)
             return {"returnCode": 1, "apiName": "UpsertUserAllApi"}
 
-        if "userData" in upsert and len(upsert["userData"]) > 0:
-            upsert["userData"][0].pop("accessCode")
-            upsert["userData"][0].pop("userId")
+        snapshots.drop("mai2", int(user_id))
+        async with self.data.base.transaction():
+            if "userData" in upsert and len(upsert["userData"]) > 0:
+                upsert["userData"][0].pop("accessCode")
+                upsert["userData"][0].pop("userId")
 
-            await self.data.profile.put_profile_detail(
-                user_id, self.version, upsert["userData"][0], False
-            )
+                await self.data.profile.put_profile_detail(
+                    user_id, self.version, upsert["userData"][0], False
+                )
         
-        if "userWebOption" in upsert and len(upsert["userWebOption"]) > 0:            
-            upsert["userWebOption"][0]["isNetMember"] = True
-            await self.data.profile.put_web_option(
-                user_id, self.version, upsert["userWebOption"][0]
-            )
-
-        if "userGradeStatusList" in upsert and len(upsert["userGradeStatusList"]) > 0:
-            await self.data.profile.put_grade_status(
-                user_id, upsert["userGradeStatusList"][0]
-            )
-
-        if "userBossList" in upsert and len(upsert["userBossList"]) > 0:
-            await self.data.profile.put_boss_list(
-                user_id, upsert["userBossList"][0]
-            )
+            if "userWebOption" in upsert and len(upsert["userWebOption"]) > 0:            
+                upsert["userWebOption"][0]["isNetMember"] = True
+                await self.data.profile.put_web_option(
+                    user_id, self.version, upsert["userWebOption"][0]
+                )
 
-        if "userPlaylogList" in upsert and len(upsert["userPlaylogList"]) > 0:
-            for playlog in upsert["userPlaylogList"]:
-                await self.data.score.put_playlog(
-                    user_id, playlog, False
+            if "userGradeStatusList" in upsert and len(upsert["userGradeStatusList"]) > 0:
+                await self.data.profile.put_grade_status(
+                    user_id, upsert["userGradeStatusList"][0]
                 )
 
-        if "userExtend" in upsert and len(upsert["userExtend"]) > 0:
-            await self.data.profile.put_profile_extend(
-                user_id, self.version, upsert["userExtend"][0]
-            )
+            if "userBossList" in upsert and len(upsert["userBossList"]) > 0:
+                await self.data.profile.put_boss_list(
+                    user_id, upsert["userBossList"][0]
+                )
 
-        if "userGhost" in upsert:
-            for ghost in upsert["userGhost"]:
-                await self.data.profile.put_profile_ghost(user_id, self.version, ghost)
+            if "userPlaylogList" in upsert and len(upsert["userPlaylogList"]) > 0:
+                for playlog in upsert["userPlaylogList"]:
+                    await self.data.score.put_playlog(
+                        user_id, playlog, False, self.version
+                    )
 
-        if "userRecentRatingList" in upsert:
-            await self.data.profile.put_recent_rating(user_id, upsert["userRecentRatingList"])
+            if "userExtend" in upsert and len(upsert["userExtend"]) > 0:
+                await self.data.profile.put_profile_extend(
+                    user_id, self.version, upsert["userExtend"][0]
+                )
 
-        if "userOption" in upsert and len(upsert["userOption"]) > 0:
-            upsert["userOption"][0].pop("userId")
-            await self.data.profile.put_profile_option(
-                user_id, self.version, upsert["userOption"][0], False
-            )
+            if "userGhost" in upsert:
+                for ghost in upsert["userGhost"]:
+                    await self.data.profile.put_profile_ghost(user_id, self.version, ghost)
 
-        if "userRatingList" in upsert and len(upsert["userRatingList"]) > 0:
-            await self.data.profile.put_profile_rating(
-                user_id, self.version, upsert["userRatingList"][0]
-            )
+            if "userRecentRatingList" in upsert:
+                await self.data.profile.put_recent_rating(user_id, upsert["userRecentRatingList"])
 
-        if "userActivityList" in upsert and len(upsert["userActivityList"]) > 0:
-            for act in upsert["userActivityList"]:
-                await self.data.profile.put_profile_activity(user_id, act)
-
-        if "userChargeList" in upsert and len(upsert["userChargeList"]) > 0:
-            for charge in upsert["userChargeList"]:
-                # remove the ".0" from the date string, festival only?
-                charge["purchaseDate"] = charge["purchaseDate"].replace(".0", "")
-                await self.data.item.put_charge(
-                    user_id,
-                    charge["chargeId"],
-                    charge["stock"],
-                    charge["purchaseDate"],
-                    charge["validDate"]
+            if "userOption" in upsert and len(upsert["userOption"]) > 0:
+                upsert["userOption"][0].pop("userId")
+                await self.data.profile.put_profile_option(
+                    user_id, self.version, upsert["userOption"][0], False
                 )
 
-        if "userCharacterList" in upsert and len(upsert["userCharacterList"]) > 0:
-            for char in upsert["userCharacterList"]:
-                await self.data.item.put_character_(
-                    user_id,
-                    char
+            if "userRatingList" in upsert and len(upsert["userRatingList"]) > 0:
+                await self.data.profile.put_profile_rating(
+                    user_id, self.version, upsert["userRatingList"][0]
                 )
 
-        if "userItemList" in upsert and len(upsert["userItemList"]) > 0:
-            for item in upsert["userItemList"]:
-                await self.data.item.put_item(
-                    user_id,
-                    int(item["itemKind"]),
-                    item["itemId"],
-                    item["stock"],
-                    True
+            if "userActivityList" in upsert and len(upsert["userActivityList"]) > 0:
+                await self.data.profile.put_profile_activities(user_id, upsert["userActivityList"])
+
+            if "userChargeList" in upsert and len(upsert["userChargeList"]) > 0:
+                for charge in upsert["userChargeList"]:
+                    # remove the ".0" from the date string, festival only?
+                    charge["purchaseDate"] = charge["purchaseDate"].replace(".0", "")
+                    await self.data.item.put_charge(
+                        user_id,
+                        charge["chargeId"],
+                        charge["stock"],
+                        charge["purchaseDate"],
+                        charge["validDate"]
+                    )
+
+            if "userCharacterList" in upsert and len(upsert["userCharacterList"]) > 0:
+                await self.data.item.put_characters_(user_id, upsert["userCharacterList"])
+
+            if "userItemList" in upsert and len(upsert["userItemList"]) > 0:
+                await self.data.item.put_items(
+                    user_id, [{**item, "isValid": True} for item in upsert["userItemList"]]
                 )
 
-        if "userLoginBonusList" in upsert and len(upsert["userLoginBonusList"]) > 0:
-            for login_bonus in upsert["userLoginBonusList"]:
-                await self.data.item.put_login_bonus(
-                    user_id,
-                    login_bonus["bonusId"],
-                    login_bonus["point"],
-                    login_bonus["isCurrent"],
-                    login_bonus["isComplete"],
-                )
+            if "userLoginBonusList" in upsert and len(upsert["userLoginBonusList"]) > 0:
+                await self.data.item.put_login_bonuses(user_id, upsert["userLoginBonusList"])
 
-        if "userMapList" in upsert and len(upsert["userMapList"]) > 0:
-            for map in upsert["userMapList"]:
-                await self.data.item.put_map(
-                    user_id,
-                    map["mapId"],
-                    map["distance"],
-                    map["isLock"],
-                    map["isClear"],
-                    map["isComplete"],
-                )
+            if "userMapList" in upsert and len(upsert["userMapList"]) > 0:
+                await self.data.item.put_maps(user_id, upsert["userMapList"])
 
-        if "userMusicDetailList" in upsert and len(upsert["userMusicDetailList"]) > 0:
-            for music in upsert["userMusicDetailList"]:
-                await self.data.score.put_best_score(user_id, music, False)
-
-        if "userCourseList" in upsert and len(upsert["userCourseList"]) > 0:
-            for course in upsert["userCourseList"]:
-                await self.data.score.put_course(user_id, course)
-
-        if "userFavoriteList" in upsert and len(upsert["userFavoriteList"]) > 0:
-            for fav in upsert["userFavoriteList"]:
-                await self.data.item.put_favorite(user_id, fav["kind"], fav["itemIdList"])
-
-        if (
-            "userFriendSeasonRankingList" in upsert
-            and len(upsert["userFriendSeasonRankingList"]) > 0
-        ):
-            for fsr in upsert["userFriendSeasonRankingList"]:
-                fsr["recordDate"] = (
-                    datetime.strptime(
-                        fsr["recordDate"], f"{Mai2Constants.DATE_TIME_FORMAT}.0"
-                    ),
-                )
-                await self.data.item.put_friend_season_ranking(user_id, fsr)
+            if "userMusicDetailList" in upsert and len(upsert["userMusicDetailList"]) > 0:
+                await self.data.score.put_best_scores(user_id, upsert["userMusicDetailList"], False)
+
+            if "userCourseList" in upsert and len(upsert["userCourseList"]) > 0:
+                await self.data.score.put_courses(user_id, upsert["userCourseList"])
+
+            if "userFavoriteList" in upsert and len(upsert["userFavoriteList"]) > 0:
+                for fav in upsert["userFavoriteList"]:
+                    await self.data.item.put_favorite(user_id, fav["kind"], fav["itemIdList"])
+
+            if (
+                "userFriendSeasonRankingList" in upsert
+                and len(upsert["userFriendSeasonRankingList"]) > 0
+            ):
+                for fsr in upsert["userFriendSeasonRankingList"]:
+                    fsr["recordDate"] = (
+                        datetime.strptime(
+                            fsr["recordDate"], f"{Mai2Constants.DATE_TIME_FORMAT}.0"
+                        ),
+                    )
+                    await self.data.item.put_friend_season_ranking(user_id, fsr)
 
         return {"returnCode": 1, "apiName": "UpsertUserAllApi"}
 
     async def handle_user_logout_api_request(self, data: Dict) -> Dict:
+        snapshots.drop("mai2", int(data.get("userId", 0)))
         return {"returnCode": 1}
 
     async def handle_get_user_data_api_request(self, data: Dict) -> Dict:
@@ -761,15 +743,16 @@ class Mai2Base:
         user_id = data.get("userId", 0)        
         next_index = data.get("nextIndex", 0)
         max_ct = data.get("maxCount", 50)
-        upper_lim = next_index + max_ct
-        music_detail_list = []
 
         if user_id <= 0:
             self.logger.warning("handle_get_user_music_api_request: Could not find userid in data, or userId is 0")
             return {}
         
-        songs = await self.data.score.get_best_scores(user_id, is_dx=False)
-        if songs is None:
+        page = await snapshots.page(
+            "mai2", user_id, self.version, next_index, max_ct,
+            lambda: self.util_generate_music_list(user_id, is_dx=False),
+        )
+        if page is None:
             self.logger.debug("handle_get_user_music_api_request: get_best_scores returned None!")
             return {
             "userId": data["userId"],
@@ -777,24 +760,27 @@ class Mai2Base:
             "userMusicList": [],
         }
 
-        num_user_songs = len(songs)
+        music_detail_list, upper_lim = page
+        self.logger.info(f"Send songs {next_index}-{next_index + len(music_detail_list)} for user {user_id} (next idx {max(upper_lim, 0)})")
+        return {
+            "userId": data["userId"],
+            "nextIndex": max(upper_lim, 0),
+            "userMusicList": [{"userMusicDetailList": music_detail_list}],
+        }
 
-        for x in range(next_index, upper_lim):
-            if num_user_songs <= x:
-                break
+    async def util_generate_music_list(self, user_id: int, is_dx: bool = True) -> Optional[List[Dict]]:
+        songs = await self.data.score.get_best_scores(user_id, is_dx=is_dx)
+        if songs is None:
+            return None
 
-            tmp = songs[x]._asdict()
+        music_detail_list = []
+        for song in sorted(songs, key=lambda x: (x["musicId"], x["level"])):
+            tmp = song._asdict()
             tmp.pop("id")
             tmp.pop("user")
             music_detail_list.append(tmp)
 
-        next_index = 0 if len(music_detail_list) < max_ct or num_user_songs == upper_lim else upper_lim
-        self.logger.info(f"Send songs {next_index}-{upper_lim} ({len(music_detail_list)}) out of {num_user_songs} for user {user_id} (next idx {next_index})")
-        return {
-            "userId": data["userId"],
-            "nextIndex": next_index,
-            "userMusicList": [{"userMusicDetailList": music_detail_list}],
-        }
+        return music_detail_list
 
     async def handle_upload_user_portrait_api_request(self, data: Dict) -> Dict:
         self.logger.debug(data)
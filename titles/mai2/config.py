@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Tuple
 
 from core.config import CoreConfig
 
@@ -88,6 +88,17 @@ class Mai2CryptoConfig:
             self.__config, "mai2", "crypto", "keys", default={}
         )
 
+    @property
+    def key_bytes(self) -> Dict[int, Tuple[bytes, bytes]]:
+        """
+        keys with the key and iv already decoded from hex, for use on the request path
+        """
+        return {
+            version: (bytes.fromhex(keys[0]), bytes.fromhex(keys[1]))
+            for version, keys in self.keys.items()
+            if len(keys) >= 2
+        }
+
     @property
     def encrypted_only(self) -> bool:
         return CoreConfig.get_config_field(
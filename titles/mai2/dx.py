@@ -6,6 +6,7 @@ from random import randint
 
 from core.config import CoreConfig
 from core.utils import Utils
+from core.data import snapshots
 from titles.mai2.base import Mai2Base
 from titles.mai2.config import Mai2Config
 from titles.mai2.const import Mai2Constants
@@ -123,7 +124,7 @@ class Mai2DX(Mai2Base):
         user_id = data["userId"]
         playlog = data["userPlaylog"]
 
-        await self.data.score.put_playlog(user_id, playlog)
+        await self.data.score.put_playlog(user_id, playlog, version=self.version)
 
         return {"returnCode": 1, "apiName": "UploadUserPlaylogApi"}
 
@@ -153,120 +154,91 @@ class Mai2DX(Mai2Base):
             self.logger.info("Guest play from place ID %d, ignoring.", place_id)
             return {"returnCode": 1, "apiName": "UpsertUserAllApi"}
 
-        if "userData" in upsert and len(upsert["userData"]) > 0:
-            upsert["userData"][0]["isNetMember"] = 1
-            upsert["userData"][0].pop("accessCode")
-            await self.data.profile.put_profile_detail(
-                user_id, self.version, upsert["userData"][0]
-            )
-
-        if "userExtend" in upsert and len(upsert["userExtend"]) > 0:
-            await self.data.profile.put_profile_extend(
-                user_id, self.version, upsert["userExtend"][0]
-            )
-
-        if "userGhost" in upsert:
-            for ghost in upsert["userGhost"]:
-                await self.data.profile.put_profile_ghost(user_id, self.version, ghost)
-
-        if "userOption" in upsert and len(upsert["userOption"]) > 0:
-            await self.data.profile.put_profile_option(
-                user_id, self.version, upsert["userOption"][0]
-            )
-
-        if "userRatingList" in upsert and len(upsert["userRatingList"]) > 0:
-            await self.data.profile.put_profile_rating(
-                user_id, self.version, upsert["userRatingList"][0]
-            )
-
-        if "userActivityList" in upsert and len(upsert["userActivityList"]) > 0:
-            for k, v in upsert["userActivityList"][0].items():
-                for act in v:
-                    await self.data.profile.put_profile_activity(user_id, act)
-
-        if "userChargeList" in upsert and len(upsert["userChargeList"]) > 0:
-            for charge in upsert["userChargeList"]:
-                # remove the ".0" from the date string, festival only?
-                charge["purchaseDate"] = charge["purchaseDate"].replace(".0", "")
-                await self.data.item.put_charge(
-                    user_id,
-                    charge["chargeId"],
-                    charge["stock"],
-                    datetime.strptime(
-                        charge["purchaseDate"], Mai2Constants.DATE_TIME_FORMAT
-                    ),
-                    datetime.strptime(
-                        charge["validDate"], Mai2Constants.DATE_TIME_FORMAT
-                    ),
+        snapshots.drop("mai2", int(user_id))
+        async with self.data.base.transaction():
+            if "userData" in upsert and len(upsert["userData"]) > 0:
+                upsert["userData"][0]["isNetMember"] = 1
+                upsert["userData"][0].pop("accessCode")
+                await self.data.profile.put_profile_detail(
+                    user_id, self.version, upsert["userData"][0]
                 )
 
-        if "userCharacterList" in upsert and len(upsert["userCharacterList"]) > 0:
-            for char in upsert["userCharacterList"]:
-                await self.data.item.put_character(
-                    user_id,
-                    char["characterId"],
-                    char["level"],
-                    char["awakening"],
-                    char["useCount"],
+            if "userExtend" in upsert and len(upsert["userExtend"]) > 0:
+                await self.data.profile.put_profile_extend(
+                    user_id, self.version, upsert["userExtend"][0]
                 )
 
-        if "userItemList" in upsert and len(upsert["userItemList"]) > 0:
-            for item in upsert["userItemList"]:
-                await self.data.item.put_item(
-                    user_id,
-                    int(item["itemKind"]),
-                    item["itemId"],
-                    item["stock"],
-                    item["isValid"],
-                )
+            if "userGhost" in upsert:
+                for ghost in upsert["userGhost"]:
+                    await self.data.profile.put_profile_ghost(user_id, self.version, ghost)
 
-        if "userLoginBonusList" in upsert and len(upsert["userLoginBonusList"]) > 0:
-            for login_bonus in upsert["userLoginBonusList"]:
-                await self.data.item.put_login_bonus(
-                    user_id,
-                    login_bonus["bonusId"],
-                    login_bonus["point"],
-                    login_bonus["isCurrent"],
-                    login_bonus["isComplete"],
+            if "userOption" in upsert and len(upsert["userOption"]) > 0:
+                await self.data.profile.put_profile_option(
+                    user_id, self.version, upsert["userOption"][0]
                 )
 
-        if "userMapList" in upsert and len(upsert["userMapList"]) > 0:
-            for map in upsert["userMapList"]:
-                await self.data.item.put_map(
-                    user_id,
-                    map["mapId"],
-                    map["distance"],
-                    map["isLock"],
-                    map["isClear"],
-                    map["isComplete"],
+            if "userRatingList" in upsert and len(upsert["userRatingList"]) > 0:
+                await self.data.profile.put_profile_rating(
+                    user_id, self.version, upsert["userRatingList"][0]
                 )
 
-        if "userMusicDetailList" in upsert and len(upsert["userMusicDetailList"]) > 0:
-            for music in upsert["userMusicDetailList"]:
-                await self.data.score.put_best_score(user_id, music)
-
-        if "userCourseList" in upsert and len(upsert["userCourseList"]) > 0:
-            for course in upsert["userCourseList"]:
-                await self.data.score.put_course(user_id, course)
-
-        if "userFavoriteList" in upsert and len(upsert["userFavoriteList"]) > 0:
-            for fav in upsert["userFavoriteList"]:
-                await self.data.item.put_favorite(user_id, fav["kind"], fav["itemIdList"])
-
-        if (
-            "userFriendSeasonRankingList" in upsert
-            and len(upsert["userFriendSeasonRankingList"]) > 0
-        ):
-            for fsr in upsert["userFriendSeasonRankingList"]:
-                fsr["recordDate"] = (
-                    datetime.strptime(
-                        fsr["recordDate"], f"{Mai2Constants.DATE_TIME_FORMAT}.0"
-                    ),
+            if "userActivityList" in upsert and len(upsert["userActivityList"]) > 0:
+                await self.data.profile.put_profile_activities(
+                    user_id, [act for v in upsert["userActivityList"][0].values() for act in v]
                 )
-                await self.data.item.put_friend_season_ranking(user_id, fsr)
+
+            if "userChargeList" in upsert and len(upsert["userChargeList"]) > 0:
+                for charge in upsert["userChargeList"]:
+                    # remove the ".0" from the date string, festival only?
+                    charge["purchaseDate"] = charge["purchaseDate"].replace(".0", "")
+                    await self.data.item.put_charge(
+                        user_id,
+                        charge["chargeId"],
+                        charge["stock"],
+                        datetime.strptime(
+                            charge["purchaseDate"], Mai2Constants.DATE_TIME_FORMAT
+                        ),
+                        datetime.strptime(
+                            charge["validDate"], Mai2Constants.DATE_TIME_FORMAT
+                        ),
+                    )
+
+            if "userCharacterList" in upsert and len(upsert["userCharacterList"]) > 0:
+                await self.data.item.put_characters(user_id, upsert["userCharacterList"])
+
+            if "userItemList" in upsert and len(upsert["userItemList"]) > 0:
+                await self.data.item.put_items(user_id, upsert["userItemList"])
+
+            if "userLoginBonusList" in upsert and len(upsert["userLoginBonusList"]) > 0:
+                await self.data.item.put_login_bonuses(user_id, upsert["userLoginBonusList"])
+
+            if "userMapList" in upsert and len(upsert["userMapList"]) > 0:
+                await self.data.item.put_maps(user_id, upsert["userMapList"])
+
+            if "userMusicDetailList" in upsert and len(upsert["userMusicDetailList"]) > 0:
+                await self.data.score.put_best_scores(user_id, upsert["userMusicDetailList"])
+
+            if "userCourseList" in upsert and len(upsert["userCourseList"]) > 0:
+                await self.data.score.put_courses(user_id, upsert["userCourseList"])
+
+            if "userFavoriteList" in upsert and len(upsert["userFavoriteList"]) > 0:
+                for fav in upsert["userFavoriteList"]:
+                    await self.data.item.put_favorite(user_id, fav["kind"], fav["itemIdList"])
+
+            if (
+                "userFriendSeasonRankingList" in upsert
+                and len(upsert["userFriendSeasonRankingList"]) > 0
+            ):
+                for fsr in upsert["userFriendSeasonRankingList"]:
+                    fsr["recordDate"] = (
+                        datetime.strptime(
+                            fsr["recordDate"], f"{Mai2Constants.DATE_TIME_FORMAT}.0"
+                        ),
+                    )
+                    await self.data.item.put_friend_season_ranking(user_id, fsr)
         
-        if "user2pPlaylog" in upsert:
-            await self.data.score.put_playlog_2p(user_id, upsert["user2pPlaylog"])
+            if "user2pPlaylog" in upsert:
+                await self.data.score.put_playlog_2p(user_id, upsert["user2pPlaylog"])
 
         return {"returnCode": 1, "apiName": "UpsertUserAllApi"}
 
@@ -611,15 +583,16 @@ class Mai2DX(Mai2Base):
         user_id = data.get("userId", 0)        
         next_index = data.get("nextIndex", 0)
         max_ct = data.get("maxCount", 50)
-        upper_lim = next_index + max_ct
-        music_detail_list = []
 
         if user_id <= 0:
             self.logger.warning("handle_get_user_music_api_request: Could not find userid in data, or userId is 0")
             return {}
         
-        songs = await self.data.score.get_best_scores(user_id)
-        if songs is None:
+        page = await snapshots.page(
+            "mai2", user_id, self.version, next_index, max_ct,
+            lambda: self.util_generate_music_list(user_id),
+        )
+        if page is None:
             self.logger.debug("handle_get_user_music_api_request: get_best_scores returned None!")
             return {
             "userId": data["userId"],
@@ -627,22 +600,11 @@ class Mai2DX(Mai2Base):
             "userMusicList": [],
         }
 
-        num_user_songs = len(songs)
-
-        for x in range(next_index, upper_lim):
-            if num_user_songs <= x:
-                break
-
-            tmp = songs[x]._asdict()
-            tmp.pop("id")
-            tmp.pop("user")
-            music_detail_list.append(tmp)
-
-        next_index = 0 if len(music_detail_list) < max_ct or num_user_songs == upper_lim else upper_lim
-        self.logger.info(f"Send songs {next_index}-{upper_lim} ({len(music_detail_list)}) out of {num_user_songs} for user {user_id} (next idx {next_index})")
+        music_detail_list, upper_lim = page
+        self.logger.info(f"Send songs {next_index}-{next_index + len(music_detail_list)} for user {user_id} (next idx {max(upper_lim, 0)})")
         return {
             "userId": data["userId"],
-            "nextIndex": next_index,
+            "nextIndex": max(upper_lim, 0),
             "userMusicList": [{"userMusicDetailList": music_detail_list}],
         }
 
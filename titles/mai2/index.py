@@ -2,7 +2,6 @@ from starlette.requests import Request
 from starlette.responses import Response, JSONResponse
 from starlette.routing import Route
 import json
-import inflection
 import yaml
 import logging, coloredlogs
 import zlib
@@ -14,7 +13,7 @@ from Crypto.Hash import MD5
 
 from core.config import CoreConfig
 from core.utils import Utils
-from core.title import BaseServlet
+from core.title import BaseServlet, HandlerTable, VersionTable
 from core.crypto import CipherAES
 from .config import Mai2Config
 from .const import Mai2Constants
@@ -40,6 +39,7 @@ class Mai2Servlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{Mai2Constants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{Mai2Constants.CONFIG_NAME}")
 
         self.versions = [
             Mai2Base,
@@ -66,6 +66,57 @@ class Mai2Servlet(BaseServlet):
             Mai2Buddies
         ]
 
+        # Version classes hold no per-request state, so one instance of each is shared.
+        # Versions before FiNALE have no handler class and are left as None.
+        self.handlers: List[HandlerTable] = [
+            HandlerTable(ver(core_cfg, self.game_cfg)) if ver is not None else None
+            for ver in self.versions
+        ]
+
+        self.old_versions = VersionTable([
+            (110, Mai2Constants.VER_MAIMAI_PLUS),
+            (120, Mai2Constants.VER_MAIMAI_GREEN),
+            (130, Mai2Constants.VER_MAIMAI_GREEN_PLUS),
+            (140, Mai2Constants.VER_MAIMAI_ORANGE),
+            (150, Mai2Constants.VER_MAIMAI_ORANGE_PLUS),
+            (160, Mai2Constants.VER_MAIMAI_PINK),
+            (170, Mai2Constants.VER_MAIMAI_PINK_PLUS),
+            (180, Mai2Constants.VER_MAIMAI_MURASAKI),
+            (185, Mai2Constants.VER_MAIMAI_MURASAKI_PLUS),
+            (190, Mai2Constants.VER_MAIMAI_MILK),
+            (195, Mai2Constants.VER_MAIMAI_MILK_PLUS),
+            (197, Mai2Constants.VER_MAIMAI_FINALE),
+        ], Mai2Constants.VER_MAIMAI)
+
+        self.dx_versions: Dict[str, VersionTable] = {
+            "SDEZ": VersionTable([ # JP
+                (110, Mai2Constants.VER_MAIMAI_DX_PLUS),
+                (114, Mai2Constants.VER_MAIMAI_DX_SPLASH),
+                (117, Mai2Constants.VER_MAIMAI_DX_SPLASH_PLUS),
+                (120, Mai2Constants.VER_MAIMAI_DX_UNIVERSE),
+                (125, Mai2Constants.VER_MAIMAI_DX_UNIVERSE_PLUS),
+                (130, Mai2Constants.VER_MAIMAI_DX_FESTIVAL),
+                (135, Mai2Constants.VER_MAIMAI_DX_FESTIVAL_PLUS),
+                (140, Mai2Constants.VER_MAIMAI_DX_BUDDIES),
+            ], Mai2Constants.VER_MAIMAI_DX),
+            "SDGA": VersionTable([ # Int
+                (105, Mai2Constants.VER_MAIMAI_DX_PLUS),
+                (110, Mai2Constants.VER_MAIMAI_DX_SPLASH),
+                (115, Mai2Constants.VER_MAIMAI_DX_SPLASH_PLUS),
+                (120, Mai2Constants.VER_MAIMAI_DX_UNIVERSE),
+                (125, Mai2Constants.VER_MAIMAI_DX_UNIVERSE_PLUS),
+                (130, Mai2Constants.VER_MAIMAI_DX_FESTIVAL),
+                (135, Mai2Constants.VER_MAIMAI_DX_FESTIVAL_PLUS),
+                (140, Mai2Constants.VER_MAIMAI),
+            ], Mai2Constants.VER_MAIMAI_DX),
+            "SDGB": VersionTable([ # CN
+                (130, Mai2Constants.VER_MAIMAI_DX_FESTIVAL),
+                (135, Mai2Constants.VER_MAIMAI),
+                (140, Mai2Constants.VER_MAIMAI_DX_BUDDIES),
+                (145, Mai2Constants.VER_MAIMAI),
+            ], Mai2Constants.VER_MAIMAI_DX),
+        }
+
         self.logger = logging.getLogger("mai2")
         if not hasattr(self.logger, "initted"):
             log_fmt_str = "[%(asctime)s] Mai2 | %(levelname)s | %(message)s"
@@ -99,17 +150,8 @@ class Mai2Servlet(BaseServlet):
                 continue
 
             self.hash_table[version] = {}
-            method_list = [
-                method
-                for method in dir(self.versions[version])
-                if not method.startswith("__")
-            ]
-
-            for method in method_list:
-                # handle_method_api_request -> HandleMethodApiRequest
-                # remove the first 6 chars and the final 7 chars to get the canonical
-                # endpoint name.
-                method_fixed = inflection.camelize(method)[6:-7]
+
+            for method_fixed in self.handlers[version].endpoints():
                 hash = MD5.new((method_fixed + keys[2]).encode())
 
                 # truncate unused bytes like the game does
@@ -152,14 +194,8 @@ class Mai2Servlet(BaseServlet):
         ]
         
     def get_allnet_info(self, game_code: str, game_ver: int, keychip: str) -> Tuple[str, str]:
-        if not self.core_cfg.server.is_using_proxy and Utils.get_title_port(self.core_cfg) != 80:
-            return (
-                f"http://{self.core_cfg.server.hostname}:{Utils.get_title_port(self.core_cfg)}/{game_code}/{game_ver}/",
-                f"{self.core_cfg.server.hostname}",
-            )
-
         return (
-            f"http://{self.core_cfg.server.hostname}/{game_code}/{game_ver}/",
+            f"{self.core_cfg.server.title_url}/{game_code}/{game_ver}/",
             f"{self.core_cfg.server.hostname}",
         )
 
@@ -204,35 +240,8 @@ class Mai2Servlet(BaseServlet):
             return Response(zlib.compress(b'{"returnCode": "1"}'))
         
         req_raw = await request.body()
-        internal_ver = 0
+        internal_ver = self.old_versions.get(version)
         client_ip = Utils.get_ip_addr(request)
-        
-        if version < 110:  # 1.0
-            internal_ver = Mai2Constants.VER_MAIMAI
-        elif version >= 110 and version < 120:  # Plus
-            internal_ver = Mai2Constants.VER_MAIMAI_PLUS
-        elif version >= 120 and version < 130:  # Green
-            internal_ver = Mai2Constants.VER_MAIMAI_GREEN
-        elif version >= 130 and version < 140:  # Green Plus
-            internal_ver = Mai2Constants.VER_MAIMAI_GREEN_PLUS
-        elif version >= 140 and version < 150:  # Orange
-            internal_ver = Mai2Constants.VER_MAIMAI_ORANGE
-        elif version >= 150 and version < 160:  # Orange Plus
-            internal_ver = Mai2Constants.VER_MAIMAI_ORANGE_PLUS
-        elif version >= 160 and version < 170:  # Pink
-            internal_ver = Mai2Constants.VER_MAIMAI_PINK
-        elif version >= 170 and version < 180:  # Pink Plus
-            internal_ver = Mai2Constants.VER_MAIMAI_PINK_PLUS
-        elif version >= 180 and version < 185:  # Murasaki
-            internal_ver = Mai2Constants.VER_MAIMAI_MURASAKI
-        elif version >= 185 and version < 190:  # Murasaki Plus
-            internal_ver = Mai2Constants.VER_MAIMAI_MURASAKI_PLUS
-        elif version >= 190 and version < 195:  # Milk
-            internal_ver = Mai2Constants.VER_MAIMAI_MILK
-        elif version >= 195 and version < 197:  # Milk Plus
-            internal_ver = Mai2Constants.VER_MAIMAI_MILK_PLUS
-        elif version >= 197:  # Finale
-            internal_ver = Mai2Constants.VER_MAIMAI_FINALE
 
         try:
             unzip = zlib.decompress(req_raw)
@@ -248,16 +257,15 @@ class Mai2Servlet(BaseServlet):
         self.logger.info(f"v{version} {endpoint} request from {client_ip}")
         self.logger.debug(req_data)
 
-        func_to_find = "handle_" + inflection.underscore(endpoint) + "_request"
-        handler_cls = self.versions[internal_ver](self.core_cfg, self.game_cfg)
+        handler_table = self.handlers[internal_ver]
+        handler = handler_table.get(endpoint) if handler_table is not None else None
 
-        if not hasattr(handler_cls, func_to_find):
+        if handler is None:
             self.logger.warning(f"Unhandled v{version} request {endpoint}")
             resp = {"returnCode": 1}
 
         else:
             try:
-                handler = getattr(handler_cls, func_to_find)
                 resp = await handler(req_data)
 
             except Exception as e:
@@ -280,53 +288,11 @@ class Mai2Servlet(BaseServlet):
             return Response(zlib.compress(b'{"returnCode": "1"}'))
 
         req_raw = await request.body()
-        internal_ver = 0
         client_ip = Utils.get_ip_addr(request)
         encrypted = False
-        
-        if game_code == "SDEZ": # JP
-          if version < 110:  # 1.0
-              internal_ver = Mai2Constants.VER_MAIMAI_DX
-          elif version >= 110 and version < 114:  # PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_PLUS
-          elif version >= 114 and version < 117:  # Splash
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_SPLASH
-          elif version >= 117 and version < 120:  # Splash PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_SPLASH_PLUS
-          elif version >= 120 and version < 125:  # UNiVERSE
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_UNIVERSE
-          elif version >= 125 and version < 130:  # UNiVERSE PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_UNIVERSE_PLUS
-          elif version >= 130 and version < 135:  # FESTiVAL
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_FESTIVAL
-          elif version >= 135 and version < 140:  # FESTiVAL PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_FESTIVAL_PLUS
-          elif version >= 140:  # BUDDiES
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_BUDDIES
-        elif game_code == "SDGA": # Int
-          if version < 105:  # 1.0
-              internal_ver = Mai2Constants.VER_MAIMAI_DX
-          elif version >= 105 and version < 110:  # PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_PLUS
-          elif version >= 110 and version < 115:  # Splash
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_SPLASH
-          elif version >= 115 and version < 120:  # Splash PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_SPLASH_PLUS
-          elif version >= 120 and version < 125:  # UNiVERSE
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_UNIVERSE
-          elif version >= 125 and version < 130:  # UNiVERSE PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_UNIVERSE_PLUS
-          elif version >= 130 and version < 135:  # FESTiVAL
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_FESTIVAL
-          elif version >= 135 and version < 140:  # FESTiVAL PLUS
-              internal_ver = Mai2Constants.VER_MAIMAI_DX_FESTIVAL_PLUS
-        elif game_code == "SDGB": # CN
-            if version < 130:  # Maimai DX CN 2023 (FESTiVAL)
-                internal_ver = Mai2Constants.VER_MAIMAI_DX
-            if 130 <= version < 135:  # Maimai DX CN 2023 (FESTiVAL)
-                internal_ver = Mai2Constants.VER_MAIMAI_DX_FESTIVAL
-            if 140 <= version < 145:  # Maimai DX CN 2023 (FESTiVAL)
-                internal_ver = Mai2Constants.VER_MAIMAI_DX_BUDDIES
+
+        version_table = self.dx_versions.get(game_code)
+        internal_ver = version_table.get(version) if version_table is not None else 0
 
         try:
             unzip = zlib.decompress(req_raw)
@@ -338,7 +304,7 @@ class Mai2Servlet(BaseServlet):
             return Response(zlib.compress(b'{"stat": "0"}'))
 
 
-        if all(c in string.hexdigits for c in endpoint) and len(endpoint) == 32:
+        if len(endpoint) == 32 and all(c in string.hexdigits for c in endpoint):
             # If we get a 32 character long hex string, it's a hash and we're
             # dealing with an encrypted request. False positives shouldn't happen
             # as long as requests are suffixed with `Api`.
@@ -359,8 +325,8 @@ class Mai2Servlet(BaseServlet):
 
             try:
                 crypt = CipherAES(
-                    bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][0]),
-                    bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][1]),
+                    self.game_cfg.crypto.key_bytes[internal_ver][0],
+                    self.game_cfg.crypto.key_bytes[internal_ver][1],
                 )
 
                 decrypted = crypt.decrypt(unzip)
@@ -401,16 +367,15 @@ class Mai2Servlet(BaseServlet):
             endpoint = endpoint.replace("MaimaiChn", "")
 
 
-        func_to_find = "handle_" + inflection.underscore(endpoint) + "_request"
-        handler_cls = self.versions[internal_ver](self.core_cfg, self.game_cfg)
+        handler_table = self.handlers[internal_ver]
+        handler = handler_table.get(endpoint) if handler_table is not None else None
 
-        if not hasattr(handler_cls, func_to_find):
+        if handler is None:
             self.logger.warning(f"Unhandled v{version} request {endpoint}")
             resp = {"returnCode": 1}
 
         else:
             try:
-                handler = getattr(handler_cls, func_to_find)
                 resp = await handler(req_data)
 
             except Exception as e:
@@ -428,8 +393,8 @@ class Mai2Servlet(BaseServlet):
         # padded = pad(zipped, 16)
 
         crypt = CipherAES(
-            bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][0]),
-            bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][1]),
+            self.game_cfg.crypto.key_bytes[internal_ver][0],
+            self.game_cfg.crypto.key_bytes[internal_ver][1],
         )
 
         return Response(
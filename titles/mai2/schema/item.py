@@ -210,6 +210,23 @@ class Mai2ItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_items(self, user_id: int, item_list: List[Dict]) -> Optional[int]:
+        rows = [
+            {
+                "user": user_id,
+                "itemKind": int(item_data["itemKind"]),
+                "itemId": item_data["itemId"],
+                "stock": item_data["stock"],
+                "isValid": item_data["isValid"],
+            }
+            for item_data in item_list
+        ]
+        result = await self.bulk_upsert(item, rows)
+        if result is None:
+            self.logger.error(f"put_items: Failed to upsert {len(rows)} items for user {user_id}")
+            return None
+        return result
+
     async def get_items(self, user_id: int, item_kind: int = None) -> Optional[List[Row]]:
         if item_kind is None:
             sql = item.select(item.c.user == user_id)
@@ -267,6 +284,23 @@ class Mai2ItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_login_bonuses(self, user_id: int, login_bonus_list: List[Dict]) -> Optional[int]:
+        rows = [
+            {
+                "user": user_id,
+                "bonusId": login_bonus_data["bonusId"],
+                "point": login_bonus_data["point"],
+                "isCurrent": login_bonus_data["isCurrent"],
+                "isComplete": login_bonus_data["isComplete"],
+            }
+            for login_bonus_data in login_bonus_list
+        ]
+        result = await self.bulk_upsert(login_bonus, rows)
+        if result is None:
+            self.logger.error(f"put_login_bonuses: Failed to upsert {len(rows)} login bonuses for user {user_id}")
+            return None
+        return result
+
     async def get_login_bonuses(self, user_id: int) -> Optional[List[Row]]:
         sql = login_bonus.select(login_bonus.c.user == user_id)
 
@@ -318,6 +352,24 @@ class Mai2ItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_maps(self, user_id: int, map_list: List[Dict]) -> Optional[int]:
+        rows = [
+            {
+                "user": user_id,
+                "mapId": map_data["mapId"],
+                "distance": map_data["distance"],
+                "isLock": map_data["isLock"],
+                "isClear": map_data["isClear"],
+                "isComplete": map_data["isComplete"],
+            }
+            for map_data in map_list
+        ]
+        result = await self.bulk_upsert(map, rows)
+        if result is None:
+            self.logger.error(f"put_maps: Failed to upsert {len(rows)} maps for user {user_id}")
+            return None
+        return result
+
     async def get_maps(self, user_id: int) -> Optional[List[Row]]:
         sql = map.select(map.c.user == user_id)
 
@@ -347,6 +399,14 @@ class Mai2ItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_characters_(self, user_id: int, char_list: List[Dict]) -> Optional[int]:
+        rows = [{**char_data, "user": user_id} for char_data in char_list]
+        result = await self.bulk_upsert(character, rows)
+        if result is None:
+            self.logger.error(f"put_characters_: Failed to upsert {len(rows)} characters for user {user_id}")
+            return None
+        return result
+
     async def put_character(
         self,
         user_id: int,
@@ -377,6 +437,23 @@ class Mai2ItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_characters(self, user_id: int, char_list: List[Dict]) -> Optional[int]:
+        rows = [
+            {
+                "user": user_id,
+                "characterId": char_data["characterId"],
+                "level": char_data["level"],
+                "awakening": char_data["awakening"],
+                "useCount": char_data["useCount"],
+            }
+            for char_data in char_list
+        ]
+        result = await self.bulk_upsert(character, rows)
+        if result is None:
+            self.logger.error(f"put_characters: Failed to upsert {len(rows)} characters for user {user_id}")
+            return None
+        return result
+
     async def get_characters(self, user_id: int) -> Optional[List[Row]]:
         sql = character.select(character.c.user == user_id)
 
@@ -704,6 +704,21 @@ class Mai2ProfileData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_profile_activities(self, user_id: int, activity_list: List[Dict]) -> Optional[int]:
+        rows = []
+        for activity_data in activity_list:
+            row = {k: v for k, v in activity_data.items() if k != "id"}
+            if "id" in activity_data:
+                row["activityId"] = activity_data["id"]
+            row["user"] = user_id
+            rows.append(row)
+
+        result = await self.bulk_upsert(activity, rows)
+        if result is None:
+            self.logger.error(f"put_profile_activities: Failed to upsert {len(rows)} activities for user {user_id}")
+            return None
+        return result
+
     async def get_profile_activity(
         self, user_id: int, kind: int = None
     ) -> Optional[List[Row]]:
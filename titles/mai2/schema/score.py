@@ -1,13 +1,13 @@
 from typing import Dict, List, Optional
-from sqlalchemy import Table, Column, UniqueConstraint, PrimaryKeyConstraint, and_
+from sqlalchemy import Table, Column, UniqueConstraint, PrimaryKeyConstraint, Index, and_
 from sqlalchemy.types import Integer, String, TIMESTAMP, Boolean, JSON, BigInteger
 from sqlalchemy.schema import ForeignKey
-from sqlalchemy.sql import func, select
+from sqlalchemy.sql import func, select, literal
 from sqlalchemy.engine import Row
 from sqlalchemy.dialects.mysql import insert
 
 from core.data.schema import BaseData, metadata
-from core.data import cached
+from core.data import cached, invalidate
 
 best_score = Table(
     "mai2_score_best",
@@ -295,6 +295,19 @@ best_score_old = Table(
     mysql_charset="utf8mb4",
 )
 
+# Play count per song per version, kept up to date by put_playlog for GetGameRankingApi
+ranking = Table(
+    "mai2_score_ranking",
+    metadata,
+    Column("id", Integer, primary_key=True, nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("musicId", Integer, nullable=False),
+    Column("playCount", Integer, nullable=False, server_default="0"),
+    UniqueConstraint("version", "musicId", name="mai2_score_ranking_uk"),
+    Index("mai2_score_ranking_count_idx", "version", "playCount"),
+    mysql_charset="utf8mb4",
+)
+
 class Mai2ScoreData(BaseData):
     async def put_best_score(self, user_id: int, score_data: Dict, is_dx: bool = True) -> Optional[int]:
         score_data["user"] = user_id
@@ -306,6 +319,7 @@ class Mai2ScoreData(BaseData):
         conflict = sql.on_duplicate_key_update(**score_data)
 
         result = await self.execute(conflict)
+        invalidate(f"user:{user_id}")
         if result is None:
             self.logger.error(
                 f"put_best_score:  Failed to insert best score! user_id {user_id} is_dx {is_dx}"
@@ -313,7 +327,15 @@ class Mai2ScoreData(BaseData):
             return None
         return result.lastrowid
 
-    @cached(2)
+    async def put_best_scores(self, user_id: int, score_list: List[Dict], is_dx: bool = True) -> Optional[int]:
+        rows = [{**score_data, "user": user_id} for score_data in score_list]
+        result = await self.bulk_upsert(best_score if is_dx else best_score_old, rows)
+        if result is None:
+            self.logger.error(f"put_best_scores: Failed to upsert {len(rows)} best scores for user {user_id}")
+        invalidate(f"user:{user_id}")
+        return result
+
+    @cached(2, tags=["user:{user_id}"])
     async def get_best_scores(self, user_id: int, song_id: int = None, is_dx: bool = True) -> Optional[List[Row]]:
         if is_dx:
             sql = best_score.select(
@@ -351,7 +373,10 @@ class Mai2ScoreData(BaseData):
             return None
         return result.fetchone()
 
-    async def put_playlog(self, user_id: int, playlog_data: Dict, is_dx: bool = True) -> Optional[int]:
+    async def put_playlog(self, user_id: int, playlog_data: Dict, is_dx: bool = True, version: Optional[int] = None) -> Optional[int]:
+        """
+        Stores a playlog, and counts the play towards version's rankings if a version is given
+        """
         playlog_data["user"] = user_id
 
         if is_dx:
@@ -365,7 +390,51 @@ class Mai2ScoreData(BaseData):
         if result is None:
             self.logger.error(f"put_playlog:  Failed to insert! user_id {user_id} is_dx {is_dx}")
             return None
+
+        if version is not None and playlog_data.get("musicId") is not None:
+            await self.put_ranking_play(version, playlog_data["musicId"])
         return result.lastrowid
+
+    async def get_rankings(self, version: int, count: int = 10) -> Optional[List[Row]]:
+        """
+        Returns the count most played songs of a version
+        """
+        sql = select(ranking.c.musicId, ranking.c.playCount).where(
+            ranking.c.version == version
+        ).order_by(ranking.c.playCount.desc()).limit(count)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
+    async def put_ranking_play(self, version: int, music_id: int) -> None:
+        sql = insert(ranking).values(version=version, musicId=music_id, playCount=1)
+        conflict = sql.on_duplicate_key_update(playCount=ranking.c.playCount + 1)
+
+        result = await self.execute(conflict)
+        if result is None:
+            self.logger.warning(f"Failed to count play of song {music_id} for v{version} rankings")
+
+    async def rebuild_rankings(self, version: int) -> None:
+        """
+        Recounts version's rankings from the DX playlog table. Playlogs don't record which
+        server version they were sent to, so every existing DX play is counted towards version
+        """
+        plays = select(
+            literal(version), playlog.c.musicId, func.count(playlog.c.id)
+        ).group_by(playlog.c.musicId)
+
+        async with self.transaction():
+            await self.execute(ranking.delete(ranking.c.version == version))
+            result = await self.execute(
+                insert(ranking).from_select(["version", "musicId", "playCount"], plays)
+            )
+
+        if result is None:
+            self.logger.error(f"Failed to rebuild v{version} rankings")
+            return
+        self.logger.info(f"Rebuilt v{version} rankings, {result.rowcount} songs")
     
     async def put_playlog_2p(self, user_id: int, playlog_2p_data: Dict) -> Optional[int]:
         playlog_2p_data["user"] = user_id
@@ -391,6 +460,14 @@ class Mai2ScoreData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_courses(self, user_id: int, course_list: List[Dict]) -> Optional[int]:
+        rows = [{**course_data, "user": user_id} for course_data in course_list]
+        result = await self.bulk_upsert(course, rows)
+        if result is None:
+            self.logger.error(f"put_courses: Failed to upsert {len(rows)} courses for user {user_id}")
+            return None
+        return result
+
     async def get_courses(self, user_id: int) -> Optional[List[Row]]:
         sql = course.select(course.c.user == user_id)
 
@@ -1,12 +1,12 @@
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import json
 import logging
 from enum import Enum
 
 import pytz
 from core.config import CoreConfig
-from core.data.cache import cached
+from core.data import snapshots
 from titles.ongeki.const import OngekiConstants
 from titles.ongeki.config import OngekiConfig
 from titles.ongeki.database import OngekiData
@@ -198,6 +198,7 @@ class OngekiBase:
         return {"returnCode": 1, "apiName": "gameLogin"}
 
     async def handle_game_logout_api_request(self, data: Dict) -> Dict:
+        snapshots.drop("ongeki", data["userId"])
         return {"returnCode": 1, "apiName": "gameLogout"}
 
     async def handle_extend_lock_time_api_request(self, data: Dict) -> Dict:
@@ -268,7 +269,7 @@ class OngekiBase:
 
         client_id = data["clientId"]
         client_setting_data = data["clientSetting"]
-        cab = await self.data.arcade.get_machine(client_id)
+        cab = await self.data.arcade.registry.get_machine(client_id)
         if cab is not None:
             await self.data.static.put_client_setting_data(cab['id'], client_setting_data)
         return {"returnCode": 1, "apiName": "UpsertClientSettingApi"}
@@ -500,23 +501,18 @@ class OngekiBase:
         }
 
     async def handle_get_user_music_api_request(self, data: Dict) -> Dict:
-        song_list = await self.util_generate_music_list(data["userId"])
-        max_ct = data["maxCount"]
-        next_idx = data["nextIndex"]
-        start_idx = next_idx
-        end_idx = max_ct + start_idx
-
-        if len(song_list[start_idx:]) > max_ct:
-            next_idx += max_ct
-
-        else:
-            next_idx = -1
+        user_id = data["userId"]
+        page = await snapshots.page(
+            "ongeki", user_id, self.version, data["nextIndex"], data["maxCount"],
+            lambda: self.util_generate_music_list(user_id),
+        )
+        song_list, next_idx = page if page is not None else ([], -1)
 
         return {
             "userId": data["userId"],
-            "length": len(song_list[start_idx:end_idx]),
+            "length": len(song_list),
             "nextIndex": next_idx,
-            "userMusicList": song_list[start_idx:end_idx],
+            "userMusicList": song_list,
         }
 
     async def handle_get_user_item_api_request(self, data: Dict) -> Dict:
@@ -953,147 +949,125 @@ class OngekiBase:
             self.logger.info("Guest play from place ID %d, ignoring.", place_id)
             return {"returnCode": 1, "apiName": "UpsertUserAllApi"}
 
+        snapshots.drop("ongeki", user_id)
         # The isNew fields are new as of Red and up. We just won't use them for now.
 
-        if "userData" in upsert and len(upsert["userData"]) > 0:
-            await self.data.profile.put_profile_data(
-                user_id, self.version, upsert["userData"][0]
-            )
+        async with self.data.base.transaction():
+            if "userData" in upsert and len(upsert["userData"]) > 0:
+                await self.data.profile.put_profile_data(
+                    user_id, self.version, upsert["userData"][0]
+                )
 
-        if "userOption" in upsert and len(upsert["userOption"]) > 0:
-            await self.data.profile.put_profile_options(user_id, upsert["userOption"][0])
+            if "userOption" in upsert and len(upsert["userOption"]) > 0:
+                await self.data.profile.put_profile_options(user_id, upsert["userOption"][0])
 
-        if "userPlaylogList" in upsert:
-            for playlog in upsert["userPlaylogList"]:
-                await self.data.score.put_playlog(user_id, playlog)
+            if "userPlaylogList" in upsert:
+                for playlog in upsert["userPlaylogList"]:
+                    await self.data.score.put_playlog(user_id, playlog)
 
-        if "userActivityList" in upsert:
-            for act in upsert["userActivityList"]:
-                await self.data.profile.put_profile_activity(
-                    user_id,
-                    act["kind"],
-                    act["id"],
-                    act["sortNumber"],
-                    act["param1"],
-                    act["param2"],
-                    act["param3"],
-                    act["param4"],
-                )
+            if "userActivityList" in upsert:
+                await self.data.profile.put_profile_activities(user_id, upsert["userActivityList"])
 
-        if "userRecentRatingList" in upsert:
-            await self.data.profile.put_profile_recent_rating(
-                user_id, upsert["userRecentRatingList"]
-            )
+            if "userRecentRatingList" in upsert:
+                await self.data.profile.put_profile_recent_rating(
+                    user_id, upsert["userRecentRatingList"]
+                )
 
-        if "userBpBaseList" in upsert:
-            await self.data.profile.put_profile_bp_list(user_id, upsert["userBpBaseList"])
+            if "userBpBaseList" in upsert:
+                await self.data.profile.put_profile_bp_list(user_id, upsert["userBpBaseList"])
 
-        if "userMusicDetailList" in upsert:
-            for x in upsert["userMusicDetailList"]:
-                await self.data.score.put_best_score(user_id, x)
+            if "userMusicDetailList" in upsert:
+                await self.data.score.put_best_scores(user_id, upsert["userMusicDetailList"])
 
-        if "userCharacterList" in upsert:
-            for x in upsert["userCharacterList"]:
-                await self.data.item.put_character(user_id, x)
+            if "userCharacterList" in upsert:
+                await self.data.item.put_characters(user_id, upsert["userCharacterList"])
 
-        if "userCardList" in upsert:
-            for x in upsert["userCardList"]:
-                await self.data.item.put_card(user_id, x)
+            if "userCardList" in upsert:
+                await self.data.item.put_cards(user_id, upsert["userCardList"])
 
-        if "userDeckList" in upsert:
-            for x in upsert["userDeckList"]:
-                await self.data.item.put_deck(user_id, x)
+            if "userDeckList" in upsert:
+                await self.data.item.put_decks(user_id, upsert["userDeckList"])
 
-        if "userTrainingRoomList" in upsert:
-            for x in upsert["userTrainingRoomList"]:
-                await self.data.profile.put_training_room(user_id, x)
+            if "userTrainingRoomList" in upsert:
+                for x in upsert["userTrainingRoomList"]:
+                    await self.data.profile.put_training_room(user_id, x)
 
-        if "userStoryList" in upsert:
-            for x in upsert["userStoryList"]:
-                await self.data.item.put_story(user_id, x)
+            if "userStoryList" in upsert:
+                await self.data.item.put_stories(user_id, upsert["userStoryList"])
 
-        if "userChapterList" in upsert:
-            for x in upsert["userChapterList"]:
-                await self.data.item.put_chapter(user_id, x)
+            if "userChapterList" in upsert:
+                await self.data.item.put_chapters(user_id, upsert["userChapterList"])
 
-        if "userMemoryChapterList" in upsert:
-            for x in upsert["userMemoryChapterList"]:
-                await self.data.item.put_memorychapter(user_id, x)
+            if "userMemoryChapterList" in upsert:
+                await self.data.item.put_memorychapters(user_id, upsert["userMemoryChapterList"])
 
-        if "userItemList" in upsert:
-            for x in upsert["userItemList"]:
-                await self.data.item.put_item(user_id, x)
+            if "userItemList" in upsert:
+                await self.data.item.put_items(user_id, upsert["userItemList"])
 
-        if "userMusicItemList" in upsert:
-            for x in upsert["userMusicItemList"]:
-                await self.data.item.put_music_item(user_id, x)
+            if "userMusicItemList" in upsert:
+                await self.data.item.put_music_items(user_id, upsert["userMusicItemList"])
 
-        if "userLoginBonusList" in upsert:
-            for x in upsert["userLoginBonusList"]:
-                await self.data.item.put_login_bonus(user_id, x)
+            if "userLoginBonusList" in upsert:
+                await self.data.item.put_login_bonuses(user_id, upsert["userLoginBonusList"])
 
-        if "userEventPointList" in upsert:
-            for x in upsert["userEventPointList"]:
-                await self.data.item.put_event_point(user_id, self.version, x)
+            if "userEventPointList" in upsert:
+                for x in upsert["userEventPointList"]:
+                    await self.data.item.put_event_point(user_id, self.version, x)
 
-        if "userMissionPointList" in upsert:
-            for x in upsert["userMissionPointList"]:
-                await self.data.item.put_mission_point(user_id, self.version, x)
+            if "userMissionPointList" in upsert:
+                for x in upsert["userMissionPointList"]:
+                    await self.data.item.put_mission_point(user_id, self.version, x)
 
-        if "userRatinglogList" in upsert:
-            for x in upsert["userRatinglogList"]:
-                await self.data.profile.put_profile_rating_log(
-                    user_id, x["dataVersion"], x["highestRating"]
-                )
+            if "userRatinglogList" in upsert:
+                for x in upsert["userRatinglogList"]:
+                    await self.data.profile.put_profile_rating_log(
+                        user_id, x["dataVersion"], x["highestRating"]
+                    )
 
-        if "userBossList" in upsert:
-            for x in upsert["userBossList"]:
-                await self.data.item.put_boss(user_id, x)
+            if "userBossList" in upsert:
+                await self.data.item.put_bosses(user_id, upsert["userBossList"])
 
-        if "userTechCountList" in upsert:
-            for x in upsert["userTechCountList"]:
-                await self.data.score.put_tech_count(user_id, x)
+            if "userTechCountList" in upsert:
+                await self.data.score.put_tech_counts(user_id, upsert["userTechCountList"])
 
-        if "userScenerioList" in upsert:
-            for x in upsert["userScenerioList"]:
-                await self.data.item.put_scenerio(user_id, x)
+            if "userScenerioList" in upsert:
+                await self.data.item.put_scenerios(user_id, upsert["userScenerioList"])
 
-        if "userTradeItemList" in upsert:
-            for x in upsert["userTradeItemList"]:
-                await self.data.item.put_trade_item(user_id, x)
+            if "userTradeItemList" in upsert:
+                await self.data.item.put_trade_items(user_id, upsert["userTradeItemList"])
 
-        if "userEventMusicList" in upsert:
-            for x in upsert["userEventMusicList"]:
-                await self.data.item.put_event_music(user_id, x)
+            if "userEventMusicList" in upsert:
+                for x in upsert["userEventMusicList"]:
+                    await self.data.item.put_event_music(user_id, x)
 
-        if "userTechEventList" in upsert:
-            for x in upsert["userTechEventList"]:
-                await self.data.item.put_tech_event(user_id, self.version, x)
+            if "userTechEventList" in upsert:
+                for x in upsert["userTechEventList"]:
+                    await self.data.item.put_tech_event(user_id, self.version, x)
 
-                # This should be updated once a day in maintenance window, but for time being we will push the update on each upsert
-                await self.data.item.put_tech_event_ranking(user_id, self.version, x)
+                    # This should be updated once a day in maintenance window, but for time being we will push the update on each upsert
+                    await self.data.item.put_tech_event_ranking(user_id, self.version, x)
 
-        if "userKopList" in upsert:
-            for x in upsert["userKopList"]:
-                await self.data.profile.put_kop(user_id, x)
+            if "userKopList" in upsert:
+                for x in upsert["userKopList"]:
+                    await self.data.profile.put_kop(user_id, x)
             
-        for rating_type in {
-            "userRatingBaseBestList",
-            "userRatingBaseBestNewList",
-            "userRatingBaseHotList",
-            "userRatingBaseNextList",
-            "userRatingBaseNextNewList",
-            "userRatingBaseHotNextList",
-        }:
-            if rating_type not in upsert:
-                continue
-
-            await self.data.profile.put_profile_rating(
-                user_id,
-                self.version,
-                rating_type,
-                upsert[rating_type],
-            )
+            for rating_type in {
+                "userRatingBaseBestList",
+                "userRatingBaseBestNewList",
+                "userRatingBaseHotList",
+                "userRatingBaseNextList",
+                "userRatingBaseNextNewList",
+                "userRatingBaseHotNextList",
+            }:
+                if rating_type not in upsert:
+                    continue
+
+                await self.data.profile.put_profile_rating(
+                    user_id,
+                    self.version,
+                    rating_type,
+                    upsert[rating_type],
+                )
 
         return {"returnCode": 1, "apiName": "upsertUserAll"}
 
@@ -1144,42 +1118,40 @@ class OngekiBase:
         Added in Bright
         """
         rival_id = data["rivalUserId"]
-        next_idx = data["nextIndex"]
-        max_ct = data["maxCount"]
-        music = self.handle_get_user_music_api_request(
-            {"userId": rival_id, "nextIndex": next_idx, "maxCount": max_ct}
+        page = await snapshots.page(
+            "ongeki_rival", rival_id, self.version, data["nextIndex"], data["maxCount"],
+            lambda: self.util_generate_rival_music_list(rival_id),
         )
+        song_list, next_idx = page if page is not None else ([], -1)
 
-        for song in music["userMusicList"]:
-            song["userRivalMusicDetailList"] = song["userMusicDetailList"]
-            song.pop("userMusicDetailList")
         return {
             "userId": data["userId"],
             "rivalUserId": rival_id,
-            "length": music["length"],
-            "nextIndex": music["nextIndex"],
-            "userRivalMusicList": music["userMusicList"],
+            "length": len(song_list),
+            "nextIndex": next_idx,
+            "userRivalMusicList": song_list,
         }
 
-    @cached(2)
-    async def util_generate_music_list(self, user_id: int) -> List:
+    async def util_generate_rival_music_list(self, rival_id: int) -> Optional[List]:
+        song_list = await self.util_generate_music_list(rival_id)
+        if song_list is None:
+            return None
+
+        return [
+            {"length": song["length"], "userRivalMusicDetailList": song["userMusicDetailList"]}
+            for song in song_list
+        ]
+
+    async def util_generate_music_list(self, user_id: int) -> Optional[List]:
         music_detail = await self.data.score.get_best_scores(user_id)
-        song_list = []
+        if music_detail is None:
+            return None
 
-        for md in music_detail:
-            found = False
+        songs: Dict[int, List[Dict]] = {}
+        for md in sorted(music_detail, key=lambda x: (x["musicId"], x["level"])):
             tmp = md._asdict()
             tmp.pop("user")
             tmp.pop("id")
+            songs.setdefault(tmp["musicId"], []).append(tmp)
 
-            for song in song_list:
-                if song["userMusicDetailList"][0]["musicId"] == tmp["musicId"]:
-                    found = True
-                    song["userMusicDetailList"].append(tmp)
-                    song["length"] = len(song["userMusicDetailList"])
-                    break
-
-            if not found:
-                song_list.append({"length": 1, "userMusicDetailList": [tmp]})
-
-        return song_list
+        return [{"length": len(details), "userMusicDetailList": details} for details in songs.values()]
@@ -1,5 +1,4 @@
-from ast import Dict
-from typing import List
+from typing import Dict, List, Tuple
 
 from core.config import CoreConfig
 
@@ -69,6 +68,17 @@ class OngekiCryptoConfig:
             self.__config, "ongeki", "crypto", "keys", default={}
         )
 
+    @property
+    def key_bytes(self) -> Dict[int, Tuple[bytes, bytes]]:
+        """
+        keys with the key and iv already decoded from hex, for use on the request path
+        """
+        return {
+            version: (bytes.fromhex(keys[0]), bytes.fromhex(keys[1]))
+            for version, keys in self.keys.items()
+            if len(keys) >= 2
+        }
+
     @property
     def encrypted_only(self) -> bool:
         return CoreConfig.get_config_field(
@@ -2,7 +2,6 @@ from starlette.requests import Request
 from starlette.routing import Route
 from starlette.responses import Response
 import json
-import inflection
 import yaml
 import string
 import logging
@@ -18,7 +17,7 @@ from typing import Tuple, Dict, List
 
 from core.config import CoreConfig
 from core.utils import Utils
-from core.title import BaseServlet
+from core.title import BaseServlet, HandlerTable, VersionTable
 from .config import OngekiConfig
 from .const import OngekiConstants
 from .base import OngekiBase
@@ -40,6 +39,7 @@ class OngekiServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{OngekiConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{OngekiConstants.CONFIG_NAME}")
 
         self.versions = [
             OngekiBase(core_cfg, self.game_cfg),
@@ -51,6 +51,18 @@ class OngekiServlet(BaseServlet):
             OngekiBright(core_cfg, self.game_cfg),
             OngekiBrightMemory(core_cfg, self.game_cfg),
         ]
+        self.handlers = [HandlerTable(ver) for ver in self.versions]
+
+        self.version_table = VersionTable([
+            (105, OngekiConstants.VER_ONGEKI_PLUS),
+            (110, OngekiConstants.VER_ONGEKI_SUMMER),
+            (115, OngekiConstants.VER_ONGEKI_SUMMER_PLUS),
+            (120, OngekiConstants.VER_ONGEKI_RED),
+            (125, OngekiConstants.VER_ONGEKI_RED_PLUS),
+            (130, OngekiConstants.VER_ONGEKI_BRIGHT),
+            (135, OngekiConstants.VER_ONGEKI_BRIGHT_MEMORY),
+            (145, OngekiConstants.VER_ONGEKI),
+        ], OngekiConstants.VER_ONGEKI)
 
         self.logger = logging.getLogger("ongeki")
 
@@ -84,13 +96,7 @@ class OngekiServlet(BaseServlet):
 
             self.hash_table[version] = {}
 
-            method_list = [
-                method
-                for method in dir(self.versions[version])
-                if not method.startswith("__")
-            ]
-            for method in method_list:
-                method_fixed = inflection.camelize(method)[6:-7]
+            for method_fixed in self.handlers[version].endpoints():
                 # number of iterations is 64 on Bright Memory
                 iter_count = 64
                 hash = PBKDF2(
@@ -151,27 +157,10 @@ class OngekiServlet(BaseServlet):
 
         req_raw = await request.body()
         encrtped = False
-        internal_ver = 0
+        internal_ver = self.version_table.get(version)
         client_ip = Utils.get_ip_addr(request)
 
-        if version < 105:  # 1.0
-            internal_ver = OngekiConstants.VER_ONGEKI
-        elif version >= 105 and version < 110:  # Plus
-            internal_ver = OngekiConstants.VER_ONGEKI_PLUS
-        elif version >= 110 and version < 115:  # Summer
-            internal_ver = OngekiConstants.VER_ONGEKI_SUMMER
-        elif version >= 115 and version < 120:  # Summer Plus
-            internal_ver = OngekiConstants.VER_ONGEKI_SUMMER_PLUS
-        elif version >= 120 and version < 125:  # Red
-            internal_ver = OngekiConstants.VER_ONGEKI_RED
-        elif version >= 125 and version < 130:  # Red Plus
-            internal_ver = OngekiConstants.VER_ONGEKI_RED_PLUS
-        elif version >= 130 and version < 135:  # Bright
-            internal_ver = OngekiConstants.VER_ONGEKI_BRIGHT
-        elif version >= 135 and version < 145:  # Bright Memory
-            internal_ver = OngekiConstants.VER_ONGEKI_BRIGHT_MEMORY
-
-        if all(c in string.hexdigits for c in endpoint) and len(endpoint) == 32:
+        if len(endpoint) == 32 and all(c in string.hexdigits for c in endpoint):
             # If we get a 32 character long hex string, it's a hash and we're
             # doing encrypted. The likelyhood of false positives is low but
             # technically not 0
@@ -191,9 +180,9 @@ class OngekiServlet(BaseServlet):
 
             try:
                 crypt = AES.new(
-                    bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][0]),
+                    self.game_cfg.crypto.key_bytes[internal_ver][0],
                     AES.MODE_CBC,
-                    bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][1]),
+                    self.game_cfg.crypto.key_bytes[internal_ver][1],
                 )
 
                 req_raw = crypt.decrypt(req_raw)
@@ -232,14 +221,13 @@ class OngekiServlet(BaseServlet):
         )
         self.logger.debug(req_data)
 
-        func_to_find = "handle_" + inflection.underscore(endpoint) + "_request"
+        handler = self.handlers[internal_ver].get(endpoint)
 
-        if not hasattr(self.versions[internal_ver], func_to_find):
+        if handler is None:
             self.logger.warning(f"Unhandled v{version} request {endpoint}")
             return Response(zlib.compress(b'{"returnCode": 1}'))
 
         try:
-            handler = getattr(self.versions[internal_ver], func_to_find)
             resp = await handler(req_data)
 
         except Exception as e:
@@ -259,9 +247,9 @@ class OngekiServlet(BaseServlet):
         padded = pad(zipped, 16)
 
         crypt = AES.new(
-            bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][0]),
+            self.game_cfg.crypto.key_bytes[internal_ver][0],
             AES.MODE_CBC,
-            bytes.fromhex(self.game_cfg.crypto.keys[internal_ver][1]),
+            self.game_cfg.crypto.key_bytes[internal_ver][1],
         )
 
         return Response(crypt.encrypt(padded))
\ No newline at end of file
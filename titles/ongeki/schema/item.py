@@ -351,6 +351,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_cards(self, aime_id: int, card_list: List[Dict]) -> Optional[int]:
+        rows = [{**card_data, "user": aime_id} for card_data in card_list]
+        result = await self.bulk_upsert(card, rows)
+        if result is None:
+            self.logger.error(f"put_cards: Failed to upsert {len(rows)} cards for user {aime_id}")
+            return None
+        return result
+
     async def get_cards(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(card).where(card.c.user == aime_id)
 
@@ -371,6 +379,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_characters(self, aime_id: int, character_list: List[Dict]) -> Optional[int]:
+        rows = [{**character_data, "user": aime_id} for character_data in character_list]
+        result = await self.bulk_upsert(character, rows)
+        if result is None:
+            self.logger.error(f"put_characters: Failed to upsert {len(rows)} characters for user {aime_id}")
+            return None
+        return result
+
     async def get_characters(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(character).where(character.c.user == aime_id)
 
@@ -391,6 +407,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_decks(self, aime_id: int, deck_list: List[Dict]) -> Optional[int]:
+        rows = [{**deck_data, "user": aime_id} for deck_data in deck_list]
+        result = await self.bulk_upsert(deck, rows)
+        if result is None:
+            self.logger.error(f"put_decks: Failed to upsert {len(rows)} decks for user {aime_id}")
+            return None
+        return result
+
     async def get_deck(self, aime_id: int, deck_id: int) -> Optional[Dict]:
         sql = select(deck).where(and_(deck.c.user == aime_id, deck.c.deckId == deck_id))
 
@@ -419,6 +443,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_bosses(self, aime_id: int, boss_list: List[Dict]) -> Optional[int]:
+        rows = [{**boss_data, "user": aime_id} for boss_data in boss_list]
+        result = await self.bulk_upsert(boss, rows)
+        if result is None:
+            self.logger.error(f"put_bosses: Failed to upsert {len(rows)} bosses for user {aime_id}")
+            return None
+        return result
+
     async def put_story(self, aime_id: int, story_data: Dict) -> Optional[int]:
         story_data["user"] = aime_id
 
@@ -431,6 +463,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_stories(self, aime_id: int, story_list: List[Dict]) -> Optional[int]:
+        rows = [{**story_data, "user": aime_id} for story_data in story_list]
+        result = await self.bulk_upsert(story, rows)
+        if result is None:
+            self.logger.error(f"put_stories: Failed to upsert {len(rows)} stories for user {aime_id}")
+            return None
+        return result
+
     async def get_stories(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(story).where(story.c.user == aime_id)
 
@@ -451,6 +491,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_chapters(self, aime_id: int, chapter_list: List[Dict]) -> Optional[int]:
+        rows = [{**chapter_data, "user": aime_id} for chapter_data in chapter_list]
+        result = await self.bulk_upsert(chapter, rows)
+        if result is None:
+            self.logger.error(f"put_chapters: Failed to upsert {len(rows)} chapters for user {aime_id}")
+            return None
+        return result
+
     async def get_chapters(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(chapter).where(chapter.c.user == aime_id)
 
@@ -471,6 +519,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_items(self, aime_id: int, item_list: List[Dict]) -> Optional[int]:
+        rows = [{**item_data, "user": aime_id} for item_data in item_list]
+        result = await self.bulk_upsert(item, rows)
+        if result is None:
+            self.logger.error(f"put_items: Failed to upsert {len(rows)} items for user {aime_id}")
+            return None
+        return result
+
     async def get_item(self, aime_id: int, item_id: int, item_kind: int) -> Optional[Dict]:
         sql = select(item).where(and_(item.c.user == aime_id, item.c.itemId == item_id))
 
@@ -504,6 +560,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_music_items(self, aime_id: int, music_item_list: List[Dict]) -> Optional[int]:
+        rows = [{**music_item_data, "user": aime_id} for music_item_data in music_item_list]
+        result = await self.bulk_upsert(music_item, rows)
+        if result is None:
+            self.logger.error(f"put_music_items: Failed to upsert {len(rows)} music items for user {aime_id}")
+            return None
+        return result
+
     async def get_music_items(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(music_item).where(music_item.c.user == aime_id)
         result = await self.execute(sql)
@@ -524,6 +588,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_login_bonuses(self, aime_id: int, login_bonus_list: List[Dict]) -> Optional[int]:
+        rows = [{**login_bonus_data, "user": aime_id} for login_bonus_data in login_bonus_list]
+        result = await self.bulk_upsert(login_bonus, rows)
+        if result is None:
+            self.logger.error(f"put_login_bonuses: Failed to upsert {len(rows)} login bonuses for user {aime_id}")
+            return None
+        return result
+
     async def get_login_bonuses(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(login_bonus).where(login_bonus.c.user == aime_id)
         result = await self.execute(sql)
@@ -591,6 +663,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_scenerios(self, aime_id: int, scenerio_list: List[Dict]) -> Optional[int]:
+        rows = [{**scenerio_data, "user": aime_id} for scenerio_data in scenerio_list]
+        result = await self.bulk_upsert(scenerio, rows)
+        if result is None:
+            self.logger.error(f"put_scenerios: Failed to upsert {len(rows)} scenerios for user {aime_id}")
+            return None
+        return result
+
     async def get_scenerios(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(scenerio).where(scenerio.c.user == aime_id)
         result = await self.execute(sql)
@@ -611,6 +691,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_trade_items(self, aime_id: int, trade_item_list: List[Dict]) -> Optional[int]:
+        rows = [{**trade_item_data, "user": aime_id} for trade_item_data in trade_item_list]
+        result = await self.bulk_upsert(trade_item, rows)
+        if result is None:
+            self.logger.error(f"put_trade_items: Failed to upsert {len(rows)} trade items for user {aime_id}")
+            return None
+        return result
+
     async def get_trade_items(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(trade_item).where(trade_item.c.user == aime_id)
         result = await self.execute(sql)
@@ -699,6 +787,14 @@ class OngekiItemData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_memorychapters(self, aime_id: int, memorychapter_list: List[Dict]) -> Optional[int]:
+        rows = [{**memorychapter_data, "user": aime_id} for memorychapter_data in memorychapter_list]
+        result = await self.bulk_upsert(memorychapter, rows)
+        if result is None:
+            self.logger.error(f"put_memorychapters: Failed to upsert {len(rows)} memorychapters for user {aime_id}")
+            return None
+        return result
+
     async def get_memorychapters(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(memorychapter).where(memorychapter.c.user == aime_id)
 
@@ -8,6 +8,7 @@ from sqlalchemy.engine import Row
 from sqlalchemy.dialects.mysql import insert
 
 from core.data.schema import BaseData, metadata
+from core.data import cached, invalidate
 from core.config import CoreConfig
 
 # Cammel case column names technically don't follow the other games but
@@ -302,6 +303,7 @@ class OngekiProfileData(BaseData):
             return None
         return result.fetchone()
 
+    @cached(lifetime=60, tags=["user:{aime_id}"])
     async def get_profile_data(self, aime_id: int, version: int) -> Optional[Row]:
         sql = select(profile).where(
             and_(
@@ -382,6 +384,7 @@ class OngekiProfileData(BaseData):
         sql = insert(profile).values(**data)
         conflict = sql.on_duplicate_key_update(**data)
         result = await self.execute(conflict)
+        invalidate(f"user:{aime_id}")
 
         if result is None:
             self.logger.warning(f"put_profile_data: Failed to update! aime_id: {aime_id}")
@@ -475,6 +478,26 @@ class OngekiProfileData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_profile_activities(self, aime_id: int, activity_list: List[Dict]) -> Optional[int]:
+        rows = [
+            {
+                "user": aime_id,
+                "kind": act["kind"],
+                "activityId": act["id"],
+                "sortNumber": act["sortNumber"],
+                "param1": act["param1"],
+                "param2": act["param2"],
+                "param3": act["param3"],
+                "param4": act["param4"],
+            }
+            for act in activity_list
+        ]
+        result = await self.bulk_upsert(activity, rows)
+        if result is None:
+            self.logger.error(f"put_profile_activities: Failed to upsert {len(rows)} activities for user {aime_id}")
+            return None
+        return result
+
     async def put_profile_region(self, aime_id: int, region: int, date: str) -> Optional[int]:
         sql = insert(activity).values(
             user=aime_id, region=region, playCount=1, created=date
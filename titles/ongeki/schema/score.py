@@ -149,6 +149,14 @@ class OngekiScoreData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_tech_counts(self, aime_id: int, tech_count_list: List[Dict]) -> Optional[int]:
+        rows = [{**tech_count_data, "user": aime_id} for tech_count_data in tech_count_list]
+        result = await self.bulk_upsert(tech_count, rows)
+        if result is None:
+            self.logger.error(f"put_tech_counts: Failed to upsert {len(rows)} tech counts for user {aime_id}")
+            return None
+        return result
+
     async def get_best_scores(self, aime_id: int) -> Optional[List[Dict]]:
         sql = select(score_best).where(score_best.c.user == aime_id)
 
@@ -174,6 +182,14 @@ class OngekiScoreData(BaseData):
             return None
         return result.lastrowid
 
+    async def put_best_scores(self, aime_id: int, music_detail_list: List[Dict]) -> Optional[int]:
+        rows = [{**music_detail, "user": aime_id} for music_detail in music_detail_list]
+        result = await self.bulk_upsert(score_best, rows)
+        if result is None:
+            self.logger.error(f"put_best_scores: Failed to upsert {len(rows)} best scores for user {aime_id}")
+            return None
+        return result
+
     async def put_playlog(self, aime_id: int, playlog_data: Dict) -> Optional[int]:
         playlog_data["user"] = aime_id
 
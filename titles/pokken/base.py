@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 import json, logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import random
 
 from core.data import Data
@@ -9,6 +9,7 @@ from .config import PokkenConfig
 from .proto import jackal_pb2
 from .database import PokkenData
 from .const import PokkenConstants
+from .matching import PokkenMatchmaker, PushFunc
 
 
 class PokkenBase:
@@ -19,6 +20,7 @@ class PokkenBase:
         self.logger = logging.getLogger("pokken")
         self.data = PokkenData(core_cfg)
         self.SUPPORT_SET_NONE = 4294967295
+        self.matching = PokkenMatchmaker(core_cfg)
 
     async def handle_noop(self, request: Any) -> bytes:
         res = jackal_pb2.Response()
@@ -411,37 +413,76 @@ class PokkenBase:
     ) -> Dict:
         return {}
 
+    def __matching_must(self, data: Dict, api: str) -> Optional[Dict]:
+        """
+        The must block of a matching request, or None if it or its pcb_id is missing
+        """
+        must = (data.get("data") or {}).get("must")
+        if not isinstance(must, dict) or must.get("pcb_id") is None:
+            self.logger.warning(f"Matching: {api} without a pcb_id - {data}")
+            return None
+        return must
+
     async def handle_matching_start_matching(
         self, data: Dict = {}, client_ip: str = "127.0.0.1"
     ) -> Dict:
+        must = self.__matching_must(data, "start_matching")
+        if must is None:
+            return await self.handle_matching_noop(data, client_ip)
+
+        await self.matching.start(must["pcb_id"], client_ip, must.get("region", 0), must.get("mode", 0))
         return {}
 
     async def handle_matching_is_matching(
         self, data: Dict = {}, client_ip: str = "127.0.0.1"
     ) -> Dict:
+        must = self.__matching_must(data, "is_matching")
+        if must is None:
+            return await self.handle_matching_noop(data, client_ip)
+
+        pcb_id = must["pcb_id"]
+        session, entry = await self.matching.poll(pcb_id)
+        if session is not None:
+            return {"data": session.make(pcb_id)}
+
         return {
             "data": {
-                "sessionId":"12345678",
-                "A":{
-                    "pcb_id": data["data"]["must"]["pcb_id"],
-                    "gip": client_ip
-                },
-                "list":[]
+                "sessionId": entry.ticket if entry is not None else "",
+                "A": {"pcb_id": pcb_id, "gip": client_ip},
+                "list": [],
             }
         }
 
     async def handle_matching_stop_matching(
         self, data: Dict = {}, client_ip: str = "127.0.0.1"
     ) -> Dict:
+        must = self.__matching_must(data, "stop_matching")
+        if must is None:
+            return await self.handle_matching_noop(data, client_ip)
+
+        await self.matching.stop(must["pcb_id"])
         return {}
 
-    async def handle_admission_noop(self, data: Dict, req_ip: str = "127.0.0.1") -> Dict:
+    async def handle_admission_noop(
+        self, data: Dict, req_ip: str = "127.0.0.1", push: Optional[PushFunc] = None
+    ) -> Dict:
         return {}
-    
-    async def handle_admission_joinsession(self, data: Dict, req_ip: str = "127.0.0.1") -> Dict:
+
+    async def handle_admission_joinsession(
+        self, data: Dict, req_ip: str = "127.0.0.1", push: Optional[PushFunc] = None
+    ) -> Dict:
         self.logger.info(f"Admission: JoinSession from {req_ip}")
-        return {
-            'data': {
-                "id": 12345678
-            }
-        }
+        pcb_id = data.get("data", {}).get("pcb_id")
+        if pcb_id is None:
+            return {"data": {"id": 12345678}}
+
+        session, _ = await self.matching.poll(pcb_id)
+
+        # sessions formed from now on are pushed over this websocket
+        if push is not None:
+            self.matching.subscribe(pcb_id, push, session)
+
+        if session is not None:
+            return {"data": {"id": int(session.id), **session.make(pcb_id)}}
+
+        return {"data": {"id": 12345678}}
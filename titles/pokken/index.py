@@ -4,7 +4,7 @@ from starlette.requests import Request
 from starlette.responses import Response, JSONResponse
 from starlette.routing import Route, WebSocketRoute
 from starlette.websockets import WebSocket, WebSocketState, WebSocketDisconnect
-import ast
+import json
 from datetime import datetime
 import yaml
 import logging, coloredlogs
@@ -27,6 +27,7 @@ class PokkenServlet(BaseServlet):
         self.game_cfg = PokkenConfig()
         if path.exists(f"{cfg_dir}/pokken.yaml"):
             self.game_cfg.update(yaml.safe_load(open(f"{cfg_dir}/pokken.yaml")))
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/pokken.yaml")
 
         self.logger = logging.getLogger("pokken")
         if not hasattr(self.logger, "inited"):
@@ -90,7 +91,16 @@ class PokkenServlet(BaseServlet):
     
     async def handle_admission(self, ws: WebSocket) -> None:
         client_ip = Utils.get_ip_addr(ws)
+        pcb_ids = set()
         await ws.accept()
+
+        async def push(msg: Dict) -> None:
+            self.logger.debug(f"Websocket push to {client_ip}: {msg}")
+            try:
+                await ws.send_json(msg)
+            except Exception as e:
+                self.logger.debug(f"Could not push to {client_ip} - {e}")
+
         while True:
             try:
                 msg: Dict = await ws.receive_json()
@@ -106,8 +116,11 @@ class PokkenServlet(BaseServlet):
             self.logger.debug(f"Admission: Message from {client_ip}:{ws.client.port} - {msg}")
             
             api = msg.get("api", "noop")
-            handler = getattr(self.base, f"handle_admission_{api.lower()}")
-            resp = await handler(msg, client_ip)
+            if isinstance(msg.get("data"), dict) and "pcb_id" in msg["data"]:
+                pcb_ids.add(msg["data"]["pcb_id"])
+
+            handler = getattr(self.base, f"handle_admission_{api.lower()}", self.base.handle_admission_noop)
+            resp = await handler(msg, client_ip, push)
             
             if resp is None:
                 resp = {}
@@ -130,7 +143,10 @@ class PokkenServlet(BaseServlet):
             except Exception as e:                
                 self.logger.error(f"Could not send JSON message to {client_ip} - {e}")
                 break
-        
+
+        for pcb_id in pcb_ids:
+            self.base.matching.unsubscribe(pcb_id, push)
+
         if ws.client_state != WebSocketState.DISCONNECTED:                    
             await ws.close()
 
@@ -172,14 +188,18 @@ class PokkenServlet(BaseServlet):
 
         if content is None or content == b"":
             self.logger.info("Empty matching request")
-            return JSONResponse(self.base.handle_matching_noop())
+            return JSONResponse(await self.base.handle_matching_noop())
+
+        try:
+            json_content = json.loads(content)
+        except ValueError as e:
+            self.logger.warning(f"Could not load JSON from matching request from {client_ip} - {e}")
+            return JSONResponse(await self.base.handle_matching_noop())
+
+        if not isinstance(json_content, dict) or "call" not in json_content:
+            self.logger.warning(f"Malformed matching request from {client_ip} - {json_content}")
+            return JSONResponse(await self.base.handle_matching_noop())
 
-        json_content = ast.literal_eval(
-            content.decode()
-            .replace("null", "None")
-            .replace("true", "True")
-            .replace("false", "False")
-        )
         self.logger.info(f"Matching {json_content['call']} request")
         self.logger.debug(json_content)
 
@@ -192,9 +212,9 @@ class PokkenServlet(BaseServlet):
             self.logger.warning(
                 f"No handler found for message type {json_content['call']}"
             )
-            return JSONResponse(self.base.handle_matching_noop())
+            return JSONResponse(await self.base.handle_matching_noop())
 
-        ret = handler(json_content, client_ip)
+        ret = await handler(json_content, client_ip)
 
         if ret is None:
             ret = {}
@@ -0,0 +1,288 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+
+from core.config import CoreConfig
+from core.store import SharedStore, StoreLockTimeout, get_store
+
+# Pushes a message to a cabinet's admission websocket
+PushFunc = Callable[[Dict], Awaitable[Any]]
+
+
+class MatchingEntry:
+    __slots__ = ("pcb_id", "gip", "key", "ticket", "last_seen")
+
+    def __init__(self, pcb_id: str, gip: str, key: Tuple[Any, Any], ticket: str) -> None:
+        self.pcb_id = pcb_id
+        self.gip = gip
+        self.key = key
+        self.ticket = ticket
+        self.last_seen = time.time()
+
+    def info(self) -> Dict:
+        return {"pcb_id": self.pcb_id, "gip": self.gip}
+
+
+class MatchingSession:
+    __slots__ = ("id", "members", "created")
+
+    def __init__(self, session_id: str, members: List[MatchingEntry]) -> None:
+        self.id = session_id
+        self.members = members
+        self.created = time.time()
+
+    def make(self, pcb_id: str) -> Dict:
+        """
+        The is_matching data for one of the session's cabinets, itself in A and the others in list
+        """
+        me = next(x for x in self.members if x.pcb_id == pcb_id)
+        return {
+            "sessionId": self.id,
+            "A": me.info(),
+            "list": [x.info() for x in self.members if x.pcb_id != pcb_id],
+        }
+
+
+class MatchingState:
+    """
+    The matching queues and sessions. queues holds the waiting cabinets of every
+    (region, mode) in the order they came in, waiting holds all of them from the least to
+    the most recently seen, and sessions is ordered oldest first, so joining, cancelling,
+    pairing and expiring are all O(1) per cabinet.
+    """
+    def __init__(self) -> None:
+        self.queues: Dict[Tuple[Any, Any], "OrderedDict[str, MatchingEntry]"] = {}
+        self.waiting: "OrderedDict[str, MatchingEntry]" = OrderedDict()
+        self.sessions: "OrderedDict[str, MatchingSession]" = OrderedDict()
+        # pcb_id -> id of the session it was put in
+        self.matched: Dict[str, str] = {}
+        self.next_id = 1
+
+    def new_id(self) -> str:
+        session_id = f"{self.next_id:08d}"
+        self.next_id += 1
+        return session_id
+
+    def enqueue(self, pcb_id: str, gip: str, key: Tuple[Any, Any]) -> MatchingEntry:
+        self.stop(pcb_id)
+
+        entry = MatchingEntry(pcb_id, gip, key, self.new_id())
+        self.queues.setdefault(key, OrderedDict())[pcb_id] = entry
+        self.waiting[pcb_id] = entry
+        return entry
+
+    def stop(self, pcb_id: str) -> None:
+        entry = self.waiting.pop(pcb_id, None)
+        if entry is not None:
+            queue = self.queues.get(entry.key)
+            if queue is not None:
+                queue.pop(pcb_id, None)
+                if not queue:
+                    del self.queues[entry.key]
+
+        self.matched.pop(pcb_id, None)
+
+    def session_of(self, pcb_id: str) -> Optional[MatchingSession]:
+        session_id = self.matched.get(pcb_id)
+        return self.sessions.get(session_id) if session_id is not None else None
+
+    def poll(self, pcb_id: str) -> Tuple[Optional[MatchingSession], Optional[MatchingEntry]]:
+        session = self.session_of(pcb_id)
+        if session is not None:
+            return (session, None)
+
+        entry = self.waiting.get(pcb_id)
+        if entry is not None:
+            entry.last_seen = time.time()
+            self.waiting.move_to_end(pcb_id)
+        return (None, entry)
+
+    def pair(self, key: Tuple[Any, Any], size: int) -> Optional[MatchingSession]:
+        queue = self.queues.get(key)
+        if queue is None or len(queue) < size:
+            return None
+
+        members = [queue.popitem(last=False)[1] for _ in range(size)]
+        if not queue:
+            del self.queues[key]
+
+        session = MatchingSession(self.new_id(), members)
+        self.sessions[session.id] = session
+        for entry in members:
+            self.waiting.pop(entry.pcb_id, None)
+            self.matched[entry.pcb_id] = session.id
+        return session
+
+    def expire(self, wait_timeout: int, session_timeout: int) -> None:
+        now = time.time()
+        while self.waiting:
+            entry = next(iter(self.waiting.values()))
+            if now - entry.last_seen <= wait_timeout:
+                break
+            self.stop(entry.pcb_id)
+
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if now - session.created <= session_timeout:
+                break
+            del self.sessions[session.id]
+            for entry in session.members:
+                if self.matched.get(entry.pcb_id) == session.id:
+                    del self.matched[entry.pcb_id]
+
+
+class PokkenMatchmaker:
+    """
+    Pairs cabinets that are looking for an online battle. Once MATCH_SIZE cabinets wait
+    in the same (region, mode) queue they are put in a session, which is handed out by
+    is_matching and pushed to every member that has its admission websocket open.
+    With a single worker the queues are held in this process behind an asyncio lock. With
+    several workers start_matching and is_matching can land on different workers, so the
+    queues are kept under one shared store key instead, updated with SharedStore.locked. If
+    the lock can't be taken the call is treated as a miss. Admission websockets stay on
+    the worker that accepted them, which pushes sessions formed by other workers to them
+    on its next expiry tick.
+    Every EXPIRE_SECONDS, cabinets that stopped polling for WAIT_TIMEOUT seconds and
+    sessions older than SESSION_TIMEOUT seconds are dropped.
+    """
+    MATCH_SIZE = 2
+    WAIT_TIMEOUT = 30
+    SESSION_TIMEOUT = 120
+    EXPIRE_SECONDS = 1
+    STORE_KEY = "pokken:matching"
+
+    def __init__(self, core_cfg: Optional[CoreConfig] = None) -> None:
+        self.core_cfg = core_cfg
+        self.logger = logging.getLogger("pokken")
+        self.lock = asyncio.Lock()
+        self.state = MatchingState()
+        self.listeners: Dict[str, PushFunc] = {}
+        # pcb_id -> id of the last session pushed to it
+        self.pushed: Dict[str, str] = {}
+        self.expiry_task: Optional[asyncio.Task] = None
+        # pushes still being sent, the loop only keeps weak references to its tasks
+        self.push_tasks: Set[asyncio.Task] = set()
+
+    def __store(self) -> Optional[SharedStore]:
+        if self.core_cfg is None or self.core_cfg.server.workers <= 1:
+            return None
+        return get_store(self.core_cfg)
+
+    @asynccontextmanager
+    async def __matching(self) -> AsyncIterator[MatchingState]:
+        if self.expiry_task is None or self.expiry_task.done():
+            self.expiry_task = asyncio.get_running_loop().create_task(self.__expire_loop())
+
+        async with self.lock:
+            store = self.__store()
+            if store is None:
+                self.state.expire(self.WAIT_TIMEOUT, self.SESSION_TIMEOUT)
+                yield self.state
+                return
+
+            async with store.locked(self.STORE_KEY, MatchingState, self.SESSION_TIMEOUT) as state:
+                state.expire(self.WAIT_TIMEOUT, self.SESSION_TIMEOUT)
+                yield state
+
+    async def __expire_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.EXPIRE_SECONDS)
+            if self.__store() is not None and not self.listeners:
+                # the store drops the whole state once nobody touched it for SESSION_TIMEOUT
+                continue
+
+            try:
+                async with self.__matching() as state:
+                    sessions = [state.session_of(pcb_id) for pcb_id in self.listeners]
+
+                for session in sessions:
+                    if session is not None:
+                        self.__notify(session)
+
+            except Exception as e:
+                self.logger.error(f"Matching: failed to expire queues - {e}")
+
+    async def start(self, pcb_id: str, gip: str, region: Any = 0, mode: Any = 0) -> Optional[MatchingSession]:
+        """
+        Queues a cabinet, returns its session if it could be paired right away
+        """
+        key = (region, mode)
+        try:
+            async with self.__matching() as state:
+                state.enqueue(pcb_id, gip, key)
+                session = state.pair(key, self.MATCH_SIZE)
+                self.logger.debug(f"Matching: {pcb_id} waiting in {key}, {len(state.queues.get(key, ()))} waiting")
+
+        except StoreLockTimeout as e:
+            self.logger.error(f"Matching: could not queue {pcb_id} - {e}")
+            return None
+
+        if session is not None:
+            self.logger.info(f"Matching: session {session.id} for {', '.join(x.pcb_id for x in session.members)}")
+            self.__notify(session)
+        return session
+
+    async def stop(self, pcb_id: str) -> None:
+        """
+        Takes a cabinet out of its queue or session
+        """
+        try:
+            async with self.__matching() as state:
+                state.stop(pcb_id)
+
+        except StoreLockTimeout as e:
+            self.logger.error(f"Matching: could not stop {pcb_id} - {e}")
+
+    async def poll(self, pcb_id: str) -> Tuple[Optional[MatchingSession], Optional[MatchingEntry]]:
+        """
+        Returns the cabinet's session if it was paired, otherwise its queue entry, which is
+        None if the cabinet isn't looking for a match
+        """
+        try:
+            async with self.__matching() as state:
+                return state.poll(pcb_id)
+
+        except StoreLockTimeout as e:
+            self.logger.error(f"Matching: could not poll {pcb_id} - {e}")
+            return (None, None)
+
+    def subscribe(self, pcb_id: str, push: PushFunc, current: Optional[MatchingSession] = None) -> None:
+        """
+        Registers a cabinet's admission websocket, sessions are pushed to it as they form.
+        current is the session the cabinet was already given, if any, which isn't pushed again.
+        """
+        self.listeners[pcb_id] = push
+        if current is not None:
+            self.pushed[pcb_id] = current.id
+
+    def unsubscribe(self, pcb_id: str, push: Optional[PushFunc] = None) -> None:
+        if push is None or self.listeners.get(pcb_id) is push:
+            self.listeners.pop(pcb_id, None)
+            self.pushed.pop(pcb_id, None)
+
+    def __notify(self, session: MatchingSession) -> None:
+        loop = asyncio.get_running_loop()
+        for entry in session.members:
+            push = self.listeners.get(entry.pcb_id)
+            if push is None or self.pushed.get(entry.pcb_id) == session.id:
+                continue
+
+            self.pushed[entry.pcb_id] = session.id
+            msg = {"type": "push", "api": "Matched", "result": "true", "data": session.make(entry.pcb_id)}
+            task = loop.create_task(push(msg))
+            self.push_tasks.add(task)
+            task.add_done_callback(self.push_tasks.discard)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counts of this process' queues, with several workers only listeners is meaningful
+        """
+        return {
+            "queues": len(self.state.queues),
+            "waiting": len(self.state.waiting),
+            "matched": len(self.state.matched),
+            "listeners": len(self.listeners),
+        }
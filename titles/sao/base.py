@@ -8,6 +8,7 @@ from core.data import Data
 from core import CoreConfig
 from .config import SaoConfig
 from .database import SaoData
+from .tables import SaoStaticTables
 from titles.sao.handlers.base import *
 
 class SaoBase:
@@ -15,6 +16,7 @@ class SaoBase:
         self.core_cfg = core_cfg
         self.game_cfg = game_cfg
         self.data = SaoData(core_cfg)
+        self.tables = SaoStaticTables(core_cfg, self.data)
         self.version = 0
         self.logger = logging.getLogger("sao")
 
@@ -268,9 +270,7 @@ class SaoBase:
 
         for x in req.material_common_reward_user_data_list:
             hero_exp = 0
-            itemList = await self.data.static.get_item_id(x.user_common_reward_id)
-            heroList = await self.data.static.get_hero_id(x.user_common_reward_id)
-            equipmentList = await self.data.static.get_equipment_id(x.user_common_reward_id)
+            heroList, equipmentList, itemList = await self.tables.reward_kind(x.user_common_reward_id)
 
             if itemList:
                 hero_exp = 2000 + int(synthesize_hero_log_data["log_exp"])
@@ -341,9 +341,7 @@ class SaoBase:
 
         for x in req_data.material_common_reward_user_data_list:
             equipment_exp = 0
-            itemList = await self.data.static.get_item_id(x.user_common_reward_id)
-            heroList = await self.data.static.get_hero_id(x.user_common_reward_id)
-            equipmentList = await self.data.static.get_equipment_id(x.user_common_reward_id)
+            heroList, equipmentList, itemList = await self.tables.reward_kind(x.user_common_reward_id)
 
             if itemList:
                 equipment_exp = 2000 + int(synthesize_equipment_data["enhancement_exp"])
@@ -491,21 +489,7 @@ class SaoBase:
 
 
         # Calculate level based off experience and the CSV list
-        with open(r'titles/sao/data/PlayerRank.csv') as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=',')
-            line_count = 0
-            data = []
-            rowf = False
-            for row in csv_reader:
-                if rowf==False:
-                    rowf=True
-                else:
-                    data.append(row)           
-            
-        for i in range(0,len(data)):
-            if exp>=int(data[i][1]) and exp<int(data[i+1][1]):
-                player_level = int(data[i][0])
-                break
+        player_level = self.tables.player_rank(exp)
 
         # Update profile
         updated_profile = await self.data.profile.put_profile(
@@ -535,21 +519,7 @@ class SaoBase:
             log_exp = int(hero_data["log_exp"]) + int(req_data.play_end_request_data_list[0].base_get_data_list[0].get_hero_log_exp)
 
             # Calculate hero level based off experience and the CSV list
-            with open(r'titles/sao/data/HeroLogLevel.csv') as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=',')
-                line_count = 0
-                data = []
-                rowf = False
-                for row in csv_reader:
-                    if rowf==False:
-                        rowf=True
-                    else:
-                        data.append(row)
-                
-            for e in range(0,len(data)):
-                if log_exp>=int(data[e][1]) and log_exp<int(data[e+1][1]):
-                    hero_level = int(data[e][0])
-                    break
+            hero_level = self.tables.hero_level(log_exp)
 
             await self.data.item.put_hero_log(
                 user_id,
@@ -569,12 +539,11 @@ class SaoBase:
         json_data = {"data": []}
 
         for r in range(0,req_data.play_end_request_data_list[0].get_rare_drop_data_count):
-            rewardList = await self.data.static.get_rare_drop_id(int(req_data.play_end_request_data_list[0].get_rare_drop_data_list[r].quest_rare_drop_id))
-            commonRewardId = rewardList["commonRewardId"]
+            commonRewardId = await self.tables.rare_drop_reward(req_data.play_end_request_data_list[0].get_rare_drop_data_list[r].quest_rare_drop_id)
+            if commonRewardId is None:
+                continue
 
-            heroList = await self.data.static.get_hero_id(commonRewardId)
-            equipmentList = await self.data.static.get_equipment_id(commonRewardId)
-            itemList = await self.data.static.get_item_id(commonRewardId)
+            heroList, equipmentList, itemList = await self.tables.reward_kind(commonRewardId)
 
             if heroList:
                 await self.data.item.put_hero_log(user_id, commonRewardId, 1, 0, 101000016, 0, 30086, 1001, 1002, 0, 0)
@@ -585,22 +554,19 @@ class SaoBase:
         
         # Generate random hero(es) based off the response    
         for a in range(0,req_data.play_end_request_data_list[0].get_unanalyzed_log_tmp_reward_data_count):
-            with open('titles/sao/data/RewardTable.csv', 'r') as f:
-                keys_unanalyzed = next(f).strip().split(',')
-                data_unanalyzed = list(DictReader(f, fieldnames=keys_unanalyzed))
-
-            randomized_unanalyzed_id = choice(data_unanalyzed)
-            heroList = await self.data.static.get_hero_id(randomized_unanalyzed_id['CommonRewardId'])
-            equipmentList = await self.data.static.get_equipment_id(randomized_unanalyzed_id['CommonRewardId'])
-            itemList = await self.data.static.get_item_id(randomized_unanalyzed_id['CommonRewardId'])
+            randomized_unanalyzed_id = self.tables.random_unanalyzed_reward()
+            if randomized_unanalyzed_id is None:
+                break
+
+            heroList, equipmentList, itemList = await self.tables.reward_kind(randomized_unanalyzed_id)
             if heroList:
-                await self.data.item.put_hero_log(user_id, randomized_unanalyzed_id['CommonRewardId'], 1, 0, 101000016, 0, 30086, 1001, 1002, 0, 0)
+                await self.data.item.put_hero_log(user_id, randomized_unanalyzed_id, 1, 0, 101000016, 0, 30086, 1001, 1002, 0, 0)
             if equipmentList:
-                await self.data.item.put_equipment_data(user_id, randomized_unanalyzed_id['CommonRewardId'], 1, 200, 0, 0, 0)
+                await self.data.item.put_equipment_data(user_id, randomized_unanalyzed_id, 1, 200, 0, 0, 0)
             if itemList:
-                await self.data.item.put_item(user_id, randomized_unanalyzed_id['CommonRewardId'])
+                await self.data.item.put_item(user_id, randomized_unanalyzed_id)
 
-            json_data["data"].append(randomized_unanalyzed_id['CommonRewardId'])
+            json_data["data"].append(randomized_unanalyzed_id)
             
         # Send response
 
@@ -688,21 +654,7 @@ class SaoBase:
         col = int(profile["own_col"]) + int(req_data.play_end_request_data_list[0].base_get_data_list[0].get_col)
 
         # Calculate level based off experience and the CSV list
-        with open(r'titles/sao/data/PlayerRank.csv') as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=',')
-            line_count = 0
-            data = []
-            rowf = False
-            for row in csv_reader:
-                if rowf==False:
-                    rowf=True
-                else:
-                    data.append(row)           
-            
-        for i in range(0,len(data)):
-            if exp>=int(data[i][1]) and exp<int(data[i+1][1]):
-                player_level = int(data[i][0])
-                break
+        player_level = self.tables.player_rank(exp)
 
         updated_profile = await self.data.profile.put_profile(
             user_id,
@@ -731,21 +683,7 @@ class SaoBase:
             log_exp = int(hero_data["log_exp"]) + int(req_data.play_end_request_data_list[0].base_get_data_list[0].get_hero_log_exp)
 
             # Calculate hero level based off experience and the CSV list
-            with open(r'titles/sao/data/HeroLogLevel.csv') as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=',')
-                line_count = 0
-                data = []
-                rowf = False
-                for row in csv_reader:
-                    if rowf==False:
-                        rowf=True
-                    else:
-                        data.append(row)
-                
-            for e in range(0,len(data)):
-                if log_exp>=int(data[e][1]) and log_exp<int(data[e+1][1]):
-                    hero_level = int(data[e][0])
-                    break
+            hero_level = self.tables.hero_level(log_exp)
 
             await self.data.item.put_hero_log(
                 user_id,
@@ -765,12 +703,11 @@ class SaoBase:
         
         # Grab the rare loot from the table, match it with the right item and then push to the player profile
         for x in req_data.play_end_request_data_list[0].get_rare_drop_data_list:
-            rewardList = await self.data.static.get_rare_drop_id(int(x.quest_rare_drop_id))
-            commonRewardId = rewardList["commonRewardId"]
+            commonRewardId = await self.tables.rare_drop_reward(x.quest_rare_drop_id)
+            if commonRewardId is None:
+                continue
 
-            heroList = await self.data.static.get_hero_id(commonRewardId)
-            equipmentList = await self.data.static.get_equipment_id(commonRewardId)
-            itemList = await self.data.static.get_item_id(commonRewardId)
+            heroList, equipmentList, itemList = await self.tables.reward_kind(commonRewardId)
 
             if heroList:
                 await self.data.item.put_hero_log(user_id, commonRewardId, 1, 0, 101000016, 0, 30086, 1001, 1002, 0, 0)
@@ -781,26 +718,19 @@ class SaoBase:
 
         # Generate random hero(es) based off the response    
         for x in req_data.play_end_request_data_list[0].get_unanalyzed_log_tmp_reward_data_list:
-            
-            with open('titles/sao/data/RewardTable.csv', 'r') as f:
-                keys_unanalyzed = next(f).strip().split(',')
-                data_unanalyzed = list(DictReader(f, fieldnames=keys_unanalyzed))
+            randomized_unanalyzed_id = self.tables.random_unanalyzed_reward(x.unanalyzed_log_grade_id)
+            if randomized_unanalyzed_id is None:
+                break
 
-            randomized_unanalyzed_id = choice(data_unanalyzed)
-            while int(randomized_unanalyzed_id['UnanalyzedLogGradeId']) != x.unanalyzed_log_grade_id:
-                randomized_unanalyzed_id = choice(data_unanalyzed)
-            
-            heroList = await self.data.static.get_hero_id(randomized_unanalyzed_id['CommonRewardId'])
-            equipmentList = await self.data.static.get_equipment_id(randomized_unanalyzed_id['CommonRewardId'])
-            itemList = await self.data.static.get_item_id(randomized_unanalyzed_id['CommonRewardId'])
+            heroList, equipmentList, itemList = await self.tables.reward_kind(randomized_unanalyzed_id)
             if heroList:
-                await self.data.item.put_hero_log(user_id, randomized_unanalyzed_id['CommonRewardId'], 1, 0, 101000016, 0, 30086, 1001, 1002, 0, 0)
+                await self.data.item.put_hero_log(user_id, randomized_unanalyzed_id, 1, 0, 101000016, 0, 30086, 1001, 1002, 0, 0)
             if equipmentList:
-                await self.data.item.put_equipment_data(user_id, randomized_unanalyzed_id['CommonRewardId'], 1, 200, 0, 0, 0)
+                await self.data.item.put_equipment_data(user_id, randomized_unanalyzed_id, 1, 200, 0, 0, 0)
             if itemList:
-                await self.data.item.put_item(user_id, randomized_unanalyzed_id['CommonRewardId'])
+                await self.data.item.put_item(user_id, randomized_unanalyzed_id)
 
-            json_data["data"].append(randomized_unanalyzed_id['CommonRewardId'])
+            json_data["data"].append(randomized_unanalyzed_id)
             
         # Send response
 
@@ -816,7 +746,7 @@ class SaoBase:
 
         end_session_data = await self.data.item.get_end_session(req.user_id)
 
-        resp = SaoEpisodePlayEndUnanalyzedLogFixedResponse(header.cmd +1, end_session_data[4])
+        resp = SaoEpisodePlayEndUnanalyzedLogFixedResponse(header.cmd +1, end_session_data[4], self.tables.unanalyzed_rewards)
         return resp.make()
 
     async def handle_c91a(self, header: SaoRequestHeader, request: bytes) -> bytes: # handler is identical to the episode
@@ -825,7 +755,7 @@ class SaoBase:
 
         end_session_data = await self.data.item.get_end_session(req.user_id)
 
-        resp = SaoEpisodePlayEndUnanalyzedLogFixedResponse(header.cmd +1, end_session_data[4])
+        resp = SaoEpisodePlayEndUnanalyzedLogFixedResponse(header.cmd +1, end_session_data[4], self.tables.unanalyzed_rewards)
         return resp.make()
 
     async def handle_cd00(self, header: SaoRequestHeader, request: bytes) -> bytes:
@@ -1,6 +1,6 @@
 import struct
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Tuple
 from construct import *
 from .helpers import *
 import csv
@@ -553,6 +553,31 @@ class SaoGetHeroLogUserDataListRequest(SaoBaseRequest):
         self.user_id = decode_str(data, 0)[0]
 
 class SaoGetHeroLogUserDataListResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(
+        ("user_hero_log_id", STR),
+        ("hero_log_id", INT),
+        ("log_level", SHORT),
+        ("max_log_level_extended_num", SHORT),
+        ("log_exp", INT),
+        ("possible_awakening_flag", BYTE),
+        ("awakening_stage", SHORT),
+        ("awakening_exp", INT),
+        ("skill_slot_correction_value", BYTE),
+        ("last_set_skill_slot1_skill_id", SHORT),
+        ("last_set_skill_slot2_skill_id", SHORT),
+        ("last_set_skill_slot3_skill_id", SHORT),
+        ("last_set_skill_slot4_skill_id", SHORT),
+        ("last_set_skill_slot5_skill_id", SHORT),
+        ("property1_property_id", INT), ("property1_value1", INT), ("property1_value2", INT),
+        ("property2_property_id", INT), ("property2_value1", INT), ("property2_value2", INT),
+        ("property3_property_id", INT), ("property3_value1", INT), ("property3_value2", INT),
+        ("property4_property_id", INT), ("property4_value1", INT), ("property4_value2", INT),
+        ("converted_card_num", SHORT),
+        ("shop_purchase_flag", BYTE),
+        ("protect_flag", BYTE),
+        ("get_date", STR),
+    )
+
     def __init__(self, cmd, hero_data) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -567,20 +592,19 @@ class SaoGetHeroLogUserDataListResponse(SaoBaseResponse):
         self.last_set_skill_slot4_skill_id = []
         self.last_set_skill_slot5_skill_id = []
 
-        for i in range(len(hero_data)):
-
-            # Calculate level based off experience and the CSV list
-            with open(r'titles/sao/data/HeroLogLevel.csv') as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=',')
-                line_count = 0
-                data = []
-                rowf = False
-                for row in csv_reader:
-                    if rowf==False:
-                        rowf=True
-                    else:
-                        data.append(row)
+        # Calculate level based off experience and the CSV list
+        with open(r'titles/sao/data/HeroLogLevel.csv') as csv_file:
+            csv_reader = csv.reader(csv_file, delimiter=',')
+            line_count = 0
+            data = []
+            rowf = False
+            for row in csv_reader:
+                if rowf==False:
+                    rowf=True
+                else:
+                    data.append(row)
 
+        for i in range(len(hero_data)):
             exp = hero_data[i][4]
                 
             for e in range(0,len(data)):
@@ -631,99 +655,21 @@ class SaoGetHeroLogUserDataListResponse(SaoBaseResponse):
         self.get_date = "20230101120000" #str
     
     def make(self) -> bytes:
-        #new stuff
-
-        hero_log_user_data_list_struct = Struct(
-            "user_hero_log_id_size" / Int32ub,  # big endian
-            "user_hero_log_id" / Int16ul[9], #string
-            "hero_log_id" / Int32ub, #int
-            "log_level" / Int16ub, #short
-            "max_log_level_extended_num" / Int16ub, #short
-            "log_exp" / Int32ub, #int
-            "possible_awakening_flag" / Int8ul,  # result is either 0 or 1
-            "awakening_stage" / Int16ub, #short
-            "awakening_exp" / Int32ub, #int
-            "skill_slot_correction_value" / Int8ul,  # result is either 0 or 1
-            "last_set_skill_slot1_skill_id" / Int16ub, #short
-            "last_set_skill_slot2_skill_id" / Int16ub, #short
-            "last_set_skill_slot3_skill_id" / Int16ub, #short
-            "last_set_skill_slot4_skill_id" / Int16ub, #short
-            "last_set_skill_slot5_skill_id" / Int16ub, #short
-            "property1_property_id" / Int32ub,
-            "property1_value1" / Int32ub,
-            "property1_value2" / Int32ub,
-            "property2_property_id" / Int32ub,
-            "property2_value1" / Int32ub,
-            "property2_value2" / Int32ub,
-            "property3_property_id" / Int32ub,
-            "property3_value1" / Int32ub,
-            "property3_value2" / Int32ub,
-            "property4_property_id" / Int32ub,
-            "property4_value1" / Int32ub,
-            "property4_value2" / Int32ub,
-            "converted_card_num" / Int16ub,
-            "shop_purchase_flag" / Int8ul,  # result is either 0 or 1
-            "protect_flag" / Int8ul,  # result is either 0 or 1
-            "get_date_size" / Int32ub,  # big endian
-            "get_date" / Int16ul[len(self.get_date)],
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "hero_log_user_data_list_size" / Rebuild(Int32ub, len_(this.hero_log_user_data_list)),  # big endian
-            "hero_log_user_data_list" / Array(this.hero_log_user_data_list_size, hero_log_user_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            hero_log_user_data_list_size=0,
-            hero_log_user_data_list=[],
-        )))
-
-        for i in range(len(self.hero_log_id)):
-            hero_data = dict(
-                user_hero_log_id_size=len(self.user_hero_log_id[i]) * 2,
-                user_hero_log_id=[ord(x) for x in self.user_hero_log_id[i]],
-                hero_log_id=self.hero_log_id[i],
-                log_level=self.log_level[i],
-                max_log_level_extended_num=self.max_log_level_extended_num[i],
-                log_exp=self.log_exp[i],
-                possible_awakening_flag=self.possible_awakening_flag,
-                awakening_stage=self.awakening_stage,
-                awakening_exp=self.awakening_exp,
-                skill_slot_correction_value=self.skill_slot_correction_value,
-                last_set_skill_slot1_skill_id=self.last_set_skill_slot1_skill_id[i],
-                last_set_skill_slot2_skill_id=self.last_set_skill_slot2_skill_id[i],
-                last_set_skill_slot3_skill_id=self.last_set_skill_slot3_skill_id[i],
-                last_set_skill_slot4_skill_id=self.last_set_skill_slot4_skill_id[i],
-                last_set_skill_slot5_skill_id=self.last_set_skill_slot5_skill_id[i],
-                property1_property_id=self.property1_property_id,
-                property1_value1=self.property1_value1,
-                property1_value2=self.property1_value2,
-                property2_property_id=self.property2_property_id,
-                property2_value1=self.property2_value1,
-                property2_value2=self.property2_value2,
-                property3_property_id=self.property3_property_id,
-                property3_value1=self.property3_value1,
-                property3_value2=self.property3_value2,
-                property4_property_id=self.property4_property_id,
-                property4_value1=self.property4_value1,
-                property4_value2=self.property4_value2,
-                converted_card_num=self.converted_card_num,
-                shop_purchase_flag=self.shop_purchase_flag,
-                protect_flag=self.protect_flag,
-                get_date_size=len(self.get_date) * 2,
-                get_date=[ord(x) for x in self.get_date],
-
+        rows = [
+            (
+                self.user_hero_log_id[i], self.hero_log_id[i], self.log_level[i], self.max_log_level_extended_num[i],
+                self.log_exp[i], self.possible_awakening_flag, self.awakening_stage, self.awakening_exp,
+                self.skill_slot_correction_value, self.last_set_skill_slot1_skill_id[i], self.last_set_skill_slot2_skill_id[i],
+                self.last_set_skill_slot3_skill_id[i], self.last_set_skill_slot4_skill_id[i], self.last_set_skill_slot5_skill_id[i],
+                self.property1_property_id, self.property1_value1, self.property1_value2,
+                self.property2_property_id, self.property2_value1, self.property2_value2,
+                self.property3_property_id, self.property3_value1, self.property3_value2,
+                self.property4_property_id, self.property4_value1, self.property4_value2,
+                self.converted_card_num, self.shop_purchase_flag, self.protect_flag, self.get_date,
             )
-            
-            resp_data.hero_log_user_data_list.append(hero_data)
-
-        resp_data["hero_log_user_data_list_size"] = len(resp_data.hero_log_user_data_list)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+            for i in range(len(self.hero_log_id))
+        ]
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -734,6 +680,25 @@ class SaoGetEquipmentUserDataListRequest(SaoBaseRequest):
         self.user_id = decode_str(data, 0)[0]
 
 class SaoGetEquipmentUserDataListResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(
+        ("user_equipment_id", STR),
+        ("equipment_id", INT),
+        ("enhancement_value", SHORT),
+        ("max_enhancement_value_extended_num", SHORT),
+        ("enhancement_exp", INT),
+        ("possible_awakening_flag", BYTE),
+        ("awakening_stage", SHORT),
+        ("awakening_exp", INT),
+        ("property1_property_id", INT), ("property1_value1", INT), ("property1_value2", INT),
+        ("property2_property_id", INT), ("property2_value1", INT), ("property2_value2", INT),
+        ("property3_property_id", INT), ("property3_value1", INT), ("property3_value2", INT),
+        ("property4_property_id", INT), ("property4_value1", INT), ("property4_value2", INT),
+        ("converted_card_num", SHORT),
+        ("shop_purchase_flag", BYTE),
+        ("protect_flag", BYTE),
+        ("get_date", STR),
+    )
+
     def __init__(self, cmd, equipment_data) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -747,20 +712,19 @@ class SaoGetEquipmentUserDataListResponse(SaoBaseResponse):
         self.possible_awakening_flag = []
         equipment_level = 0
         
-        for i in range(len(equipment_data)):
-
-            # Calculate level based off experience and the CSV list
-            with open(r'titles/sao/data/EquipmentLevel.csv') as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=',')
-                line_count = 0
-                data = []
-                rowf = False
-                for row in csv_reader:
-                    if rowf==False:
-                        rowf=True
-                    else:
-                        data.append(row)
+        # Calculate level based off experience and the CSV list
+        with open(r'titles/sao/data/EquipmentLevel.csv') as csv_file:
+            csv_reader = csv.reader(csv_file, delimiter=',')
+            line_count = 0
+            data = []
+            rowf = False
+            for row in csv_reader:
+                if rowf==False:
+                    rowf=True
+                else:
+                    data.append(row)
 
+        for i in range(len(equipment_data)):
             exp = equipment_data[i][4]
                 
             for e in range(0,len(data)):
@@ -803,86 +767,20 @@ class SaoGetEquipmentUserDataListResponse(SaoBaseResponse):
         self.get_date = "20230101120000" #str
     
     def make(self) -> bytes:
-
-        equipment_user_data_list_struct = Struct(
-            "user_equipment_id_size" / Int32ub,  # big endian
-            "user_equipment_id" / Int16ul[9], #string
-            "equipment_id" / Int32ub, #int
-            "enhancement_value" / Int16ub, #short
-            "max_enhancement_value_extended_num" / Int16ub, #short
-            "enhancement_exp" / Int32ub, #int
-            "possible_awakening_flag" / Int8ul,  # result is either 0 or 1
-            "awakening_stage" / Int16ub, #short
-            "awakening_exp" / Int32ub, #int
-            "property1_property_id" / Int32ub,
-            "property1_value1" / Int32ub,
-            "property1_value2" / Int32ub,
-            "property2_property_id" / Int32ub,
-            "property2_value1" / Int32ub,
-            "property2_value2" / Int32ub,
-            "property3_property_id" / Int32ub,
-            "property3_value1" / Int32ub,
-            "property3_value2" / Int32ub,
-            "property4_property_id" / Int32ub,
-            "property4_value1" / Int32ub,
-            "property4_value2" / Int32ub,
-            "converted_card_num" / Int16ub,
-            "shop_purchase_flag" / Int8ul,  # result is either 0 or 1
-            "protect_flag" / Int8ul,  # result is either 0 or 1
-            "get_date_size" / Int32ub,  # big endian
-            "get_date" / Int16ul[len(self.get_date)],
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "equipment_user_data_list_size" / Rebuild(Int32ub, len_(this.equipment_user_data_list)),  # big endian
-            "equipment_user_data_list" / Array(this.equipment_user_data_list_size, equipment_user_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            equipment_user_data_list_size=0,
-            equipment_user_data_list=[],
-        )))
-
-        for i in range(len(self.equipment_id)):
-            equipment_data = dict(
-                user_equipment_id_size=len(self.user_equipment_id[i]) * 2,
-                user_equipment_id=[ord(x) for x in self.user_equipment_id[i]],
-                equipment_id=self.equipment_id[i],
-                enhancement_value=self.enhancement_value[i],
-                max_enhancement_value_extended_num=self.max_enhancement_value_extended_num[i],
-                enhancement_exp=self.enhancement_exp[i],
-                possible_awakening_flag=self.possible_awakening_flag[i],
-                awakening_stage=self.awakening_stage[i],
-                awakening_exp=self.awakening_exp[i],
-                property1_property_id=self.property1_property_id,
-                property1_value1=self.property1_value1,
-                property1_value2=self.property1_value2,
-                property2_property_id=self.property2_property_id,
-                property2_value1=self.property2_value1,
-                property2_value2=self.property2_value2,
-                property3_property_id=self.property3_property_id,
-                property3_value1=self.property3_value1,
-                property3_value2=self.property3_value2,
-                property4_property_id=self.property4_property_id,
-                property4_value1=self.property4_value1,
-                property4_value2=self.property4_value2,
-                converted_card_num=self.converted_card_num,
-                shop_purchase_flag=self.shop_purchase_flag,
-                protect_flag=self.protect_flag,
-                get_date_size=len(self.get_date) * 2,
-                get_date=[ord(x) for x in self.get_date],
-
+        rows = [
+            (
+                self.user_equipment_id[i], self.equipment_id[i], self.enhancement_value[i],
+                self.max_enhancement_value_extended_num[i], self.enhancement_exp[i], self.possible_awakening_flag[i],
+                self.awakening_stage[i], self.awakening_exp[i],
+                self.property1_property_id, self.property1_value1, self.property1_value2,
+                self.property2_property_id, self.property2_value1, self.property2_value2,
+                self.property3_property_id, self.property3_value1, self.property3_value2,
+                self.property4_property_id, self.property4_value1, self.property4_value2,
+                self.converted_card_num, self.shop_purchase_flag, self.protect_flag, self.get_date,
             )
-            
-            resp_data.equipment_user_data_list.append(equipment_data)
-
-        resp_data["equipment_user_data_list_size"] = len(resp_data.equipment_user_data_list)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+            for i in range(len(self.equipment_id))
+        ]
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -893,6 +791,13 @@ class SaoGetItemUserDataListRequest(SaoBaseRequest):
         self.user_id = decode_str(data, 0)[0]
 
 class SaoGetItemUserDataListResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(
+        ("user_item_id", STR),
+        ("item_id", INT),
+        ("protect_flag", BYTE),
+        ("get_date", STR),
+    )
+
     def __init__(self, cmd, item_data) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -909,47 +814,11 @@ class SaoGetItemUserDataListResponse(SaoBaseResponse):
         self.get_date = "20230101120000" #str
     
     def make(self) -> bytes:
-        #new stuff
-
-        item_user_data_list_struct = Struct(
-            "user_item_id_size" / Int32ub,  # big endian
-            "user_item_id" / Int16ul[6], #string but this will not work with 10000 IDs... only with 6 digits
-            "item_id" / Int32ub, #int
-            "protect_flag" / Int8ul,  # result is either 0 or 1
-            "get_date_size" / Int32ub,  # big endian
-            "get_date" / Int16ul[len(self.get_date)],
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "item_user_data_list_size" / Rebuild(Int32ub, len_(this.item_user_data_list)),  # big endian
-            "item_user_data_list" / Array(this.item_user_data_list_size, item_user_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            item_user_data_list_size=0,
-            item_user_data_list=[],
-        )))
-
-        for i in range(len(self.item_id)):
-            item_data = dict(
-                user_item_id_size=len(self.user_item_id[i]) * 2,
-                user_item_id=[ord(x) for x in self.user_item_id[i]],
-                item_id=self.item_id[i],
-                protect_flag=self.protect_flag,
-                get_date_size=len(self.get_date) * 2,
-                get_date=[ord(x) for x in self.get_date],
-
-            )
-            
-            resp_data.item_user_data_list.append(item_data)
-
-        resp_data["item_user_data_list_size"] = len(resp_data.item_user_data_list)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+        rows = [
+            (self.user_item_id[i], self.item_id[i], self.protect_flag, self.get_date)
+            for i in range(len(self.item_id))
+        ]
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -959,6 +828,18 @@ class SaoGetSupportLogUserDataListRequest(SaoBaseRequest):
         super().__init__(header, data)
 
 class SaoGetSupportLogUserDataListResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(
+        ("user_support_log_id", STR),
+        ("support_log_id", INT),
+        ("possible_awakening_flag", BYTE),
+        ("awakening_stage", SHORT),
+        ("awakening_exp", INT),
+        ("converted_card_num", SHORT),
+        ("shop_purchase_flag", BYTE),
+        ("protect_flag", BYTE),
+        ("get_date", STR),
+    )
+
     def __init__(self, cmd, supportIdsData) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -975,54 +856,14 @@ class SaoGetSupportLogUserDataListResponse(SaoBaseResponse):
         self.get_date = "20230101120000" #str
     
     def make(self) -> bytes:
-        support_log_user_data_list_struct = Struct(
-            "user_support_log_id_size" / Int32ub,  # big endian
-            "user_support_log_id" / Int16ul[9],
-            "support_log_id" / Int32ub, #int
-            "possible_awakening_flag" / Int8ul,  # result is either 0 or 1
-            "awakening_stage" / Int16ub, #short
-            "awakening_exp" / Int32ub, # int
-            "converted_card_num" / Int16ub, #short
-            "shop_purchase_flag" / Int8ul,  # result is either 0 or 1
-            "protect_flag" / Int8ul,  # result is either 0 or 1
-            "get_date_size" / Int32ub,  # big endian
-            "get_date" / Int16ul[len(self.get_date)],
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "support_log_user_data_list_size" / Rebuild(Int32ub, len_(this.support_log_user_data_list)),  # big endian
-            "support_log_user_data_list" / Array(this.support_log_user_data_list_size, support_log_user_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            support_log_user_data_list_size=0,
-            support_log_user_data_list=[],
-        )))
-
-        for i in range(len(self.support_log_id)):
-            support_data = dict(
-                user_support_log_id_size=len(self.user_support_log_id[i]) * 2,
-                user_support_log_id=[ord(x) for x in self.user_support_log_id[i]],
-                support_log_id=self.support_log_id[i],
-                possible_awakening_flag=self.possible_awakening_flag,
-                awakening_stage=self.awakening_stage,
-                awakening_exp=self.awakening_exp,
-                converted_card_num=self.converted_card_num,
-                shop_purchase_flag=self.shop_purchase_flag,
-                protect_flag=self.protect_flag,
-                get_date_size=len(self.get_date) * 2,
-                get_date=[ord(x) for x in self.get_date],
-
+        rows = [
+            (
+                self.user_support_log_id[i], self.support_log_id[i], self.possible_awakening_flag, self.awakening_stage,
+                self.awakening_exp, self.converted_card_num, self.shop_purchase_flag, self.protect_flag, self.get_date,
             )
-            
-            resp_data.support_log_user_data_list.append(support_data)
-
-        resp_data["support_log_user_data_list_size"] = len(resp_data.support_log_user_data_list)
-
-        resp_data = resp_struct.build(resp_data)
+            for i in range(len(self.support_log_id))
+        ]
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -1032,6 +873,8 @@ class SaoGetTitleUserDataListRequest(SaoBaseRequest):
         super().__init__(header, data)
 
 class SaoGetTitleUserDataListResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(("user_title_id", STR), ("title_id", INT))
+
     def __init__(self, cmd, titleIdsData) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -1041,38 +884,8 @@ class SaoGetTitleUserDataListResponse(SaoBaseResponse):
         self.title_id = titleIdsData #int
     
     def make(self) -> bytes:
-        title_user_data_list_struct = Struct(
-            "user_title_id_size" / Int32ub,  # big endian
-            "user_title_id" / Int16ul[6], #string
-            "title_id" / Int32ub, #int
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "title_user_data_list_size" / Rebuild(Int32ub, len_(this.title_user_data_list)),  # big endian
-            "title_user_data_list" / Array(this.title_user_data_list_size, title_user_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            title_user_data_list_size=0,
-            title_user_data_list=[],
-        )))
-
-        for i in range(len(self.title_id)):
-            title_data = dict(
-                user_title_id_size=len(self.user_title_id[i]) * 2,
-                user_title_id=[ord(x) for x in self.user_title_id[i]],
-                title_id=self.title_id[i],
-            )
-            
-            resp_data.title_user_data_list.append(title_data)
-
-        resp_data["title_user_data_list_size"] = len(resp_data.title_user_data_list)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+        rows = [(self.user_title_id[i], self.title_id[i]) for i in range(len(self.title_id))]
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -1083,6 +896,13 @@ class SaoGetEpisodeAppendDataListRequest(SaoBaseRequest):
         self.user_id = decode_str(data, 0)[0]
 
 class SaoGetEpisodeAppendDataListResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(
+        ("user_episode_append_id", STR),
+        ("user_id", STR),
+        ("episode_append_id", INT),
+        ("own_num", INT),
+    )
+
     def __init__(self, cmd, profile_data) -> None:
         super().__init__(cmd)
         self.length = None
@@ -1094,46 +914,11 @@ class SaoGetEpisodeAppendDataListResponse(SaoBaseResponse):
         self.own_num_list = [3, 3, 3, 3 ,3]
     
     def make(self) -> bytes:
-        episode_data_struct = Struct(
-            "user_episode_append_id_size" / Rebuild(Int32ub, len_(this.user_episode_append_id) * 2),  # calculates the length of the user_episode_append_id
-            "user_episode_append_id" / PaddedString(this.user_episode_append_id_size, "utf_16_le"),  # user_episode_append_id is a (zero) padded string
-            "user_id_size" / Rebuild(Int32ub, len_(this.user_id) * 2),  # calculates the length of the user_id
-            "user_id" / PaddedString(this.user_id_size, "utf_16_le"),  # user_id is a (zero) padded string
-            "episode_append_id" / Int32ub,
-            "own_num" / Int32ub,
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "episode_append_data_list_size" / Rebuild(Int32ub, len_(this.episode_append_data_list)),  # big endian
-            "episode_append_data_list" / Array(this.episode_append_data_list_size, episode_data_struct),
-        )
-
-        # really dump to parse the build resp, but that creates a new object
-        # and is nicer to twork with
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            episode_append_data_list_size=0,
-            episode_append_data_list=[],
-        )))
-
         if len(self.user_episode_append_id_list) != len(self.user_id_list) != len(self.episode_append_id_list) != len(self.own_num_list):
             raise ValueError("all lists must be of the same length")
 
-        for i in range(len(self.user_id_list)):
-            # add the episode_data_struct to the resp_struct.episode_append_data_list
-            resp_data.episode_append_data_list.append(dict(
-                user_episode_append_id=self.user_episode_append_id_list[i],
-                user_id=self.user_id_list[i],
-                episode_append_id=self.episode_append_id_list[i],
-                own_num=self.own_num_list[i],
-            ))
-
-        resp_data["episode_append_data_list_size"] = len(resp_data.episode_append_data_list)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+        rows = zip(self.user_episode_append_id_list, self.user_id_list, self.episode_append_id_list, self.own_num_list)
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -1888,7 +1673,15 @@ class SaoEpisodePlayEndUnanalyzedLogFixedRequest(SaoBaseRequest):
         off += BYTE_OFF
 
 class SaoEpisodePlayEndUnanalyzedLogFixedResponse(SaoBaseResponse):
-    def __init__(self, cmd, end_session_data) -> None:
+    LAYOUT = FieldLayout(
+        ("unanalyzed_log_grade_id", INT),
+        ("common_reward_data_size", INT),
+        ("common_reward_type", SHORT),
+        ("common_reward_id", INT),
+        ("common_reward_num", INT),
+    )
+
+    def __init__(self, cmd, end_session_data, unanalyzed_rewards: Dict[int, Tuple[int, int]]) -> None:
         super().__init__(cmd)
         self.result = 1
 
@@ -1901,68 +1694,23 @@ class SaoEpisodePlayEndUnanalyzedLogFixedResponse(SaoBaseResponse):
         for x in range(len(end_session_data)):
             self.common_reward_id.append(end_session_data[x])
 
-            with open('titles/sao/data/RewardTable.csv', 'r') as f:
-                keys_unanalyzed = next(f).strip().split(',')
-                data_unanalyzed = list(DictReader(f, fieldnames=keys_unanalyzed))
-
-                for i in range(len(data_unanalyzed)):
-                    if int(data_unanalyzed[i]["CommonRewardId"]) == int(end_session_data[x]):
-                        self.unanalyzed_log_grade_id.append(int(data_unanalyzed[i]["UnanalyzedLogGradeId"]))
-                        self.common_reward_type.append(int(data_unanalyzed[i]["CommonRewardType"]))
-                        break
+            # CommonRewardId -> (UnanalyzedLogGradeId, CommonRewardType), from RewardTable.csv
+            reward = unanalyzed_rewards.get(int(end_session_data[x]))
+            if reward is not None:
+                self.unanalyzed_log_grade_id.append(reward[0])
+                self.common_reward_type.append(reward[1])
 
         self.unanalyzed_log_grade_id = list(map(int,self.unanalyzed_log_grade_id)) #int
         self.common_reward_type = list(map(int,self.common_reward_type)) #int
         self.common_reward_id = list(map(int,self.common_reward_id)) #int
     
     def make(self) -> bytes:
-        #new stuff
-        common_reward_data_struct = Struct(
-            "common_reward_type" / Int16ub,
-            "common_reward_id" / Int32ub,
-            "common_reward_num" / Int32ub,
-        )
-
-        play_end_unanalyzed_log_reward_data_list_struct = Struct(
-            "unanalyzed_log_grade_id" / Int32ub,
-            "common_reward_data_size" / Rebuild(Int32ub, len_(this.common_reward_data)),  # big endian
-            "common_reward_data" / Array(this.common_reward_data_size, common_reward_data_struct),
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "play_end_unanalyzed_log_reward_data_list_size" / Rebuild(Int32ub, len_(this.play_end_unanalyzed_log_reward_data_list)),  # big endian
-            "play_end_unanalyzed_log_reward_data_list" / Array(this.play_end_unanalyzed_log_reward_data_list_size, play_end_unanalyzed_log_reward_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            play_end_unanalyzed_log_reward_data_list_size=0,
-            play_end_unanalyzed_log_reward_data_list=[],
-        )))
-
-        for i in range(len(self.common_reward_id)):
-            reward_resp_data = dict(
-                unanalyzed_log_grade_id=self.unanalyzed_log_grade_id[i],
-                common_reward_data_size=0,
-                common_reward_data=[],
-            )
-
-            reward_resp_data["common_reward_data"].append(dict(
-                common_reward_type=self.common_reward_type[i],
-                common_reward_id=self.common_reward_id[i],
-                common_reward_num=self.common_reward_num,
-            ))
-            
-            resp_data.play_end_unanalyzed_log_reward_data_list.append(reward_resp_data)
-
-        resp_data["play_end_unanalyzed_log_reward_data_list_size"] = len(resp_data.play_end_unanalyzed_log_reward_data_list)
-        for i in range(len(resp_data.play_end_unanalyzed_log_reward_data_list)):
-            resp_data.play_end_unanalyzed_log_reward_data_list[i]["common_reward_data_size"] = len(resp_data.play_end_unanalyzed_log_reward_data_list[i]["common_reward_data"])
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+        # every grade holds a common_reward_data list of just its one reward
+        rows = [
+            (self.unanalyzed_log_grade_id[i], 1, self.common_reward_type[i], self.common_reward_id[i], self.common_reward_num)
+            for i in range(len(self.common_reward_id))
+        ]
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -1973,6 +1721,18 @@ class SaoGetQuestSceneUserDataListRequest(SaoBaseRequest):
         self.user_id = decode_str(data, 0)[0]
 
 class SaoGetQuestSceneUserDataListResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(
+        ("quest_type", BYTE),
+        ("quest_scene_id", SHORT),
+        ("clear_flag", BYTE),
+        ("quest_scene_best_score_user_data_size", INT),
+        ("clear_time", INT),
+        ("combo_num", INT),
+        ("total_damage", STR),
+        ("concurrent_destroying_num", SHORT),
+        ("quest_scene_ex_bonus_user_data_list_size", INT),
+    )
+
     def __init__(self, cmd, quest_data) -> None:
         super().__init__(cmd)
         self.length = None
@@ -2013,71 +1773,16 @@ class SaoGetQuestSceneUserDataListResponse(SaoBaseResponse):
         self.concurrent_destroying_num = list(map(int,self.combo_num)) #int
     
     def make(self) -> bytes:
-        #new stuff
-        quest_scene_ex_bonus_user_data_list_struct = Struct(
-            "ex_bonus_table_id" / Int32ub,  # big endian
-            "achievement_flag" / Int8ul, # result is either 0 or 1
-        )
-
-        quest_scene_best_score_user_data_struct = Struct(
-            "clear_time" / Int32ub,  # big endian
-            "combo_num" / Int32ub,  # big endian
-            "total_damage_size" / Int32ub, # big endian
-            "total_damage" / Int16ul[1],
-            "concurrent_destroying_num" / Int16ub,
-        )
-
-        quest_scene_user_data_list_struct = Struct(
-            "quest_type" / Int8ul, # result is either 0 or 1
-            "quest_scene_id" / Int16ub, #short
-            "clear_flag" / Int8ul, # result is either 0 or 1
-            "quest_scene_best_score_user_data_size" / Rebuild(Int32ub, len_(this.quest_scene_best_score_user_data)),  # big endian
-            "quest_scene_best_score_user_data" / Array(this.quest_scene_best_score_user_data_size, quest_scene_best_score_user_data_struct),
-            "quest_scene_ex_bonus_user_data_list_size" / Rebuild(Int32ub, len_(this.quest_scene_ex_bonus_user_data_list)),  # big endian
-            "quest_scene_ex_bonus_user_data_list" / Array(this.quest_scene_ex_bonus_user_data_list_size, quest_scene_ex_bonus_user_data_list_struct),
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "quest_scene_user_data_list_size" / Rebuild(Int32ub, len_(this.quest_scene_user_data_list)),  # big endian
-            "quest_scene_user_data_list" / Array(this.quest_scene_user_data_list_size, quest_scene_user_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            quest_scene_user_data_list_size=0,
-            quest_scene_user_data_list=[],
-        )))
-
-        for i in range(len(self.quest_scene_id)):
-            quest_resp_data = dict(
-                quest_type=self.quest_type[i],
-                quest_scene_id=self.quest_scene_id[i],
-                clear_flag=self.clear_flag[i],
-
-                quest_scene_best_score_user_data_size=0,
-                quest_scene_best_score_user_data=[],
-                quest_scene_ex_bonus_user_data_list_size=0,
-                quest_scene_ex_bonus_user_data_list=[],
+        # every scene holds a quest_scene_best_score_user_data list of just its best score and
+        # an empty quest_scene_ex_bonus_user_data_list
+        rows = [
+            (
+                self.quest_type[i], self.quest_scene_id[i], self.clear_flag[i], 1,
+                self.clear_time[i], self.combo_num[i], self.total_damage[i], self.concurrent_destroying_num[i], 0,
             )
-
-            quest_resp_data["quest_scene_best_score_user_data"].append(dict(
-                clear_time=self.clear_time[i],
-                combo_num=self.combo_num[i],
-                total_damage_size=len(self.total_damage[i]) * 2,
-                total_damage=[ord(x) for x in self.total_damage[i]],
-                concurrent_destroying_num=self.concurrent_destroying_num[i],
-            ))
-            
-            resp_data.quest_scene_user_data_list.append(quest_resp_data)
-
-        resp_data["quest_scene_user_data_list_size"] = len(resp_data.quest_scene_user_data_list)
-        for i in range(len(resp_data.quest_scene_user_data_list)):
-            resp_data.quest_scene_user_data_list[i]["quest_scene_best_score_user_data_size"] = len(resp_data.quest_scene_user_data_list[i]["quest_scene_best_score_user_data"])
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+            for i in range(len(self.quest_scene_id))
+        ]
+        resp_data = self.LAYOUT.pack_list(rows, encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -2217,6 +1922,9 @@ class SaoSynthesizeEnhancementHeroLogRequest(SaoBaseRequest):
             self.material_common_reward_user_data_list.append(mat)
 
 class SaoSynthesizeEnhancementHeroLogResponse(SaoBaseResponse):
+    # a one entry list of the same layout as SaoGetHeroLogUserDataListResponse
+    LAYOUT = SaoGetHeroLogUserDataListResponse.LAYOUT
+
     def __init__(self, cmd, hero_data) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -2273,98 +1981,7 @@ class SaoSynthesizeEnhancementHeroLogResponse(SaoBaseResponse):
         self.get_date = "20230101120000" #str
     
     def make(self) -> bytes:
-        #new stuff
-
-        hero_log_user_data_list_struct = Struct(
-            "user_hero_log_id_size" / Int32ub,  # big endian
-            "user_hero_log_id" / Int16ul[9], #string
-            "hero_log_id" / Int32ub, #int
-            "log_level" / Int16ub, #short
-            "max_log_level_extended_num" / Int16ub, #short
-            "log_exp" / Int32ub, #int
-            "possible_awakening_flag" / Int8ul,  # result is either 0 or 1
-            "awakening_stage" / Int16ub, #short
-            "awakening_exp" / Int32ub, #int
-            "skill_slot_correction_value" / Int8ul,  # result is either 0 or 1
-            "last_set_skill_slot1_skill_id" / Int16ub, #short
-            "last_set_skill_slot2_skill_id" / Int16ub, #short
-            "last_set_skill_slot3_skill_id" / Int16ub, #short
-            "last_set_skill_slot4_skill_id" / Int16ub, #short
-            "last_set_skill_slot5_skill_id" / Int16ub, #short
-            "property1_property_id" / Int32ub,
-            "property1_value1" / Int32ub,
-            "property1_value2" / Int32ub,
-            "property2_property_id" / Int32ub,
-            "property2_value1" / Int32ub,
-            "property2_value2" / Int32ub,
-            "property3_property_id" / Int32ub,
-            "property3_value1" / Int32ub,
-            "property3_value2" / Int32ub,
-            "property4_property_id" / Int32ub,
-            "property4_value1" / Int32ub,
-            "property4_value2" / Int32ub,
-            "converted_card_num" / Int16ub,
-            "shop_purchase_flag" / Int8ul,  # result is either 0 or 1
-            "protect_flag" / Int8ul,  # result is either 0 or 1
-            "get_date_size" / Int32ub,  # big endian
-            "get_date" / Int16ul[len(self.get_date)],
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "hero_log_user_data_list_size" / Rebuild(Int32ub, len_(this.hero_log_user_data_list)),  # big endian
-            "hero_log_user_data_list" / Array(this.hero_log_user_data_list_size, hero_log_user_data_list_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            hero_log_user_data_list_size=0,
-            hero_log_user_data_list=[],
-        )))
-
-        hero_data = dict(
-            user_hero_log_id_size=len(self.user_hero_log_id) * 2,
-            user_hero_log_id=[ord(x) for x in self.user_hero_log_id],
-            hero_log_id=self.hero_log_id,
-            log_level=self.log_level,
-            max_log_level_extended_num=self.max_log_level_extended_num,
-            log_exp=self.log_exp,
-            possible_awakening_flag=self.possible_awakening_flag,
-            awakening_stage=self.awakening_stage,
-            awakening_exp=self.awakening_exp,
-            skill_slot_correction_value=self.skill_slot_correction_value,
-            last_set_skill_slot1_skill_id=self.last_set_skill_slot1_skill_id,
-            last_set_skill_slot2_skill_id=self.last_set_skill_slot2_skill_id,
-            last_set_skill_slot3_skill_id=self.last_set_skill_slot3_skill_id,
-            last_set_skill_slot4_skill_id=self.last_set_skill_slot4_skill_id,
-            last_set_skill_slot5_skill_id=self.last_set_skill_slot5_skill_id,
-            property1_property_id=self.property1_property_id,
-            property1_value1=self.property1_value1,
-            property1_value2=self.property1_value2,
-            property2_property_id=self.property2_property_id,
-            property2_value1=self.property2_value1,
-            property2_value2=self.property2_value2,
-            property3_property_id=self.property3_property_id,
-            property3_value1=self.property3_value1,
-            property3_value2=self.property3_value2,
-            property4_property_id=self.property4_property_id,
-            property4_value1=self.property4_value1,
-            property4_value2=self.property4_value2,
-            converted_card_num=self.converted_card_num,
-            shop_purchase_flag=self.shop_purchase_flag,
-            protect_flag=self.protect_flag,
-            get_date_size=len(self.get_date) * 2,
-            get_date=[ord(x) for x in self.get_date],
-
-        )
-        
-        resp_data.hero_log_user_data_list.append(hero_data)
-
-        resp_data["hero_log_user_data_list_size"] = len(resp_data.hero_log_user_data_list)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+        resp_data = self.LAYOUT.pack_list([self.LAYOUT.values(self)], encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -2396,6 +2013,9 @@ class SaoSynthesizeEnhancementEquipmentRequest(SaoBaseRequest):
             self.material_common_reward_user_data_list.append(mat)
 
 class SaoSynthesizeEnhancementEquipmentResponse(SaoBaseResponse):
+    # a one entry list of the same layout as SaoGetEquipmentUserDataListResponse
+    LAYOUT = SaoGetEquipmentUserDataListResponse.LAYOUT
+
     def __init__(self, cmd, synthesize_equipment_data) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -2447,85 +2067,7 @@ class SaoSynthesizeEnhancementEquipmentResponse(SaoBaseResponse):
         self.get_date = "20230101120000" #str
     
     def make(self) -> bytes:
-
-        after_equipment_user_data_struct = Struct(
-            "user_equipment_id_size" / Int32ub,  # big endian
-            "user_equipment_id" / Int16ul[9], #string
-            "equipment_id" / Int32ub, #int
-            "enhancement_value" / Int16ub, #short
-            "max_enhancement_value_extended_num" / Int16ub, #short
-            "enhancement_exp" / Int32ub, #int
-            "possible_awakening_flag" / Int8ul,  # result is either 0 or 1
-            "awakening_stage" / Int16ub, #short
-            "awakening_exp" / Int32ub, #int
-            "property1_property_id" / Int32ub,
-            "property1_value1" / Int32ub,
-            "property1_value2" / Int32ub,
-            "property2_property_id" / Int32ub,
-            "property2_value1" / Int32ub,
-            "property2_value2" / Int32ub,
-            "property3_property_id" / Int32ub,
-            "property3_value1" / Int32ub,
-            "property3_value2" / Int32ub,
-            "property4_property_id" / Int32ub,
-            "property4_value1" / Int32ub,
-            "property4_value2" / Int32ub,
-            "converted_card_num" / Int16ub,
-            "shop_purchase_flag" / Int8ul,  # result is either 0 or 1
-            "protect_flag" / Int8ul,  # result is either 0 or 1
-            "get_date_size" / Int32ub,  # big endian
-            "get_date" / Int16ul[len(self.get_date)],
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "after_equipment_user_data_size" / Rebuild(Int32ub, len_(this.after_equipment_user_data)),  # big endian
-            "after_equipment_user_data" / Array(this.after_equipment_user_data_size, after_equipment_user_data_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            after_equipment_user_data_size=0,
-            after_equipment_user_data=[],
-        )))
-
-        synthesize_equipment_data = dict(
-            user_equipment_id_size=len(self.user_equipment_id) * 2,
-            user_equipment_id=[ord(x) for x in self.user_equipment_id],
-            equipment_id=self.equipment_id,
-            enhancement_value=self.enhancement_value,
-            max_enhancement_value_extended_num=self.max_enhancement_value_extended_num,
-            enhancement_exp=self.enhancement_exp,
-            possible_awakening_flag=self.possible_awakening_flag,
-            awakening_stage=self.awakening_stage,
-            awakening_exp=self.awakening_exp,
-            property1_property_id=self.property1_property_id,
-            property1_value1=self.property1_value1,
-            property1_value2=self.property1_value2,
-            property2_property_id=self.property2_property_id,
-            property2_value1=self.property2_value1,
-            property2_value2=self.property2_value2,
-            property3_property_id=self.property3_property_id,
-            property3_value1=self.property3_value1,
-            property3_value2=self.property3_value2,
-            property4_property_id=self.property4_property_id,
-            property4_value1=self.property4_value1,
-            property4_value2=self.property4_value2,
-            converted_card_num=self.converted_card_num,
-            shop_purchase_flag=self.shop_purchase_flag,
-            protect_flag=self.protect_flag,
-            get_date_size=len(self.get_date) * 2,
-            get_date=[ord(x) for x in self.get_date],
-
-        )
-            
-        resp_data.after_equipment_user_data.append(synthesize_equipment_data)
-
-        resp_data["after_equipment_user_data_size"] = len(resp_data.after_equipment_user_data)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+        resp_data = self.LAYOUT.pack_list([self.LAYOUT.values(self)], encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -2817,6 +2359,36 @@ class SaoScanQrQuestProfileCardRequest(SaoBaseRequest):
         super().__init__(header, data)
 
 class SaoScanQrQuestProfileCardResponse(SaoBaseResponse):
+    LAYOUT = FieldLayout(
+        ("profile_card_code", STR),
+        ("nick_name", STR),
+        ("rank_num", SHORT),
+        ("setting_title_id", INT),
+        ("skill_id", SHORT),
+        ("hero_log_hero_log_id", INT),
+        ("hero_log_log_level", SHORT),
+        ("hero_log_awakening_stage", SHORT),
+        ("hero_log_property1_property_id", INT), ("hero_log_property1_value1", INT), ("hero_log_property1_value2", INT),
+        ("hero_log_property2_property_id", INT), ("hero_log_property2_value1", INT), ("hero_log_property2_value2", INT),
+        ("hero_log_property3_property_id", INT), ("hero_log_property3_value1", INT), ("hero_log_property3_value2", INT),
+        ("hero_log_property4_property_id", INT), ("hero_log_property4_value1", INT), ("hero_log_property4_value2", INT),
+        ("main_weapon_equipment_id", INT),
+        ("main_weapon_enhancement_value", SHORT),
+        ("main_weapon_awakening_stage", SHORT),
+        ("main_weapon_property1_property_id", INT), ("main_weapon_property1_value1", INT), ("main_weapon_property1_value2", INT),
+        ("main_weapon_property2_property_id", INT), ("main_weapon_property2_value1", INT), ("main_weapon_property2_value2", INT),
+        ("main_weapon_property3_property_id", INT), ("main_weapon_property3_value1", INT), ("main_weapon_property3_value2", INT),
+        ("main_weapon_property4_property_id", INT), ("main_weapon_property4_value1", INT), ("main_weapon_property4_value2", INT),
+        ("sub_equipment_equipment_id", INT),
+        ("sub_equipment_enhancement_value", SHORT),
+        ("sub_equipment_awakening_stage", SHORT),
+        ("sub_equipment_property1_property_id", INT), ("sub_equipment_property1_value1", INT), ("sub_equipment_property1_value2", INT),
+        ("sub_equipment_property2_property_id", INT), ("sub_equipment_property2_value1", INT), ("sub_equipment_property2_value2", INT),
+        ("sub_equipment_property3_property_id", INT), ("sub_equipment_property3_value1", INT), ("sub_equipment_property3_value2", INT),
+        ("sub_equipment_property4_property_id", INT), ("sub_equipment_property4_value1", INT), ("sub_equipment_property4_value2", INT),
+        ("holographic_flag", BYTE),
+    )
+
     def __init__(self, cmd) -> None:
         super().__init__(cmd)
         self.result = 1
@@ -2881,153 +2453,7 @@ class SaoScanQrQuestProfileCardResponse(SaoBaseResponse):
         self.holographic_flag = 1 #byte
     
     def make(self) -> bytes:
-        #new stuff
-
-        read_profile_card_data_struct = Struct(
-            "profile_card_code_size" / Int32ub,  # big endian
-            "profile_card_code" / Int16ul[len(self.profile_card_code)],
-            "nick_name_size" / Int32ub,  # big endian
-            "nick_name" / Int16ul[len(self.nick_name)],
-            "rank_num" / Int16ub, #short
-            "setting_title_id" / Int32ub, #int
-            "skill_id" / Int16ub, #short
-            "hero_log_hero_log_id" / Int32ub, #int
-            "hero_log_log_level" / Int16ub, #short
-            "hero_log_awakening_stage" / Int16ub, #short
-
-            "hero_log_property1_property_id" / Int32ub, #int
-            "hero_log_property1_value1" / Int32ub, #int
-            "hero_log_property1_value2" / Int32ub, #int
-            "hero_log_property2_property_id" / Int32ub, #int
-            "hero_log_property2_value1" / Int32ub, #int
-            "hero_log_property2_value2" / Int32ub, #int
-            "hero_log_property3_property_id" / Int32ub, #int
-            "hero_log_property3_value1" / Int32ub, #int
-            "hero_log_property3_value2" / Int32ub, #int
-            "hero_log_property4_property_id" / Int32ub, #int
-            "hero_log_property4_value1" / Int32ub, #int
-            "hero_log_property4_value2" / Int32ub, #int
-
-            "main_weapon_equipment_id" / Int32ub, #int
-            "main_weapon_enhancement_value" / Int16ub, #short
-            "main_weapon_awakening_stage" / Int16ub, #short
-
-            "main_weapon_property1_property_id" / Int32ub, #int
-            "main_weapon_property1_value1" / Int32ub, #int
-            "main_weapon_property1_value2" / Int32ub, #int
-            "main_weapon_property2_property_id" / Int32ub, #int
-            "main_weapon_property2_value1" / Int32ub, #int
-            "main_weapon_property2_value2" / Int32ub, #int
-            "main_weapon_property3_property_id" / Int32ub, #int
-            "main_weapon_property3_value1" / Int32ub, #int
-            "main_weapon_property3_value2" / Int32ub, #int
-            "main_weapon_property4_property_id" / Int32ub, #int
-            "main_weapon_property4_value1" / Int32ub, #int
-            "main_weapon_property4_value2" / Int32ub, #int
-
-            "sub_equipment_equipment_id" / Int32ub, #int
-            "sub_equipment_enhancement_value" / Int16ub, #short
-            "sub_equipment_awakening_stage" / Int16ub, #short
-
-            "sub_equipment_property1_property_id" / Int32ub, #int
-            "sub_equipment_property1_value1" / Int32ub, #int
-            "sub_equipment_property1_value2" / Int32ub, #int
-            "sub_equipment_property2_property_id" / Int32ub, #int
-            "sub_equipment_property2_value1" / Int32ub, #int
-            "sub_equipment_property2_value2" / Int32ub, #int
-            "sub_equipment_property3_property_id" / Int32ub, #int
-            "sub_equipment_property3_value1" / Int32ub, #int
-            "sub_equipment_property3_value2" / Int32ub, #int
-            "sub_equipment_property4_property_id" / Int32ub, #int
-            "sub_equipment_property4_value1" / Int32ub, #int
-            "sub_equipment_property4_value2" / Int32ub, #int
-
-            "holographic_flag" / Int8ul,  # result is either 0 or 1
-
-        )
-
-        # create a resp struct
-        resp_struct = Struct(
-            "result" / Int8ul,  # result is either 0 or 1
-            "read_profile_card_data_size" / Rebuild(Int32ub, len_(this.read_profile_card_data)),  # big endian
-            "read_profile_card_data" / Array(this.read_profile_card_data_size, read_profile_card_data_struct),
-        )
-
-        resp_data = resp_struct.parse(resp_struct.build(dict(
-            result=self.result,
-            read_profile_card_data_size=0,
-            read_profile_card_data=[],
-        )))
-
-        hero_data = dict(
-            profile_card_code_size=len(self.profile_card_code) * 2,
-            profile_card_code=[ord(x) for x in self.profile_card_code],
-            nick_name_size=len(self.nick_name) * 2,
-            nick_name=[ord(x) for x in self.nick_name],
-
-            rank_num=self.rank_num,
-            setting_title_id=self.setting_title_id,
-            skill_id=self.skill_id,
-            hero_log_hero_log_id=self.hero_log_hero_log_id,
-            hero_log_log_level=self.hero_log_log_level,
-            hero_log_awakening_stage=self.hero_log_awakening_stage,
-
-            hero_log_property1_property_id=self.hero_log_property1_property_id,
-            hero_log_property1_value1=self.hero_log_property1_value1,
-            hero_log_property1_value2=self.hero_log_property1_value2,
-            hero_log_property2_property_id=self.hero_log_property2_property_id,
-            hero_log_property2_value1=self.hero_log_property2_value1,
-            hero_log_property2_value2=self.hero_log_property2_value2,
-            hero_log_property3_property_id=self.hero_log_property3_property_id,
-            hero_log_property3_value1=self.hero_log_property3_value1,
-            hero_log_property3_value2=self.hero_log_property3_value2,
-            hero_log_property4_property_id=self.hero_log_property4_property_id,
-            hero_log_property4_value1=self.hero_log_property4_value1,
-            hero_log_property4_value2=self.hero_log_property4_value2,
-
-            main_weapon_equipment_id=self.main_weapon_equipment_id,
-            main_weapon_enhancement_value=self.main_weapon_enhancement_value,
-            main_weapon_awakening_stage=self.main_weapon_awakening_stage,
-
-            main_weapon_property1_property_id=self.main_weapon_property1_property_id,
-            main_weapon_property1_value1=self.main_weapon_property1_value1,
-            main_weapon_property1_value2=self.main_weapon_property1_value2,
-            main_weapon_property2_property_id=self.main_weapon_property2_property_id,
-            main_weapon_property2_value1=self.main_weapon_property2_value1,
-            main_weapon_property2_value2=self.main_weapon_property2_value2,
-            main_weapon_property3_property_id=self.main_weapon_property3_property_id,
-            main_weapon_property3_value1=self.main_weapon_property3_value1,
-            main_weapon_property3_value2=self.main_weapon_property3_value2,
-            main_weapon_property4_property_id=self.main_weapon_property4_property_id,
-            main_weapon_property4_value1=self.main_weapon_property4_value1,
-            main_weapon_property4_value2=self.main_weapon_property4_value2,
-
-            sub_equipment_equipment_id=self.sub_equipment_equipment_id,
-            sub_equipment_enhancement_value=self.sub_equipment_enhancement_value,
-            sub_equipment_awakening_stage=self.sub_equipment_awakening_stage,
-
-            sub_equipment_property1_property_id=self.sub_equipment_property1_property_id,
-            sub_equipment_property1_value1=self.sub_equipment_property1_value1,
-            sub_equipment_property1_value2=self.sub_equipment_property1_value2,
-            sub_equipment_property2_property_id=self.sub_equipment_property2_property_id,
-            sub_equipment_property2_value1=self.sub_equipment_property2_value1,
-            sub_equipment_property2_value2=self.sub_equipment_property2_value2,
-            sub_equipment_property3_property_id=self.sub_equipment_property3_property_id,
-            sub_equipment_property3_value1=self.sub_equipment_property3_value1,
-            sub_equipment_property3_value2=self.sub_equipment_property3_value2,
-            sub_equipment_property4_property_id=self.sub_equipment_property4_property_id,
-            sub_equipment_property4_value1=self.sub_equipment_property4_value1,
-            sub_equipment_property4_value2=self.sub_equipment_property4_value2,
-
-            holographic_flag=self.holographic_flag,
-        )
-        
-        resp_data.read_profile_card_data.append(hero_data)
-
-        resp_data["read_profile_card_data_size"] = len(resp_data.read_profile_card_data)
-
-        # finally, rebuild the resp_data
-        resp_data = resp_struct.build(resp_data)
+        resp_data = self.LAYOUT.pack_list([self.LAYOUT.values(self)], encode_byte(self.result))
 
         self.length = len(resp_data)
         return super().make() + resp_data
@@ -3111,8 +2537,7 @@ class GetShopResourceSalesDataListResponse(SaoBaseResponse):
         self.shop_resource_sales_data: List[ShopResourceSalesData] = []
 
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.shop_resource_sales_data)
+        ret = encode_arr_cls(self.shop_resource_sales_data, encode_byte(self.result))
         
         self.header.length = len(ret)
         return super().make() + ret
@@ -3132,8 +2557,7 @@ class GetYuiMedalShopUserDataListResponse(SaoBaseResponse):
         self.user_data_list: List[YuiMedalShopUserData] = []
 
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.user_data_list)
+        ret = encode_arr_cls(self.user_data_list, encode_byte(self.result))
         
         self.header.length = len(ret)
         return super().make() + ret
@@ -3153,8 +2577,7 @@ class GetGashaMedalShopUserDataListResponse(SaoBaseResponse):
         self.data_list: List[GashaMedalShopUserData] = []
 
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.data_list)
+        ret = encode_arr_cls(self.data_list, encode_byte(self.result))
         
         self.header.length = len(ret)
         return super().make() + ret
@@ -3171,8 +2594,7 @@ class GetMYuiMedalShopDataResponse(SaoBaseResponse):
         self.data_list: List[YuiMedalShopData] = []
 
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.data_list)
+        ret = encode_arr_cls(self.data_list, encode_byte(self.result))
         
         self.header.length = len(ret)
         return super().make() + ret
@@ -3189,8 +2611,7 @@ class GetMYuiMedalShopItemsResponse(SaoBaseResponse):
         self.data_list: List[YuiMedalShopItemData] = []
 
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.data_list)
+        ret = encode_arr_cls(self.data_list, encode_byte(self.result))
         
         self.header.length = len(ret)
         return super().make() + ret
@@ -3207,8 +2628,7 @@ class GetMGashaMedalShopsResponse(SaoBaseResponse):
         self.data_list: List[GashaMedalShop] = []
 
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.data_list)
+        ret = encode_arr_cls(self.data_list, encode_byte(self.result))
         
         self.header.length = len(ret)
         return super().make() + ret
@@ -3225,8 +2645,7 @@ class GetMResEarnCampaignShopsResponse(SaoBaseResponse):
         self.data_list: List[ResEarnCampaignShop] = []
 
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.data_list)
+        ret = encode_arr_cls(self.data_list, encode_byte(self.result))
         
         self.header.length = len(ret)
         return super().make() + ret
@@ -3295,8 +2714,7 @@ class SaoGetQuestHierarchyProgressDegreesRankingListResponse(SaoBaseResponse):
         self.quest_hierarchy_progress_degrees_ranking_data_list: List[QuestHierarchyProgressDegreesRankingData] = []
     
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.quest_hierarchy_progress_degrees_ranking_data_list)
+        ret = encode_arr_cls(self.quest_hierarchy_progress_degrees_ranking_data_list, encode_byte(self.result))
         return super().make() + ret
 
 class SaoGetQuestPopularHeroLogRankingListRequest(SaoBaseRequest):
@@ -3319,6 +2737,5 @@ class SaoGetQuestPopularHeroLogRankingListResponse(SaoBaseResponse):
         self.quest_popular_hero_log_ranking_data_list: List[PopularHeroLogRankingData] = []
     
     def make(self) -> bytes:
-        ret = encode_byte(self.result)
-        ret += encode_arr_cls(self.quest_popular_hero_log_ranking_data_list)
+        ret = encode_arr_cls(self.quest_popular_hero_log_ranking_data_list, encode_byte(self.result))
         return super().make() + ret
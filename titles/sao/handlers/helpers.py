@@ -1,4 +1,4 @@
-from typing import Tuple, List, Optional
+from typing import Any, Dict, Iterable, Tuple, List, Optional, Sequence
 import struct
 import logging
 from datetime import datetime
@@ -47,7 +47,7 @@ def decode_str(data: bytes, offset: int) -> Tuple[str, int]:
     try:
         str_len = decode_int(data, offset)
         num_bytes_decoded = INT_OFF + str_len
-        str_out = data[offset + INT_OFF:offset + num_bytes_decoded].decode("utf-16-le", errors="replace")
+        str_out = bytes(data[offset + INT_OFF:offset + num_bytes_decoded]).decode("utf-16-le", errors="replace")
         return (str_out, num_bytes_decoded)
     except:
         logging.getLogger('sao').error(f"Failed to parse {data[offset:]} as string!")
@@ -102,29 +102,167 @@ def encode_str(s: str) -> bytes:
         logging.getLogger('sao').error(f"Failed to encode {s} as bytes!")
         return b""
 
+# element size -> struct format used by the matching encode_* function
+ARR_NUM_FMT = {
+    BYTE_OFF: "b",
+    SHORT_OFF: "h",
+    INT_OFF: "i",
+    LONG_OFF: "l",
+    BIGINT_OFF: "q",
+}
+
 def encode_arr_num(data: List[int], element_size: int) -> bytes:
-    ret = encode_int(len(data))
-        
-    if element_size == BYTE_OFF:
-        for x in data:
-            ret += encode_byte(x)
-    elif element_size == SHORT_OFF:
-        for x in data:
-            ret += encode_short(x)
-    elif element_size == INT_OFF:
-        for x in data:
-            ret += encode_int(x)
-    elif element_size == LONG_OFF:
-        for x in data:
-            ret += encode_long(x)
-    elif element_size == BIGINT_OFF:
-        for x in data:
-            ret += encode_bigint(x)
-    else:
+    fmt = ARR_NUM_FMT.get(element_size)
+    if fmt is None:
         logging.getLogger('sao').error(f"Unknown element size {element_size}")
         return b"\x00" * INT_OFF
 
-    return ret
+    return struct.pack(f"!i{len(data)}{fmt}", len(data), *data)
+
+BYTE = "byte"
+SHORT = "short"
+INT = "int"
+SBYTE = "sbyte"
+SSHORT = "sshort"
+SINT = "sint"
+STR = "str"
+DT = "dt"
+
+# field kind -> big endian struct format, BYTE/SHORT/INT are unsigned like decode_num and the
+# construct types the list responses used, SBYTE/SSHORT/SINT are signed like encode_*
+FIELD_FMT = {
+    BYTE: "B",
+    SHORT: "H",
+    INT: "I",
+    SBYTE: "b",
+    SSHORT: "h",
+    SINT: "i",
+}
+
+class FieldLayout:
+    """
+    Declarative field layout of a helper, ex. FieldLayout(("rank", INT), ("user_id", STR)).
+    Runs of numeric fields are compiled into one big endian struct.Struct each, STR fields
+    are length prefixed utf-16-le like encode_str/decode_str and DT fields are datetimes
+    sent as fmt_dt strings. Numbers are unsigned unless their kind is SBYTE/SSHORT/SINT.
+    pack_list sizes the whole list first and packs every row into
+    one preallocated bytearray, so encoding is linear in the number of rows.
+    """
+    def __init__(self, *fields: Tuple[str, str]) -> None:
+        self.fields = fields
+        self.names = tuple(name for name, _ in fields)
+        # (struct, first field index, field count) for numeric runs, struct is None for a
+        # single STR/DT field
+        self.runs: List[Tuple[Optional[struct.Struct], int, int]] = []
+        self.fixed_size = 0
+
+        run_start = 0
+        for i, (_, kind) in enumerate(fields + (("", ""),)):
+            if kind in FIELD_FMT:
+                continue
+
+            if i > run_start:
+                fmt = struct.Struct("!" + "".join(FIELD_FMT[k] for _, k in fields[run_start:i]))
+                self.runs.append((fmt, run_start, i - run_start))
+                self.fixed_size += fmt.size
+
+            if kind in (STR, DT):
+                self.runs.append((None, i, 1))
+                self.fixed_size += INT_OFF
+            elif kind:
+                raise ValueError(f"Unknown field kind {kind}")
+
+            run_start = i + 1
+
+        self.has_strings = any(run[0] is None for run in self.runs)
+
+    def unpack_from(self, data: bytes, offset: int = 0) -> Tuple[Dict[str, Any], int]:
+        view = memoryview(data)
+        ret: Dict[str, Any] = {}
+        sz = 0
+
+        for dec, start, count in self.runs:
+            if dec is None:
+                name, kind = self.fields[start]
+                tmp = decode_str(view, offset + sz)
+                ret[name] = prs_dt(tmp[0]) if kind == DT else tmp[0]
+                sz += tmp[1]
+                continue
+
+            try:
+                values = dec.unpack_from(view, offset + sz)
+            except struct.error:
+                logging.getLogger('sao').error(f"Failed to parse {bytes(view[offset + sz:offset + sz + dec.size])} as {dec.format}")
+                values = dec.unpack(bytes(view[offset + sz:offset + sz + dec.size]).ljust(dec.size, b"\x00"))
+
+            ret.update(zip(self.names[start:start + count], values))
+            sz += dec.size
+
+        return (ret, sz)
+
+    def decode_into(self, obj: Any, data: bytes, offset: int = 0) -> int:
+        """
+        Sets every field as an attribute of obj, returns the number of bytes decoded
+        """
+        values, sz = self.unpack_from(data, offset)
+        obj.__dict__.update(values)
+        return sz
+
+    def values(self, obj: Any) -> Tuple:
+        return tuple(getattr(obj, name) for name in self.names)
+
+    def __prepare(self, row: Sequence) -> Tuple[List, int]:
+        if not self.has_strings:
+            return (list(row), self.fixed_size)
+
+        row = list(row)
+        size = self.fixed_size
+        for fmt, start, _ in self.runs:
+            if fmt is None:
+                value = row[start]
+                if self.fields[start][1] == DT:
+                    value = fmt_dt(value)
+                elif not isinstance(value, str):
+                    # encode_str failed on these and logged them, send an empty string instead
+                    value = "" if value is None else str(value)
+                row[start] = value.encode("utf-16-le", errors="replace")
+                size += len(row[start])
+        return (row, size)
+
+    def __pack_into(self, buf: bytearray, offset: int, row: List) -> int:
+        for enc, start, count in self.runs:
+            if enc is None:
+                value = row[start]
+                struct.pack_into("!I", buf, offset, len(value))
+                buf[offset + INT_OFF:offset + INT_OFF + len(value)] = value
+                offset += INT_OFF + len(value)
+            else:
+                enc.pack_into(buf, offset, *row[start:start + count])
+                offset += enc.size
+        return offset
+
+    def pack(self, row: Sequence) -> bytes:
+        """
+        Encodes one row, a sequence of values in field order (see values())
+        """
+        prepared, size = self.__prepare(row)
+        buf = bytearray(size)
+        self.__pack_into(buf, 0, prepared)
+        return bytes(buf)
+
+    def pack_list(self, rows: Iterable[Sequence], prefix: bytes = b"") -> bytes:
+        """
+        Encodes prefix, the number of rows as an int and then every row
+        """
+        prepared = [self.__prepare(row) for row in rows]
+        buf = bytearray(len(prefix) + INT_OFF + sum(x[1] for x in prepared))
+        buf[:len(prefix)] = prefix
+        struct.pack_into("!I", buf, len(prefix), len(prepared))
+
+        offset = len(prefix) + INT_OFF
+        for row, _ in prepared:
+            offset = self.__pack_into(buf, offset, row)
+        return bytes(buf)
 
 class BaseHelper:
     def __init__(self, data: bytes, offset: int) -> None:
@@ -153,13 +291,17 @@ def decode_arr_cls(data: bytes, offset: int, cls: BaseHelper):
     
     return (ret, size)
 
-def encode_arr_cls(data: List[BaseHelper]) -> bytes:
-    ret = encode_int(len(data))
-    
-    for x in data:
-        ret += x.make()
-    
-    return ret
+def encode_arr_cls(data: List[BaseHelper], prefix: bytes = b"") -> bytes:
+    """
+    Encodes prefix, the number of helpers and then every helper. A list of one helper class
+    with a LAYOUT, whose make() is LAYOUT.pack, is packed in one go with pack_list.
+    """
+    cls = type(data[0]) if data else None
+    layout = getattr(cls, "LAYOUT", None)
+    if layout is not None and all(type(x) is cls for x in data):
+        return layout.pack_list([layout.values(x) for x in data], prefix)
+
+    return b"".join([prefix, encode_int(len(data))] + [x.make() for x in data])
 
 class MaterialCommonRewardUserData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
@@ -258,110 +400,81 @@ class GetPlayerTraceData(BaseHelper):
         self._sz = user_quest_scene_player_trace_id[1]
 
 class BaseGetData(BaseHelper):
-    def __init__(self, data: bytes, offset: int) -> None:
-        self.get_hero_log_exp = decode_int(data, offset)
-        offset += INT_OFF
-
-        self.get_col = decode_int(data, offset)
-
-        self._sz = INT_OFF + INT_OFF
+    LAYOUT = FieldLayout(("get_hero_log_exp", INT), ("get_col", INT))
 
-class RareDropData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
-        self.quest_rare_drop_id = decode_int(data, offset)
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self._sz = INT_OFF
+class RareDropData(BaseHelper):
+    LAYOUT = FieldLayout(("quest_rare_drop_id", INT))
 
-class UnanalyzedLogTmpRewardData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
-        self.unanalyzed_log_grade_id = decode_int(data, offset)
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self._sz = INT_OFF
+class UnanalyzedLogTmpRewardData(BaseHelper):
+    LAYOUT = FieldLayout(("unanalyzed_log_grade_id", INT))
 
-class SpecialRareDropData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
-        self.quest_special_rare_drop_id = decode_int(data, offset)
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self._sz = INT_OFF
+class SpecialRareDropData(BaseHelper):
+    LAYOUT = FieldLayout(("quest_special_rare_drop_id", INT))
 
-class EventItemData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
-        self.event_item_id = decode_int(data, offset)
-        offset += INT_OFF
-        self.get_num = decode_short(data, offset)
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self._sz = INT_OFF + SHORT_OFF
+class EventItemData(BaseHelper):
+    LAYOUT = FieldLayout(("event_item_id", INT), ("get_num", SHORT))
 
-class DiscoveryEnemyData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
-        self.enemy_kind_id = decode_int(data, offset)
-        offset += INT_OFF
-        self.destroy_num = decode_short(data, offset)
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self._sz = INT_OFF + SHORT_OFF
+class DiscoveryEnemyData(BaseHelper):
+    LAYOUT = FieldLayout(("enemy_kind_id", INT), ("destroy_num", SHORT))
 
-class DestroyBossData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
-        self.boss_type = decode_byte(data, offset)
-        offset += BYTE_OFF
-        self.enemy_kind_id = decode_int(data, offset)
-        offset += INT_OFF
-        self.mission_difficulty_id = decode_short(data, offset)
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self._sz = INT_OFF + SHORT_OFF + BYTE_OFF
+class DestroyBossData(BaseHelper):
+    LAYOUT = FieldLayout(("boss_type", BYTE), ("enemy_kind_id", INT), ("mission_difficulty_id", SHORT))
 
-class MissionData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
-        self.mission_id = decode_int(data, offset)
-        offset += INT_OFF
-        self.clear_flag = decode_byte(data, offset)
-        offset += BYTE_OFF
-        self.destroy_num = decode_short(data, offset)
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self._sz = INT_OFF + SHORT_OFF + BYTE_OFF
+class MissionData(BaseHelper):
+    LAYOUT = FieldLayout(("mission_id", INT), ("clear_flag", BYTE), ("destroy_num", SHORT))
 
-class ScoreData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.clear_time = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-
-        self.combo_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-
-        total_damage = decode_str(data, offset + self._sz)
-        self.total_damage = total_damage[0]
-        self._sz += total_damage[1]
-
-        self.concurrent_destroying_num = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-
-        self.reaching_skill_level = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-
-        self.ko_chara_num = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-
-        self.acceleration_invocation_num = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-
-        self.boss_destroying_num = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-
-        self.synchro_skill_used_flag = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-
-        self.used_friend_skill_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-
-        self.friend_skill_used_flag = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self.continue_cnt = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
+class ScoreData(BaseHelper):
+    LAYOUT = FieldLayout(
+        ("clear_time", INT),
+        ("combo_num", INT),
+        ("total_damage", STR),
+        ("concurrent_destroying_num", SHORT),
+        ("reaching_skill_level", SHORT),
+        ("ko_chara_num", BYTE),
+        ("acceleration_invocation_num", SHORT),
+        ("boss_destroying_num", SHORT),
+        ("synchro_skill_used_flag", BYTE),
+        ("used_friend_skill_id", INT),
+        ("friend_skill_used_flag", BYTE),
+        ("continue_cnt", SHORT),
+        ("total_loss_num", SHORT),
+    )
 
-        self.total_loss_num = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
+    def __init__(self, data: bytes, offset: int) -> None:
+        super().__init__(data, offset)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
 class PlayEndRequestData(BaseHelper):
     def __init__(self, data: bytes, offset: int) -> None:
@@ -495,51 +608,26 @@ class MultiPlayStartRequestData(BaseHelper):
             self.entry_user_data_list.append(tmp)
 
 class MultiPlayEndRequestData(BaseHelper):
+    LAYOUT = FieldLayout(("dummy_1", BYTE), ("dummy_2", BYTE), ("dummy_3", BYTE))
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.dummy_1 = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.dummy_2 = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.dummy_3 = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
 class SalesResourceData(BaseHelper):
+    LAYOUT = FieldLayout(
+        ("common_reward_type", SSHORT),
+        ("common_reward_id", SINT),
+        ("property1_property_id", SINT), ("property1_value1", SINT), ("property1_value2", SINT),
+        ("property2_property_id", SINT), ("property2_value1", SINT), ("property2_value2", SINT),
+        ("property3_property_id", SINT), ("property3_value1", SINT), ("property3_value2", SINT),
+        ("property4_property_id", SINT), ("property4_value1", SINT), ("property4_value2", SINT),
+    )
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.common_reward_type = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-        self.common_reward_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property1_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property1_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property1_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property2_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property2_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property2_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property3_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property3_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property3_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property4_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property4_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property4_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-    
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
+
     @classmethod
     def from_args(cls, reward_type: int = 0, reward_id: int = 0) -> "SalesResourceData":
         ret = cls(b"\x00" * 54, 0)
@@ -549,27 +637,18 @@ class SalesResourceData(BaseHelper):
         return ret
 
     def make(self) -> bytes:
-        ret = b""
-        ret += encode_short(self.common_reward_type)
-        ret += encode_int(self.common_reward_id)
-        
-        ret += encode_int(self.property1_property_id)
-        ret += encode_int(self.property1_value1)
-        ret += encode_int(self.property1_value2)
-        
-        ret += encode_int(self.property2_property_id)
-        ret += encode_int(self.property2_value1)
-        ret += encode_int(self.property2_value2)
-        
-        ret += encode_int(self.property3_property_id)
-        ret += encode_int(self.property3_value1)
-        ret += encode_int(self.property3_value2)
-        
-        ret += encode_int(self.property4_property_id)
-        ret += encode_int(self.property4_value1)
-        ret += encode_int(self.property4_value2)
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class ShopResourceSalesData(BaseHelper):
+    # the fields before sales_resource_data_list
+    HEAD_LAYOUT = FieldLayout(
+        ("user_shop_resource_id", STR),
+        ("discharge_user_id", STR),
+        ("remaining_num", SSHORT),
+        ("purchase_num", SSHORT),
+        ("sales_start_date", DT),
+    )
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
         user_shop_resource_id = decode_str(data, offset + self._sz)
@@ -603,27 +682,16 @@ class ShopResourceSalesData(BaseHelper):
         ret.sales_start_date = prs_dt()
     
     def make(self) -> bytes:
-        ret = encode_str(self.user_shop_resource_id)
-        ret += encode_str(self.discharge_user_id)
-        ret += encode_short(self.remaining_num)
-        ret += encode_short(self.purchase_num)
-        ret += encode_str(fmt_dt(self.sales_start_date))
-        ret += encode_arr_cls(self.sales_resource_data_list)
-        return ret
+        head = self.HEAD_LAYOUT.pack(self.HEAD_LAYOUT.values(self))
+        return encode_arr_cls(self.sales_resource_data_list, head)
 
 class YuiMedalShopUserData(BaseHelper):
+    LAYOUT = FieldLayout(("yui_medal_shop_id", SINT), ("purchase_num", SINT), ("last_purchase_date", DT))
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.yui_medal_shop_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.purchase_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        last_purchase_date = decode_str(data, offset + self._sz)
-        self.last_purchase_date = last_purchase_date[0]
-        self._sz += last_purchase_date[1]
-    
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
+
     @classmethod
     def from_args(cls, yui_medal_shop_id: int = 0, purchase_num: int = 0, last_purchase_date: datetime = datetime.fromtimestamp(0)) -> "YuiMedalShopUserData":
         ret = cls(b"\x00" * 20, 0)
@@ -633,20 +701,15 @@ class YuiMedalShopUserData(BaseHelper):
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.yui_medal_shop_id)
-        ret += encode_int(self.purchase_num)
-        ret += encode_str(fmt_dt(self.last_purchase_date))
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class GashaMedalShopUserData(BaseHelper):
+    LAYOUT = FieldLayout(("gasha_medal_shop_id", SINT), ("purchase_num", SINT))
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.gasha_medal_shop_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.purchase_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-    
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
+
     @classmethod
     def from_args(cls, gasha_medal_shop_id: int = 0, purchase_num: int = 0) -> "GashaMedalShopUserData":
         ret = cls(b"\x00" * 20, 0)
@@ -655,131 +718,63 @@ class GashaMedalShopUserData(BaseHelper):
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.gasha_medal_shop_id)
-        ret += encode_int(self.purchase_num)
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class YuiMedalShopData(BaseHelper):
+    LAYOUT = FieldLayout(
+        ("yui_medal_shop_id", SINT),
+        ("name", STR),
+        ("description", STR),
+        ("selling_yui_medal", SSHORT),
+        ("selling_col", SINT),
+        ("selling_event_item_id", SINT),
+        ("selling_event_item_num", SINT),
+        ("selling_ticket_num", SINT),
+        ("purchase_limit", SSHORT),
+        ("pick_up_flag", SBYTE),
+        ("product_category", SBYTE),
+        ("sales_type", SBYTE),
+        ("target_days", SBYTE),
+        ("target_hour", SBYTE),
+        ("interval_hour", SBYTE),
+        ("sales_start_date", DT),
+        ("sales_end_date", DT),
+        ("sort", SBYTE),
+    )
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.yui_medal_shop_id = decode_int(data, offset + self._sz)
-        
-        name = decode_str(data, offset + self._sz)
-        self.name = name[0]
-        self._sz += name[1]
-
-        description = decode_str(data, offset + self._sz)
-        self.description = description[0]
-        self._sz += description[1]
-        
-        self.selling_yui_medal = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-        self.selling_col = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.selling_event_item_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.selling_event_item_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.selling_ticket_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.purchase_limit = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-        self.pick_up_flag = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.product_category = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.sales_type = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.target_days = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.target_hour = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.interval_hour = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        
-        sales_start_date = decode_str(data, offset + self._sz)
-        self.sales_start_date = prs_dt(sales_start_date[0])
-        self._sz += sales_start_date[1]
-        
-        sales_end_date = decode_str(data, offset + self._sz)
-        self.sales_end_date = prs_dt(sales_end_date[0])
-        self._sz += sales_end_date[1]
-        
-        self.sort = decode_byte(data, offset + self._sz)
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
     @classmethod
     def from_args(cls, shop_id: int = 0, name: str = "", desc: str = "") -> "YuiMedalShopData":
-        ret = cls(b"\x00" * 43, 0)
+        ret = cls(b"\x00" * 47, 0)
         ret.yui_medal_shop_id = shop_id
         ret.name = name
         ret.description = desc
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.yui_medal_shop_id)
-        ret += encode_str(self.name)
-        ret += encode_str(self.description)
-        ret += encode_short(self.selling_yui_medal)
-        ret += encode_int(self.selling_col)
-        ret += encode_int(self.selling_event_item_id)
-        ret += encode_int(self.selling_event_item_num)
-        ret += encode_int(self.selling_ticket_num)
-        ret += encode_short(self.purchase_limit)
-        ret += encode_byte(self.pick_up_flag)
-        ret += encode_byte(self.product_category)
-        ret += encode_byte(self.sales_type)
-        ret += encode_byte(self.target_days)
-        ret += encode_byte(self.target_hour)
-        ret += encode_byte(self.interval_hour)
-        ret += encode_str(fmt_dt(self.sales_start_date))
-        ret += encode_str(fmt_dt(self.sales_end_date))
-        ret += encode_byte(self.sort)
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class YuiMedalShopItemData(BaseHelper):
+    LAYOUT = FieldLayout(
+        ("yui_medal_shop_item_id", SINT),
+        ("yui_medal_shop_id", SINT),
+        ("common_reward_type", SBYTE),
+        ("common_reward_id", SINT),
+        ("common_reward_num", SSHORT),
+        ("strength", SINT),
+        ("property1_property_id", SINT), ("property1_value1", SINT), ("property1_value2", SINT),
+        ("property2_property_id", SINT), ("property2_value1", SINT), ("property2_value2", SINT),
+        ("property3_property_id", SINT), ("property3_value1", SINT), ("property3_value2", SINT),
+        ("property4_property_id", SINT), ("property4_value1", SINT), ("property4_value2", SINT),
+    )
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.yui_medal_shop_item_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.yui_medal_shop_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.common_reward_type = decode_byte(data, offset + self._sz)
-        self._sz += BYTE_OFF
-        self.common_reward_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.common_reward_num = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-        self.strength = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property1_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property1_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property1_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property2_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property2_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property2_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property3_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property3_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property3_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        
-        self.property4_property_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property4_value1 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.property4_value2 = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-    
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
+
     @classmethod
     def from_args(cls, item_id: int = 0, shop_id: int = 0, reward_type: int = 0, reward_id: int = 0, reward_num: int = 0, strength: int = 0) -> "YuiMedalShopItemData":
         ret = cls(b"\x00" * 67, 0)
@@ -792,110 +787,53 @@ class YuiMedalShopItemData(BaseHelper):
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.yui_medal_shop_item_id)
-        ret += encode_int(self.yui_medal_shop_id)
-        ret += encode_byte(self.common_reward_type)
-        ret += encode_int(self.common_reward_id)
-        ret += encode_short(self.common_reward_num)
-        ret += encode_int(self.strength)
-        
-        ret += encode_int(self.property1_property_id)
-        ret += encode_int(self.property1_value1)
-        ret += encode_int(self.property1_value2)
-        
-        ret += encode_int(self.property2_property_id)
-        ret += encode_int(self.property2_value1)
-        ret += encode_int(self.property2_value2)
-        
-        ret += encode_int(self.property3_property_id)
-        ret += encode_int(self.property3_value1)
-        ret += encode_int(self.property3_value2)
-        
-        ret += encode_int(self.property4_property_id)
-        ret += encode_int(self.property4_value1)
-        ret += encode_int(self.property4_value2)
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class ResEarnCampaignShop(BaseHelper):
+    LAYOUT = FieldLayout(
+        ("res_earn_campaign_shop_id", SINT),
+        ("res_earn_campaign_application_id", SINT),
+        ("name", STR),
+        ("selling_yui_medal", SSHORT),
+        ("selling_col", SINT),
+        ("selling_event_item_id", SINT),
+        ("selling_event_item_num", SINT),
+        ("purchase_limit", SSHORT),
+        ("get_application_point", SSHORT),
+        ("sales_start_date", DT),
+        ("sales_end_date", DT),
+    )
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.res_earn_campaign_shop_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.res_earn_campaign_application_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-
-        name = decode_str(data, offset + self._sz)
-        self.name = name[0]
-        self._sz += name[1]
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self.selling_yui_medal = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-        self.selling_col = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.selling_event_item_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.selling_event_item_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.purchase_limit = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-        self.get_application_point = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-
-        sales_start_date = decode_str(data, offset + self._sz)
-        self.sales_start_date = prs_dt(sales_start_date[0])
-        self._sz += sales_start_date[1]
-        
-        sales_end_date = decode_str(data, offset + self._sz)
-        self.sales_end_date = prs_dt(sales_end_date[0])
-        self._sz += sales_end_date[1]
-    
     @classmethod
     def from_args(cls, shop_id: int = 0, app_id: int = 0, name: str = "") -> "ResEarnCampaignShop":
-        ret = cls(b"\x00" * 26, 0)
+        ret = cls(b"\x00" * 38, 0)
         ret.res_earn_campaign_shop_id = shop_id
         ret.res_earn_campaign_application_id = app_id
         ret.name = name
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.res_earn_campaign_shop_id)
-        ret = encode_int(self.res_earn_campaign_application_id)
-        ret += encode_str(self.name)
-        ret += encode_short(self.selling_yui_medal)
-        ret += encode_int(self.selling_col)
-        ret += encode_int(self.selling_event_item_id)
-        ret += encode_int(self.selling_event_item_num)
-        ret += encode_short(self.purchase_limit)
-        ret += encode_short(self.get_application_point)
-        ret += encode_str(fmt_dt(self.sales_start_date))
-        ret += encode_str(fmt_dt(self.sales_end_date))
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class GashaMedalShop(BaseHelper):
+    LAYOUT = FieldLayout(
+        ("gasha_medal_shop_id", SINT),
+        ("name", STR),
+        ("gasha_medal_id", SINT),
+        ("use_gasha_medal_num", SINT),
+        ("purchase_limit", SSHORT),
+        ("sales_start_date", DT),
+        ("sales_end_date", DT),
+    )
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.gasha_medal_shop_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-
-        name = decode_str(data, offset + self._sz)
-        self.name = name[0]
-        self._sz += name[1]
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        self.gasha_medal_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.use_gasha_medal_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.purchase_limit = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-
-        sales_start_date = decode_str(data, offset + self._sz)
-        self.sales_start_date = prs_dt(sales_start_date[0])
-        self._sz += sales_start_date[1]
-        
-        sales_end_date = decode_str(data, offset + self._sz)
-        self.sales_end_date = prs_dt(sales_end_date[0])
-        self._sz += sales_end_date[1]
-    
     @classmethod
     def from_args(cls, shop_id: int = 0, name: str = "", medal_id: int = 0, medal_num: int = 0, purchase_limit: int = 0) -> "GashaMedalShop":
         ret = cls(b"\x00" * 26, 0)
@@ -907,74 +845,41 @@ class GashaMedalShop(BaseHelper):
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.gasha_medal_shop_id)
-        ret += encode_str(self.name)
-        ret += encode_int(self.gasha_medal_id)
-        ret += encode_int(self.use_gasha_medal_num)
-        ret += encode_short(self.purchase_limit)
-        ret += encode_str(fmt_dt(self.sales_start_date))
-        ret += encode_str(fmt_dt(self.sales_end_date))
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class QuestHierarchyProgressDegreesRankingData(BaseHelper):
+    LAYOUT = FieldLayout(
+        ("rank", SINT),
+        ("trial_tower_id", SINT),
+        ("user_id", STR),
+        ("nick_name", STR),
+        ("setting_title_id", SINT),
+        ("favorite_hero_log_id", SINT),
+        ("favorite_hero_log_awakening_stage", SSHORT),
+        ("favorite_support_log_id", SINT),
+        ("favorite_support_log_awakening_stage", SSHORT),
+        ("clear_time", STR),
+    )
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.rank = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.trial_tower_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-
-        user_id = decode_str(data, offset + self._sz)
-        self.user_id = user_id[0]
-        self._sz += user_id[1]
-
-        nick_name = decode_str(data, offset + self._sz)
-        self.nick_name = nick_name[0]
-        self._sz += nick_name[1]
-
-        self.setting_title_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.favorite_hero_log_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.favorite_hero_log_awakening_stage = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
-        self.favorite_support_log_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.favorite_support_log_awakening_stage = decode_short(data, offset + self._sz)
-        self._sz += SHORT_OFF
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
 
-        clear_time = decode_str(data, offset + self._sz)
-        self.clear_time = clear_time[0]
-        self._sz += clear_time[1]
-    
     @classmethod
     def from_args(cls) -> "QuestHierarchyProgressDegreesRankingData":
         ret = cls(b"\x00" * 36, 0)
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.rank)
-        ret += encode_int(self.trial_tower_id)
-        ret += encode_str(self.user_id)
-        ret += encode_str(self.nick_name)
-        ret += encode_int(self.setting_title_id)
-        ret += encode_int(self.favorite_hero_log_id)
-        ret += encode_short(self.favorite_hero_log_awakening_stage)
-        ret += encode_int(self.favorite_support_log_id)
-        ret += encode_short(self.favorite_support_log_awakening_stage)
-        ret += encode_str(self.clear_time)
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
 
 class PopularHeroLogRankingData(BaseHelper):
+    LAYOUT = FieldLayout(("rank", SINT), ("hero_log_id", SINT), ("used_num", SINT))
+
     def __init__(self, data: bytes, offset: int) -> None:
         super().__init__(data, offset)
-        self.rank = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.hero_log_id = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-        self.used_num = decode_int(data, offset + self._sz)
-        self._sz += INT_OFF
-    
+        self._sz = self.LAYOUT.decode_into(self, data, offset)
+
     @classmethod
     def from_args(cls, ranking: int, hero_id: int, used_num: int) -> "PopularHeroLogRankingData":
         ret = cls(b"\x00" * 12, 0)
@@ -984,7 +889,4 @@ class PopularHeroLogRankingData(BaseHelper):
         return ret
     
     def make(self) -> bytes:
-        ret = encode_int(self.rank)
-        ret += encode_int(self.hero_log_id)
-        ret += encode_int(self.used_num)
-        return ret
+        return self.LAYOUT.pack(self.LAYOUT.values(self))
@@ -25,6 +25,7 @@ class SaoServlet(BaseServlet):
         self.game_cfg = SaoConfig()
         if path.exists(f"{cfg_dir}/sao.yaml"):
             self.game_cfg.update(yaml.safe_load(open(f"{cfg_dir}/sao.yaml")))
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/sao.yaml")
 
         self.logger = logging.getLogger("sao")
         if not hasattr(self.logger, "inited"):
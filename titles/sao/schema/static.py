@@ -321,6 +321,38 @@ class SaoStaticData(BaseData):
             return None
         return [list[2] for list in result.fetchall()]
 
+    async def get_all_hero_log_ids(self) -> Optional[List[int]]:
+        sql = select(hero.c.heroLogId).distinct()
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return [row[0] for row in result.fetchall()]
+
+    async def get_all_equipment_ids(self) -> Optional[List[int]]:
+        sql = select(equipment.c.equipmentId).distinct()
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return [row[0] for row in result.fetchall()]
+
+    async def get_all_item_ids(self) -> Optional[List[int]]:
+        sql = select(item.c.itemId).distinct()
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return [row[0] for row in result.fetchall()]
+
+    async def get_all_rare_drops(self) -> Optional[List[Row]]:
+        sql = select(rare_drop.c.questRareDropId, rare_drop.c.commonRewardId).order_by(rare_drop.c.id)
+
+        result = await self.execute(sql)
+        if result is None:
+            return None
+        return result.fetchall()
+
     async def get_item_id(self, itemId: int) -> Optional[Dict]:
         sql = item.select(item.c.itemId == itemId)
         
@@ -0,0 +1,172 @@
+from array import array
+from bisect import bisect_right
+from random import choice
+from typing import Dict, List, Optional, Set, Tuple
+from os import path
+import csv
+import logging
+
+from core.config import CoreConfig
+from core.data.catalog import StaticCatalog
+from .database import SaoData
+
+
+class SaoRewards:
+    """
+    Which CommonRewardIds are hero logs, equipment and items, and the CommonRewardId every
+    rare drop gives. Empty until read.py imported the static tables.
+    """
+    def __init__(self, heroes: List[int], equipment: List[int], items: List[int], rare_drops: List) -> None:
+        self.hero_log_ids: Set[int] = set(heroes)
+        self.equipment_ids: Set[int] = set(equipment)
+        self.item_ids: Set[int] = set(items)
+        self.rare_drops: Dict[int, int] = {}
+        for row in rare_drops:
+            self.rare_drops.setdefault(row["questRareDropId"], row["commonRewardId"])
+
+    def empty(self) -> bool:
+        return not self.hero_log_ids or not self.equipment_ids or not self.item_ids
+
+
+class SaoRewardCatalog(StaticCatalog):
+    async def load(self, data: SaoData) -> Optional[SaoRewards]:
+        heroes = await data.static.get_all_hero_log_ids()
+        equipment = await data.static.get_all_equipment_ids()
+        items = await data.static.get_all_item_ids()
+        rare_drops = await data.static.get_all_rare_drops()
+        if heroes is None or equipment is None or items is None or rare_drops is None:
+            self.logger.error("Failed to load SAO static reward tables")
+            return None
+
+        rewards = SaoRewards(heroes, equipment, items, rare_drops)
+        logging.getLogger("sao").info(
+            f"Loaded {len(rewards.hero_log_ids)} hero logs, {len(rewards.equipment_ids)} equipment, "
+            f"{len(rewards.item_ids)} items and {len(rewards.rare_drops)} rare drops"
+        )
+        return rewards
+
+
+catalog = SaoRewardCatalog("sao")
+
+
+class SaoStaticTables:
+    """
+    The game tables quest completion needs, loaded once instead of on every play end.
+    PlayerRank, HeroLogLevel and RewardTable are read from the csv files in data_dir when
+    the servlet starts. Which kind of reward (hero log, equipment or item) a CommonRewardId
+    is, and what each rare drop gives, come from the imported static tables through the
+    title's StaticCatalog, so they are reloaded once read.py imports new data. Until they
+    are loaded and not empty, rewards are looked up one by one.
+    """
+    def __init__(self, core_cfg: CoreConfig, data: SaoData, data_dir: str = "titles/sao/data") -> None:
+        self.core_cfg = core_cfg
+        self.data = data
+        self.logger = logging.getLogger("sao")
+
+        # TotalExp / RequireExp of every level in ascending order, next to the level it gives
+        self.rank_exp, self.ranks = self.__load_levels(f"{data_dir}/PlayerRank.csv")
+        self.hero_level_exp, self.hero_levels = self.__load_levels(f"{data_dir}/HeroLogLevel.csv")
+
+        # CommonRewardId -> (UnanalyzedLogGradeId, CommonRewardType)
+        self.unanalyzed_rewards: Dict[int, Tuple[int, int]] = {}
+        self.unanalyzed_by_grade: Dict[int, List[int]] = {}
+        self.unanalyzed_ids: List[int] = []
+        self.__load_reward_table(f"{data_dir}/RewardTable.csv")
+
+    def __load_levels(self, file: str) -> Tuple[array, array]:
+        exps = array("q")
+        levels = array("l")
+        if not path.exists(file):
+            self.logger.warning(f"Failed to find csv file {file}")
+            return exps, levels
+
+        with open(file, "r", encoding="utf8") as f:
+            reader = csv.reader(f, delimiter=",")
+            next(reader, None)
+            for row in reader:
+                if len(row) < 2 or not row[0]:
+                    continue
+                levels.append(int(row[0]))
+                exps.append(int(row[1]))
+
+        return exps, levels
+
+    def __load_reward_table(self, file: str) -> None:
+        if not path.exists(file):
+            self.logger.warning(f"Failed to find csv file {file}")
+            return
+
+        with open(file, "r", encoding="utf8") as f:
+            for row in csv.DictReader(f, delimiter=","):
+                reward_id = int(row["CommonRewardId"])
+                grade = int(row["UnanalyzedLogGradeId"])
+                self.unanalyzed_ids.append(reward_id)
+                self.unanalyzed_by_grade.setdefault(grade, []).append(reward_id)
+                # first row wins, like the old linear search in the response
+                self.unanalyzed_rewards.setdefault(reward_id, (grade, int(row["CommonRewardType"])))
+
+    @staticmethod
+    def __level(exps: array, levels: array, exp: int) -> int:
+        idx = bisect_right(exps, exp) - 1
+        if idx < 0:
+            return levels[0] if levels else 1
+        return levels[idx]
+
+    def player_rank(self, exp: int) -> int:
+        """
+        Returns the player rank for a total exp, capped at the highest rank
+        """
+        return self.__level(self.rank_exp, self.ranks, exp)
+
+    def hero_level(self, log_exp: int) -> int:
+        """
+        Returns the hero log level for an amount of log exp, capped at the highest level
+        """
+        return self.__level(self.hero_level_exp, self.hero_levels, log_exp)
+
+    def random_unanalyzed_reward(self, grade_id: Optional[int] = None) -> Optional[int]:
+        """
+        Picks a random CommonRewardId out of the reward table, from grade_id only if it's given
+        """
+        ids = self.unanalyzed_by_grade.get(grade_id) if grade_id is not None else None
+        if not ids:
+            if grade_id is not None:
+                self.logger.warning(f"No unanalyzed log rewards for grade {grade_id}, picking from every grade")
+            ids = self.unanalyzed_ids
+
+        return choice(ids) if ids else None
+
+    async def rewards(self) -> Optional[SaoRewards]:
+        """
+        Returns the imported reward tables, or None if they aren't loaded or are still empty
+        """
+        rewards = await catalog.get(self.core_cfg, self.data)
+        if rewards is None or rewards.empty():
+            return None
+        return rewards
+
+    async def reward_kind(self, reward_id: int) -> Tuple[bool, bool, bool]:
+        """
+        Returns whether reward_id is a hero log, a piece of equipment and an item
+        """
+        reward_id = int(reward_id)
+        rewards = await self.rewards()
+        if rewards is None:
+            return (
+                await self.data.static.get_hero_id(reward_id) is not None,
+                await self.data.static.get_equipment_id(reward_id) is not None,
+                await self.data.static.get_item_id(reward_id) is not None,
+            )
+
+        return (reward_id in rewards.hero_log_ids, reward_id in rewards.equipment_ids, reward_id in rewards.item_ids)
+
+    async def rare_drop_reward(self, quest_rare_drop_id: int) -> Optional[int]:
+        """
+        Returns the CommonRewardId given by a rare drop, or None if it isn't known
+        """
+        rewards = await self.rewards()
+        if rewards is None:
+            row = await self.data.static.get_rare_drop_id(int(quest_rare_drop_id))
+            return row["commonRewardId"] if row is not None else None
+
+        return rewards.rare_drops.get(int(quest_rare_drop_id))
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, List, Dict
 import logging
 import inflection
@@ -98,9 +99,9 @@ class WaccaBase:
         req = HousingStartRequestV1(data)
         allnet_region_id = None
 
-        machine = await self.data.arcade.get_machine(req.chipId)
+        machine = await self.data.arcade.registry.get_machine(req.chipId)
         if machine is not None:
-            arcade = await self.data.arcade.get_arcade(machine["arcade"])
+            arcade = await self.data.arcade.registry.get_arcade(machine["arcade"])
             allnet_region_id = arcade["region_id"]
 
         if req.appVersion.country == AllnetCountryCode.JAPAN.value:
@@ -280,12 +281,22 @@ class WaccaBase:
         self.logger.info(f"Get detail for profile {req.userId}")
         user_id = profile["user"]
 
-        profile_scores = await self.data.score.get_best_scores(user_id)
-        profile_items = await self.data.item.get_items(user_id)
-        profile_song_unlocks = await self.data.item.get_song_unlocks(user_id)
-        profile_options = await self.data.profile.get_options(user_id)
-        profile_trophies = await self.data.item.get_trophies(user_id)
-        profile_tickets = await self.data.item.get_tickets(user_id)
+        # none of these depend on each other, so run them side by side
+        (
+            profile_scores,
+            profile_items,
+            profile_song_unlocks,
+            profile_options,
+            profile_trophies,
+            profile_tickets,
+        ) = await asyncio.gather(
+            self.data.score.get_best_scores(user_id),
+            self.data.item.get_items(user_id),
+            self.data.item.get_song_unlocks(user_id),
+            self.data.profile.get_options(user_id),
+            self.data.item.get_trophies(user_id),
+            self.data.item.get_tickets(user_id),
+        )
 
         resp.songUpdateTime = int(profile["last_login_date"].timestamp())
         resp.songPlayStatus = [profile["last_song_id"], 1]
@@ -647,13 +658,7 @@ class WaccaBase:
 
         # wp, ticket info
         if req.difficulty > WaccaConstants.Difficulty.HARD.value:
-            old_score = await self.data.score.get_best_score(
-                user_id, req.songId, req.difficulty
-            )
-            if not old_score:
-                await self.data.score.put_best_score(
-                    user_id, req.songId, req.difficulty, 0, [0] * 5, [0] * 13, 0, 0
-                )
+            await self.data.score.ensure_best_score(user_id, req.songId, req.difficulty)
 
         await self.data.item.unlock_song(
             user_id,
@@ -716,110 +721,84 @@ class WaccaBase:
             + req.songDetail.flagAllMarvelous
         )
 
-        await self.data.score.put_playlog(
-            user_id,
-            req.songDetail.songId,
-            req.songDetail.difficulty,
-            req.songDetail.score,
-            playlog_clear_status,
-            req.songDetail.grade.value,
-            req.songDetail.maxCombo,
-            req.songDetail.judgements.marvCt,
-            req.songDetail.judgements.greatCt,
-            req.songDetail.judgements.goodCt,
-            req.songDetail.judgements.missCt,
-            req.songDetail.fastCt,
-            req.songDetail.slowCt,
-            self.season,
-        )
-
-        old_score = await self.data.score.get_best_score(
-            user_id, req.songDetail.songId, req.songDetail.difficulty
-        )
-
-        if not old_score:
-            grades = [0] * 13
-            clears = [0] * 5
+        clear_flags = [
+            req.songDetail.flagCleared,
+            req.songDetail.flagMissless,
+            req.songDetail.flagFullcombo,
+            req.songDetail.flagAllMarvelous,
+        ]
 
-            clears[0] = 1
-            clears[1] = 1 if req.songDetail.flagCleared else 0
-            clears[2] = 1 if req.songDetail.flagMissless else 0
-            clears[3] = 1 if req.songDetail.flagFullcombo else 0
-            clears[4] = 1 if req.songDetail.flagAllMarvelous else 0
-
-            grades[req.songDetail.grade.value - 1] = 1
-
-            await self.data.score.put_best_score(
+        # the result screen is filled in from the merged best score, so the old one isn't read
+        _, best = await asyncio.gather(
+            self.data.score.put_playlog(
                 user_id,
                 req.songDetail.songId,
                 req.songDetail.difficulty,
                 req.songDetail.score,
-                clears,
-                grades,
+                playlog_clear_status,
+                req.songDetail.grade.value,
                 req.songDetail.maxCombo,
+                req.songDetail.judgements.marvCt,
+                req.songDetail.judgements.greatCt,
+                req.songDetail.judgements.goodCt,
                 req.songDetail.judgements.missCt,
-            )
+                req.songDetail.fastCt,
+                req.songDetail.slowCt,
+                self.season,
+            ),
+            self.data.score.merge_best_score(
+                user_id,
+                req.songDetail.songId,
+                req.songDetail.difficulty,
+                req.songDetail.score,
+                clear_flags,
+                req.songDetail.grade.value,
+                req.songDetail.maxCombo,
+                req.songDetail.judgements.missCt,
+            ),
+        )
+
+        if not best:
+            # couldn't merge, show this play on its own
+            grades = [0] * 13
+            grades[req.songDetail.grade.value - 1] = 1
+            clears = [1] + [1 if flag else 0 for flag in clear_flags]
 
             resp.songDetail.score = req.songDetail.score
             resp.songDetail.lowestMissCount = req.songDetail.judgements.missCt
 
         else:
             grades = [
-                old_score["grade_d_ct"],
-                old_score["grade_c_ct"],
-                old_score["grade_b_ct"],
-                old_score["grade_a_ct"],
-                old_score["grade_aa_ct"],
-                old_score["grade_aaa_ct"],
-                old_score["grade_s_ct"],
-                old_score["grade_ss_ct"],
-                old_score["grade_sss_ct"],
-                old_score["grade_master_ct"],
-                old_score["grade_sp_ct"],
-                old_score["grade_ssp_ct"],
-                old_score["grade_sssp_ct"],
+                best["grade_d_ct"],
+                best["grade_c_ct"],
+                best["grade_b_ct"],
+                best["grade_a_ct"],
+                best["grade_aa_ct"],
+                best["grade_aaa_ct"],
+                best["grade_s_ct"],
+                best["grade_ss_ct"],
+                best["grade_sss_ct"],
+                best["grade_master_ct"],
+                best["grade_sp_ct"],
+                best["grade_ssp_ct"],
+                best["grade_sssp_ct"],
             ]
             clears = [
-                old_score["play_ct"],
-                old_score["clear_ct"],
-                old_score["missless_ct"],
-                old_score["fullcombo_ct"],
-                old_score["allmarv_ct"],
+                best["play_ct"],
+                best["clear_ct"],
+                best["missless_ct"],
+                best["fullcombo_ct"],
+                best["allmarv_ct"],
             ]
 
-            clears[0] += 1
-            clears[1] += 1 if req.songDetail.flagCleared else 0
-            clears[2] += 1 if req.songDetail.flagMissless else 0
-            clears[3] += 1 if req.songDetail.flagFullcombo else 0
-            clears[4] += 1 if req.songDetail.flagAllMarvelous else 0
-
-            grades[req.songDetail.grade.value - 1] += 1
-
-            best_score = max(req.songDetail.score, old_score["score"])
-            best_max_combo = max(req.songDetail.maxCombo, old_score["best_combo"])
-            lowest_miss_ct = min(
-                req.songDetail.judgements.missCt, old_score["lowest_miss_ct"]
-            )
-            best_rating = max(
+            resp.songDetail.score = best["score"]
+            resp.songDetail.lowestMissCount = best["lowest_miss_ct"]
+            # the merge leaves the rating alone, so this is still the one from earlier plays
+            resp.songDetail.rating = max(
                 self.util_calc_song_rating(req.songDetail.score, req.songDetail.level),
-                old_score["rating"],
+                best["rating"],
             )
 
-            await self.data.score.put_best_score(
-                user_id,
-                req.songDetail.songId,
-                req.songDetail.difficulty,
-                best_score,
-                clears,
-                grades,
-                best_max_combo,
-                lowest_miss_ct,
-            )
-
-            resp.songDetail.score = best_score
-            resp.songDetail.lowestMissCount = lowest_miss_ct
-            resp.songDetail.rating = best_rating
-
         resp.songDetail.clearCounts = SongDetailClearCounts(counts=clears)
         resp.songDetail.clearCountsSeason = SongDetailClearCounts(counts=clears)
 
@@ -1063,20 +1042,7 @@ class WaccaBase:
                     or item.itemType == WaccaConstants.ITEM_TYPES["music_unlock"]
                 ):
                     if item.quantity > WaccaConstants.Difficulty.HARD.value:
-                        old_score = await self.data.score.get_best_score(
-                            user_id, item.itemId, item.quantity
-                        )
-                        if not old_score:
-                            await self.data.score.put_best_score(
-                                user_id,
-                                item.itemId,
-                                item.quantity,
-                                0,
-                                [0] * 5,
-                                [0] * 13,
-                                0,
-                                0,
-                            )
+                        await self.data.score.ensure_best_score(user_id, item.itemId, item.quantity)
 
                     if item.quantity == 0:
                         item.quantity = WaccaConstants.Difficulty.HARD.value
@@ -242,10 +242,7 @@ class PlayModeCounts:
 
 
 class SongUnlock:
-    songId: int = 0
-    difficulty: int = 0
-    whenAppeared: int = 0
-    whenUnlocked: int = 0
+    __slots__ = ("songId", "difficulty", "whenAppeared", "whenUnlocked")
 
     def __init__(
         self,
@@ -467,6 +464,8 @@ class UserItemInfoV3(UserItemInfoV2):
 
 
 class SongDetailClearCounts:
+    __slots__ = ("playCt", "clearCt", "misslessCt", "fullComboCt", "allMarvelousCt")
+
     def __init__(
         self,
         playCt: int = 0,
@@ -501,6 +500,7 @@ class SongDetailClearCounts:
 
 
 class SongDetailGradeCountsV1:
+    __slots__ = ("dCt", "cCt", "bCt", "aCt", "aaCt", "aaaCt", "sCt", "ssCt", "sssCt", "masterCt")
     dCt: int
     cCt: int
     bCt: int
@@ -566,6 +566,7 @@ class SongDetailGradeCountsV1:
 
 
 class SongDetailGradeCountsV2(SongDetailGradeCountsV1):
+    __slots__ = ("spCt", "sspCt", "ssspCt")
     spCt: int
     sspCt: int
     ssspCt: int
@@ -617,20 +618,34 @@ class SongDetailGradeCountsV2(SongDetailGradeCountsV1):
 
 
 class BestScoreDetailV1:
-    songId: int = 0
-    difficulty: int = 1
-    clearCounts: SongDetailClearCounts = SongDetailClearCounts()
-    clearCountsSeason: SongDetailClearCounts = SongDetailClearCounts()
-    gradeCounts: SongDetailGradeCountsV1 = SongDetailGradeCountsV1()
-    score: int = 0
-    bestCombo: int = 0
-    lowestMissCtMaybe: int = 0
-    isUnlock: int = 1
-    rating: int = 0
+    __slots__ = (
+        "songId",
+        "difficulty",
+        "clearCounts",
+        "clearCountsSeason",
+        "gradeCounts",
+        "score",
+        "bestCombo",
+        "lowestMissCtMaybe",
+        "isUnlock",
+        "rating",
+    )
 
     def __init__(self, song_id: int, difficulty: int = 1) -> None:
         self.songId = song_id
         self.difficulty = difficulty
+        self.clearCounts = SongDetailClearCounts()
+        self.clearCountsSeason = self.clearCounts
+        self.gradeCounts = self.new_grade_counts()
+        self.score = 0
+        self.bestCombo = 0
+        self.lowestMissCtMaybe = 0
+        self.isUnlock = 1
+        self.rating = 0
+
+    @staticmethod
+    def new_grade_counts() -> SongDetailGradeCountsV1:
+        return SongDetailGradeCountsV1()
 
     def make(self) -> List:
         return [
@@ -648,7 +663,11 @@ class BestScoreDetailV1:
 
 
 class BestScoreDetailV2(BestScoreDetailV1):
-    gradeCounts: SongDetailGradeCountsV2 = SongDetailGradeCountsV2()
+    __slots__ = ()
+
+    @staticmethod
+    def new_grade_counts() -> SongDetailGradeCountsV2:
+        return SongDetailGradeCountsV2()
 
 
 class SongUpdateJudgementCounts:
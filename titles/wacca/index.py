@@ -34,6 +34,7 @@ class WaccaServlet(BaseServlet):
             self.game_cfg.update(
                 yaml.safe_load(open(f"{cfg_dir}/{WaccaConstants.CONFIG_NAME}"))
             )
+        CoreConfig.freeze(self.game_cfg, f"{cfg_dir}/{WaccaConstants.CONFIG_NAME}")
         self.data = Data(core_cfg)
 
         self.versions = [
@@ -87,19 +88,14 @@ class WaccaServlet(BaseServlet):
         return True
     
     def get_allnet_info(self, game_code: str, game_ver: int, keychip: str) -> Tuple[str, str]:
-        if not self.core_cfg.server.is_using_proxy and Utils.get_title_port(self.core_cfg) != 80:
-            return (
-                f"http://{self.core_cfg.server.hostname}:{Utils.get_title_port(self.core_cfg)}/WaccaServlet",
-                self.core_cfg.server.hostname,
-            )
-
-        return (f"http://{self.core_cfg.server.hostname}/WaccaServlet", self.core_cfg.server.hostname)
+        return (f"{self.core_cfg.server.title_url}/WaccaServlet", self.core_cfg.server.hostname)
     
     async def render_POST(self, request: Request) -> bytes:
         def end(resp: Dict) -> bytes:
-            hash = md5(json.dumps(resp, ensure_ascii=False).encode()).digest()
-            j_Resp = Response(json.dumps(resp, ensure_ascii=False))
-            j_Resp.raw_headers.append((b"X-Wacca-Hash", hash.hex().encode()))
+            # serialize once, the hash has to be of the exact bytes that are sent
+            body = json.dumps(resp, ensure_ascii=False).encode()
+            j_Resp = Response(body)
+            j_Resp.raw_headers.append((b"X-Wacca-Hash", md5(body).hexdigest().encode()))
             return j_Resp
 
         api = request.path_params.get('api', '')
@@ -140,7 +136,7 @@ class WaccaServlet(BaseServlet):
             return end(resp.make())
         
         if not self.core_cfg.server.allow_unregistered_serials:
-            mech = await self.data.arcade.get_machine(req.chipId)
+            mech = await self.data.arcade.registry.get_machine(req.chipId)
             if not mech:
                 self.logger.error(f"Blocked request from unregistered serial {req.chipId} to {url_path}")
                 resp = BaseResponse()
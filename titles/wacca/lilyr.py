@@ -43,9 +43,9 @@ class WaccaLilyR(WaccaLily):
         req = HousingStartRequestV2(data)
         allnet_region_id = None
         
-        machine = await self.data.arcade.get_machine(req.chipId)
+        machine = await self.data.arcade.registry.get_machine(req.chipId)
         if machine is not None:
-            arcade = await self.data.arcade.get_arcade(machine["arcade"])
+            arcade = await self.data.arcade.registry.get_arcade(machine["arcade"])
             allnet_region_id = arcade["region_id"]
 
         if req.appVersion.country == AllnetCountryCode.JAPAN.value:
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, List, Dict
 from datetime import datetime, timedelta
 import json
@@ -64,15 +65,28 @@ class WaccaReverse(WaccaLilyR):
         self.logger.info(f"Get detail for profile {req.userId}")
         user_id = profile["user"]
 
-        profile_scores = await self.data.score.get_best_scores(user_id)
-        profile_items = await self.data.item.get_items(user_id)
-        profile_song_unlocks = await self.data.item.get_song_unlocks(user_id)
-        profile_options = await self.data.profile.get_options(user_id)
-        profile_favorites = await self.data.profile.get_favorite_songs(user_id)
-        profile_gates = await self.data.profile.get_gates(user_id)
-        profile_bingo = await self.data.profile.get_bingo(user_id)
-        profile_trophies = await self.data.item.get_trophies(user_id)
-        profile_tickets = await self.data.item.get_tickets(user_id)
+        # none of these depend on each other, so run them side by side
+        (
+            profile_scores,
+            profile_items,
+            profile_song_unlocks,
+            profile_options,
+            profile_favorites,
+            profile_gates,
+            profile_bingo,
+            profile_trophies,
+            profile_tickets,
+        ) = await asyncio.gather(
+            self.data.score.get_best_scores(user_id),
+            self.data.item.get_items(user_id),
+            self.data.item.get_song_unlocks(user_id),
+            self.data.profile.get_options(user_id),
+            self.data.profile.get_favorite_songs(user_id),
+            self.data.profile.get_gates(user_id),
+            self.data.profile.get_bingo(user_id),
+            self.data.item.get_trophies(user_id),
+            self.data.item.get_tickets(user_id),
+        )
 
         if profile["gate_tutorial_flags"] is not None:
             for x in profile["gate_tutorial_flags"]:
@@ -173,6 +173,104 @@ class WaccaScoreData(BaseData):
 
         return result.lastrowid
 
+    async def merge_best_score(
+        self,
+        user_id: int,
+        song_id: int,
+        chart_id: int,
+        score: int,
+        clear_flags: List[int],
+        grade: int,
+        max_combo: int,
+        miss_ct: int,
+    ) -> Optional[Row]:
+        """
+        Merges a play into the user's best score for a chart with a single statement, so plays
+        that are saved at the same time can't overwrite each other's counts. clear_flags are
+        the cleared, missless, full combo and all marvelous flags of the play and grade is its
+        grade value (1 = D). Score and combo keep the highest value, the miss count the lowest.
+        Returns the merged row, which MySQL's upsert can't hand back itself.
+        """
+        clear_cols = ["clear_ct", "missless_ct", "fullcombo_ct", "allmarv_ct"]
+        grade_cols = [
+            "grade_d_ct", "grade_c_ct", "grade_b_ct", "grade_a_ct", "grade_aa_ct", "grade_aaa_ct", "grade_s_ct",
+            "grade_ss_ct", "grade_sss_ct", "grade_master_ct", "grade_sp_ct", "grade_ssp_ct", "grade_sssp_ct",
+        ]
+
+        values = {col: 1 if flag else 0 for col, flag in zip(clear_cols, clear_flags)}
+        values.update({col: 1 if idx == grade - 1 else 0 for idx, col in enumerate(grade_cols)})
+
+        sql = insert(best_score).values(
+            user=user_id,
+            song_id=song_id,
+            chart_id=chart_id,
+            score=score,
+            play_ct=1,
+            best_combo=max_combo,
+            lowest_miss_ct=miss_ct,
+            rating=0,
+            **values,
+        )
+
+        updates = {col: best_score.c[col] + 1 for col, val in values.items() if val}
+        conflict = sql.on_duplicate_key_update(
+            score=func.greatest(best_score.c.score, score),
+            play_ct=best_score.c.play_ct + 1,
+            best_combo=func.greatest(best_score.c.best_combo, max_combo),
+            lowest_miss_ct=func.least(best_score.c.lowest_miss_ct, miss_ct),
+            **updates,
+        )
+
+        result = await self.execute(conflict)
+        if result is None:
+            self.logger.error(
+                f"{__name__}: failed to merge best score! profile: {user_id}, song: {song_id}, chart: {chart_id}"
+            )
+            return None
+
+        return await self.get_best_score(user_id, song_id, chart_id)
+
+    async def ensure_best_score(self, user_id: int, song_id: int, chart_id: int) -> Optional[int]:
+        """
+        Creates an empty best score for a newly unlocked chart, leaves an existing one alone
+        """
+        sql = insert(best_score).prefix_with("IGNORE").values(
+            user=user_id,
+            song_id=song_id,
+            chart_id=chart_id,
+            score=0,
+            play_ct=0,
+            clear_ct=0,
+            missless_ct=0,
+            fullcombo_ct=0,
+            allmarv_ct=0,
+            grade_d_ct=0,
+            grade_c_ct=0,
+            grade_b_ct=0,
+            grade_a_ct=0,
+            grade_aa_ct=0,
+            grade_aaa_ct=0,
+            grade_s_ct=0,
+            grade_ss_ct=0,
+            grade_sss_ct=0,
+            grade_master_ct=0,
+            grade_sp_ct=0,
+            grade_ssp_ct=0,
+            grade_sssp_ct=0,
+            best_combo=0,
+            lowest_miss_ct=0,
+            rating=0,
+        )
+
+        result = await self.execute(sql)
+        if result is None:
+            self.logger.error(
+                f"{__name__}: failed to create best score! profile: {user_id}, song: {song_id}, chart: {chart_id}"
+            )
+            return None
+
+        return result.lastrowid
+
     async def put_playlog(
         self,
         user_id: int,